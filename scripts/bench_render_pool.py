@@ -0,0 +1,142 @@
+"""Benchmark PNG card rendering: one Chromium per image vs the shared render pool.
+
+Renders the weekly report card N times each way and prints renders/sec plus the
+peak RSS of this process and all its children (Chromium), sampled from /proc.
+Needs Playwright with Chromium installed (`playwright install chromium`); Linux only
+for the RSS numbers.
+
+    python scripts/bench_render_pool.py --renders 20 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tm_bot"))
+from visualisation.render_pool import CHROMIUM_ARGS, RenderPool  # noqa: E402
+from visualisation.weekly_report_card import build_weekly_report_card_html  # noqa: E402
+
+WEEK_START = datetime(2025, 12, 22)
+WEEK_END = datetime(2025, 12, 28, 23, 59)
+SUMMARY = {
+    "P01": {
+        "text": "Learn Arabic - تعلم العربية (Level 1)",
+        "hours_promised": 5.0,
+        "hours_spent": 3.5,
+        "sessions": [{"date": date(2025, 12, 22), "hours": 1.0}, {"date": date(2025, 12, 24), "hours": 2.5}],
+    },
+    "P02": {
+        "text": "Deep work",
+        "hours_promised": 10.0,
+        "hours_spent": 6.0,
+        "sessions": [{"date": date(2025, 12, 23), "hours": 3.0}, {"date": date(2025, 12, 26), "hours": 3.0}],
+    },
+}
+
+
+def _tree_rss_bytes(root_pid: int) -> int:
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as handle:
+                ppid = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class PeakRss:
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_rss_bytes(os.getpid()))
+            self._stop.wait(0.05)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def _render_cold(html_doc: str, output_path: str) -> None:
+    """The pre-pool path: launch Playwright + Chromium for every image."""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        try:
+            page = await browser.new_page(viewport={"width": 1200, "height": 900}, device_scale_factor=2)
+            await page.set_content(html_doc, wait_until="load")
+            await page.screenshot(path=output_path, full_page=True, type="png")
+        finally:
+            await browser.close()
+
+
+async def _run(mode: str, renders: int, concurrency: int, out_dir: str, pool: RenderPool) -> float:
+    html_doc = build_weekly_report_card_html(SUMMARY, week_start=WEEK_START, week_end=WEEK_END, width=1200)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(idx: int) -> None:
+        path = os.path.join(out_dir, f"{mode}_{idx}.png")
+        async with gate:
+            if mode == "cold":
+                await _render_cold(html_doc, path)
+            else:
+                await pool.render(html_doc, path, width=1200, height=900)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(renders)])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--browsers", type=int, default=1)
+    parser.add_argument("--pages", type=int, default=4)
+    args = parser.parse_args()
+
+    pool = RenderPool(browsers=args.browsers, pages_per_browser=args.pages)
+    with tempfile.TemporaryDirectory() as out_dir:
+        for mode in ("cold", "pool"):
+            if mode == "pool":
+                # Warm the pool outside the measurement, as a long-running bot would be.
+                asyncio.run(_run("pool", 1, 1, out_dir, pool))
+            with PeakRss() as rss:
+                elapsed = asyncio.run(_run(mode, args.renders, args.concurrency, out_dir, pool))
+            print(
+                f"{mode:>5}: {args.renders} renders in {elapsed:.2f}s "
+                f"({args.renders / elapsed:.2f} renders/s), peak RSS {rss.peak / 1024 / 1024:.0f} MB"
+            )
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+One-shot import of legacy YouTube watch stats (JSONL) into Postgres.
+
+Reads ROOT_DIR/youtube_watch_stats/youtube_watch_stats.jsonl (or --path) and
+inserts it into youtube_watch_event / youtube_watch_daily in batches. Each line
+gets a stable id, so re-running the import does not duplicate anything.
+
+Usage:
+    python scripts/import_youtube_watch_stats.py --root-dir /srv/zana
+    python scripts/import_youtube_watch_stats.py --path /backup/youtube_watch_stats.jsonl --batch-size 2000
+"""
+
+import argparse
+import os
+import sys
+from itertools import islice
+from pathlib import Path
+
+# Add tm_bot to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tm_bot"))
+
+from repositories.youtube_watch_repo import YoutubeWatchRepository
+from utils.logger import get_logger
+from webapp.youtube_watch_stats import iter_legacy_records, legacy_stats_path
+
+logger = get_logger(__name__)
+
+
+def import_file(path: str, batch_size: int) -> int:
+    repo = YoutubeWatchRepository()
+    records = iter_legacy_records(path)
+    read = inserted = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        read += len(batch)
+        inserted += repo.insert_watch_events(batch)
+        logger.info("Imported %d/%d record(s) so far", inserted, read)
+    logger.info("Done: %d record(s) read, %d inserted, %d already present", read, inserted, read - inserted)
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import legacy YouTube watch stats JSONL into Postgres")
+    parser.add_argument("--root-dir", default=os.getenv("ROOT_DIR"), help="Bot ROOT_DIR (default: $ROOT_DIR)")
+    parser.add_argument("--path", default=None, help="JSONL file to import (overrides --root-dir)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    path = args.path or (legacy_stats_path(args.root_dir) if args.root_dir else None)
+    if not path or not os.path.isfile(path):
+        parser.error(f"No stats file found (path={path!r}); pass --path or --root-dir")
+    import_file(path, max(1, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
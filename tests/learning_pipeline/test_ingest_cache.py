@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from services.learning_pipeline import ingest_cache as ingest_cache_module
+from services.learning_pipeline.ingest_cache import ArtifactTooLargeError, IngestCache
+
+pytestmark = [pytest.mark.unit]
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self._body), 4):
+            yield self._body[start:start + 4]
+
+
+def _install_fake_get(monkeypatch, responses):
+    calls = []
+
+    def fake_safe_get(url, timeout_seconds=None, headers=None, stream=False):
+        calls.append({"url": url, "headers": dict(headers or {})})
+        return responses.pop(0)
+
+    monkeypatch.setattr(ingest_cache_module, "safe_get", fake_safe_get)
+    return calls
+
+
+def test_fresh_entries_are_served_without_network(tmp_path, monkeypatch):
+    calls = _install_fake_get(monkeypatch, [FakeResponse(body=b"<html>hello</html>")])
+    cache = IngestCache(root_dir=str(tmp_path), max_age_seconds=3600)
+
+    assert cache.fetch_text("https://example.com/post?utm_source=x") == "<html>hello</html>"
+    assert cache.fetch_text("https://EXAMPLE.com/post") == "<html>hello</html>"
+    assert len(calls) == 1
+
+
+def test_stale_entries_are_revalidated_with_conditional_get(tmp_path, monkeypatch):
+    calls = _install_fake_get(
+        monkeypatch,
+        [
+            FakeResponse(body=b"feed-v1", headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"}),
+            FakeResponse(status_code=304),
+            FakeResponse(body=b"feed-v2", headers={"ETag": '"def"'}),
+        ],
+    )
+    cache = IngestCache(root_dir=str(tmp_path), max_age_seconds=0)
+
+    assert cache.fetch_bytes("https://example.com/feed.rss") == b"feed-v1"
+    assert cache.fetch_bytes("https://example.com/feed.rss") == b"feed-v1"
+    assert calls[1]["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2026 00:00:00 GMT",
+    }
+    assert cache.fetch_bytes("https://example.com/feed.rss") == b"feed-v2"
+
+
+def test_cache_key_overrides_signed_urls_and_size_limit(tmp_path, monkeypatch):
+    calls = _install_fake_get(monkeypatch, [FakeResponse(body=b"audio-bytes"), FakeResponse(body=b"x" * 64)])
+    cache = IngestCache(root_dir=str(tmp_path))
+
+    first = cache.fetch("https://cdn.example.com/a.mp3?sig=1", cache_key="https://example.com/ep#audio")
+    second = cache.fetch("https://cdn.example.com/a.mp3?sig=2", cache_key="https://example.com/ep#audio")
+    assert first.path == second.path
+    assert second.from_cache is True
+    assert len(calls) == 1
+
+    with pytest.raises(ArtifactTooLargeError):
+        cache.fetch("https://cdn.example.com/big.mp3", max_bytes=16)
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+def test_lru_eviction_keeps_total_size_bounded(tmp_path, monkeypatch):
+    _install_fake_get(
+        monkeypatch,
+        [FakeResponse(body=b"a" * 40), FakeResponse(body=b"b" * 40), FakeResponse(body=b"c" * 40)],
+    )
+    cache = IngestCache(root_dir=str(tmp_path), max_bytes=100)
+
+    first = cache.fetch("https://example.com/1")
+    second = cache.fetch("https://example.com/2")
+    os.utime(first.path, (1_000, 1_000))
+    os.utime(second.path, (2_000, 2_000))
+    cache.fetch("https://example.com/3")
+
+    assert cache.total_bytes() <= 100
+    assert not (tmp_path / "blobs" / first.sha256[:2] / first.sha256).exists()
@@ -1,12 +1,12 @@
 import uuid
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from db.postgres_db import check_table_exists, get_db_session
 from repositories.content_repo import ContentRepository
 from services.learning_pipeline.job_repo import LearningPipelineJobRepository
-from services.learning_pipeline.learning_repo import LearningPipelineRepository
+from services.learning_pipeline.learning_repo import LearningPipelineRepository, delete_shared_analysis
 from services.learning_pipeline.types import SegmentRecord
 
 pytestmark = [pytest.mark.integration, pytest.mark.requires_postgres]
@@ -208,3 +208,48 @@ def test_learning_repo_user_concept_mastery_roundtrip():
     assert result2["attempt_count"] == 2
     assert result2["correct_count"] == 1
     assert result2["mastery_score"] is not None
+
+
+def test_shared_rebuild_keeps_user_mastery_and_joins_inflight_job():
+    _require_learning_tables()
+    content_repo = ContentRepository()
+    job_repo = LearningPipelineJobRepository()
+    learning_repo = LearningPipelineRepository()
+
+    suffix = uuid.uuid4().hex
+    content_id = content_repo.upsert_content(
+        canonical_url=f"https://example.com/shared/{suffix}",
+        original_url=f"https://example.com/shared/{suffix}",
+        provider="blog",
+        content_type="text",
+        title="Shared analysis test",
+    )
+    first = job_repo.create_or_reuse_job(user_id="3001", content_id=content_id)
+    second = job_repo.create_or_reuse_job(user_id="3002", content_id=content_id, force_rebuild=True)
+    assert second["id"] == first["id"]
+    assert second["user_id"] == "3001"
+
+    concept_map = learning_repo.replace_concepts_and_edges(
+        content_id=content_id,
+        concepts=[{"label": "Recall"}, {"label": "Spacing"}],
+        edges=[],
+    )
+    learning_repo.apply_mastery_result("3001", concept_map["recall"], "correct")
+    learning_repo.apply_mastery_result("3002", concept_map["spacing"], "correct")
+
+    with get_db_session() as session:
+        delete_shared_analysis(session, content_id)
+    rebuilt = learning_repo.replace_concepts_and_edges(
+        content_id=content_id,
+        concepts=[{"label": "recall"}],
+        edges=[],
+    )
+    assert rebuilt["recall"] == concept_map["recall"]
+    with get_db_session() as session:
+        rows = session.execute(
+            text("SELECT user_id, concept_id FROM user_concept_mastery WHERE concept_id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": list(concept_map.values())},
+        ).fetchall()
+    assert [(str(row[0]), str(row[1])) for row in rows] == [("3001", concept_map["recall"])]
@@ -6,7 +6,7 @@ from services.learning_pipeline.analysis_service import _compute_weights
 from services.learning_pipeline.embedding_service import EmbeddingService
 from services.learning_pipeline.learning_repo import compute_next_mastery_score
 from services.learning_pipeline.security import validate_safe_http_url
-from services.learning_pipeline.segmenter import Segmenter
+from services.learning_pipeline.segmenter import Segmenter, segment_id_for
 
 
 def test_segmenter_splits_and_chunks_text():
@@ -33,6 +33,30 @@ def test_segmenter_splits_and_chunks_text():
     assert all(chunk["text"] for chunk in chunks)
 
 
+def test_segmenter_chunk_ids_are_deterministic_and_streamed():
+    segmenter = Segmenter(chunk_size=80, chunk_overlap=10)
+    text = "\n\n".join(f"Paragraph {n} talks about spaced repetition and recall." * 3 for n in range(5))
+    segment_iter = segmenter.iter_segments(text, section_path="article")
+    assert not isinstance(segment_iter, list)
+    segments = list(segment_iter)
+    assert [s.text for s in segments] == [s.text for s in segmenter.segment_text(text, section_path="article")]
+
+    rows = [
+        {"id": segment_id_for("content-1", idx, seg.text), "segment_index": idx, "text": seg.text}
+        for idx, seg in enumerate(segments)
+    ]
+    first = [chunk["chunk_id"] for chunk in segmenter.build_chunks(rows)]
+    second = [chunk["chunk_id"] for chunk in Segmenter(chunk_size=80, chunk_overlap=10).iter_chunks(rows)]
+    assert first == second
+    assert len(set(first)) == len(first)
+
+    rows[0]["text"] = rows[0]["text"] + " Changed."
+    rows[0]["id"] = segment_id_for("content-1", 0, rows[0]["text"])
+    changed = [chunk["chunk_id"] for chunk in segmenter.build_chunks(rows)]
+    assert changed[0] != first[0]
+    assert changed[-1] == first[-1]
+
+
 def test_compute_weights_returns_normalized_values():
     concepts = [
         {"label": "python", "concept_type": "topic", "definition": "", "examples": []},
@@ -363,3 +387,128 @@ def test_index_then_search_round_trip():
     assert payload["text"] == "abc"
     assert payload["concept_ids"] == ["c1", "c2"]
     assert payload["language"] == "en"
+
+
+def test_index_chunks_skip_existing_only_embeds_new_chunks():
+    stored = []
+    FakeClient, FakeModels, _ = _make_fake_qdrant(stored)
+
+    class RetrievingClient(FakeClient):
+        def retrieve(self, collection_name, ids, with_payload=False, with_vectors=False):
+            return [pt for pt in stored if pt.id in ids]
+
+    service = _make_test_service(RetrievingClient, FakeModels)
+    embedded = []
+    service._embed_texts = lambda texts: embedded.extend(texts) or [[1.0, 0.0, 0.0] for _ in texts]
+
+    chunks = [{"chunk_id": "k1", "text": "alpha"}, {"chunk_id": "k2", "text": "beta"}]
+    assert service.index_chunks(content_id="c1", chunks=chunks, user_id="u1", skip_existing=True) is True
+    assert embedded == ["alpha", "beta"]
+
+    embedded.clear()
+    chunks.append({"chunk_id": "k3", "text": "gamma"})
+    assert service.index_chunks(content_id="c1", chunks=chunks, user_id="u1", skip_existing=True) is True
+    assert embedded == ["gamma"]
+    assert len(stored) == 3
+
+
+def test_lexical_query_helpers():
+    from services.learning_pipeline.learning_repo import build_or_tsquery, text_search_config_for
+
+    assert build_or_tsquery("What is spaced repetition? Spaced!") == "'what' | 'is' | 'spaced' | 'repetition'"
+    assert build_or_tsquery("?!") == ""
+    assert text_search_config_for("en-US") == "english"
+    assert text_search_config_for("de") == "german"
+    assert text_search_config_for("fa") == "simple"
+    assert text_search_config_for(None) == "simple"
+
+
+def test_qa_fallback_uses_indexed_search_and_degrades_to_scan():
+    from services.learning_pipeline.qa_service import QAService
+
+    class FakeRepo:
+        def __init__(self, fail):
+            self.fail = fail
+
+        def search_segments_lexical(self, content_id, question, limit=8):
+            if self.fail:
+                raise RuntimeError("column search_tsv does not exist")
+            return [{"id": "s2", "start_ms": 0, "end_ms": 10, "text": "recall practice", "score": 0.4}]
+
+        def list_segments(self, content_id):
+            return [{"id": "s1", "text": "memory recall works"}, {"id": "s3", "text": "unrelated"}]
+
+    service = QAService(embedding_service=EmbeddingService(qdrant_url=""), learning_repo=FakeRepo(fail=False))
+    hits = service._fallback_retrieval("c1", "how does recall work", limit=3)
+    assert [hit["payload"]["segment_id"] for hit in hits] == ["s2"]
+    assert hits[0]["score"] == 0.4
+
+    service.learning_repo = FakeRepo(fail=True)
+    hits = service._fallback_retrieval("c1", "how does recall work", limit=3)
+    assert [hit["payload"]["segment_id"] for hit in hits] == ["s1"]
+
+
+def test_concept_ids_are_stable_per_content_and_label():
+    from services.learning_pipeline.learning_repo import concept_id_for
+
+    assert concept_id_for("c1", "Recall") == concept_id_for("c1", " recall ")
+    assert concept_id_for("c1", "recall") != concept_id_for("c2", "recall")
+
+
+def test_force_rebuild_clears_shared_analysis_only_under_the_job_lock(monkeypatch):
+    from contextlib import contextmanager
+
+    from services.learning_pipeline import job_repo as job_repo_module
+
+    class FakeResult:
+        def __init__(self, row=None):
+            self.row = row
+
+        def mappings(self):
+            return self
+
+        def fetchone(self):
+            return self.row
+
+    class FakeSession:
+        def __init__(self, status):
+            self.row = {"id": "job-1", "user_id": "3", "content_id": "c1", "status": status, "stage": "queued"}
+            self.statements = []
+
+        def execute(self, statement, params=None):
+            sql = " ".join(str(statement).split())
+            self.statements.append(sql.split(" ")[0])
+            if "FOR UPDATE" in sql:
+                return FakeResult(self.row)
+            if sql.startswith("UPDATE"):
+                return FakeResult(dict(self.row, user_id=params["user_id"], status="pending"))
+            return FakeResult()
+
+    for status, expect_clear in (("running", False), ("completed", True)):
+        session = FakeSession(status)
+
+        @contextmanager
+        def fake_db_session():
+            yield session
+
+        monkeypatch.setattr(job_repo_module, "get_db_session", fake_db_session)
+        job = job_repo_module.LearningPipelineJobRepository().create_or_reuse_job("7", "c1", force_rebuild=True)
+
+        assert job["id"] == "job-1"
+        deletes = session.statements.count("DELETE")
+        assert deletes == (4 if expect_clear else 0)
+        if expect_clear:
+            # Cleared after the row is locked and before the job is requeued, in one transaction.
+            assert session.statements.index("DELETE") > session.statements.index("SELECT")
+            assert session.statements.index("DELETE") < session.statements.index("UPDATE")
+
+
+def test_qa_collapses_duplicate_chunk_hits():
+    from services.learning_pipeline.qa_service import _dedupe_hits
+
+    hits = [
+        {"score": 0.9, "payload": {"segment_id": "s1", "chunk_index": 0, "text": "a"}},
+        {"score": 0.9, "payload": {"segment_id": "s1", "chunk_index": 0, "text": "a"}},
+        {"score": 0.5, "payload": {"segment_id": "s2", "chunk_index": 0, "text": "b"}},
+    ]
+    assert [hit["payload"]["segment_id"] for hit in _dedupe_hits(hits)] == ["s1", "s2"]
@@ -0,0 +1,153 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services.learning_pipeline.types import IngestedContent, SegmentRecord
+from services.learning_pipeline.worker import LearningPipelineWorker
+
+pytestmark = [pytest.mark.unit]
+
+
+class FakeLearningRepo:
+    def __init__(self):
+        self.segments = []
+        self.artifacts = []
+        self.concepts = []
+
+    def add_asset(self, **_kwargs):
+        return str(uuid.uuid4())
+
+    def replace_segments(self, content_id, segments, language=None):
+        self.segments = [
+            {"id": f"seg-{idx}", "content_id": content_id, "segment_index": idx, "text": seg.text}
+            for idx, seg in enumerate(segments)
+        ]
+        return list(self.segments)
+
+    def list_segments(self, _content_id):
+        return list(self.segments)
+
+    def add_artifact(self, content_id, artifact_type, artifact_format, payload_json, model_name=None):
+        artifact_id = str(uuid.uuid4())
+        self.artifacts.append({"id": artifact_id, "artifact_type": artifact_type, "payload_json": payload_json})
+        return artifact_id
+
+    def save_stage_checkpoint(self, content_id, stage, payload):
+        return self.add_artifact(content_id, f"checkpoint_{stage}", "json", payload)
+
+    def get_stage_checkpoints(self, _content_id):
+        latest = {}
+        for artifact in self.artifacts:
+            if artifact["artifact_type"].startswith("checkpoint_"):
+                latest[artifact["artifact_type"][len("checkpoint_"):]] = artifact
+        return latest
+
+    def replace_concepts_and_edges(self, content_id, concepts, edges):
+        self.concepts = list(concepts)
+        return {}
+
+
+class FakeJobRepo:
+    def __init__(self):
+        self.stages = []
+
+    def set_stage(self, _job_id, stage):
+        self.stages.append(stage)
+
+    def mark_gemini_fallback_used(self, _job_id):
+        pass
+
+
+def _make_worker(calls, fail_stages=None):
+    fail_stages = fail_stages if fail_stages is not None else set()
+    worker = LearningPipelineWorker()
+    worker.learning_repo = FakeLearningRepo()
+    worker.job_repo = FakeJobRepo()
+    worker.content_repo = type(
+        "FakeContentRepo",
+        (),
+        {"get_content_by_id": lambda self, _cid: {"original_url": "https://example.com/a", "provider": "blog"}},
+    )()
+
+    def ingest(_content):
+        calls.append("fetch")
+        return IngestedContent(
+            source_type="blog",
+            language="en",
+            text="",
+            segments=[SegmentRecord(text="alpha beta"), SegmentRecord(text="gamma delta")],
+        )
+
+    def index_chunks(content_id, chunks, language, user_id, skip_existing=False):
+        calls.append("embed")
+        if "embed" in fail_stages:
+            raise RuntimeError("vector store down")
+        return True
+
+    def generate_summaries(segments):
+        calls.append("summarize")
+        return {"summary_global": {"text": "x"}}, False, "heuristic"
+
+    def extract_concepts(segments):
+        calls.append("concept_extract")
+        return {"concepts": [{"label": "alpha"}], "edges": []}, False, "heuristic"
+
+    def create_quiz(content_id, difficulty, count):
+        calls.append("quiz_generate")
+        return {"quiz_set_id": "quiz-1", "questions": []}, False
+
+    worker._ingest_content = ingest
+    worker.embedding_service.index_chunks = index_chunks
+    worker.analysis_service.generate_summaries = generate_summaries
+    worker.analysis_service.extract_concepts = extract_concepts
+    worker.quiz_service.create_quiz = create_quiz
+    return worker
+
+
+def test_run_pipeline_resumes_from_checkpoints_after_failure(monkeypatch):
+    monkeypatch.setattr(
+        "services.learning_pipeline.worker.validate_safe_http_url", lambda url: url
+    )
+    calls = []
+    fail_stages = {"embed"}
+    worker = _make_worker(calls, fail_stages)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(worker._run_pipeline(job_id="job-1", content_id="content-1", user_id="1"))
+    assert sorted(calls) == ["concept_extract", "embed", "fetch", "summarize"]
+
+    calls.clear()
+    fail_stages.clear()
+    asyncio.run(worker._run_pipeline(job_id="job-1", content_id="content-1", user_id="1"))
+
+    # Ingest, summaries and concepts are reused; only the failed stage and its dependents rerun.
+    assert calls == ["embed", "quiz_generate"]
+    assert worker.job_repo.stages[-1] == "done"
+
+    calls.clear()
+    asyncio.run(worker._run_pipeline(job_id="job-1", content_id="content-1", user_id="1"))
+    assert calls == []
+
+
+def test_parallel_stages_run_concurrently(monkeypatch):
+    monkeypatch.setattr(
+        "services.learning_pipeline.worker.validate_safe_http_url", lambda url: url
+    )
+    calls = []
+    worker = _make_worker(calls)
+    running = {"now": 0, "peak": 0}
+
+    async def tracked(stage, *_args):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {}
+
+    monkeypatch.setattr(worker, "_stage_embed", lambda *a: tracked("embed", *a))
+    monkeypatch.setattr(worker, "_stage_summarize", lambda *a: tracked("summarize", *a))
+    monkeypatch.setattr(worker, "_stage_concept_extract", lambda *a: tracked("concept_extract", *a))
+
+    asyncio.run(worker._run_pipeline(job_id="job-1", content_id="content-1", user_id="1"))
+    assert running["peak"] == 3
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 
@@ -48,6 +48,26 @@ def test_upload_and_sign(monkeypatch):
     assert datetime.fromisoformat(expires_at)
 
 
+def test_signed_urls_are_reused_within_their_validity_window(monkeypatch):
+    fake_client = _FakeS3Client()
+    monkeypatch.setenv("OBJECT_STORAGE_BUCKET", "xaana-pdf")
+    monkeypatch.setenv("OBJECT_STORAGE_ACCESS_KEY_ID", "key")
+    monkeypatch.setenv("OBJECT_STORAGE_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setattr("services.object_storage_service.boto3.client", lambda *args, **kwargs: fake_client)
+
+    svc = ObjectStorageService()
+    first = svc.build_signed_get_url("s3://xaana-pdf/a.pdf", expires_in=600)
+    assert svc.build_signed_get_url("s3://xaana-pdf/a.pdf", expires_in=600) == first
+    svc.build_signed_get_url("s3://xaana-pdf/b.pdf", expires_in=600)
+    assert len(fake_client.presign_calls) == 2
+
+    # Less than a quarter of the lifetime left: sign again.
+    url, expires = svc._signed_urls[("s3://xaana-pdf/a.pdf", 600)]
+    svc._signed_urls[("s3://xaana-pdf/a.pdf", 600)] = (url, datetime.fromisoformat(first[1]) - timedelta(seconds=500))
+    svc.build_signed_get_url("s3://xaana-pdf/a.pdf", expires_in=600)
+    assert len(fake_client.presign_calls) == 3
+
+
 def test_invalid_storage_uri_raises():
     with pytest.raises(ValueError):
         ObjectStorageService._parse_storage_uri("https://example.com/file.pdf")
@@ -2,10 +2,14 @@
 Unit tests for content manager: URL canonicalization, bucket mapping,
 completion calculation, and short-segment filtering.
 """
+import threading
+import time
+
 import pytest
 
 from utils.url_utils import canonicalize_url
 from services.content_progress_service import (
+    ConsumptionCoalescer,
     ContentProgressService,
     map_ratio_to_bucket_indices_exclusive,
     map_to_bucket_indices,
@@ -204,3 +208,143 @@ def test_pdf_reader_read_allows_single_bucket_segment_without_moving_resume():
     assert sum(1 for value in repo.buckets if value) == 1
     assert repo.updated["last_position"] is None
     assert repo.updated["progress_ratio"] == pytest.approx(1 / 120)
+
+
+class _BatchRepo:
+    def __init__(self, fail_first=False):
+        self.calls = {"get_content_by_id": 0, "get_heatmap": 0}
+        self.batches = []
+        self.updates = []
+        self.fail_first = fail_first
+        self.buckets = [0] * 120
+
+    def get_content_by_id(self, content_id):
+        self.calls["get_content_by_id"] += 1
+        return {"id": content_id, "content_type": "video", "duration_seconds": 600}
+
+    def get_heatmap(self, user_id, content_id):
+        self.calls["get_heatmap"] += 1
+        return {"bucket_count": 120, "buckets": list(self.buckets)}
+
+    def apply_consumption_batch(self, user_id, content_id, events, bucket_increments, bucket_count, updated_at):
+        if self.fail_first:
+            self.fail_first = False
+            raise RuntimeError("db down")
+        self.batches.append({"events": events, "increments": dict(bucket_increments)})
+        for index, count in bucket_increments.items():
+            self.buckets[index] += count
+        return list(self.buckets)
+
+    def update_user_content_progress(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+@pytest.mark.unit
+def test_coalescer_turns_a_burst_of_segments_into_one_write():
+    repo = _BatchRepo()
+    coalescer = ConsumptionCoalescer(content_repo=repo, flush_seconds=60)
+    service = ContentProgressService(content_repo=repo, coalescer=coalescer)
+
+    for second in range(0, 300, 10):
+        result = service.record_consumption(
+            user_id="7", content_id="video-1", start_position=second, end_position=second + 10,
+            position_unit="seconds", client="telegram_web",
+        )
+    covered = set().union(*(map_to_bucket_indices(s, s + 10, 600, 120) for s in range(0, 300, 10)))
+    assert result["progress_ratio"] == pytest.approx(len(covered) / 120)
+    assert repo.calls == {"get_content_by_id": 1, "get_heatmap": 1}
+    assert repo.batches == []
+    assert coalescer.flush_due() == 0  # not due yet
+
+    assert coalescer.flush("7", "video-1") is True
+    assert len(repo.batches) == 1
+    # Touching segments are merged into one event; increments match the per-segment mapping.
+    assert [(e["start_position"], e["end_position"]) for e in repo.batches[0]["events"]] == [(0, 300)]
+    assert sum(repo.batches[0]["increments"].values()) == sum(
+        len(map_to_bucket_indices(s, s + 10, 600, 120)) for s in range(0, 300, 10)
+    )
+    assert repo.updates[-1]["progress_ratio"] == pytest.approx(len(covered) / 120)
+    assert repo.updates[-1]["last_position"] == 300
+    assert coalescer.stats()["pending"] == 0
+
+
+@pytest.mark.unit
+def test_coalescer_keeps_segments_buffered_when_a_flush_fails():
+    repo = _BatchRepo(fail_first=True)
+    coalescer = ConsumptionCoalescer(content_repo=repo, flush_seconds=60)
+    service = ContentProgressService(content_repo=repo, coalescer=coalescer)
+
+    service.record_consumption(
+        user_id="7", content_id="video-1", start_position=0, end_position=30,
+        position_unit="seconds", client="telegram_web",
+    )
+    assert coalescer.flush_all() == 0
+    service.record_consumption(
+        user_id="7", content_id="video-1", start_position=100, end_position=130,
+        position_unit="seconds", client="telegram_web",
+    )
+    assert coalescer.flush_all() == 1
+    assert len(repo.batches) == 1
+    assert [(e["start_position"], e["end_position"]) for e in repo.batches[0]["events"]] == [(0, 30), (100, 130)]
+    expected = set(map_to_bucket_indices(0, 30, 600, 120)) | set(map_to_bucket_indices(100, 130, 600, 120))
+    assert {i for i, b in enumerate(repo.buckets) if b} == expected
+
+
+class _SlowBatchRepo(_BatchRepo):
+    """Reads the increments when the statement is built, then waits on the database."""
+
+    def apply_consumption_batch(self, user_id, content_id, events, bucket_increments, bucket_count, updated_at):
+        self.batches.append({"events": len(events), "total": sum(bucket_increments.values())})
+        time.sleep(0.001)
+        return list(self.buckets)
+
+    def add_user_content(self, user_id, content_id):
+        pass
+
+
+class _YieldingLock:
+    """Lock that pauses `thread` after each release, widening any gap between its critical sections."""
+
+    def __init__(self, thread):
+        self._lock = threading.Lock()
+        self._thread = thread
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+        if threading.current_thread() is self._thread:
+            time.sleep(0.0005)
+
+
+@pytest.mark.unit
+def test_coalescer_loses_no_segments_to_a_concurrent_flush():
+    repo = _SlowBatchRepo()
+    coalescer = ConsumptionCoalescer(content_repo=repo, flush_seconds=1e-9)
+    coalescer._lock = _YieldingLock(threading.current_thread())
+    service = ContentProgressService(content_repo=repo, coalescer=coalescer)
+    recording = threading.Event()
+    recording.set()
+
+    def sweeper():
+        while recording.is_set():
+            coalescer.flush_due()
+
+    thread = threading.Thread(target=sweeper)
+    thread.start()
+    try:
+        for second in range(0, 600, 5):
+            service.record_consumption(
+                user_id="7", content_id="video-1", start_position=second, end_position=second + 5,
+                position_unit="seconds", client="telegram_web",
+            )
+    finally:
+        recording.clear()
+        thread.join()
+    coalescer.flush_all()
+
+    expected = sum(len(map_to_bucket_indices(s, s + 5, 600, 120)) for s in range(0, 600, 5))
+    assert sum(batch["total"] for batch in repo.batches) == expected
+    assert coalescer.stats()["pending"] == 0
@@ -0,0 +1,120 @@
+import asyncio
+import io
+import os
+
+from PIL import Image
+
+from services import avatar_service
+from services.avatar_service import (
+    AvatarService,
+    avatar_thumbnail,
+    avatar_thumbnail_cache,
+    avatar_thumbnail_data_uri,
+    thumbnail_path_for,
+)
+
+
+def _write_jpeg(path, color, size=(400, 300)):
+    Image.new("RGB", size, color).save(path, format="JPEG")
+
+
+def test_thumbnail_is_written_once_and_served_from_cache(tmp_path, monkeypatch):
+    avatar_thumbnail_cache.clear()
+    avatar = str(tmp_path / "42.jpg")
+    _write_jpeg(avatar, "red")
+
+    loads = []
+    original_load = avatar_service._AvatarThumbnailCache._load
+    monkeypatch.setattr(
+        avatar_service._AvatarThumbnailCache,
+        "_load",
+        staticmethod(lambda path, mtime_ns: loads.append(path) or original_load(path, mtime_ns)),
+    )
+
+    content, mime = avatar_thumbnail(avatar)
+    assert mime == "image/webp"
+    assert os.path.isfile(thumbnail_path_for(avatar))
+    with Image.open(io.BytesIO(content)) as thumb:
+        assert thumb.size == (96, 96)
+
+    assert avatar_thumbnail_data_uri(avatar).startswith("data:image/webp;base64,")
+    assert avatar_thumbnail(avatar)[0] == content
+    assert len(loads) == 1
+
+    # A re-downloaded avatar (newer mtime) invalidates the cached thumbnail.
+    _write_jpeg(avatar, "blue")
+    stat = os.stat(avatar)
+    os.utime(avatar, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert avatar_thumbnail(avatar)[0] != content
+    assert len(loads) == 2
+
+
+def test_refresh_pending_batches_stale_users_with_bounded_concurrency(tmp_path, monkeypatch):
+    service = AvatarService(str(tmp_path))
+    service.refresh_concurrency = 3
+    service.refresh_batch_size = 50
+    for user_id in range(60):
+        service.enqueue_refresh(user_id)
+        service.enqueue_refresh(user_id)  # repeated interactions are deduplicated
+
+    checked_batches = []
+    monkeypatch.setattr(
+        service,
+        "list_stale_user_ids",
+        lambda user_ids: checked_batches.append(list(user_ids)) or [u for u in user_ids if u % 2 == 0],
+    )
+    in_flight, peak, refreshed = [0], [0], []
+
+    async def fake_refresh(bot, user_id):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        refreshed.append(user_id)
+        return True
+
+    monkeypatch.setattr(service, "refresh_avatar", fake_refresh)
+
+    async def run():
+        return await service.refresh_pending(bot=None), await service.refresh_pending(bot=None)
+
+    first, second = asyncio.run(run())
+    assert [len(batch) for batch in checked_batches] == [50, 10]
+    assert first + second == 30
+    assert sorted(refreshed) == list(range(0, 60, 2))
+    assert peak[0] == 3
+
+
+def test_thumbnail_route_revalidates_with_an_mtime_etag(tmp_path, monkeypatch):
+    from contextlib import contextmanager
+    from types import SimpleNamespace
+
+    from db import postgres_db
+    from webapp.routers.health import get_user_avatar
+
+    avatar_thumbnail_cache.clear()
+    avatar = tmp_path / "media" / "avatars" / "42.jpg"
+    avatar.parent.mkdir(parents=True)
+    _write_jpeg(str(avatar), "green")
+
+    row = {"avatar_path": "media/avatars/42.jpg", "avatar_visibility": "public"}
+    session = SimpleNamespace(
+        execute=lambda *args, **kwargs: SimpleNamespace(mappings=lambda: SimpleNamespace(fetchone=lambda: row))
+    )
+    monkeypatch.setattr(postgres_db, "get_db_session", contextmanager(lambda: (yield session)))
+
+    def request(headers=None):
+        return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(root_dir=str(tmp_path))), headers=headers or {})
+
+    first = asyncio.run(get_user_avatar(request(), "42", size="thumb", current_user_id=1))
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.media_type == "image/webp"
+
+    revalidated = asyncio.run(get_user_avatar(request({"if-none-match": etag}), "42", size="thumb", current_user_id=1))
+    assert revalidated.status_code == 304
+
+    os.utime(avatar, ns=(os.stat(avatar).st_atime_ns, os.stat(avatar).st_mtime_ns + 1_000_000_000))
+    changed = asyncio.run(get_user_avatar(request({"if-none-match": etag}), "42", size="thumb", current_user_id=1))
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,104 @@
+import asyncio
+import types
+
+import pytest
+from telegram.error import Forbidden, RetryAfter, TimedOut
+
+from services.broadcast_engine import BroadcastEngine, TokenBucket
+
+
+class FakeProgress:
+    def __init__(self, finished=None, file_id=None):
+        self.finished = set(finished or [])
+        self.records = []
+        self.file_id = file_id
+
+    def finished_recipients(self):
+        return set(self.finished)
+
+    def record(self, results):
+        self.records.extend(results)
+
+    def get_media_file_id(self):
+        return self.file_id
+
+    def set_media_file_id(self, file_id):
+        self.file_id = file_id
+
+
+def _photo_message(file_id):
+    return types.SimpleNamespace(photo=[types.SimpleNamespace(file_id="thumb"), types.SimpleNamespace(file_id=file_id)])
+
+
+def test_image_is_uploaded_once_and_file_id_reused():
+    sent = []
+
+    async def send(user_id, photo):
+        sent.append((user_id, photo))
+        if user_id == 1:
+            raise Forbidden("bot was blocked by the user")
+        return _photo_message("file-123")
+
+    progress = FakeProgress()
+    engine = BroadcastEngine(send, photo_source=lambda: b"upload", progress=progress, rate_per_second=1000, concurrency=4)
+    result = asyncio.run(engine.run([1, 2, 3, 4, 5]))
+
+    assert result == {"success": 4, "failed": 1}
+    assert [photo for _, photo in sent] == [b"upload", b"upload", "file-123", "file-123", "file-123"]
+    assert progress.file_id == "file-123"
+    assert sorted((uid, status) for uid, status, _, _ in progress.records) == [
+        (1, "failed"), (2, "sent"), (3, "sent"), (4, "sent"), (5, "sent"),
+    ]
+
+
+def test_retry_after_pauses_and_retries(monkeypatch):
+    calls = {}
+
+    async def send(user_id, photo):
+        calls[user_id] = calls.get(user_id, 0) + 1
+        if user_id == 2 and calls[user_id] == 1:
+            raise RetryAfter(0)
+        if user_id == 3 and calls[user_id] < 3:
+            raise TimedOut()
+        return object()
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr("services.broadcast_engine.asyncio.sleep", lambda _s: real_sleep(0))
+    monkeypatch.setattr("services.broadcast_engine.PER_CHAT_INTERVAL_SECONDS", 0)
+    engine = BroadcastEngine(send, rate_per_second=1000, concurrency=2, max_attempts=3)
+    result = asyncio.run(engine.run([1, 2, 3]))
+
+    assert result == {"success": 3, "failed": 0}
+    assert calls == {1: 1, 2: 2, 3: 3}
+
+
+def test_resume_skips_finished_recipients():
+    sent = []
+
+    async def send(user_id, photo):
+        sent.append(user_id)
+        return object()
+
+    progress = FakeProgress(finished={1, 2})
+    result = asyncio.run(BroadcastEngine(send, progress=progress, rate_per_second=1000).run([1, 2, 3, 4]))
+
+    assert result == {"success": 2, "failed": 0}
+    assert sorted(sent) == [3, 4]
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=10, capacity=1, clock=lambda: now[0], sleep=fake_sleep)
+
+    async def run():
+        for _ in range(21):
+            await bucket.acquire()
+        bucket.pause(5)
+        await bucket.acquire()
+
+    asyncio.run(run())
+    assert now[0] == pytest.approx(2.0 + 5.0 + 0.1)
@@ -1,8 +1,12 @@
+import types
 from datetime import datetime, timezone
+from unittest.mock import MagicMock
 
 import pytest
+from telegram.error import RetryAfter
 
 from models.models import Broadcast
+from platforms.telegram.response_service import TelegramResponseService
 from services import broadcast_service
 
 
@@ -51,6 +55,7 @@ async def test_execute_broadcast_from_db_uses_default_bot_token(monkeypatch):
         bot_token=None,
         media_type=None,
         media_url=None,
+        progress=None,
     ):
         send_calls.append(
             {
@@ -60,6 +65,7 @@ async def test_execute_broadcast_from_db_uses_default_bot_token(monkeypatch):
                 "bot_token": bot_token,
                 "media_type": media_type,
                 "media_url": media_url,
+                "progress": progress,
             }
         )
         return {"success": len(user_ids), "failed": 0}
@@ -77,6 +83,7 @@ async def test_execute_broadcast_from_db_uses_default_bot_token(monkeypatch):
     assert send_calls[0]["bot_token"] == "fallback-token"
     assert send_calls[0]["media_type"] == "image"
     assert send_calls[0]["media_url"] == "https://example.com/image.jpg"
+    assert send_calls[0]["progress"] is not None
     assert fake_broadcast.status == "completed"
 
 
@@ -111,3 +118,22 @@ async def test_execute_broadcast_from_db_without_delivery_channel_raises(monkeyp
     # Keep pending so dispatcher can retry after config is fixed.
     assert fake_broadcast.status == "pending"
 
+
+
+@pytest.mark.asyncio
+async def test_send_broadcast_via_response_service_retries_after_flood_wait():
+    calls = []
+
+    class _FloodedBot:
+        async def send_message(self, chat_id, **kwargs):
+            calls.append(chat_id)
+            if len(calls) == 1:
+                raise RetryAfter(0)
+            return types.SimpleNamespace(message_id=len(calls))
+
+    response_service = TelegramResponseService(MagicMock(), bot=_FloodedBot())
+
+    result = await broadcast_service.send_broadcast(response_service, [1], "hello")
+
+    assert calls == [1, 1]
+    assert result == {"success": 1, "failed": 0}
@@ -0,0 +1,220 @@
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from services import club_reminder_service
+from services.club_reminder_service import ClubReminderService, load_checkin_card, next_fire_utc
+
+NOW = datetime(2026, 3, 2, 21, 5)
+CLUB = {
+    "club_id": "club-1",
+    "owner_user_id": "7",
+    "name": "Runners",
+    "telegram_chat_id": "-100",
+    "reminder_time": "21:00",
+    "language": "en",
+    "timezone": "UTC",
+    "leaderboard_time": None,
+    "next_reminder_at_utc": "2026-03-02T21:00:00Z",
+}
+
+
+class _SharedStateRepo:
+    """In-memory stand-in for the club_daily_sends / club_checkin_cards tables."""
+
+    def __init__(self):
+        self.sends = {}
+        self.cards = {}
+
+    def claim_daily_sends(self, kind, claims, owner, stale_after_seconds=600):
+        won = set()
+        for club_id, local_date in claims:
+            if (club_id, kind, local_date) not in self.sends:
+                self.sends[(club_id, kind, local_date)] = "claimed"
+                won.add(club_id)
+        return won
+
+    def mark_daily_send_done(self, kind, club_id, local_date):
+        self.sends[(club_id, kind, local_date)] = "sent"
+
+    def release_daily_send(self, kind, club_id, local_date):
+        if self.sends.get((club_id, kind, local_date)) == "claimed":
+            del self.sends[(club_id, kind, local_date)]
+
+    def save_checkin_card(self, chat_id, message_id, state):
+        self.cards[(chat_id, message_id)] = state
+
+    def get_checkin_card(self, chat_id, message_id):
+        return self.cards.get((chat_id, message_id))
+
+    def list_checkin_cards(self, club_id, since_utc):
+        return [(key, state) for key, state in self.cards.items() if state["club_id"] == club_id]
+
+    def delete_checkin_cards_before(self, cutoff_utc):
+        return 0
+
+
+class _FakeClubsRepo:
+    def __init__(self):
+        self.fire_times = []
+
+    def list_clubs_due(self, kind, now_utc_iso, limit=1000):
+        return [dict(CLUB)]
+
+    def set_club_fire_times(self, kind, fire_times):
+        self.fire_times.append((kind, dict(fire_times)))
+
+    def get_club_members_promises(self, club_id):
+        return [{"user_id": "42", "first_name": "Sam", "promise_uuid": "p-1", "promise_text": "Run 5k"}]
+
+
+class _FakeActionsRepo:
+    def get_today_checkins(self, promise_uuid, today=None):
+        return set()
+
+    def get_checkin_streak(self, user_id, promise_uuid, reference_date=None):
+        return 2
+
+
+class _FakeBot:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None, reply_markup=None):
+        if self.fail:
+            raise RuntimeError("telegram down")
+        self.sent.append(text)
+        return SimpleNamespace(chat_id=chat_id, message_id=len(self.sent))
+
+    async def pin_chat_message(self, **kwargs):
+        return True
+
+
+def _service(state_repo):
+    service = object.__new__(ClubReminderService)
+    service.clubs_repo = _FakeClubsRepo()
+    service.actions_repo = _FakeActionsRepo()
+    service.state_repo = state_repo
+    return service
+
+
+async def test_reminder_is_sent_once_across_replicas_and_restarts(monkeypatch):
+    state_repo = _SharedStateRepo()
+    monkeypatch.setattr(club_reminder_service, "ClubReminderStateRepository", lambda: state_repo)
+    bot_a, bot_b = _FakeBot(), _FakeBot()
+
+    await _service(state_repo).send_due_club_reminders(bot_a, {}, now_utc=NOW)
+    # Second replica in the same window, and the first one again after a restart (empty bot_data).
+    await _service(state_repo).send_due_club_reminders(bot_b, {}, now_utc=NOW)
+    await _service(state_repo).send_due_club_reminders(bot_a, {}, now_utc=NOW)
+
+    assert len(bot_a.sent) == 1
+    assert bot_b.sent == []
+    assert state_repo.sends == {("club-1", "reminder", "2026-03-02"): "sent"}
+
+    # The card survives a restart: a fresh process loads it from the store.
+    card = load_checkin_card({}, -100, 1)
+    assert card["club_id"] == "club-1"
+    assert card["members"][0]["streak"] == 2
+
+
+async def test_failed_send_releases_claim_for_retry(monkeypatch):
+    state_repo = _SharedStateRepo()
+    monkeypatch.setattr(club_reminder_service, "ClubReminderStateRepository", lambda: state_repo)
+
+    await _service(state_repo).send_due_club_reminders(_FakeBot(fail=True), {}, now_utc=NOW)
+    assert state_repo.sends == {}
+
+    bot = _FakeBot()
+    await _service(state_repo).send_due_club_reminders(bot, {}, now_utc=NOW)
+    assert len(bot.sent) == 1
+
+
+async def test_club_is_rescheduled_for_the_next_local_day(monkeypatch):
+    state_repo = _SharedStateRepo()
+    monkeypatch.setattr(club_reminder_service, "ClubReminderStateRepository", lambda: state_repo)
+    service = _service(state_repo)
+
+    await service.send_due_club_reminders(_FakeBot(), {}, now_utc=NOW)
+    assert service.clubs_repo.fire_times == [("reminder", {"club-1": "2026-03-03T21:00:00Z"})]
+
+    # A failed send inside the grace window is retried a few minutes later.
+    failing = _service(_SharedStateRepo())
+    await failing.send_due_club_reminders(_FakeBot(fail=True), {}, now_utc=NOW)
+    assert failing.clubs_repo.fire_times == [("reminder", {"club-1": "2026-03-02T21:10:00Z"})]
+
+
+def test_next_fire_utc_follows_local_time_across_dst():
+    # 08:00 in New York is 13:00 UTC before the March DST switch and 12:00 UTC after it.
+    assert next_fire_utc("08:00", "America/New_York", datetime(2026, 3, 7, 14, 0)) == datetime(2026, 3, 8, 12, 0)
+    assert next_fire_utc("08:00", "America/New_York", datetime(2026, 3, 6, 12, 0)) == datetime(2026, 3, 6, 13, 0)
+    # Unknown timezone and malformed time fall back to UTC and 21:00.
+    assert next_fire_utc("bad", "Nowhere/Zone", datetime(2026, 3, 2, 22, 0)) == datetime(2026, 3, 3, 21, 0)
+
+
+class _ManyClubsRepo(_FakeClubsRepo):
+    def __init__(self, count, owner_timezone_from=None):
+        super().__init__()
+        self.clubs = [
+            dict(CLUB, club_id=f"club-{i}", telegram_chat_id=str(-1000 - i)) for i in range(count)
+        ]
+        # Clubs from this index on have no timezone of their own and follow their owner's.
+        for i, club in enumerate(self.clubs):
+            if owner_timezone_from is not None and i >= owner_timezone_from:
+                club.update(timezone=None, owner_user_id=str(5000 + i))
+
+    def list_clubs_due(self, kind, now_utc_iso, limit=1000):
+        return [dict(club) for club in self.clubs]
+
+
+class _FakeSettingsRepo:
+    calls = []
+
+    def get_timezones(self, user_ids):
+        user_ids = list(user_ids)
+        _FakeSettingsRepo.calls.append(len(user_ids))
+        return {user_id: "Asia/Tehran" for user_id in user_ids}
+
+    def get_settings(self, user_id):
+        raise AssertionError("owner timezones must be looked up in one batch")
+
+
+class _SlowBot(_FakeBot):
+    """Telegram stand-in with per-call latency; one chat always fails."""
+
+    def __init__(self, latency, failing_chat_id):
+        super().__init__()
+        self.latency = latency
+        self.failing_chat_id = failing_chat_id
+
+    async def send_message(self, chat_id, text, parse_mode=None, reply_markup=None):
+        await asyncio.sleep(self.latency)
+        if chat_id == self.failing_chat_id:
+            raise RuntimeError("chat not found")
+        return await super().send_message(chat_id, text, parse_mode, reply_markup)
+
+
+async def test_thousand_club_tick_fans_out_within_its_window(monkeypatch):
+    state_repo = _SharedStateRepo()
+    monkeypatch.setattr(club_reminder_service, "ClubReminderStateRepository", lambda: state_repo)
+    monkeypatch.setattr(club_reminder_service, "SettingsRepository", _FakeSettingsRepo)
+    _FakeSettingsRepo.calls = []
+    service = _service(state_repo)
+    service.clubs_repo = _ManyClubsRepo(1000, owner_timezone_from=500)
+    bot = _SlowBot(latency=0.02, failing_chat_id=-1000)
+
+    started = time.monotonic()
+    sent = await service.send_due_club_reminders(bot, {}, now_utc=NOW)
+    elapsed = time.monotonic() - started
+
+    # Sequentially this is 1000 x 20ms = 20s of send latency alone.
+    assert elapsed < 10
+    assert sent == len(bot.sent) == 999
+    ((kind, fire_times),) = service.clubs_repo.fire_times
+    assert fire_times["club-0"] == "2026-03-02T21:10:00Z"  # the failed club retries
+    assert fire_times["club-1"] == "2026-03-03T21:00:00Z"
+    # Owner-timezone clubs: one settings query for all 500 owners, next 21:00 Tehran (UTC+3:30).
+    assert _FakeSettingsRepo.calls == [500]
+    assert fire_times["club-500"] == "2026-03-03T17:30:00Z"
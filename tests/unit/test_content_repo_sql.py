@@ -7,8 +7,9 @@ from repositories.content_repo import ContentRepository
 
 
 class _FakeResult:
-    def __init__(self, row=None):
+    def __init__(self, row=None, rows=None):
         self._row = row
+        self._rows = rows or []
 
     def mappings(self):
         return self
@@ -16,17 +17,21 @@ class _FakeResult:
     def fetchone(self):
         return self._row
 
+    def fetchall(self):
+        return self._rows
+
 
 class _FakeSession:
-    def __init__(self):
+    def __init__(self, rows=None):
         self.calls = []
+        self.rows = rows or []
 
     def execute(self, statement, params=None):
         sql = statement.text if hasattr(statement, "text") else str(statement)
         self.calls.append((sql, params or {}))
         if "SELECT id FROM content WHERE canonical_url = :canonical_url" in sql:
             return _FakeResult({"id": "resolved-content-id"})
-        return _FakeResult()
+        return _FakeResult(rows=self.rows)
 
 
 class _FakeSessionContext:
@@ -67,3 +72,49 @@ def test_upsert_content_uses_cast_for_metadata_json(monkeypatch):
     assert ":metadata_json::jsonb" not in insert_sql
     assert "EXCLUDED.metadata_json::jsonb" not in insert_sql
     assert json.loads(insert_params["metadata_json"]) == {"captions_available": True}
+
+
+@pytest.mark.unit
+def test_library_pages_use_keyset_cursors(monkeypatch):
+    row = {
+        "content_id": "c-1",
+        "user_content_id": "uc-1",
+        "_k0": "intro to sql",
+        "_k1": "2026-01-02T00:00:00Z",
+        "_k2": "uc-1",
+    }
+    fake_session = _FakeSession(rows=[row])
+    monkeypatch.setattr(content_repo_module, "get_db_session", lambda: _FakeSessionContext(fake_session))
+    repo = ContentRepository()
+
+    (item,) = repo.get_user_contents("7", sort="title")
+    assert "_k0" not in item
+
+    repo.get_user_contents("7", sort="title", cursor=item["cursor"])
+    sql, params = fake_session.calls[-1]
+    assert "OFFSET" not in sql
+    # Title ascends, then (added_at, id) descend as one row value.
+    assert (
+        "((LOWER(COALESCE(c.title, ''))) > (:k0) OR ((LOWER(COALESCE(c.title, ''))) = (:k0) "
+        "AND (uc.added_at, uc.id) < (:k1, :k2)))"
+    ) in sql
+    assert (params["k0"], params["k1"], params["k2"]) == ("intro to sql", "2026-01-02T00:00:00Z", "uc-1")
+
+    with pytest.raises(ValueError):
+        repo.get_user_contents("7", sort="recent", cursor=item["cursor"])
+    with pytest.raises(ValueError):
+        repo.get_user_contents("7", cursor="offset:20")
+
+
+@pytest.mark.unit
+def test_unfiltered_facets_read_maintained_counts(monkeypatch):
+    fake_session = _FakeSession(rows=[
+        {"facet": "status", "value": "saved", "count": 3},
+        {"facet": "content_type", "value": "pdf", "count": 3},
+    ])
+    monkeypatch.setattr(content_repo_module, "get_db_session", lambda: _FakeSessionContext(fake_session))
+
+    facets = ContentRepository().get_user_content_facets("7")
+
+    assert facets == {"status": {"saved": 3}, "content_type": {"pdf": 3}}
+    assert "FROM user_content_facet_counts" in fake_session.calls[0][0]
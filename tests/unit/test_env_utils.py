@@ -0,0 +1,24 @@
+import pytest
+
+from utils.env import env_float, env_int
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("raw, expected", [(None, 8), ("", 8), ("12", 12), (" 3 ", 3), ("0", 8), ("-2", 8), ("many", 8)])
+def test_env_int_keeps_positive_values(monkeypatch, raw, expected):
+    if raw is None:
+        monkeypatch.delenv("TEST_ENV_SETTING", raising=False)
+    else:
+        monkeypatch.setenv("TEST_ENV_SETTING", raw)
+    assert env_int("TEST_ENV_SETTING", 8) == expected
+
+
+@pytest.mark.unit
+def test_zero_is_accepted_only_when_allowed(monkeypatch):
+    monkeypatch.setenv("TEST_ENV_SETTING", "0")
+    assert env_int("TEST_ENV_SETTING", 8, allow_zero=True) == 0
+    assert env_float("TEST_ENV_SETTING", 60.0) == 60.0
+    assert env_float("TEST_ENV_SETTING", 60.0, allow_zero=True) == 0.0
+
+    monkeypatch.setenv("TEST_ENV_SETTING", "0.5")
+    assert env_float("TEST_ENV_SETTING", 60.0) == 0.5
@@ -0,0 +1,82 @@
+from datetime import date, datetime
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from visualisation.native_cards import (
+    _direction_runs,
+    render_streak_heatmap_pillow,
+    render_weekly_report_card_pillow,
+)
+
+WEEK_START = datetime(2025, 12, 22)
+WEEK_END = datetime(2025, 12, 28, 23, 59)
+SUMMARY = {
+    "P01": {
+        "text": "Learn Arabic - تعلم العربية (Level 1)",
+        "hours_promised": 5.0,
+        "hours_spent": 3.5,
+        "sessions": [{"date": date(2025, 12, 22), "hours": 1.0}, {"date": date(2025, 12, 24), "hours": 2.5}],
+    },
+    "P02": {
+        "text": "Deep work",
+        "hours_promised": 10.0,
+        "hours_spent": 6.0,
+        "sessions": [{"date": date(2025, 12, 23), "hours": 3.0}],
+    },
+}
+
+
+def test_weekly_card_matches_html_canvas_size(tmp_path):
+    path = render_weekly_report_card_pillow(
+        summary=SUMMARY, output_path=str(tmp_path / "weekly.png"), week_start=WEEK_START, week_end=WEEK_END
+    )
+    with Image.open(path) as image:
+        assert image.width == 2400
+        assert image.height >= 1800
+
+
+def test_empty_week_and_heatmap_render(tmp_path):
+    weekly = render_weekly_report_card_pillow(
+        summary={}, output_path=str(tmp_path / "empty.png"), week_start=WEEK_START, week_end=WEEK_END
+    )
+    heatmap = render_streak_heatmap_pillow(
+        heatmap_data={"P01": {"text": "Reading", "hours_by_date": {date(2025, 12, 1): 2.0}}},
+        output_path=str(tmp_path / "heatmap.png"),
+        ref_time=datetime(2025, 12, 24),
+    )
+    with Image.open(weekly) as image:
+        assert image.size[0] == 2400
+    with Image.open(heatmap) as image:
+        assert image.size[0] == 2800
+
+
+def test_mixed_rtl_title_is_ordered_visually():
+    runs = _direction_runs("Learn Arabic - تعلم العربية (Level 1)", rtl=True)
+    assert runs == [(True, ")"), (False, "Level 1"), (True, " - تعلم العربية ("), (False, "Learn Arabic")]
+    assert _direction_runs("Deep work", rtl=False) == [(False, "Deep work")]
+
+
+def test_pillow_card_is_close_to_chromium_render(tmp_path):
+    from visualisation.render_pool import RenderPool
+    from visualisation.weekly_report_card import build_weekly_report_card_html
+
+    html_doc = build_weekly_report_card_html(SUMMARY, week_start=WEEK_START, week_end=WEEK_END, width=1200)
+    pool = RenderPool(browsers=1, pages_per_browser=1)
+    try:
+        html_path = pool.render_sync(html_doc, str(tmp_path / "html.png"), width=1200, height=900)
+    except Exception as exc:
+        pytest.skip(f"Chromium not available: {exc}")
+    finally:
+        pool.shutdown()
+    pillow_path = render_weekly_report_card_pillow(
+        summary=SUMMARY, output_path=str(tmp_path / "pillow.png"), week_start=WEEK_START, week_end=WEEK_END
+    )
+
+    with Image.open(html_path) as html_image, Image.open(pillow_path) as pillow_image:
+        assert abs(html_image.height - pillow_image.height) <= 0.1 * html_image.height
+        size = (240, 180)
+        diff = ImageChops.difference(
+            html_image.convert("L").resize(size), pillow_image.convert("L").resize(size)
+        )
+        assert ImageStat.Stat(diff).mean[0] < 12
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+
+import pytest
+
+import services.query_service as query_service_module
+from services.query_service import MAX_RESULT_ROWS, QueryService
+
+
+class _FakeResult:
+    def __init__(self, rows=None, scalar=None):
+        self._rows = rows or []
+        self._scalar = scalar
+        self.closed = False
+
+    def scalar(self):
+        return self._scalar
+
+    def mappings(self):
+        return self
+
+    def fetchmany(self, size):
+        return self._rows[:size]
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    def __init__(self, plan_cost=10.0, rows=None, error=None):
+        self.plan_cost = plan_cost
+        self.rows = rows or []
+        self.error = error
+        self.calls = []
+
+    def execute(self, statement, params=None, execution_options=None):
+        sql = str(statement)
+        self.calls.append((sql, params, execution_options))
+        if sql.startswith("EXPLAIN"):
+            return _FakeResult(scalar=[{"Plan": {"Total Cost": self.plan_cost}}])
+        if "set_config" in sql:
+            return _FakeResult()
+        if self.error:
+            raise self.error
+        return _FakeResult(rows=self.rows)
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = _FakeSession()
+
+    @contextmanager
+    def _readonly_session():
+        yield session
+
+    monkeypatch.setattr(query_service_module, "get_readonly_db_session", _readonly_session)
+    return session
+
+
+QUERY = "SELECT user_id, text FROM promises WHERE user_id = '42'"
+
+
+@pytest.mark.unit
+def test_query_sets_timeout_and_streams_capped_rows(fake_session):
+    fake_session.rows = [{"user_id": "42", "text": f"p{i}"} for i in range(MAX_RESULT_ROWS + 20)]
+
+    ok, rows, error = QueryService(statement_timeout_ms=1500).validate_and_execute_query(QUERY, "42")
+
+    assert ok and error is None
+    assert len(rows) == MAX_RESULT_ROWS
+    timeout_sql, timeout_params, _ = fake_session.calls[0]
+    assert "statement_timeout" in timeout_sql and timeout_params == {"timeout": "1500"}
+    assert fake_session.calls[1][0].startswith("EXPLAIN (FORMAT JSON) SELECT * FROM (")
+    assert fake_session.calls[2][2]["stream_results"] is True
+
+
+@pytest.mark.unit
+def test_query_over_cost_budget_is_not_executed(fake_session):
+    fake_session.plan_cost = 5_000_000.0
+
+    ok, rows, error = QueryService(max_plan_cost=1000).validate_and_execute_query(QUERY, "42")
+
+    assert not ok and rows is None
+    assert "too much data" in error
+    assert len(fake_session.calls) == 2
+
+
+@pytest.mark.unit
+def test_statement_timeout_is_reported_plainly(fake_session):
+    fake_session.error = RuntimeError("canceling statement due to statement timeout")
+
+    ok, _, error = QueryService().validate_and_execute_query(QUERY, "42")
+
+    assert not ok
+    assert "took too long" in error
+
+
+@pytest.mark.parametrize(
+    "environment, expected",
+    [("production", "prod-replica"), ("staging", "staging-replica"), ("", "staging-replica")],
+)
+def test_readonly_url_follows_environment(monkeypatch, environment, expected):
+    from db.postgres_db import get_readonly_database_url
+
+    monkeypatch.setenv("ENVIRONMENT", environment)
+    monkeypatch.setenv("DATABASE_URL_PROD", "prod-primary")
+    monkeypatch.setenv("DATABASE_URL_STAGING", "staging-primary")
+    monkeypatch.setenv("DATABASE_URL_READONLY_PROD", "prod-replica")
+    monkeypatch.setenv("DATABASE_URL_READONLY_STAGING", "staging-replica")
+
+    assert get_readonly_database_url() == expected
+
+
+def test_readonly_url_falls_back_to_the_environments_primary(monkeypatch):
+    from db.postgres_db import get_readonly_database_url
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setenv("DATABASE_URL_PROD", "prod-primary")
+    monkeypatch.delenv("DATABASE_URL_READONLY_PROD", raising=False)
+    monkeypatch.setenv("DATABASE_URL_READONLY_STAGING", "staging-replica")
+
+    assert get_readonly_database_url() == "prod-primary"
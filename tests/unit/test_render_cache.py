@@ -0,0 +1,90 @@
+import asyncio
+import os
+import types
+
+from visualisation import render_cache as render_cache_module
+from visualisation.render_cache import PngRenderCache, send_cached_photo
+
+
+def _png(path, payload):
+    path.write_bytes(b"\x89PNG" + payload)
+    return str(path)
+
+
+def test_identical_html_is_served_from_cache(tmp_path):
+    cache = PngRenderCache(root_dir=str(tmp_path / "cache"))
+    key = cache.key_for("<p>week</p>", 1200, 900)
+    assert key != cache.key_for("<p>week</p>", 1400, 900)
+
+    assert cache.get(key, str(tmp_path / "out1.png")) is False
+    cache.put(key, _png(tmp_path / "rendered.png", b"a" * 100))
+    assert cache.get(key, str(tmp_path / "out2.png")) is True
+    assert (tmp_path / "out2.png").read_bytes() == (tmp_path / "rendered.png").read_bytes()
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == 104
+
+
+def test_lru_eviction_bounds_cache_size(tmp_path):
+    cache = PngRenderCache(root_dir=str(tmp_path / "cache"), max_bytes=250)
+    keys = [cache.key_for(f"<p>{i}</p>", 800, 600) for i in range(3)]
+    cache.put(keys[0], _png(tmp_path / "0.png", b"x" * 100))
+    cache.put(keys[1], _png(tmp_path / "1.png", b"y" * 100))
+    os.utime(cache._image_path(keys[0]), (1_000, 1_000))
+    os.utime(cache._image_path(keys[1]), (2_000, 2_000))
+    cache.put(keys[2], _png(tmp_path / "2.png", b"z" * 100))
+
+    assert cache.stats()["total_bytes"] <= 250
+    assert not os.path.exists(cache._image_path(keys[0]))
+    assert os.path.exists(cache._image_path(keys[2]))
+
+
+def test_send_cached_photo_reuses_telegram_file_id(tmp_path, monkeypatch):
+    cache = PngRenderCache(root_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(render_cache_module, "_shared_cache", cache)
+    sent = []
+
+    class FakeBot:
+        async def send_photo(self, photo, **kwargs):
+            sent.append(photo)
+            return types.SimpleNamespace(photo=[types.SimpleNamespace(file_id="small"), types.SimpleNamespace(file_id="big")])
+
+    first = _png(tmp_path / "a.png", b"same")
+    second = _png(tmp_path / "b.png", b"same")
+    asyncio.run(send_cached_photo(FakeBot(), first, chat_id=1))
+    asyncio.run(send_cached_photo(FakeBot(), second, chat_id=2))
+
+    assert sent == [first, "big"]
+    assert cache.stats()["file_id_reuses"] == 1
+
+
+def test_weekly_card_and_heatmap_are_sent_through_the_file_id_cache(tmp_path, monkeypatch):
+    from services.reports import ReportsService
+
+    cache = PngRenderCache(root_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(render_cache_module, "_shared_cache", cache)
+    reports = ReportsService(promises_repo=None, actions_repo=None)
+    rendered = []
+
+    async def fake_render(user_id, ref_time):
+        rendered.append(_png(tmp_path / f"card{len(rendered)}.png", b"week"))
+        return rendered[-1]
+
+    monkeypatch.setattr(reports, "generate_weekly_visualization_image", fake_render)
+    monkeypatch.setattr(reports, "generate_streak_heatmap_image", fake_render)
+    sent = []
+
+    class FakeBot:
+        async def send_photo(self, photo, **kwargs):
+            sent.append(photo)
+            return types.SimpleNamespace(photo=[types.SimpleNamespace(file_id="card-id")])
+
+    asyncio.run(reports.send_weekly_visualization(FakeBot(), 1, None, chat_id=1))
+    asyncio.run(reports.send_weekly_visualization(FakeBot(), 1, None, chat_id=1))
+    asyncio.run(reports.send_streak_heatmap(FakeBot(), 1, None, chat_id=1))
+
+    assert sent == [rendered[0], "card-id", "card-id"]
+    assert not any(os.path.exists(path) for path in rendered)
@@ -0,0 +1,132 @@
+import asyncio
+import sys
+import types
+
+import pytest
+
+from visualisation.render_pool import RenderPool, RenderQueueFullError
+
+
+class FakePage:
+    def __init__(self, state):
+        self.state = state
+        self.closed = False
+
+    async def set_viewport_size(self, size):
+        pass
+
+    async def set_content(self, html_doc, wait_until="load"):
+        if "CRASH" in html_doc:
+            self.state["browsers"][-1].connected = False
+            raise RuntimeError("Target closed")
+        if "SLOW" in html_doc:
+            await asyncio.sleep(1)
+
+    async def evaluate(self, _js):
+        return True
+
+    async def screenshot(self, path, full_page=True, type="png"):
+        with open(path, "wb") as handle:
+            handle.write(b"\x89PNG")
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self, state):
+        self.state = state
+
+    async def new_page(self):
+        self.state["pages"] += 1
+        return FakePage(self.state)
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, state):
+        self.state = state
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **_kwargs):
+        return FakeContext(self.state)
+
+    async def close(self):
+        self.connected = False
+
+
+def _install_fake_playwright(monkeypatch):
+    state = {"browsers": [], "pages": 0}
+
+    class FakeChromium:
+        async def launch(self, **_kwargs):
+            browser = FakeBrowser(state)
+            state["browsers"].append(browser)
+            return browser
+
+    class FakePlaywright:
+        chromium = FakeChromium()
+
+        async def stop(self):
+            pass
+
+    class FakeStarter:
+        async def start(self):
+            return FakePlaywright()
+
+    module = types.ModuleType("playwright.async_api")
+    module.async_playwright = lambda: FakeStarter()
+    monkeypatch.setitem(sys.modules, "playwright.async_api", module)
+    return state
+
+
+def test_renders_reuse_one_warm_browser(tmp_path, monkeypatch):
+    state = _install_fake_playwright(monkeypatch)
+    pool = RenderPool(browsers=1, pages_per_browser=2)
+    try:
+        async def run():
+            return await asyncio.gather(
+                *[pool.render("<p>card</p>", str(tmp_path / f"card_{i}.png"), width=800, height=600) for i in range(6)]
+            )
+
+        paths = asyncio.run(run())
+        assert all((tmp_path / f"card_{i}.png").exists() for i in range(6))
+        assert len(paths) == 6
+        assert len(state["browsers"]) == 1
+        assert pool.stats()["renders"] == 6
+    finally:
+        pool.shutdown()
+
+
+def test_crashed_browser_is_relaunched(tmp_path, monkeypatch):
+    state = _install_fake_playwright(monkeypatch)
+    pool = RenderPool(browsers=1, pages_per_browser=1)
+    try:
+        with pytest.raises(RuntimeError):
+            pool.render_sync("<p>CRASH</p>", str(tmp_path / "a.png"), width=800, height=600)
+        assert pool.render_sync("<p>ok</p>", str(tmp_path / "b.png"), width=800, height=600).endswith("b.png")
+        assert len(state["browsers"]) == 2
+        assert pool.stats()["browser_restarts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_timeouts_and_queue_limit(tmp_path, monkeypatch):
+    _install_fake_playwright(monkeypatch)
+    pool = RenderPool(browsers=1, pages_per_browser=1, queue_limit=1, timeout_seconds=0.05)
+    try:
+        future = pool._submit("<p>SLOW</p>", str(tmp_path / "slow.png"), 800, 600)
+        with pytest.raises(RenderQueueFullError):
+            pool.render_sync("<p>ok</p>", str(tmp_path / "x.png"), width=800, height=600)
+        with pytest.raises(asyncio.TimeoutError):
+            future.result(timeout=5)
+        # The timed-out page is replaced and the pool keeps serving.
+        assert pool.render_sync("<p>ok</p>", str(tmp_path / "y.png"), width=800, height=600).endswith("y.png")
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.shutdown()
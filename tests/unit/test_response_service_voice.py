@@ -0,0 +1,32 @@
+import asyncio
+import types
+
+import pytest
+
+
+@pytest.mark.unit
+def test_rejected_voice_reply_leaves_no_conversation_entry():
+    pytest.importorskip("telegram")
+    from telegram.error import BadRequest
+
+    from services.response_service import ResponseService
+
+    saved = []
+    service = ResponseService.__new__(ResponseService)
+    service.conversation_repo = types.SimpleNamespace(save_message=lambda **kwargs: saved.append(kwargs))
+
+    async def reply_voice(voice):
+        if voice == "stale-file-id":
+            raise BadRequest("Wrong file identifier")
+        return types.SimpleNamespace(message_id=77)
+
+    update = types.SimpleNamespace(
+        effective_user=types.SimpleNamespace(id=5),
+        effective_chat=types.SimpleNamespace(id=5),
+        message=types.SimpleNamespace(reply_voice=reply_voice),
+    )
+
+    assert asyncio.run(service.reply_voice(update, "stale-file-id")) is None
+    assert saved == []
+    assert asyncio.run(service.reply_voice(update, b"ogg")).message_id == 77
+    assert [entry["message_id"] for entry in saved] == [77]
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from services.sweep_scheduler import AdvisoryLeaderLock, SweepScheduler
+
+
+class _FakeLock:
+    def __init__(self, leader: bool) -> None:
+        self.leader = leader
+        self.released = False
+
+    def try_acquire(self) -> bool:
+        return self.leader
+
+    def release(self) -> None:
+        self.released = True
+
+
+def _counter(calls, next_due=None):
+    async def run():
+        calls.append(datetime.now(timezone.utc))
+        return next_due() if next_due else None
+
+    return run
+
+
+def test_next_due_from_sweep_and_wake():
+    scheduler = SweepScheduler(leader_election=False)
+    hinted, idle = [], []
+
+    async def run():
+        # Hinted sweeper asks to run again shortly; idle one would wait a minute.
+        scheduler.register(
+            "hinted",
+            _counter(hinted, lambda: datetime.now(timezone.utc) + timedelta(seconds=0.1)),
+            interval=60,
+            min_interval=0.05,
+        )
+        scheduler.register("idle", _counter(idle), interval=60)
+        await scheduler.start()
+        await asyncio.sleep(0.35)
+        assert len(idle) == 1
+        scheduler.wake("idle")
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert len(hinted) >= 3
+    assert len(idle) == 2
+
+
+def test_follower_skips_leader_only_sweepers():
+    lock = _FakeLock(leader=False)
+    scheduler = SweepScheduler(leader_lock=lock)
+    leader_calls, shared_calls = [], []
+
+    async def run():
+        scheduler.register("leader", _counter(leader_calls), interval=60)
+        scheduler.register("shared", _counter(shared_calls), interval=60, leader_only=False)
+        await scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert leader_calls == []
+    assert len(shared_calls) == 1
+    assert scheduler.stats()["leader"] is False
+    assert lock.released
+
+
+def test_errors_are_counted_and_do_not_stop_the_sweeper():
+    scheduler = SweepScheduler(leader_election=False)
+
+    async def failing():
+        raise RuntimeError("db down")
+
+    async def run():
+        scheduler.register("failing", failing, interval=0.05, min_interval=0.01)
+        await scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    stats = scheduler.stats()["sweepers"]["failing"]
+    assert stats["runs"] >= 2
+    assert stats["errors"] == stats["runs"]
+    assert stats["last_error"] == "db down"
+    assert stats["max_lag_ms"] >= 0
+
+
+class _FakeConnection:
+    """Tracks whether a transaction is open, like a SQLAlchemy 2.0 Connection's autobegin."""
+
+    def __init__(self):
+        self.in_transaction = False
+        self.closed = False
+
+    def _run(self, *args, **kwargs):
+        self.in_transaction = True
+        return self
+
+    execute = exec_driver_sql = _run
+
+    def scalar(self):
+        return True
+
+    def commit(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_leader_lock_ping_does_not_leave_the_session_idle_in_transaction(monkeypatch):
+    import db.postgres_db
+
+    connection = _FakeConnection()
+    monkeypatch.setattr(db.postgres_db, "get_engine", lambda: type("Engine", (), {"connect": lambda self: connection})())
+    lock = AdvisoryLeaderLock()
+
+    assert lock.try_acquire() is True
+    assert connection.in_transaction is False
+    assert lock.try_acquire() is True  # leadership ping on the held connection
+    assert connection.in_transaction is False
+    assert not connection.closed
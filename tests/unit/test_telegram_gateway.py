@@ -0,0 +1,82 @@
+import asyncio
+import functools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from telegram import Bot
+
+from services import telegram_gateway
+from services.telegram_gateway import TelegramGateway
+
+
+class _FakeBotApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.endswith("/getMe"):
+            result = {"id": 1, "is_bot": True, "first_name": "Xaana", "username": "xaana_bot"}
+            body = json.dumps({"ok": True, "result": result}).encode()
+        else:
+            body = json.dumps({"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}).encode()
+        self.send_response(200 if b'"ok": true' in body else 400)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def bot_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeBotApi)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/bot"
+    monkeypatch.setattr(telegram_gateway, "Bot", functools.partial(Bot, base_url=base_url))
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_sends_share_one_bot_and_reuse_connections(bot_api):
+    gateway = TelegramGateway(concurrency=2, pool_size=2, http2=False)
+
+    async def run():
+        bot = gateway.get_bot("123:abc")
+        assert gateway.get_bot("123:abc") is bot
+        assert gateway.get_bot("456:def") is not bot
+        for _ in range(5):
+            me = await bot.get_me()
+            assert me.username == "xaana_bot"
+        await gateway.aclose()
+
+    asyncio.run(run())
+    stats = gateway.stats()
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 4
+    assert stats["p95_latency_ms"] > 0
+
+
+def test_errors_propagate_and_bots_are_per_event_loop(bot_api):
+    from telegram.error import BadRequest
+
+    gateway = TelegramGateway(concurrency=1, pool_size=1, http2=False)
+    bots = []
+
+    async def run():
+        bot = gateway.get_bot("123:abc")
+        bots.append(bot)
+        with pytest.raises(BadRequest):
+            await bot.send_message(chat_id=1, text="hi")
+        await gateway.aclose()
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert bots[0] is not bots[1]
+    assert gateway.stats()["errors"] == 2
@@ -0,0 +1,79 @@
+import json
+import threading
+
+import pytest
+
+from handlers import translator
+from handlers.messages_store import Language, MessageTemplateStore
+from handlers.translation_catalog import TranslationCatalog, protect_placeholders, restore_placeholders
+
+
+@pytest.fixture
+def backend_calls():
+    calls = []
+
+    def backend(texts, target_lang, source_lang):
+        calls.append(list(texts))
+        return translator.local_translate_backend(texts, target_lang, source_lang)
+
+    translator.set_translation_backend(backend)
+    yield calls
+    translator.set_translation_backend(None)
+
+
+def test_placeholders_survive_translation_or_are_rejected():
+    text, fields = protect_placeholders("Logged {time} for *{promise_id}* ({pct:.0%})")
+    assert text == "Logged __PH_0__ for *__PH_1__* (__PH_2__)"
+    assert restore_placeholders("[fa] " + text, fields) == "[fa] Logged {time} for *{promise_id}* ({pct:.0%})"
+    assert restore_placeholders("Logged __PH_0__ for", fields) is None
+
+
+def test_templates_are_translated_once_per_language_and_persisted(tmp_path, backend_calls):
+    store = MessageTemplateStore(catalog=TranslationCatalog(str(tmp_path)))
+    templates = store._get_english_translations()
+
+    assert store.warm_catalog() == 2 * len(templates)
+    # One batched pass per language, not one request per template.
+    assert len(backend_calls) == 2 * len(translator._batches([protect_placeholders(t)[0] for t in templates.values()]))
+
+    for minutes in range(20):
+        message = store.get_message("session_snoozed", Language.FA, promise_id="P01", minutes=minutes)
+        assert message == f"[fa] #P01 snoozed for {minutes}m. ⏰"
+    calls_after_warm = len(backend_calls)
+    assert calls_after_warm == 2 * len(translator._batches([protect_placeholders(t)[0] for t in templates.values()]))
+
+    stored = json.loads((tmp_path / "catalog_fr.json").read_text(encoding="utf-8"))
+    assert stored["session_snoozed"]["text"] == "[fr] #{promise_id} snoozed for {minutes}m. ⏰"
+
+    # A fresh process reads the catalog from disk: nothing is sent again.
+    reloaded = MessageTemplateStore(catalog=TranslationCatalog(str(tmp_path)))
+    assert reloaded.warm_catalog() == 0
+    assert reloaded.get_message("time_added", Language.FR, time="1h") == "[fr] Added 1h"
+    assert len(backend_calls) == calls_after_warm
+
+
+def test_concurrent_saves_leave_a_complete_catalog(tmp_path, backend_calls):
+    catalog = TranslationCatalog(str(tmp_path))
+    templates = {f"key_{i}": f"Message number {i} for {{name}}" for i in range(40)}
+
+    def look_up(keys):
+        for key in keys:
+            catalog.lookup("fa", key, templates[key])
+
+    keys = sorted(templates)
+    threads = [threading.Thread(target=look_up, args=(keys[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(tmp_path / "catalog_fa.json", encoding="utf-8") as f:
+        stored = json.load(f)
+    assert sorted(stored) == keys
+    assert [p.name for p in tmp_path.iterdir()] == ["catalog_fa.json"]
+
+
+def test_dynamic_text_is_batched_and_cached(backend_calls):
+    assert translator.translate_batch(["a", "b", "a", ""], "fr") == ["[fr] a", "[fr] b", "[fr] a", ""]
+    assert translator.translate_text("b", "fr") == "[fr] b"
+    assert backend_calls == [["a", "b"]]
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.translation_review import ReviewCache, review_reason
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "source, translated, lang, expected",
+    [
+        ("You logged 2 hours on P01 today.", "امروز ۲ ساعت برای P01 ثبت کردید.", "fa", None),
+        ("Great job, keep going!", "Bravo, continuez comme ça !", "fr", None),
+        ("You logged 2 hours today.", "امروز ۳ ساعت ثبت کردید.", "fa", "numbers changed"),
+        ("Open https://xaana.club/app now", "Ouvrez https://xaana.club maintenant", "fr", "urls changed"),
+        ("Your *weekly* report is ready.", "Votre rapport hebdomadaire est prêt.", "fr", "markdown changed"),
+        ("Your weekly report is ready to view.", "Your weekly report is ready to view.", "fa", "script share 0.00"),
+        ("Your weekly report is ready to view.", "Your weekly report is ready to view.", "fr", "untranslated"),
+        ("Say hi to Sara at the Xaana club.", "Dites bonjour à Sarah au club Xaana.", "fr", "proper nouns changed: Sara"),
+        ("Keep up the great work this week, you are doing well.", "Bien.", "fr", "length ratio 0.09"),
+    ],
+)
+def test_review_reason(source, translated, lang, expected):
+    assert review_reason(source, translated, lang) == expected
+
+
+@pytest.mark.unit
+def test_only_flagged_translations_are_reviewed_and_reviews_are_cached(monkeypatch):
+    pytest.importorskip("telegram")
+    from handlers.messages_store import Language
+    from services import response_service as response_module
+    from services.response_service import ResponseService
+
+    translations = {
+        "Nice work today.": "Beau travail aujourd'hui.",
+        "Say hi to Sara.": "Dites bonjour à Sarah.",
+    }
+    monkeypatch.setattr(response_module, "translate_text", lambda text, target, source="en": translations[text])
+
+    reviews = []
+
+    def invoke(messages):
+        reviews.append(messages)
+        return SimpleNamespace(content="Dites bonjour à Sara.")
+
+    service = ResponseService(llm_handler=SimpleNamespace(chat_model=SimpleNamespace(invoke=invoke)))
+
+    assert service._translate_if_needed("Nice work today.", Language.FR) == "Beau travail aujourd'hui."
+    assert reviews == []
+
+    for _ in range(3):
+        assert service._translate_if_needed("Say hi to Sara.", Language.FR) == "Dites bonjour à Sara."
+    assert len(reviews) == 1
+
+
+@pytest.mark.unit
+def test_failed_review_is_not_cached(monkeypatch):
+    pytest.importorskip("telegram")
+    from handlers.messages_store import Language
+    from services import response_service as response_module
+    from services.response_service import ResponseService
+
+    monkeypatch.setattr(response_module, "translate_text", lambda text, target, source="en": "Dites bonjour à Sarah.")
+    outcomes = [RuntimeError("model timeout"), SimpleNamespace(content="Dites bonjour à Sara.")]
+
+    def invoke(messages):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    service = ResponseService(llm_handler=SimpleNamespace(chat_model=SimpleNamespace(invoke=invoke)))
+
+    # The failed review serves the unreviewed translation once, without caching it.
+    assert service._translate_if_needed("Say hi to Sara.", Language.FR) == "Dites bonjour à Sarah."
+    assert len(service._review_cache) == 0
+    assert service._translate_if_needed("Say hi to Sara.", Language.FR) == "Dites bonjour à Sara."
+    assert len(service._review_cache) == 1
+
+
+@pytest.mark.unit
+def test_review_cache_is_bounded():
+    cache = ReviewCache(max_entries=2)
+    for i in range(3):
+        cache.put("fa", f"text {i}", f"reviewed {i}")
+    assert cache.get("fa", "text 0") is None
+    assert cache.get("fa", "text 2") == "reviewed 2"
+    assert cache.get("fr", "text 2") is None
+    assert len(cache) == 2
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from services.gcp_tts_service import GcpTtsService
+from services.voice_note_cache import VoiceNoteCache, normalize_tts_text, voice_note_key
+
+
+@pytest.mark.unit
+def test_key_ignores_whitespace_but_not_voice_settings():
+    params = ["fa-IR", "gemini-2.5-flash-tts", "Achernar"]
+
+    assert voice_note_key("Hello  there\n", params) == voice_note_key(" Hello there", params)
+    assert voice_note_key("Hello there", params) != voice_note_key("Hello there", ["en-US", *params[1:]])
+    assert normalize_tts_text("a\t b\n\nc ") == "a b c"
+
+
+@pytest.mark.unit
+def test_audio_and_file_ids_round_trip(tmp_path):
+    cache = VoiceNoteCache(str(tmp_path))
+    key = voice_note_key("Time for your reminder", ["en-US"])
+
+    assert cache.get_audio(key) is None
+    cache.put_audio(key, b"ogg-bytes")
+    assert cache.get_audio(key) == b"ogg-bytes"
+
+    cache.put_file_id(key, "111", "file-a")
+    cache.put_file_id(key, "222", "file-b")
+    assert cache.get_file_id(key, "111") == "file-a"
+
+    cache.forget_file_id(key, "111")
+    assert cache.get_file_id(key, "111") is None
+    assert VoiceNoteCache(str(tmp_path)).get_file_id(key, "222") == "file-b"
+
+
+@pytest.mark.unit
+def test_prune_removes_least_recently_used_notes(tmp_path):
+    cache = VoiceNoteCache(str(tmp_path), max_bytes=250)
+    keys = [voice_note_key(f"note {i}", ["en-US"]) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put_audio(key, b"x" * 100)
+        os.utime(cache._path(key, ".ogg"), (1000 + i, 1000 + i))
+
+    cache.put_audio(keys[2], b"x" * 100)
+
+    assert cache.get_audio(keys[0]) is None
+    assert cache.get_audio(keys[1]) is not None
+    assert cache.get_audio(keys[2]) is not None
+
+
+@pytest.mark.unit
+def test_synthesize_voice_note_uses_cached_audio(tmp_path, monkeypatch):
+    service = GcpTtsService(cache=VoiceNoteCache(str(tmp_path)))
+    calls = []
+
+    def fake_synthesize(text, language_code):
+        calls.append(text)
+        return b"ogg-" + text.encode()
+
+    monkeypatch.setattr(service, "_synthesize", fake_synthesize)
+
+    assert service.synthesize_voice_note("Well done!", "fa") == b"ogg-Well done!"
+    assert service.synthesize_voice_note("Well done!", "fa-IR") == b"ogg-Well done!"
+    assert service.synthesize_voice_note("Well done!", "en") == b"ogg-Well done!"
+    assert len(calls) == 2
@@ -1,6 +1,13 @@
+import time
+
 import pytest
 
-from services.voice_service import VoiceService
+from services.voice_service import (
+    LocalRecognizer,
+    TranscriptionResult,
+    VoiceService,
+    select_transcription,
+)
 
 
 @pytest.mark.unit
@@ -49,3 +56,86 @@ def test_clean_text_for_tts_removes_structured_markdown_log_block():
     assert "Log" not in cleaned
     assert "trace_id" not in cleaned
     assert "tool output" not in cleaned
+
+
+def _result(text, confidence, language_code):
+    return TranscriptionResult(text=text, confidence=confidence, language_code=language_code, alternatives=[])
+
+
+@pytest.fixture
+def voice_file(tmp_path):
+    path = tmp_path / "voice.ogg"
+    path.write_bytes(b"OggS")
+    return str(path)
+
+
+@pytest.mark.unit
+def test_multi_language_runs_both_recognitions_concurrently(voice_file):
+    recognizer = LocalRecognizer(
+        results={"fa-IR": _result("salam", 0.6, "fa-IR"), "en-US": _result("hello", 0.7, "en-US")},
+        delays={"fa-IR": 0.3, "en-US": 0.3},
+    )
+    service = VoiceService(recognizer=recognizer)
+
+    started = time.monotonic()
+    result = service.transcribe_voice_multi_language(voice_file, user_language="fa")
+    elapsed = time.monotonic() - started
+
+    assert sorted(recognizer.calls) == ["en-US", "fa-IR"]
+    assert elapsed < 0.55
+    # Within the margin, the user's language wins over an English detection.
+    assert result.text == "salam"
+
+
+@pytest.mark.unit
+def test_multi_language_returns_decisive_user_result_without_waiting(voice_file):
+    recognizer = LocalRecognizer(
+        results={"fa-IR": _result("salam", 0.9, "fa-IR"), "en-US": _result("hello", 0.95, "en-US")},
+        delays={"en-US": 1.0},
+    )
+    service = VoiceService(recognizer=recognizer)
+
+    started = time.monotonic()
+    result = service.transcribe_voice_multi_language(voice_file, user_language="fa")
+
+    assert time.monotonic() - started < 0.5
+    assert result.text == "salam"
+
+
+@pytest.mark.unit
+def test_multi_language_waits_for_english_when_user_result_is_not_confident(voice_file):
+    recognizer = LocalRecognizer(
+        results={"fa-IR": _result("salam", 0.4, "fa-IR"), "en-US": _result("hello", 0.9, "en-US")},
+        delays={"en-US": 0.1},
+    )
+    service = VoiceService(recognizer=recognizer)
+
+    assert service.transcribe_voice_multi_language(voice_file, user_language="fa").text == "hello"
+
+
+@pytest.mark.unit
+def test_multi_language_english_user_makes_a_single_call(voice_file):
+    recognizer = LocalRecognizer(results={"en-US": _result("hello", 0.9, "en-US")})
+    service = VoiceService(recognizer=recognizer)
+
+    assert service.transcribe_voice_multi_language(voice_file, user_language="en").text == "hello"
+    assert recognizer.calls == ["en-US"]
+
+
+@pytest.mark.unit
+def test_recognizer_failure_yields_empty_transcription(voice_file):
+    def failing(content, primary_language, alternative_languages):
+        raise RuntimeError("unavailable")
+
+    result = VoiceService(recognizer=failing).transcribe_voice_multi_language(voice_file, user_language="fa")
+
+    assert result.text == ""
+    assert result.confidence == 0.0
+
+
+@pytest.mark.unit
+def test_select_transcription_prefers_more_confident_other_language():
+    user_result = _result("bonjour", 0.5, "fr-FR")
+    english_result = _result("salam", 0.9, "fa-IR")
+
+    assert select_transcription(user_result, english_result, "fa") is english_result
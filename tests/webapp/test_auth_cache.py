@@ -0,0 +1,121 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from webapp import dependencies
+from webapp.auth_cache import VerifiedAuthCache
+from webapp.dependencies import get_current_user
+from webapp.routers.auth import logout, revoke_sessions
+
+
+class _SessionRepo:
+    def __init__(self):
+        self.sessions = {"tok-1": 7, "tok-2": 7}
+        self.lookups = 0
+
+    def get_session(self, token):
+        self.lookups += 1
+        user_id = self.sessions.get(token)
+        if user_id is None:
+            return None
+        return SimpleNamespace(user_id=user_id, expires_at=datetime.utcnow() + timedelta(days=90))
+
+    def delete_session(self, token):
+        return self.sessions.pop(token, None) is not None
+
+    def delete_user_sessions(self, user_id):
+        tokens = [t for t, uid in self.sessions.items() if uid == user_id]
+        for token in tokens:
+            del self.sessions[token]
+        return len(tokens)
+
+
+def _request(repo, cache):
+    state = SimpleNamespace(auth_session_repo=repo, auth_cache=cache, bot_token="123:abc")
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+def _auth(request, token):
+    return asyncio.run(get_current_user(request, None, f"Bearer {token}"))
+
+
+def test_session_lookups_are_cached_until_logout():
+    repo = _SessionRepo()
+    request = _request(repo, VerifiedAuthCache(ttl_seconds=60, max_entries=100))
+
+    assert [_auth(request, "tok-1") for _ in range(12)] == [7] * 12
+    assert repo.lookups == 1
+
+    asyncio.run(logout(request, "Bearer tok-1"))
+    with pytest.raises(HTTPException):
+        _auth(request, "tok-1")
+
+
+def test_logout_invalidates_after_the_session_is_deleted():
+    repo = _SessionRepo()
+    cache = VerifiedAuthCache(ttl_seconds=60, max_entries=100)
+    request = _request(repo, cache)
+    delete_session = repo.delete_session
+
+    def delete_racing_a_lookup(token):
+        # A concurrent request read the session and cached it just before the row went away.
+        cache.put("session", token, repo.sessions[token])
+        return delete_session(token)
+
+    repo.delete_session = delete_racing_a_lookup
+    asyncio.run(logout(request, "Bearer tok-1"))
+
+    assert cache.get("session", "tok-1") is None
+    with pytest.raises(HTTPException):
+        _auth(request, "tok-1")
+
+
+def test_revocation_drops_every_cached_session_of_the_user():
+    repo = _SessionRepo()
+    cache = VerifiedAuthCache(ttl_seconds=60, max_entries=100)
+    request = _request(repo, cache)
+    _auth(request, "tok-1")
+    _auth(request, "tok-2")
+
+    assert asyncio.run(revoke_sessions(request, user_id=7)) == {"revoked": 2}
+    assert cache.stats()["entries"] == 0
+    with pytest.raises(HTTPException):
+        _auth(request, "tok-2")
+
+
+def test_init_data_cache_never_outlives_its_auth_date(monkeypatch):
+    calls = []
+    auth_date = int(time.time()) - dependencies.INIT_DATA_MAX_AGE_SECONDS + 1
+
+    def fake_validate(init_data, bot_token, max_age_seconds=86400):
+        calls.append(init_data)
+        if time.time() - auth_date > max_age_seconds:
+            return None
+        return {"user": {"id": 9}, "auth_date": auth_date}
+
+    monkeypatch.setattr(dependencies, "validate_telegram_init_data", fake_validate)
+    request = _request(_SessionRepo(), VerifiedAuthCache(ttl_seconds=60, max_entries=100))
+
+    init_data = "auth_date=1&hash=x"
+    assert asyncio.run(get_current_user(request, init_data, None)) == 9
+    assert asyncio.run(get_current_user(request, init_data, None)) == 9
+    assert len(calls) == 1
+
+    # Once the initData itself is too old the cached entry is gone too.
+    time.sleep(1.1)
+    with pytest.raises(HTTPException):
+        asyncio.run(get_current_user(request, init_data, None))
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded():
+    cache = VerifiedAuthCache(ttl_seconds=60, max_entries=2)
+    for i in range(3):
+        cache.put("session", f"tok-{i}", i)
+    assert cache.get("session", "tok-0") is None
+    assert cache.get("session", "tok-2") == 2
+    assert cache.stats()["entries"] == 2
@@ -259,6 +259,37 @@ def test_local_pdf_open_and_file(monkeypatch, tmp_path):
     assert file_resp.headers["content-type"].startswith("application/pdf")
 
 
+def test_local_pdf_file_supports_ranges_and_revalidation(monkeypatch, tmp_path):
+    file_path = tmp_path / "sample.pdf"
+    file_path.write_bytes(b"%PDF-1.7 local test")
+    app, _ = _build_local_app(monkeypatch, file_path=file_path)
+    client = TestClient(app)
+    url = "/api/content/content-1/pdf/file?asset_id=asset-1"
+
+    full = client.get(url)
+    assert full.headers["accept-ranges"] == "bytes"
+    assert "immutable" in full.headers["cache-control"]
+    etag = full.headers["etag"]
+
+    part = client.get(url, headers={"Range": "bytes=0-3"})
+    assert part.status_code == 206
+    assert part.content == b"%PDF"
+    assert part.headers["content-range"] == "bytes 0-3/19"
+
+    tail = client.get(url, headers={"Range": "bytes=-4", "If-Range": full.headers["last-modified"]})
+    assert tail.status_code == 206
+    assert tail.content == b"test"
+
+    stale_if_range = client.get(url, headers={"Range": "bytes=0-3", "If-Range": '"other"'})
+    assert stale_if_range.status_code == 200
+    assert stale_if_range.content == b"%PDF-1.7 local test"
+
+    assert client.get(url, headers={"Range": "bytes=50-"}).status_code == 416
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
 def test_consume_event_logs_assigned_content_time_to_promise(monkeypatch, tmp_path):
     app = FastAPI()
     app.include_router(content_router.router)
@@ -53,7 +53,7 @@ def test_report_stats_logs_time_to_assigned_promise(monkeypatch, tmp_path):
     monkeypatch.setattr(router_mod, "append_stats", lambda **kwargs: None)
     monkeypatch.setattr(router_mod, "format_summary_message", lambda *_args, **_kwargs: "summary")
     monkeypatch.setattr(router_mod, "PlannerAPIAdapter", FakePlanner)
-    monkeypatch.setattr("telegram.Bot", FakeBot)
+    monkeypatch.setattr("services.telegram_gateway.get_telegram_bot", FakeBot)
 
     response = asyncio.run(router_mod.report_stats(FakeRequest()))
 
@@ -115,7 +115,7 @@ def test_report_stats_skips_logging_for_tiny_watch_time(monkeypatch, tmp_path):
     monkeypatch.setattr(router_mod, "append_stats", lambda **kwargs: None)
     monkeypatch.setattr(router_mod, "format_summary_message", lambda *_args, **_kwargs: "summary")
     monkeypatch.setattr(router_mod, "PlannerAPIAdapter", FakePlanner)
-    monkeypatch.setattr("telegram.Bot", FakeBot)
+    monkeypatch.setattr("services.telegram_gateway.get_telegram_bot", FakeBot)
 
     response = asyncio.run(router_mod.report_stats(FakeRequest()))
 
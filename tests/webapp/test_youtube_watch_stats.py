@@ -0,0 +1,57 @@
+import json
+
+from webapp import youtube_watch_stats
+from webapp.youtube_watch_stats import WatchStatsBuffer, append_stats, iter_legacy_records
+
+
+class _Repo:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def insert_watch_events(self, records):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("db down")
+        self.batches.append(list(records))
+        return len(records)
+
+
+def test_reports_are_written_in_batches(monkeypatch):
+    repo = _Repo()
+    buffer = WatchStatsBuffer(repo=repo, batch_size=100)
+    monkeypatch.setattr(youtube_watch_stats, "_buffer", buffer)
+
+    for i in range(250):
+        append_stats(user_id=7, video_id=f"v{i % 3}", time_spent_seconds=12.34, segments=[[0, 12]])
+    assert repo.batches == []
+
+    assert buffer.flush() == 250
+    assert [len(batch) for batch in repo.batches] == [100, 100, 50]
+    assert repo.batches[0][0]["time_spent_seconds"] == 12.3
+    assert len({r["id"] for batch in repo.batches for r in batch}) == 250
+    assert buffer.pending() == 0
+
+
+def test_failed_batch_stays_queued_in_order():
+    repo = _Repo(fail_times=1)
+    buffer = WatchStatsBuffer(repo=repo, batch_size=2, max_pending=3)
+    for i in range(4):
+        buffer.add({"id": str(i)})
+
+    assert buffer.dropped == 1
+    assert buffer.flush() == 0
+    assert buffer.pending() == 3
+    assert buffer.flush() == 3
+    assert [r["id"] for batch in repo.batches for r in batch] == ["1", "2", "3"]
+
+
+def test_legacy_records_get_stable_ids(tmp_path):
+    path = tmp_path / "youtube_watch_stats.jsonl"
+    good = {"ts": "2026-01-02T03:04:05Z", "user_id": 7, "video_id": "abc", "time_spent_seconds": 30, "segments": []}
+    path.write_text(json.dumps(good) + "\n\nnot json\n" + json.dumps({"ts": "x"}) + "\n", encoding="utf-8")
+
+    first = list(iter_legacy_records(str(path)))
+    second = list(iter_legacy_records(str(path)))
+    assert [r["video_id"] for r in first] == ["abc"]
+    assert first[0]["id"] == second[0]["id"]
@@ -0,0 +1,43 @@
+"""Full-text search index on content_segment.text
+
+QAService falls back to lexical retrieval when the vector store has no hits or
+is down. It used to load every segment and score word overlap in Python on each
+question. Store a per-segment text search config (derived from the content
+language), a generated tsvector over the text and a GIN index, so the fallback
+ranks segments in a single indexed query.
+
+Revision ID: 032_content_segment_fts
+Revises: 031_club_leaderboard_schedule
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "032_content_segment_fts"
+down_revision: Union[str, None] = "031_club_leaderboard_schedule"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE content_segment "
+        "ADD COLUMN text_search_config regconfig NOT NULL DEFAULT 'simple'"
+    )
+    op.execute(
+        "ALTER TABLE content_segment "
+        "ADD COLUMN search_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector(text_search_config, coalesce(text, ''))) STORED"
+    )
+    op.execute(
+        "CREATE INDEX ix_content_segment_search_tsv "
+        "ON content_segment USING GIN (search_tsv)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_content_segment_search_tsv")
+    op.execute("ALTER TABLE content_segment DROP COLUMN IF EXISTS search_tsv")
+    op.execute("ALTER TABLE content_segment DROP COLUMN IF EXISTS text_search_config")
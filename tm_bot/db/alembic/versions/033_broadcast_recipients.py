@@ -0,0 +1,42 @@
+"""Per-recipient broadcast delivery progress
+
+The broadcast engine records each recipient's outcome so a broadcast
+interrupted by a restart resumes with the recipients it had not reached yet,
+and remembers the Telegram file_id of an uploaded broadcast image so a resumed
+run does not upload it again.
+
+Revision ID: 033_broadcast_recipients
+Revises: 032_content_segment_fts
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "033_broadcast_recipients"
+down_revision: Union[str, None] = "032_content_segment_fts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "broadcast_recipients",
+        sa.Column("broadcast_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("updated_at_utc", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("broadcast_id", "user_id"),
+        sa.ForeignKeyConstraint(["broadcast_id"], ["broadcasts.broadcast_id"], ondelete="CASCADE"),
+        sa.CheckConstraint("status IN ('sent', 'failed')", name="check_broadcast_recipient_status"),
+    )
+    op.add_column("broadcasts", sa.Column("media_file_id", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("broadcasts", "media_file_id")
+    op.drop_table("broadcast_recipients")
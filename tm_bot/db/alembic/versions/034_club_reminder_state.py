@@ -0,0 +1,56 @@
+"""Durable club reminder claims and check-in card state
+
+club_daily_sends records which club reminders/leaderboards were claimed and
+sent for each club-local day, replacing per-process bot_data dedup so ticks
+can run on several bot replicas and survive restarts.
+
+club_checkin_cards stores the live check-in card state (members, statuses,
+streaks) keyed by the Telegram message, so button taps keep working after a
+restart or on another replica.
+
+Revision ID: 034_club_reminder_state
+Revises: 033_broadcast_recipients
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "034_club_reminder_state"
+down_revision: Union[str, None] = "033_broadcast_recipients"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "club_daily_sends",
+        sa.Column("club_id", sa.Text(), nullable=False),
+        sa.Column("kind", sa.Text(), nullable=False),
+        sa.Column("local_date", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("claimed_by", sa.Text(), nullable=True),
+        sa.Column("claimed_at_utc", sa.Text(), nullable=False),
+        sa.Column("sent_at_utc", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("club_id", "kind", "local_date"),
+        sa.CheckConstraint("status IN ('claimed', 'sent')", name="check_club_daily_send_status"),
+    )
+    op.create_table(
+        "club_checkin_cards",
+        sa.Column("chat_id", sa.BigInteger(), nullable=False),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("club_id", sa.Text(), nullable=False),
+        sa.Column("state_json", sa.Text(), nullable=False),
+        sa.Column("created_at_utc", sa.Text(), nullable=False),
+        sa.Column("updated_at_utc", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("chat_id", "message_id"),
+    )
+    op.create_index("ix_club_checkin_cards_club_created", "club_checkin_cards", ["club_id", "created_at_utc"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_club_checkin_cards_club_created", table_name="club_checkin_cards")
+    op.drop_table("club_checkin_cards")
+    op.drop_table("club_daily_sends")
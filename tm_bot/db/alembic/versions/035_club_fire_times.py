@@ -0,0 +1,45 @@
+"""Add clubs.next_reminder_at_utc and clubs.next_leaderboard_at_utc
+
+The club reminder scheduler stores each club's next reminder / leaderboard
+fire time (UTC ISO) here, computed when the club's settings change and after
+each send, and wakes at the earliest one instead of scanning every club every
+15 minutes. NULL means "not computed yet"; the scheduler fills it in.
+
+Revision ID: 035_club_fire_times
+Revises: 034_club_reminder_state
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "035_club_fire_times"
+down_revision: Union[str, None] = "034_club_reminder_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("clubs", sa.Column("next_reminder_at_utc", sa.Text(), nullable=True))
+    op.add_column("clubs", sa.Column("next_leaderboard_at_utc", sa.Text(), nullable=True))
+    op.create_index(
+        "ix_clubs_next_reminder_at_utc",
+        "clubs",
+        ["next_reminder_at_utc"],
+        postgresql_where=sa.text("next_reminder_at_utc IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_clubs_next_leaderboard_at_utc",
+        "clubs",
+        ["next_leaderboard_at_utc"],
+        postgresql_where=sa.text("next_leaderboard_at_utc IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clubs_next_leaderboard_at_utc", table_name="clubs")
+    op.drop_index("ix_clubs_next_reminder_at_utc", table_name="clubs")
+    op.drop_column("clubs", "next_leaderboard_at_utc")
+    op.drop_column("clubs", "next_reminder_at_utc")
@@ -0,0 +1,175 @@
+"""Content library: keyset indexes, trigram search index, facet counts
+
+- Indexes on user_content matching the keyset order of each library sort
+  mode (recent, added, progress), so deep pages cost the same as the first.
+- A pg_trgm GIN index over the concatenated searchable content columns
+  (ContentRepository's CONTENT_SEARCH_DOCUMENT), so `%q%` searches don't scan.
+- user_content_facet_counts: per-user status / content type counts, kept up
+  to date by triggers on user_content and content and backfilled here.
+
+Revision ID: 036_content_library_keyset
+Revises: 035_club_fire_times
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "036_content_library_keyset"
+down_revision: Union[str, None] = "035_club_fire_times"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_user_content_recent_keyset ON user_content (
+            user_id,
+            (last_interaction_at IS NOT NULL) DESC,
+            COALESCE(last_interaction_at, '') DESC,
+            added_at DESC,
+            id DESC
+        );
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_user_content_added_keyset
+        ON user_content (user_id, added_at DESC, id DESC);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_user_content_progress_keyset ON user_content (
+            user_id,
+            COALESCE(progress_ratio, -1) DESC,
+            (last_interaction_at IS NOT NULL) DESC,
+            COALESCE(last_interaction_at, '') DESC,
+            added_at DESC,
+            id DESC
+        );
+    """)
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_content_search_trgm ON content USING gin (
+            (COALESCE(title, '') || ' ' || COALESCE(description, '') || ' ' ||
+             COALESCE(author_channel, '') || ' ' || COALESCE(provider, '') || ' ' ||
+             COALESCE(original_url, '') || ' ' || COALESCE(canonical_url, ''))
+            gin_trgm_ops
+        );
+    """)
+
+    op.create_table(
+        "user_content_facet_counts",
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("facet", sa.Text(), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "facet", "value"),
+    )
+
+    # Same classification as ContentRepository.get_user_content_facets.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION content_facet_type(p_content_type TEXT, p_provider TEXT, p_metadata JSONB)
+        RETURNS TEXT AS $$
+            SELECT CASE
+                WHEN LOWER(COALESCE(p_provider, '')) = 'telegram_pdf'
+                  OR LOWER(COALESCE(p_metadata->>'mime_type', '')) = 'application/pdf' THEN 'pdf'
+                ELSE COALESCE(NULLIF(p_content_type, ''), 'other')
+            END
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_content_facet_bump(p_user_id TEXT, p_facet TEXT, p_value TEXT, p_delta INTEGER)
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO user_content_facet_counts(user_id, facet, value, count)
+            VALUES (p_user_id, p_facet, p_value, p_delta)
+            ON CONFLICT (user_id, facet, value)
+            DO UPDATE SET count = user_content_facet_counts.count + EXCLUDED.count;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_content_facets_trg() RETURNS trigger AS $$
+        DECLARE
+            facet_type TEXT;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT content_facet_type(c.content_type, c.provider, c.metadata_json) INTO facet_type
+                FROM content c WHERE c.id = OLD.content_id;
+                PERFORM user_content_facet_bump(OLD.user_id, 'status', COALESCE(OLD.status, 'saved'), -1);
+                PERFORM user_content_facet_bump(OLD.user_id, 'content_type', COALESCE(facet_type, 'other'), -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT content_facet_type(c.content_type, c.provider, c.metadata_json) INTO facet_type
+                FROM content c WHERE c.id = NEW.content_id;
+                PERFORM user_content_facet_bump(NEW.user_id, 'status', COALESCE(NEW.status, 'saved'), 1);
+                PERFORM user_content_facet_bump(NEW.user_id, 'content_type', COALESCE(facet_type, 'other'), 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER user_content_facets_ins_del
+        AFTER INSERT OR DELETE ON user_content
+        FOR EACH ROW EXECUTE FUNCTION user_content_facets_trg();
+    """)
+    op.execute("""
+        CREATE TRIGGER user_content_facets_upd
+        AFTER UPDATE OF status, user_id, content_id ON user_content
+        FOR EACH ROW
+        WHEN (OLD.status IS DISTINCT FROM NEW.status
+              OR OLD.user_id IS DISTINCT FROM NEW.user_id
+              OR OLD.content_id IS DISTINCT FROM NEW.content_id)
+        EXECUTE FUNCTION user_content_facets_trg();
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION content_facets_trg() RETURNS trigger AS $$
+        DECLARE
+            old_type TEXT := content_facet_type(OLD.content_type, OLD.provider, OLD.metadata_json);
+            new_type TEXT := content_facet_type(NEW.content_type, NEW.provider, NEW.metadata_json);
+            saved RECORD;
+        BEGIN
+            IF old_type IS DISTINCT FROM new_type THEN
+                FOR saved IN SELECT user_id FROM user_content WHERE content_id = NEW.id LOOP
+                    PERFORM user_content_facet_bump(saved.user_id, 'content_type', old_type, -1);
+                    PERFORM user_content_facet_bump(saved.user_id, 'content_type', new_type, 1);
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER content_facets_upd
+        AFTER UPDATE OF content_type, provider, metadata_json ON content
+        FOR EACH ROW EXECUTE FUNCTION content_facets_trg();
+    """)
+
+    op.execute("""
+        INSERT INTO user_content_facet_counts(user_id, facet, value, count)
+        SELECT user_id, 'status', COALESCE(status, 'saved'), COUNT(*)
+        FROM user_content
+        GROUP BY user_id, COALESCE(status, 'saved')
+        UNION ALL
+        SELECT uc.user_id, 'content_type', content_facet_type(c.content_type, c.provider, c.metadata_json), COUNT(*)
+        FROM user_content uc
+        JOIN content c ON c.id = uc.content_id
+        GROUP BY uc.user_id, content_facet_type(c.content_type, c.provider, c.metadata_json);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS content_facets_upd ON content;")
+    op.execute("DROP TRIGGER IF EXISTS user_content_facets_upd ON user_content;")
+    op.execute("DROP TRIGGER IF EXISTS user_content_facets_ins_del ON user_content;")
+    op.execute("DROP FUNCTION IF EXISTS content_facets_trg();")
+    op.execute("DROP FUNCTION IF EXISTS user_content_facets_trg();")
+    op.execute("DROP FUNCTION IF EXISTS user_content_facet_bump(TEXT, TEXT, TEXT, INTEGER);")
+    op.execute("DROP FUNCTION IF EXISTS content_facet_type(TEXT, TEXT, JSONB);")
+    op.drop_table("user_content_facet_counts")
+    op.execute("DROP INDEX IF EXISTS ix_content_search_trgm;")
+    op.execute("DROP INDEX IF EXISTS ix_user_content_progress_keyset;")
+    op.execute("DROP INDEX IF EXISTS ix_user_content_added_keyset;")
+    op.execute("DROP INDEX IF EXISTS ix_user_content_recent_keyset;")
@@ -0,0 +1,85 @@
+"""YouTube watch events table (monthly partitions) and daily rollup
+
+Watch reports used to be appended to ROOT_DIR/youtube_watch_stats/*.jsonl on
+the webapp's local disk. They now go to:
+
+- youtube_watch_event: one row per report, range-partitioned by month on
+  watched_at. Partitions are created on demand by
+  youtube_watch_event_ensure_partition(month), which the repository calls
+  before inserting a batch.
+- youtube_watch_daily: per (user, UTC day, video) report count and seconds
+  watched, incremented in the same statement as the event insert so stats
+  queries never scan raw events.
+
+Existing JSONL files can be loaded with scripts/import_youtube_watch_stats.py.
+
+Revision ID: 037_youtube_watch_events
+Revises: 036_content_library_keyset
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "037_youtube_watch_events"
+down_revision: Union[str, None] = "036_content_library_keyset"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS youtube_watch_event (
+            id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            watched_at TIMESTAMPTZ NOT NULL,
+            time_spent_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+            segments JSONB NOT NULL DEFAULT '[]'::jsonb,
+            closed_via TEXT,
+            PRIMARY KEY (id, watched_at)
+        ) PARTITION BY RANGE (watched_at);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_youtube_watch_event_user_watched
+        ON youtube_watch_event (user_id, watched_at DESC);
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION youtube_watch_event_ensure_partition(p_month DATE)
+        RETURNS void AS $$
+        DECLARE
+            month_start DATE := date_trunc('month', p_month)::date;
+            partition_name TEXT := 'youtube_watch_event_' || to_char(month_start, 'YYYY_MM');
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF youtube_watch_event '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                (month_start::timestamp AT TIME ZONE 'UTC'),
+                ((month_start + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC')
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("SELECT youtube_watch_event_ensure_partition((now() AT TIME ZONE 'UTC')::date);")
+    op.execute(
+        "SELECT youtube_watch_event_ensure_partition(((now() AT TIME ZONE 'UTC') + INTERVAL '1 month')::date);"
+    )
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS youtube_watch_daily (
+            user_id TEXT NOT NULL,
+            day DATE NOT NULL,
+            video_id TEXT NOT NULL,
+            watch_count INTEGER NOT NULL DEFAULT 0,
+            seconds_watched DOUBLE PRECISION NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day, video_id)
+        );
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS youtube_watch_daily;")
+    op.execute("DROP TABLE IF EXISTS youtube_watch_event CASCADE;")
+    op.execute("DROP FUNCTION IF EXISTS youtube_watch_event_ensure_partition(DATE);")
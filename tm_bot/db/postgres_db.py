@@ -109,6 +109,84 @@ def get_db_session() -> Iterator[Session]:
         session.close()
 
 
+# Read-only engine for ad-hoc analytic queries (lazy initialization)
+_readonly_engine: Optional[Engine] = None
+_ReadonlySessionLocal: Optional[sessionmaker] = None
+
+
+def get_readonly_database_url() -> str:
+    """
+    Get the read replica URL for the current environment.
+
+    Follows the ENVIRONMENT logic of get_database_url:
+    - 'production' or 'prod' -> DATABASE_URL_READONLY_PROD
+    - 'staging' or 'stage' -> DATABASE_URL_READONLY_STAGING
+    - default -> DATABASE_URL_READONLY_STAGING (for safety)
+
+    Falls back to get_database_url() when no replica is set for the environment.
+    """
+    env = os.getenv("ENVIRONMENT", "").lower()
+
+    if env in ("production", "prod"):
+        url = os.getenv("DATABASE_URL_READONLY_PROD")
+        if url:
+            return url
+
+    if env in ("staging", "stage") or not env:
+        url = os.getenv("DATABASE_URL_READONLY_STAGING")
+        if url:
+            return url
+
+    return get_database_url()
+
+
+def get_readonly_engine() -> Engine:
+    """
+    Engine for ad-hoc read-only queries (the user query tool).
+
+    Points at the read replica when configured, and always has its own small
+    pool, so slow analytic reads wait for each other instead of taking
+    connections from the transactional pool.
+    """
+    global _readonly_engine
+    if _readonly_engine is None:
+        _readonly_engine = create_engine(
+            get_readonly_database_url(),
+            pool_size=2,
+            max_overflow=3,
+            pool_timeout=5,  # Fail fast when every read-only connection is busy
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=False,
+        )
+    return _readonly_engine
+
+
+@contextmanager
+def get_readonly_db_session() -> Iterator[Session]:
+    """
+    Context manager for a READ ONLY transaction on the read-only engine.
+
+    Nothing is committed: the transaction is always rolled back, which also
+    discards any SET LOCAL settings made inside it.
+    """
+    global _ReadonlySessionLocal
+    if _ReadonlySessionLocal is None:
+        _ReadonlySessionLocal = sessionmaker(
+            bind=get_readonly_engine(),
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    session = _ReadonlySessionLocal()
+    try:
+        session.execute(text("SET TRANSACTION READ ONLY"))
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
 def resolve_promise_uuid(session: Session, user_id: str, promise_id: Optional[str]) -> Optional[str]:
     """
     Resolve promise UUID from promise_id (current_id or alias).
@@ -68,7 +68,9 @@ from services.club_reminder_service import (
     CLUB_CHECKIN_PREFIX,
     build_club_reminder_message,
     create_club_checkin_keyboard,
+    load_checkin_card,
     local_today_for_timezone,
+    remember_checkin_card,
 )
 from services.admin_ops_service import (
     dispatch_github_workflow,
@@ -1122,7 +1124,8 @@ class CallbackHandlers:
         """Send a .ics file for a planned session when the user taps ICS in the saved-session DM."""
         from datetime import datetime, timezone
         from io import BytesIO
-        from telegram import Bot, InputFile
+        from telegram import InputFile
+        from services.telegram_gateway import get_telegram_bot
         from utils.calendar_utils import (
             calendar_event_description,
             generate_ics,
@@ -1175,7 +1178,7 @@ class CallbackHandlers:
                     await query.message.reply_text("Could not send calendar file. Try again from the app.")
                 return
 
-            bot = Bot(token=bot_token)
+            bot = get_telegram_bot(bot_token)
             ics_bytes = BytesIO(ics_text.encode("utf-8"))
             await bot.send_document(
                 chat_id=user_id,
@@ -1760,8 +1763,8 @@ class CallbackHandlers:
         
         # Image generation disabled - send text-only weekly report with mini app button
         # Note: Re-enable image generation if needed in the future
-        # image_path = await self.plan_keeper.reports_service.generate_weekly_visualization_image(
-        #     user_id, user_now
+        # await self.plan_keeper.reports_service.send_weekly_visualization(
+        #     context.bot, user_id, user_now, chat_id=user_id, caption=message_text, reply_markup=keyboard
         # )
         
         try:
@@ -2845,13 +2848,12 @@ Generate the calendar links now:"""
         message_id = query.message.message_id
         bot_data = context.bot_data
 
-        state_key = (chat_id, message_id)
-        if "club_checkins" not in bot_data or state_key not in bot_data["club_checkins"]:
+        state = load_checkin_card(bot_data, chat_id, message_id)
+        if state is None:
             await query.answer("This check-in has expired. ⏳", show_alert=True)
             await query.edit_message_reply_markup(reply_markup=None)
             return
 
-        state = bot_data["club_checkins"][state_key]
         members = state["members"]
         club_name = state["club_name"]
         promise_uuid = state.get("promise_uuid")
@@ -2899,6 +2901,7 @@ Generate the calendar links now:"""
                         pass
             except Exception as exc:
                 logger.warning("[ClubCheckin] Failed to persist action for user %s: %s", user_id, exc)
+        remember_checkin_card(bot_data, chat_id, message_id, state)
 
         sent_at = state.get("sent_at_utc")
         try:
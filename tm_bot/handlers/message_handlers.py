@@ -4,6 +4,7 @@ Handles all command and text message processing.
 """
 
 import asyncio
+import io
 import os
 import html
 import json
@@ -69,7 +70,7 @@ class MessageHandlers:
         self.application = application
         self.response_service = response_service
         self.miniapp_url = miniapp_url
-        self.voice_service = VoiceService()
+        self.voice_service = VoiceService(tts_cache_dir=os.path.join(root_dir, "tts_cache"))
         self.content_service = ContentService()
         self.content_resolve_service = ContentResolveService()
         self.content_repo = ContentRepository()
@@ -196,15 +197,11 @@ class MessageHandlers:
             logger.warning(f"Failed to update user info for user {user_id}: {e}")
     
     async def _update_user_avatar_async(self, context: CallbackContext, user_id: int) -> None:
-        """Fetch and store user avatar asynchronously (non-blocking)."""
+        """Queue the user's avatar for the background refresh (see AvatarService.refresh_pending)."""
         try:
-            if context and context.bot:
-                # Run avatar fetch in background (fire and forget)
-                asyncio.create_task(
-                    self.avatar_service.fetch_and_store_avatar(context.bot, user_id)
-                )
+            self.avatar_service.enqueue_refresh(user_id)
         except Exception as e:
-            logger.debug(f"Failed to schedule avatar fetch for user {user_id}: {e}")
+            logger.debug(f"Failed to queue avatar refresh for user {user_id}: {e}")
     
     def get_user_timezone(self, user_id: int) -> str:
         """Get user timezone using the settings service."""
@@ -522,8 +519,8 @@ class MessageHandlers:
         
         # Image generation disabled - send text-only weekly report with mini app button
         # Note: Re-enable image generation if needed in the future
-        # image_path = await self.plan_keeper.reports_service.generate_weekly_visualization_image(
-        #     user_id, report_ref_time
+        # await self.plan_keeper.reports_service.send_weekly_visualization(
+        #     context.bot, user_id, report_ref_time, chat_id=update.effective_chat.id, caption=message_text, reply_markup=keyboard
         # )
         
         await self.response_service.reply_text(
@@ -886,33 +883,31 @@ class MessageHandlers:
         
         if self._is_voice_mode_enabled(settings):
             try:
-                # Synthesize speech (text will be cleaned inside synthesize_speech)
                 speech_lang = self._resolve_tts_language_code(settings, user_lang)
+
+                # A note this bot already uploaded is re-sent by file_id: no synthesis, no upload.
+                bot_id = self._bot_id(context)
+                cache = self.voice_service.voice_note_cache if bot_id else None
+                note_key = self.voice_service.voice_note_key(text_response, speech_lang) if cache else None
+                if note_key:
+                    file_id = cache.get_file_id(note_key, bot_id)
+                    if file_id:
+                        if await self.response_service.reply_voice(update, file_id, user_id=user_id):
+                            return
+                        cache.forget_file_id(note_key, bot_id)
+
+                # Synthesize speech (text will be cleaned inside synthesize_speech)
                 audio_bytes = self.voice_service.synthesize_speech(text_response, speech_lang)
                 
                 if audio_bytes:
                     # Send as voice message via ResponseService
-                    import tempfile
-                    import os
-                    temp_dir = tempfile.gettempdir()
-                    temp_path = os.path.join(temp_dir, f"tts_{update.effective_message.message_id}.ogg")
-                    
-                    try:
-                        with open(temp_path, 'wb') as f:
-                            f.write(audio_bytes)
-                        
-                        with open(temp_path, 'rb') as voice_file:
-                            await self.response_service.reply_voice(
-                                update, voice_file,
-                                user_id=user_id
-                            )
-                    finally:
-                        # Clean up temp file
-                        try:
-                            if os.path.exists(temp_path):
-                                os.remove(temp_path)
-                        except Exception:
-                            pass
+                    message = await self.response_service.reply_voice(
+                        update, io.BytesIO(audio_bytes),
+                        user_id=user_id
+                    )
+                    uploaded_file_id = getattr(getattr(message, "voice", None), "file_id", None)
+                    if note_key and uploaded_file_id:
+                        cache.put_file_id(note_key, bot_id, uploaded_file_id)
                     return
                 else:
                     # TTS failed, fallback to text
@@ -927,6 +922,15 @@ class MessageHandlers:
             user_id=user_id
         )
 
+    @staticmethod
+    def _bot_id(context) -> Optional[str]:
+        """Id of the bot handling the update; Telegram file ids are only valid for that bot."""
+        bot = getattr(context, "bot", None)
+        try:
+            return str(bot.id) if bot is not None else None
+        except Exception:
+            return None
+
     @staticmethod
     def _is_voice_mode_enabled(settings) -> bool:
         return bool(settings and getattr(settings, "voice_mode", None) == "enabled")
@@ -2296,8 +2300,8 @@ class MessageHandlers:
             
             # Image generation disabled - send text-only weekly report with mini app button
             # Re-enable image generation if needed in the future
-            # image_path = await self.plan_keeper.reports_service.generate_weekly_visualization_image(
-            #     user_id, ref_time
+            # await self.plan_keeper.reports_service.send_weekly_visualization(
+            #     context.bot, user_id, ref_time, chat_id=update.effective_chat.id, caption=message_text, reply_markup=keyboard
             # )
             
             # Create keyboard with refresh and mini app buttons
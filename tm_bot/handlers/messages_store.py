@@ -1,10 +1,16 @@
+import os
+import threading
 from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 
 from telegram import User
 
+from handlers.translation_catalog import TranslationCatalog
 from handlers.translator import translate_text
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class Language(Enum):
@@ -25,9 +31,15 @@ class MessageTemplate:
 class MessageTemplateStore:
     """Manages translations and message formatting."""
 
-    def __init__(self, default_language: Language = Language.EN, settings_repo=None):
+    def __init__(
+        self,
+        default_language: Language = Language.EN,
+        settings_repo=None,
+        catalog: Optional[TranslationCatalog] = None,
+    ):
         self.default_language = default_language
         self.settings_repo = settings_repo
+        self.catalog = catalog
 
     def _get_english_translations(self) -> Dict[str, str]:
         """English translations."""
@@ -237,23 +249,35 @@ class MessageTemplateStore:
                 (candidate for candidate in Language if candidate.value == str(lang_input).lower().strip()),
                 self.default_language,
             )
-        message = self._get_english_translations().get(key, key)
+        template = self._get_english_translations().get(key, key)
+
+        # Prefer the catalog's translated template: user values never reach the translator.
+        translated_template = None
+        if lang != Language.EN and self.catalog is not None and key != template:
+            translated_template = self.catalog.lookup(lang.value, key, template)
+        message = translated_template or template
 
-        # Substitute variables first
+        # Substitute variables
         if kwargs:
             try:
                 message = message.format(**kwargs)
-            except KeyError as e:
+            except (KeyError, IndexError, ValueError) as e:
                 # If a variable is missing, log and return the message as-is
-                import logging
-                logging.warning(f"Missing variable {e} for message key '{key}' in language {lang.value}")
+                logger.warning(f"Formatting message key '{key}' in language {lang.value} failed: {e}")
 
-        # Translate if not English
-        if lang != Language.EN:
+        # No catalog entry: translate the formatted message
+        if lang != Language.EN and translated_template is None:
             message = translate_text(message, lang.value, "en")
 
         return message
 
+    def warm_catalog(self) -> int:
+        """Translate every template into every non-default language (batched; run once at startup)."""
+        if self.catalog is None:
+            return 0
+        templates = self._get_english_translations()
+        return sum(self.catalog.warm(lang.value, templates) for lang in Language if lang != Language.EN)
+
     def get_user_language(self, user_id: int) -> Language:
         """Get user's preferred language from settings repository."""
         if self.settings_repo:
@@ -307,7 +331,23 @@ def get_user_language(user: Union[User, int, str]) -> Language:
         return Language.EN
 
 
-def initialize_message_store(settings_repo):
-    """Initialize the global message store with settings repository."""
+def initialize_message_store(settings_repo, root_dir: Optional[str] = None):
+    """
+    Initialize the global message store with settings repository.
+
+    With `root_dir`, translated templates live in ROOT_DIR/translations and
+    are warmed in a background thread (TRANSLATION_CATALOG_WARM=0 skips that).
+    """
     global _translation_manager
-    _translation_manager = MessageTemplateStore(settings_repo=settings_repo)
+    catalog = TranslationCatalog(os.path.join(root_dir, "translations")) if root_dir else None
+    _translation_manager = MessageTemplateStore(settings_repo=settings_repo, catalog=catalog)
+    if catalog is not None and os.getenv("TRANSLATION_CATALOG_WARM", "1") != "0":
+        store = _translation_manager
+
+        def _warm() -> None:
+            try:
+                store.warm_catalog()
+            except Exception as e:
+                logger.warning(f"Translation catalog warm-up failed: {e}")
+
+        threading.Thread(target=_warm, name="translation-catalog-warm", daemon=True).start()
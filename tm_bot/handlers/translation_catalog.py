@@ -0,0 +1,144 @@
+"""
+Persistent catalog of translated message templates.
+
+`MessageTemplateStore` templates are translated once per language *before*
+interpolation, with their `{placeholders}` swapped for opaque tokens the
+translator leaves alone, and stored as JSON under
+ROOT_DIR/translations/catalog_<lang>.json. Each entry remembers a hash of the
+English template, so editing a template re-translates just that key.
+`warm()` fills a language in one batched pass at startup; a key missing at
+lookup time is translated on demand and saved too.
+
+A translation whose tokens did not survive is not stored; `lookup` returns
+None and the caller falls back to translating the formatted message.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from handlers import translator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_FIELD_RE = re.compile(r"\{[A-Za-z_][A-Za-z0-9_]*(?:[!:][^{}]*)?\}")
+_TOKEN_RE = re.compile(r"__PH_(\d+)__")
+
+
+def protect_placeholders(template: str) -> Tuple[str, List[str]]:
+    """Replace format fields with __PH_n__ tokens; returns (text, fields in token order)."""
+    fields: List[str] = []
+
+    def _swap(match: "re.Match[str]") -> str:
+        fields.append(match.group(0))
+        return f"__PH_{len(fields) - 1}__"
+
+    return _FIELD_RE.sub(_swap, template), fields
+
+
+def restore_placeholders(text: str, fields: List[str]) -> Optional[str]:
+    """Put the fields back; None when a token was lost, duplicated or invented by the translator."""
+    found = [int(n) for n in _TOKEN_RE.findall(text)]
+    if sorted(found) != list(range(len(fields))):
+        return None
+    return _TOKEN_RE.sub(lambda m: fields[int(m.group(1))], text)
+
+
+def _source_hash(template: str) -> str:
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationCatalog:
+    """Translated templates per language, backed by one JSON file per language."""
+
+    def __init__(self, directory: str, source_lang: str = "en"):
+        self.directory = directory
+        self.source_lang = source_lang
+        self._entries: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        # One save at a time: the snapshot is taken inside it, so the last write has the newest entries.
+        self._save_lock = threading.Lock()
+
+    def _path(self, lang: str) -> str:
+        return os.path.join(self.directory, f"catalog_{lang}.json")
+
+    def _language(self, lang: str) -> Dict[str, Dict[str, str]]:
+        with self._lock:
+            entries = self._entries.get(lang)
+            if entries is not None:
+                return entries
+        try:
+            with open(self._path(lang), "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+        except FileNotFoundError:
+            loaded = {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable translation catalog %s: %s", self._path(lang), exc)
+            loaded = {}
+        with self._lock:
+            return self._entries.setdefault(lang, loaded)
+
+    def _save(self, lang: str) -> None:
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self._entries.get(lang) or {})
+            tmp_path = None
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=f"catalog_{lang}.", suffix=".tmp", dir=self.directory)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False, indent=1, sort_keys=True)
+                os.replace(tmp_path, self._path(lang))
+            except OSError as exc:
+                logger.warning("Could not save translation catalog %s: %s", self._path(lang), exc)
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def cached(self, lang: str, key: str, template: str) -> Optional[str]:
+        """Stored translation of `template`, if it is current."""
+        entry = self._language(lang).get(key)
+        if entry and entry.get("source_hash") == _source_hash(template):
+            return entry.get("text")
+        return None
+
+    def lookup(self, lang: str, key: str, template: str) -> Optional[str]:
+        """Translated template for `key`, translating and storing it on a miss."""
+        text = self.cached(lang, key, template)
+        if text is None and self._translate(lang, [(key, template)]):
+            self._save(lang)
+            text = self.cached(lang, key, template)
+        return text
+
+    def warm(self, lang: str, templates: Dict[str, str]) -> int:
+        """Translate every missing or outdated template of `lang` in batches; returns how many were added."""
+        if lang == self.source_lang:
+            return 0
+        stale = [(key, template) for key, template in templates.items() if self.cached(lang, key, template) is None]
+        added = self._translate(lang, stale) if stale else 0
+        if added:
+            self._save(lang)
+            logger.info("Translation catalog %s: %d template(s) added, %d total", lang, added, len(templates))
+        return added
+
+    def _translate(self, lang: str, items: Iterable[Tuple[str, str]]) -> int:
+        items = list(items)
+        protected = [protect_placeholders(template) for _, template in items]
+        translations = translator.translate_batch([text for text, _ in protected], lang, self.source_lang)
+        added = 0
+        entries = self._language(lang)
+        for (key, template), (text, fields), translated in zip(items, protected, translations):
+            if translated == text and re.search(r"[^\W\d_]", _TOKEN_RE.sub("", text)):
+                continue  # translation failed (text came back as is); try again next time
+            restored = restore_placeholders(translated, fields)
+            if restored is None:
+                logger.warning("Translated template %r (%s) lost its placeholders; not cached", key, lang)
+                continue
+            with self._lock:
+                entries[key] = {"source_hash": _source_hash(template), "text": restored}
+            added += 1
+        return added
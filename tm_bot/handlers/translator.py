@@ -1,82 +1,177 @@
 """
 Translation module using Google Cloud Translation API.
-Provides caching to minimize API calls for frequently used messages.
+
+One pooled TranslationServiceClient per process; texts are sent in batches
+(`translate_batch`) and results kept in a bounded LRU cache. Message templates
+are not translated here per call: `handlers.translation_catalog` translates
+them once per language and persists the result, so this path only sees
+genuinely dynamic text (LLM replies, error details, broadcasts).
 """
 
-from typing import Dict
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from llms.llm_env_utils import load_llm_env
+from utils.env import env_int
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Translation cache to avoid repeated API calls
-_translation_cache: Dict[str, str] = {}
+# Per Cloud Translation request: at most this many texts / code points.
+MAX_BATCH_TEXTS = 128
+MAX_BATCH_CHARS = 25000
+
+TranslateBackend = Callable[[Sequence[str], str, str], List[str]]
+
+
+# Translation cache to avoid repeated API calls: (source, target, text) -> translation
+_translation_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_max_entries = env_int("TRANSLATION_CACHE_MAX_ENTRIES", 5000)
+
+_client = None
+_parent: Optional[str] = None
+_client_lock = threading.Lock()
+_backend_override: Optional[TranslateBackend] = None
+
+
+def _get_client() -> Tuple[object, str]:
+    """The process-wide TranslationServiceClient and its parent path (created on first use)."""
+    global _client, _parent
+    with _client_lock:
+        if _client is None:
+            from google.cloud import translate_v3 as translate
+
+            # GCP configuration is only needed (and loaded) once something is actually translated.
+            cfg = load_llm_env()
+            location = cfg.get("GCP_LOCATION", "us-central1")
+            _parent = f"projects/{cfg.get('GCP_PROJECT_ID')}/locations/{location}"
+            _client = translate.TranslationServiceClient()
+        return _client, _parent
+
+
+def google_translate_backend(texts: Sequence[str], target_lang: str, source_lang: str) -> List[str]:
+    from google.cloud import translate_v3 as translate
+
+    client, parent = _get_client()
+    request = translate.TranslateTextRequest(
+        contents=list(texts),
+        target_language_code=target_lang,
+        source_language_code=source_lang or "",
+        parent=parent,
+        mime_type="text/plain",
+    )
+    response = client.translate_text(request=request)
+    return [t.translated_text for t in response.translations]
+
+
+def local_translate_backend(texts: Sequence[str], target_lang: str, source_lang: str) -> List[str]:
+    """Offline stand-in: tags each text with the target language, leaves it otherwise unchanged."""
+    return [f"[{target_lang}] {text}" for text in texts]
+
+
+def set_translation_backend(backend: Optional[TranslateBackend]) -> None:
+    """Use `backend` instead of the env-selected one (None restores it). Clears the cache."""
+    global _backend_override
+    _backend_override = backend
+    clear_translation_cache()
 
-# Load GCP configuration
-cfg = load_llm_env()
-project_id = cfg.get("GCP_PROJECT_ID")
-location = cfg.get("GCP_LOCATION", "us-central1")
+
+def _backend() -> TranslateBackend:
+    if _backend_override is not None:
+        return _backend_override
+    if os.getenv("TRANSLATION_BACKEND", "google").strip().lower() == "local":
+        return local_translate_backend
+    return google_translate_backend
+
+
+def _batches(texts: List[str]) -> List[List[str]]:
+    batches: List[List[str]] = []
+    current: List[str] = []
+    chars = 0
+    for text in texts:
+        if current and (len(current) >= MAX_BATCH_TEXTS or chars + len(text) > MAX_BATCH_CHARS):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(text)
+        chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(texts: Sequence[str], target_lang: str, source_lang: str = "en") -> List[str]:
+    """
+    Translate several texts with as few API requests as possible.
+
+    Cached texts are not sent again; a failed request leaves its texts untranslated.
+    Returns translations in input order.
+    """
+    results = list(texts)
+    if target_lang == source_lang:
+        return results
+
+    missing: Dict[str, List[int]] = {}
+    with _cache_lock:
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            cached = _translation_cache.get((source_lang, target_lang, text))
+            if cached is not None:
+                _translation_cache.move_to_end((source_lang, target_lang, text))
+                results[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
+    if not missing:
+        return results
+
+    translated = {}
+    backend = _backend()
+    for batch in _batches(list(missing)):
+        try:
+            for text, translation in zip(batch, backend(batch, target_lang, source_lang)):
+                translated[text] = translation
+        except ImportError:
+            logger.error("google-cloud-translate not available. Install with: pip install google-cloud-translate")
+            break
+        except Exception as e:
+            logger.error(f"Translation of {len(batch)} text(s) to {target_lang} failed: {str(e)}")
+
+    with _cache_lock:
+        for text, translation in translated.items():
+            _translation_cache[(source_lang, target_lang, text)] = translation
+        while len(_translation_cache) > _cache_max_entries:
+            _translation_cache.popitem(last=False)
+    logger.debug(f"Translated {len(translated)}/{len(missing)} text(s) from {source_lang} to {target_lang}")
+    for text, translation in translated.items():
+        for i in missing[text]:
+            results[i] = translation
+    return results
 
 
 def translate_text(text: str, target_lang: str, source_lang: str = "en") -> str:
     """
     Translate text using Google Cloud Translation API with caching.
-    
+
     Args:
         text: Text to translate
         target_lang: Target language code (e.g., "fa", "fr")
         source_lang: Source language code (default: "en")
-    
+
     Returns:
         Translated text or original text if translation fails
     """
     if not text or target_lang == source_lang:
         return text
-    
-    # Create cache key
-    cache_key = f"{source_lang}:{target_lang}:{text}"
-    
-    # Check cache first
-    if cache_key in _translation_cache:
-        return _translation_cache[cache_key]
-    
-    try:
-        # Import GCP translate client
-        from google.cloud import translate_v3 as translate
-        
-        client = translate.TranslationServiceClient()
-        parent = f"projects/{project_id}/locations/{location}"
-        
-        request = translate.TranslateTextRequest(
-            contents=[text],
-            target_language_code=target_lang,
-            source_language_code=source_lang or "",
-            parent=parent,
-            mime_type="text/plain"
-        )
-        
-        response = client.translate_text(request=request)
-        translated_text = response.translations[0].translated_text
-        
-        # Cache the result
-        _translation_cache[cache_key] = translated_text
-        
-        logger.debug(f"Translated '{text[:50]}...' from {source_lang} to {target_lang}")
-        return translated_text
-        
-    except ImportError:
-        logger.error("google-cloud-translate not available. Install with: pip install google-cloud-translate")
-        return text
-    except Exception as e:
-        logger.error(f"Translation failed for '{text[:50]}...': {str(e)}")
-        return text
+    return translate_batch([text], target_lang, source_lang)[0]
 
 
 def clear_translation_cache() -> None:
     """Clear the translation cache."""
-    global _translation_cache
-    _translation_cache.clear()
+    with _cache_lock:
+        _translation_cache.clear()
     logger.info("Translation cache cleared")
 
 
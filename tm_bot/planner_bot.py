@@ -10,7 +10,7 @@ import subprocess
 import sys
 import threading
 from collections import defaultdict, deque
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from unittest.mock import Mock
 
@@ -51,6 +51,8 @@ logger = get_logger(__name__)
 CLUB_TELEGRAM_CONFIRM_PREFIX = "clubtg_confirm:"
 _GROUP_ACTIVE_SECONDS = 10 * 60
 _GROUP_WARM_SECONDS = 60 * 60
+# Upper bound on the club timer sleep, so fire times changed by the webapp are picked up.
+CLUB_TIMER_MAX_SLEEP = timedelta(seconds=60)
 _DEFAULT_BOT_SELF_ALIASES = ("xaana", "zana", "زانا")
 _BOT_ALIAS_ENV = "XAANA_BOT_ALIASES"
 
@@ -208,7 +210,7 @@ class PlannerBot:
         self.plan_keeper.set_llm_handler(self.llm_handler)
 
         # Initialize message store with settings repository
-        initialize_message_store(self.plan_keeper.settings_repo)
+        initialize_message_store(self.plan_keeper.settings_repo, root_dir=self.root_dir)
 
         # Register all handlers
         if self.application:
@@ -704,6 +706,7 @@ class PlannerBot:
         from services.club_reminder_service import (
             build_club_reminder_message,
             create_club_checkin_keyboard,
+            remember_checkin_card,
             _display_name,
             _owner_timezone,
         )
@@ -773,10 +776,7 @@ class PlannerBot:
         self._record_group_bot_message(ctx, message, sent_message=sent)
         if keyboard and sent:
             try:
-                bot_data = ctx.platform_context.bot_data
-                if "club_checkins" not in bot_data:
-                    bot_data["club_checkins"] = {}
-                bot_data["club_checkins"][(sent.chat_id, sent.message_id)] = {
+                remember_checkin_card(ctx.platform_context.bot_data, sent.chat_id, sent.message_id, {
                     "club_id": club_id,
                     "club_name": club_name,
                     "promise_text": promise_text,
@@ -785,7 +785,7 @@ class PlannerBot:
                     "timezone": timezone_name,
                     "members": members,
                     "sent_at_utc": datetime.utcnow().isoformat(),
-                }
+                })
             except Exception:
                 pass
 
@@ -946,12 +946,11 @@ class PlannerBot:
                     evidence.reason,
                     evidence.confidence,
                 )
-            has_live_card = any(
-                str(s.get("club_id") or "") == club_id
-                for s in (bot_data.get("club_checkins") or {}).values()
-                if isinstance(s, dict)
-            )
-            await self._refresh_group_checkin_cards(ctx, club, bot_data, promise_uuid)
+            from services.club_reminder_service import live_checkin_cards
+
+            live_cards = live_checkin_cards(bot_data, club_id)
+            has_live_card = bool(live_cards)
+            await self._refresh_group_checkin_cards(ctx, club, bot_data, promise_uuid, live_cards)
             if is_new_checkin and not has_live_card:
                 # No reminder card to update — give the user visible feedback
                 try:
@@ -975,21 +974,25 @@ class PlannerBot:
         club: dict,
         bot_data: dict,
         promise_uuid: str,
+        live_cards: dict | None = None,
     ) -> None:
-        """Best-effort refresh of any live check-in cards cached in bot_data."""
-        if not bot_data or "club_checkins" not in bot_data:
-            return
-
+        """Best-effort refresh of the club's live check-in cards (stored and cached)."""
         from repositories.actions_repo import ActionsRepository
         from services.club_reminder_service import (
             build_club_reminder_message,
             create_club_checkin_keyboard,
+            live_checkin_cards,
+            remember_checkin_card,
             _owner_timezone,
         )
 
         club_id = str(club.get("club_id") or "")
         if not club_id:
             return
+        if live_cards is None:
+            live_cards = live_checkin_cards(bot_data, club_id)
+        if not live_cards:
+            return
 
         actions_repo = ActionsRepository()
         checked_in = actions_repo.get_today_checkins(promise_uuid)
@@ -997,9 +1000,7 @@ class PlannerBot:
         timezone_name = _owner_timezone(str(club.get("owner_user_id") or ""))
         bot = getattr(ctx.platform_context, "bot", None)
 
-        for state_key, state in list(bot_data.get("club_checkins", {}).items()):
-            if str(state.get("club_id") or "") != club_id:
-                continue
+        for state_key, state in list(live_cards.items()):
             if isinstance(state_key, tuple) and state_key and state_key[0] != ctx.chat_id:
                 continue
 
@@ -1030,7 +1031,10 @@ class PlannerBot:
                 now_utc=now_utc_card,
                 timezone=state.get("timezone"),
             )
-            if not bot or not new_text or not isinstance(state_key, tuple) or len(state_key) != 2:
+            if not isinstance(state_key, tuple) or len(state_key) != 2:
+                continue
+            remember_checkin_card(bot_data, state_key[0], state_key[1], state)
+            if not bot or not new_text:
                 continue
             try:
                 await bot.edit_message_text(
@@ -2268,30 +2272,35 @@ class PlannerBot:
         
         logger.info(f"bootstrap_schedule_existing_users: successfully scheduled reminders for {scheduled_count}/{len(user_ids)} users")
 
-        # Repeating tick every 15 min — sends reminders to clubs whose
-        # configured reminder_time falls within the current window.
+        # Club reminder/leaderboard timer: a one-shot job that re-arms itself
+        # for the earliest stored club fire time (see _club_timer_tick).
+        try:
+            self._arm_club_timer(datetime.now(timezone.utc))
+            logger.info("bootstrap_schedule_existing_users: armed club_timer")
+        except Exception as exc:
+            logger.exception("bootstrap_schedule_existing_users: failed to arm club_timer: %s", exc)
+
+        # Hourly full recompute of club fire times (owner timezone changes).
         try:
             job_scheduler.schedule_repeating(
-                name="club_reminder_tick",
-                callback=self._send_due_club_reminders,
-                seconds=900,
+                name="club_schedule_refresh",
+                callback=self._refresh_club_schedules,
+                seconds=3600,
             )
-            logger.info("bootstrap_schedule_existing_users: scheduled club_reminder_tick every 15 min")
+            logger.info("bootstrap_schedule_existing_users: scheduled club_schedule_refresh every hour")
         except Exception as exc:
-            logger.exception("bootstrap_schedule_existing_users: failed to schedule club_reminder_tick: %s", exc)
+            logger.exception("bootstrap_schedule_existing_users: failed to schedule club_schedule_refresh: %s", exc)
 
-        # Repeating tick every 15 min — sends the rendered leaderboard image to
-        # clubs whose configured leaderboard_time falls within the current
-        # window (opt-in only; skipped when unset).
+        # Background avatar refresh for users queued by recent interactions.
         try:
             job_scheduler.schedule_repeating(
-                name="club_leaderboard_tick",
-                callback=self._send_due_club_leaderboards,
-                seconds=900,
+                name="avatar_refresh",
+                callback=self._refresh_pending_avatars,
+                seconds=60,
             )
-            logger.info("bootstrap_schedule_existing_users: scheduled club_leaderboard_tick every 15 min")
+            logger.info("bootstrap_schedule_existing_users: scheduled avatar_refresh every 60 sec")
         except Exception as exc:
-            logger.exception("bootstrap_schedule_existing_users: failed to schedule club_leaderboard_tick: %s", exc)
+            logger.exception("bootstrap_schedule_existing_users: failed to schedule avatar_refresh: %s", exc)
 
         # Repeating tick every 5 min — dispatches due promise reminders.
         try:
@@ -2335,31 +2344,71 @@ class PlannerBot:
             logger.exception("Bot run loop failed: %s", e)
             raise
 
-    async def _send_due_club_reminders(self, context) -> None:
-        """Scheduled callback (every 15 min): send reminders to clubs whose time is now due."""
+    def _arm_club_timer(self, when_utc: datetime) -> None:
+        self.platform_adapter.job_scheduler.schedule_once(
+            name="club_timer",
+            callback=self._club_timer_tick,
+            when_dt=when_utc,
+        )
+
+    async def _club_timer_tick(self, context) -> None:
+        """
+        Send club reminders and leaderboards whose fire time has come, then
+        re-arm for the next stored fire time. Sleeps at most CLUB_TIMER_MAX_SLEEP
+        so fire times changed by the webapp (another process) are picked up.
+        """
         from services.club_reminder_service import ClubReminderService
-        bot = getattr(context, "bot", None)
-        if bot is None:
-            logger.warning("[ClubReminder] No bot instance in context — skipping tick")
-            return
+
+        next_fire = None
         try:
+            bot = getattr(context, "bot", None)
+            if bot is None:
+                logger.warning("[ClubReminder] No bot instance in context — skipping tick")
+                return
             service = ClubReminderService()
-            await service.send_due_club_reminders(bot, context.bot_data)
+            try:
+                await asyncio.to_thread(service.schedule_unscheduled_clubs)
+            except Exception as exc:
+                logger.warning("[ClubReminder] Could not schedule new clubs: %s", exc)
+            try:
+                await service.send_due_club_reminders(bot, context.bot_data)
+            except Exception as exc:
+                logger.exception("[ClubReminder] Tick failed: %s", exc)
+            try:
+                await service.send_due_club_leaderboards(bot, context.bot_data, self.miniapp_url)
+            except Exception as exc:
+                logger.exception("[ClubLeaderboard] Tick failed: %s", exc)
+            next_fire = await asyncio.to_thread(service.next_fire_time)
         except Exception as exc:
-            logger.exception("[ClubReminder] Tick failed: %s", exc)
+            logger.exception("[ClubReminder] Timer tick failed: %s", exc)
+        finally:
+            now = datetime.now(timezone.utc)
+            when = now + CLUB_TIMER_MAX_SLEEP
+            if next_fire is not None:
+                when = min(when, max(now + timedelta(seconds=1), next_fire.replace(tzinfo=timezone.utc)))
+            try:
+                self._arm_club_timer(when)
+            except Exception as exc:
+                logger.exception("[ClubReminder] Could not re-arm club timer: %s", exc)
 
-    async def _send_due_club_leaderboards(self, context) -> None:
-        """Scheduled callback (every 15 min): send leaderboard images to clubs whose time is now due."""
+    async def _refresh_club_schedules(self, context) -> None:
+        """Scheduled callback (hourly): recompute every club's reminder/leaderboard fire times."""
         from services.club_reminder_service import ClubReminderService
+        try:
+            count = await asyncio.to_thread(ClubReminderService().refresh_all_schedules)
+            logger.info("[ClubReminder] Recomputed fire times for %d club(s)", count)
+        except Exception as exc:
+            logger.exception("[ClubReminder] Schedule refresh failed: %s", exc)
+
+    async def _refresh_pending_avatars(self, context) -> None:
+        """Scheduled callback (every 60s): refresh stale avatars of recently active users."""
         bot = getattr(context, "bot", None)
-        if bot is None:
-            logger.warning("[ClubLeaderboard] No bot instance in context — skipping tick")
+        if bot is None or not self.message_handlers:
             return
         try:
-            service = ClubReminderService()
-            await service.send_due_club_leaderboards(bot, context.bot_data, self.miniapp_url)
+            await self.message_handlers.avatar_service.refresh_pending(bot)
         except Exception as exc:
-            logger.exception("[ClubLeaderboard] Tick failed: %s", exc)
+            logger.exception("[Avatar] Background refresh failed: %s", exc)
 
     async def _dispatch_promise_reminders(self, context) -> None:
         """Scheduled callback (every 5 min): send due promise reminders to users."""
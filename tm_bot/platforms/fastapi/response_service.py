@@ -71,6 +71,7 @@ class FastAPIResponseService(IResponseService):
         parse_mode: Optional[str] = None,
         reply_to_message_id: Optional[int] = None,
         disable_web_page_preview: bool = False,
+        raise_errors: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Send a text message to the user."""
         response = {
@@ -100,6 +101,7 @@ class FastAPIResponseService(IResponseService):
         caption: Optional[str] = None,
         keyboard: Optional[Keyboard] = None,
         parse_mode: Optional[str] = None,
+        raise_errors: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Send a photo to the user."""
         # For web app, we'll return a URL or base64 data
@@ -31,8 +31,15 @@ class IResponseService(ABC):
         parse_mode: Optional[str] = None,
         reply_to_message_id: Optional[int] = None,
         disable_web_page_preview: bool = False,
+        raise_errors: bool = False,
     ) -> Optional[Any]:
-        """Send a text message to the user."""
+        """
+        Send a text message to the user.
+
+        Failures are logged and give None, unless ``raise_errors`` is set: then the
+        platform error (e.g. Telegram's RetryAfter) reaches callers that pace or
+        retry sends themselves.
+        """
         pass
     
     @abstractmethod
@@ -44,8 +51,9 @@ class IResponseService(ABC):
         caption: Optional[str] = None,
         keyboard: Optional[Keyboard] = None,
         parse_mode: Optional[str] = None,
+        raise_errors: bool = False,
     ) -> Optional[Any]:
-        """Send a photo to the user."""
+        """Send a photo to the user (``raise_errors`` as for send_text)."""
         pass
     
     @abstractmethod
@@ -49,6 +49,7 @@ class TelegramResponseService(IResponseService):
         parse_mode: Optional[str] = None,
         reply_to_message_id: Optional[int] = None,
         disable_web_page_preview: bool = False,
+        raise_errors: bool = False,
     ) -> Optional[Message]:
         """Send a text message to the user."""
         # Convert keyboard if provided
@@ -72,6 +73,8 @@ class TelegramResponseService(IResponseService):
                 self.log_user_message(user_id, text, message.message_id if message else None, chat_id)
                 return message
             except Exception as e:
+                if raise_errors:
+                    raise
                 logger.error(f"Error sending message to user {user_id}: {e}")
                 return None
         else:
@@ -90,6 +93,7 @@ class TelegramResponseService(IResponseService):
         caption: Optional[str] = None,
         keyboard: Optional[Keyboard] = None,
         parse_mode: Optional[str] = None,
+        raise_errors: bool = False,
     ) -> Optional[Message]:
         """Send a photo to the user."""
         telegram_keyboard = None
@@ -110,6 +114,8 @@ class TelegramResponseService(IResponseService):
                 self.log_user_message(user_id, content, message.message_id if message else None, chat_id)
                 return message
             except Exception as e:
+                if raise_errors:
+                    raise
                 logger.error(f"Error sending photo to user {user_id}: {e}")
                 return None
         else:
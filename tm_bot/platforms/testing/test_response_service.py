@@ -46,6 +46,7 @@ class TestResponseService(IResponseService):
         parse_mode: Optional[str] = None,
         reply_to_message_id: Optional[int] = None,
         disable_web_page_preview: bool = False,
+        raise_errors: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Send a text message to the user (captured for testing)."""
         message = {
@@ -70,6 +71,7 @@ class TestResponseService(IResponseService):
         caption: Optional[str] = None,
         keyboard: Optional[Keyboard] = None,
         parse_mode: Optional[str] = None,
+        raise_errors: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Send a photo to the user (captured for testing)."""
         message = {
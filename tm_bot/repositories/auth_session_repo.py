@@ -113,6 +113,18 @@ class AuthSessionRepository:
             logger.debug("Deleted auth session %s…", session_token[:8])
         return deleted
 
+    def delete_user_sessions(self, user_id: int) -> int:
+        """Revoke every browser session of a user; returns how many were deleted."""
+        with get_db_session() as db:
+            result = db.execute(
+                text("DELETE FROM auth_sessions WHERE user_id = :user_id;"),
+                {"user_id": str(user_id)},
+            )
+        count = result.rowcount or 0
+        if count:
+            logger.info("Revoked %d auth session(s) for user %s", count, user_id)
+        return count
+
     def cleanup_expired(self) -> int:
         now_iso = utc_now_iso()
         with get_db_session() as db:
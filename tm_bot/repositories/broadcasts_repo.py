@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Set, Tuple
 from datetime import datetime
 import json
 import uuid
@@ -36,6 +36,13 @@ class BroadcastsRepository:
         cols = set(get_table_columns(session, "broadcasts"))
         return "media_type" in cols and "media_url" in cols
 
+    @staticmethod
+    def _has_recipient_progress(session) -> bool:
+        """Return True when the broadcast_recipients table and broadcasts.media_file_id exist."""
+        return bool(get_table_columns(session, "broadcast_recipients")) and (
+            "media_file_id" in set(get_table_columns(session, "broadcasts"))
+        )
+
     def create_broadcast(
         self,
         admin_id: int,
@@ -319,6 +326,20 @@ class BroadcastsRepository:
 
         return broadcasts
 
+    def next_scheduled_time_utc(self, now_utc: datetime) -> Optional[datetime]:
+        """Scheduled time of the next pending broadcast after ``now_utc``, or None."""
+        with get_db_session() as session:
+            value = session.execute(
+                text("""
+                    SELECT MIN(scheduled_time_utc)
+                    FROM broadcasts
+                    WHERE status = 'pending'
+                      AND scheduled_time_utc > :now_utc;
+                """),
+                {"now_utc": dt_to_utc_iso(now_utc)},
+            ).scalar()
+        return dt_from_utc_iso(value) if value else None
+
     def update_broadcast(
         self,
         broadcast_id: str,
@@ -413,3 +434,85 @@ class BroadcastsRepository:
     def mark_broadcast_completed(self, broadcast_id: str) -> bool:
         """Mark a broadcast as completed."""
         return self.update_broadcast(broadcast_id, status="completed")
+
+    def get_finished_recipients(self, broadcast_id: str) -> Set[int]:
+        """User IDs that already have a final outcome ('sent' or 'failed') for this broadcast."""
+        with get_db_session() as session:
+            if not self._has_recipient_progress(session):
+                return set()
+            rows = session.execute(
+                text("""
+                    SELECT user_id FROM broadcast_recipients
+                    WHERE broadcast_id = :broadcast_id;
+                """),
+                {"broadcast_id": broadcast_id},
+            ).fetchall()
+        return {int(row[0]) for row in rows}
+
+    def record_recipient_results(
+        self,
+        broadcast_id: str,
+        results: Sequence[Tuple[int, str, int, Optional[str]]],
+    ) -> None:
+        """
+        Upsert per-recipient outcomes.
+
+        Args:
+            broadcast_id: Broadcast ID
+            results: (user_id, status, attempts, error) tuples; status is 'sent' or 'failed'
+        """
+        if not results:
+            return
+        now = utc_now_iso()
+        with get_db_session() as session:
+            if not self._has_recipient_progress(session):
+                return
+            session.execute(
+                text("""
+                    INSERT INTO broadcast_recipients(
+                        broadcast_id, user_id, status, attempts, error, updated_at_utc
+                    ) VALUES (
+                        :broadcast_id, :user_id, :status, :attempts, :error, :updated_at_utc
+                    )
+                    ON CONFLICT (broadcast_id, user_id) DO UPDATE SET
+                        status = EXCLUDED.status,
+                        attempts = broadcast_recipients.attempts + EXCLUDED.attempts,
+                        error = EXCLUDED.error,
+                        updated_at_utc = EXCLUDED.updated_at_utc;
+                """),
+                [
+                    {
+                        "broadcast_id": broadcast_id,
+                        "user_id": str(user_id),
+                        "status": status,
+                        "attempts": int(attempts),
+                        "error": (error or None) and str(error)[:500],
+                        "updated_at_utc": now,
+                    }
+                    for user_id, status, attempts, error in results
+                ],
+            )
+
+    def get_media_file_id(self, broadcast_id: str) -> Optional[str]:
+        """Telegram file_id of the broadcast image once it has been uploaded."""
+        with get_db_session() as session:
+            if not self._has_recipient_progress(session):
+                return None
+            row = session.execute(
+                text("SELECT media_file_id FROM broadcasts WHERE broadcast_id = :broadcast_id;"),
+                {"broadcast_id": broadcast_id},
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def set_media_file_id(self, broadcast_id: str, file_id: str) -> None:
+        with get_db_session() as session:
+            if not self._has_recipient_progress(session):
+                return
+            session.execute(
+                text("""
+                    UPDATE broadcasts
+                    SET media_file_id = :file_id, updated_at_utc = :updated_at_utc
+                    WHERE broadcast_id = :broadcast_id;
+                """),
+                {"broadcast_id": broadcast_id, "file_id": file_id, "updated_at_utc": utc_now_iso()},
+            )
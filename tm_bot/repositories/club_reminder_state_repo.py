@@ -0,0 +1,155 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from db.postgres_db import dt_to_utc_iso, get_db_session, utc_now_iso
+
+
+# A claim whose owner never marked it sent (crash mid-send) can be re-claimed after this long.
+STALE_CLAIM_SECONDS = 600
+
+
+class ClubReminderStateRepository:
+    """
+    Durable club reminder state shared by all bot replicas.
+
+    - club_daily_sends: one row per (club, kind, local date). Inserting the row is
+      the "claim": only the instance whose insert succeeds sends that day's
+      reminder/leaderboard, so restarts and parallel ticks never send twice.
+    - club_checkin_cards: state of live check-in cards keyed by (chat_id,
+      message_id), so button taps can update a card after a restart or on
+      another replica.
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def claim_daily_sends(
+        self,
+        kind: str,
+        claims: Iterable[Tuple[str, str]],
+        owner: str,
+        stale_after_seconds: int = STALE_CLAIM_SECONDS,
+    ) -> Set[str]:
+        """
+        Claim (club_id, local_date) sends of ``kind`` in one statement.
+
+        Returns the club_ids claimed by this call; clubs already sent, or claimed
+        by another instance within ``stale_after_seconds``, are left out.
+        """
+        claims = list(claims)
+        if not claims:
+            return set()
+        now = utc_now_iso()
+        stale_before = dt_to_utc_iso(datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds))
+        with get_db_session() as session:
+            rows = session.execute(
+                text("""
+                    INSERT INTO club_daily_sends(
+                        club_id, kind, local_date, status, claimed_by, claimed_at_utc
+                    )
+                    SELECT c.club_id, :kind, c.local_date, 'claimed', :owner, :now
+                    FROM unnest(CAST(:club_ids AS TEXT[]), CAST(:local_dates AS TEXT[])) AS c(club_id, local_date)
+                    ON CONFLICT (club_id, kind, local_date) DO UPDATE SET
+                        claimed_by = EXCLUDED.claimed_by,
+                        claimed_at_utc = EXCLUDED.claimed_at_utc
+                    WHERE club_daily_sends.status = 'claimed'
+                      AND club_daily_sends.claimed_at_utc < :stale_before
+                    RETURNING club_id;
+                """),
+                {
+                    "kind": kind,
+                    "owner": owner,
+                    "now": now,
+                    "stale_before": stale_before,
+                    "club_ids": [str(club_id) for club_id, _ in claims],
+                    "local_dates": [str(local_date) for _, local_date in claims],
+                },
+            ).fetchall()
+            return {str(row[0]) for row in rows}
+
+    def mark_daily_send_done(self, kind: str, club_id: str, local_date: str) -> None:
+        """Record a claimed send as delivered (or deliberately skipped) for the day."""
+        with get_db_session() as session:
+            session.execute(
+                text("""
+                    UPDATE club_daily_sends
+                    SET status = 'sent', sent_at_utc = :now
+                    WHERE club_id = :club_id AND kind = :kind AND local_date = :local_date;
+                """),
+                {"club_id": str(club_id), "kind": kind, "local_date": str(local_date), "now": utc_now_iso()},
+            )
+
+    def release_daily_send(self, kind: str, club_id: str, local_date: str) -> None:
+        """Drop an unsent claim so a later tick can retry it."""
+        with get_db_session() as session:
+            session.execute(
+                text("""
+                    DELETE FROM club_daily_sends
+                    WHERE club_id = :club_id AND kind = :kind AND local_date = :local_date
+                      AND status = 'claimed';
+                """),
+                {"club_id": str(club_id), "kind": kind, "local_date": str(local_date)},
+            )
+
+    def save_checkin_card(self, chat_id: int, message_id: int, state: Dict) -> None:
+        """Insert or replace the state of a live check-in card."""
+        now = utc_now_iso()
+        with get_db_session() as session:
+            session.execute(
+                text("""
+                    INSERT INTO club_checkin_cards(
+                        chat_id, message_id, club_id, state_json, created_at_utc, updated_at_utc
+                    ) VALUES (
+                        :chat_id, :message_id, :club_id, :state_json, :now, :now
+                    )
+                    ON CONFLICT (chat_id, message_id) DO UPDATE SET
+                        club_id = EXCLUDED.club_id,
+                        state_json = EXCLUDED.state_json,
+                        updated_at_utc = EXCLUDED.updated_at_utc;
+                """),
+                {
+                    "chat_id": int(chat_id),
+                    "message_id": int(message_id),
+                    "club_id": str(state.get("club_id") or ""),
+                    "state_json": json.dumps(state, default=str),
+                    "now": now,
+                },
+            )
+
+    def get_checkin_card(self, chat_id: int, message_id: int) -> Optional[Dict]:
+        with get_db_session() as session:
+            value = session.execute(
+                text("""
+                    SELECT state_json
+                    FROM club_checkin_cards
+                    WHERE chat_id = :chat_id AND message_id = :message_id;
+                """),
+                {"chat_id": int(chat_id), "message_id": int(message_id)},
+            ).scalar()
+        return json.loads(value) if value else None
+
+    def list_checkin_cards(self, club_id: str, since_utc: datetime) -> List[Tuple[Tuple[int, int], Dict]]:
+        """Cards of ``club_id`` created since ``since_utc`` as ((chat_id, message_id), state)."""
+        with get_db_session() as session:
+            rows = session.execute(
+                text("""
+                    SELECT chat_id, message_id, state_json
+                    FROM club_checkin_cards
+                    WHERE club_id = :club_id AND created_at_utc >= :since
+                    ORDER BY created_at_utc;
+                """),
+                {"club_id": str(club_id), "since": dt_to_utc_iso(since_utc, assume_local_tz=False)},
+            ).fetchall()
+        return [((int(row[0]), int(row[1])), json.loads(row[2])) for row in rows]
+
+    def delete_checkin_cards_before(self, cutoff_utc: datetime) -> int:
+        """Forget cards created before ``cutoff_utc``; returns how many were removed."""
+        with get_db_session() as session:
+            result = session.execute(
+                text("DELETE FROM club_checkin_cards WHERE created_at_utc < :cutoff;"),
+                {"cutoff": dt_to_utc_iso(cutoff_utc, assume_local_tz=False)},
+            )
+            return int(result.rowcount or 0)
@@ -3,11 +3,36 @@ from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 
 from sqlalchemy import text
-from db.postgres_db import get_db_session, utc_now_iso
+from db.postgres_db import dt_from_utc_iso, get_db_session, utc_now_iso
 
 
 _CLUB_TELEGRAM_COLUMNS_CHECKED = False
 
+# Per-kind "next fire time" column maintained by the club reminder scheduler.
+CLUB_SCHEDULE_COLUMNS = {
+    "reminder": "next_reminder_at_utc",
+    "leaderboard": "next_leaderboard_at_utc",
+}
+
+_ACTIVE_TELEGRAM_CLUB_FILTER = """
+    telegram_status IN ('ready', 'connected')
+    AND NULLIF(trim(COALESCE(telegram_chat_id, '')), '') IS NOT NULL
+    AND COALESCE(status, 'active') = 'active'
+"""
+
+_SCHEDULED_CLUB_COLUMNS = """
+    club_id,
+    owner_user_id,
+    name,
+    telegram_chat_id,
+    COALESCE(reminder_time, '21:00') AS reminder_time,
+    language,
+    timezone,
+    leaderboard_time,
+    next_reminder_at_utc,
+    next_leaderboard_at_utc
+"""
+
 
 def ensure_club_telegram_columns(session) -> None:
     """Best-effort runtime guard for deployments where Alembic has not run yet."""
@@ -31,6 +56,8 @@ def ensure_club_telegram_columns(session) -> None:
         "ALTER TABLE clubs ADD COLUMN IF NOT EXISTS club_goal TEXT",
         "ALTER TABLE clubs ADD COLUMN IF NOT EXISTS timezone TEXT",
         "ALTER TABLE clubs ADD COLUMN IF NOT EXISTS leaderboard_time TEXT",
+        "ALTER TABLE clubs ADD COLUMN IF NOT EXISTS next_reminder_at_utc TEXT",
+        "ALTER TABLE clubs ADD COLUMN IF NOT EXISTS next_leaderboard_at_utc TEXT",
     ):
         session.execute(text(ddl))
 
@@ -448,6 +475,80 @@ class ClubsRepository:
             ).mappings().fetchall()
             return [dict(row) for row in rows]
 
+    def list_clubs_due(self, kind: str, now_utc_iso: str, limit: int = 1000) -> List[Dict]:
+        """Active Telegram clubs whose next ``kind`` fire time is at or before ``now_utc_iso``."""
+        column = CLUB_SCHEDULE_COLUMNS[kind]
+        with get_db_session() as session:
+            ensure_club_telegram_columns(session)
+            rows = session.execute(
+                text(f"""
+                    SELECT {_SCHEDULED_CLUB_COLUMNS}
+                    FROM clubs
+                    WHERE {column} <= :now
+                      AND {_ACTIVE_TELEGRAM_CLUB_FILTER}
+                    ORDER BY {column}
+                    LIMIT :limit;
+                """),
+                {"now": now_utc_iso, "limit": int(limit)},
+            ).mappings().fetchall()
+            return [dict(row) for row in rows]
+
+    def list_unscheduled_clubs(self) -> List[Dict]:
+        """Active Telegram clubs missing a next reminder (or configured leaderboard) fire time."""
+        with get_db_session() as session:
+            ensure_club_telegram_columns(session)
+            rows = session.execute(
+                text(f"""
+                    SELECT {_SCHEDULED_CLUB_COLUMNS}
+                    FROM clubs
+                    WHERE (
+                        next_reminder_at_utc IS NULL
+                        OR (NULLIF(trim(COALESCE(leaderboard_time, '')), '') IS NOT NULL
+                            AND next_leaderboard_at_utc IS NULL)
+                    )
+                      AND {_ACTIVE_TELEGRAM_CLUB_FILTER};
+                """),
+            ).mappings().fetchall()
+            return [dict(row) for row in rows]
+
+    def list_scheduled_clubs(self) -> List[Dict]:
+        """All active Telegram clubs with their schedule columns (for a full recompute)."""
+        with get_db_session() as session:
+            ensure_club_telegram_columns(session)
+            rows = session.execute(
+                text(f"""
+                    SELECT {_SCHEDULED_CLUB_COLUMNS}
+                    FROM clubs
+                    WHERE {_ACTIVE_TELEGRAM_CLUB_FILTER};
+                """),
+            ).mappings().fetchall()
+            return [dict(row) for row in rows]
+
+    def set_club_fire_times(self, kind: str, fire_times: Dict[str, Optional[str]]) -> None:
+        """Store next ``kind`` fire times (UTC ISO, or None to unschedule) for several clubs."""
+        if not fire_times:
+            return
+        column = CLUB_SCHEDULE_COLUMNS[kind]
+        with get_db_session() as session:
+            ensure_club_telegram_columns(session)
+            session.execute(
+                text(f"UPDATE clubs SET {column} = :fire_at WHERE club_id = :club_id;"),
+                [{"club_id": str(club_id), "fire_at": fire_at} for club_id, fire_at in fire_times.items()],
+            )
+
+    def get_next_club_fire_time(self) -> Optional[datetime]:
+        """Earliest scheduled reminder/leaderboard fire time across active Telegram clubs."""
+        with get_db_session() as session:
+            ensure_club_telegram_columns(session)
+            value = session.execute(
+                text(f"""
+                    SELECT LEAST(MIN(next_reminder_at_utc), MIN(next_leaderboard_at_utc))
+                    FROM clubs
+                    WHERE {_ACTIVE_TELEGRAM_CLUB_FILTER};
+                """),
+            ).scalar()
+        return dt_from_utc_iso(value) if value else None
+
     def update_club_context(
         self,
         club_id: str,
@@ -1,10 +1,11 @@
 """
 Repository for content catalog, user_content, consumption events, and rollup heatmaps.
 """
+import base64
 import json
 import logging
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import text
 
@@ -17,6 +18,74 @@ def _now() -> str:
     return utc_now_iso()
 
 
+# Text searched by the library filter. Must match the expression of the
+# ix_content_search_trgm index (migration 036) for the index to be used.
+CONTENT_SEARCH_DOCUMENT = (
+    "(COALESCE(c.title, '') || ' ' || COALESCE(c.description, '') || ' ' || "
+    "COALESCE(c.author_channel, '') || ' ' || COALESCE(c.provider, '') || ' ' || "
+    "COALESCE(c.original_url, '') || ' ' || COALESCE(c.canonical_url, ''))"
+)
+
+# Library sort modes as (expression, direction) keys. Every order ends in uc.id
+# so row positions are unique and keyset cursors never skip or repeat rows.
+# "Never interacted" rows sort after interacted ones, as NULLS LAST did.
+_RECENT_KEYS = [
+    ("(uc.last_interaction_at IS NOT NULL)", "DESC"),
+    ("COALESCE(uc.last_interaction_at, '')", "DESC"),
+    ("uc.added_at", "DESC"),
+    ("uc.id", "DESC"),
+]
+_LIBRARY_SORT_KEYS = {
+    "recent": _RECENT_KEYS,
+    "added": [("uc.added_at", "DESC"), ("uc.id", "DESC")],
+    "title": [("LOWER(COALESCE(c.title, ''))", "ASC"), ("uc.added_at", "DESC"), ("uc.id", "DESC")],
+    "progress": [("COALESCE(uc.progress_ratio, -1)", "DESC")] + _RECENT_KEYS,
+}
+
+
+def _keyset_condition(keys: List[Tuple[str, str]]) -> str:
+    """
+    WHERE clause selecting rows after the cursor position (:k0, :k1, ...).
+
+    Consecutive keys with the same direction are compared as one row value
+    so the matching index can be range-scanned.
+    """
+    groups: List[Tuple[str, List[Tuple[str, str]]]] = []
+    for i, (expr, direction) in enumerate(keys):
+        if groups and groups[-1][0] == direction:
+            groups[-1][1].append((expr, f":k{i}"))
+        else:
+            groups.append((direction, [(expr, f":k{i}")]))
+
+    def build(index: int) -> str:
+        direction, columns = groups[index]
+        lhs = "(" + ", ".join(expr for expr, _ in columns) + ")"
+        rhs = "(" + ", ".join(param for _, param in columns) + ")"
+        after = f"{lhs} {'<' if direction == 'DESC' else '>'} {rhs}"
+        if index == len(groups) - 1:
+            return after
+        return f"({after} OR ({lhs} = {rhs} AND {build(index + 1)}))"
+
+    return build(0)
+
+
+def _encode_library_cursor(sort: str, values: List[Any]) -> str:
+    payload = json.dumps({"sort": sort, "key": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_library_cursor(cursor: str, sort: str, key_count: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        values = payload["key"]
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if payload.get("sort") != sort or not isinstance(values, list) or len(values) != key_count:
+        raise ValueError("Cursor does not match the requested sort")
+    return values
+
+
 class ContentRepository:
     """PostgreSQL-backed content and user_content repository."""
 
@@ -269,7 +338,15 @@ class ContentRepository:
         content_type: Optional[str] = None,
         sort: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Return joined content + user_content + rollup rows for the library."""
+        """
+        Return joined content + user_content + rollup rows for the library.
+
+        Pages are keyset-based: each row carries a `cursor` for the position
+        right after it, to be passed back as `cursor` for the next page.
+        Raises ValueError for a cursor that is malformed or from another sort.
+        """
+        sort_key = sort if sort in _LIBRARY_SORT_KEYS else "recent"
+        keys = _LIBRARY_SORT_KEYS[sort_key]
         params: Dict[str, Any] = {"user_id": user_id, "limit": max(1, min(int(limit or 20), 101))}
         conditions = ["uc.user_id = :user_id"]
         if status and status != "all":
@@ -285,43 +362,14 @@ class ContentRepository:
                 params["content_type"] = content_type
         if q and q.strip():
             params["q"] = f"%{q.strip()}%"
-            conditions.append(
-                """
-                (
-                    c.title ILIKE :q
-                    OR c.description ILIKE :q
-                    OR c.author_channel ILIKE :q
-                    OR c.provider ILIKE :q
-                    OR c.original_url ILIKE :q
-                    OR c.canonical_url ILIKE :q
-                )
-                """
-            )
-        offset = 0
-        if cursor and cursor.startswith("offset:"):
-            try:
-                offset = max(0, int(cursor.split(":", 1)[1]))
-            except (TypeError, ValueError):
-                offset = 0
-        elif cursor:
-            conditions.append(
-                """
-                (
-                    uc.last_interaction_at IS NOT NULL AND uc.last_interaction_at < :cursor
-                    OR uc.last_interaction_at IS NULL AND uc.added_at < :cursor
-                )
-                """
-            )
-            params["cursor"] = cursor
-        params["offset"] = offset
+            conditions.append(f"{CONTENT_SEARCH_DOCUMENT} ILIKE :q")
+        if cursor:
+            values = _decode_library_cursor(cursor, sort_key, len(keys))
+            conditions.append(_keyset_condition(keys))
+            params.update({f"k{i}": value for i, value in enumerate(values)})
 
-        sort_key = sort or "recent"
-        order_by = {
-            "added": "uc.added_at DESC",
-            "title": "LOWER(COALESCE(c.title, '')) ASC, uc.added_at DESC",
-            "progress": "uc.progress_ratio DESC NULLS LAST, uc.last_interaction_at DESC NULLS LAST, uc.added_at DESC",
-            "recent": "uc.last_interaction_at DESC NULLS LAST, uc.added_at DESC",
-        }.get(sort_key, "uc.last_interaction_at DESC NULLS LAST, uc.added_at DESC")
+        key_columns = ", ".join(f"{expr} AS _k{i}" for i, (expr, _) in enumerate(keys))
+        order_by = ", ".join(f"{expr} {direction}" for expr, direction in keys)
 
         with get_db_session() as session:
             rows = session.execute(
@@ -333,46 +381,57 @@ class ContentRepository:
                            uc.completed_at, uc.last_position, uc.position_unit, uc.progress_ratio,
                            uc.total_consumed_seconds, uc.notes, uc.rating,
                            uc.assigned_promise_id, uc.assigned_at,
-                           r.bucket_count, r.buckets
+                           r.bucket_count, r.buckets,
+                           {key_columns}
                     FROM user_content uc
                     JOIN content c ON c.id = uc.content_id
                     LEFT JOIN user_content_rollup r ON r.user_id = uc.user_id AND r.content_id = uc.content_id
                     WHERE {" AND ".join(conditions)}
                     ORDER BY {order_by}
                     LIMIT :limit
-                    OFFSET :offset
                 """),
                 params,
             ).mappings().fetchall()
-        return [dict(r) for r in rows]
+
+        items = []
+        for r in rows:
+            item = dict(r)
+            item["cursor"] = _encode_library_cursor(sort_key, [item.pop(f"_k{i}") for i in range(len(keys))])
+            items.append(item)
+        return items
 
     def get_user_content_facets(self, user_id: str, q: Optional[str] = None) -> Dict[str, Dict[str, int]]:
-        """Return lightweight facet counts for the user's library."""
-        params: Dict[str, Any] = {"user_id": user_id}
-        where = ["uc.user_id = :user_id"]
-        if q and q.strip():
-            params["q"] = f"%{q.strip()}%"
-            where.append(
-                """
-                (
-                    c.title ILIKE :q
-                    OR c.description ILIKE :q
-                    OR c.author_channel ILIKE :q
-                    OR c.provider ILIKE :q
-                    OR c.original_url ILIKE :q
-                    OR c.canonical_url ILIKE :q
-                )
-                """
-            )
+        """
+        Return lightweight facet counts for the user's library.
+
+        Without a search the counts come from user_content_facet_counts, which
+        triggers keep up to date on every user_content / content change; with
+        a search only the matching rows are counted.
+        """
+        if not (q and q.strip()):
+            with get_db_session() as session:
+                rows = session.execute(
+                    text("""
+                        SELECT facet, value, count
+                        FROM user_content_facet_counts
+                        WHERE user_id = :user_id AND count > 0
+                    """),
+                    {"user_id": user_id},
+                ).mappings().fetchall()
+            facets: Dict[str, Dict[str, int]] = {"status": {}, "content_type": {}}
+            for row in rows:
+                facets.setdefault(str(row["facet"]), {})[str(row["value"])] = int(row["count"])
+            return facets
+
         with get_db_session() as session:
             rows = session.execute(
                 text(f"""
                     SELECT uc.status, c.content_type, c.provider, c.metadata_json
                     FROM user_content uc
                     JOIN content c ON c.id = uc.content_id
-                    WHERE {" AND ".join(where)}
+                    WHERE uc.user_id = :user_id AND {CONTENT_SEARCH_DOCUMENT} ILIKE :q
                 """),
-                params,
+                {"user_id": user_id, "q": f"%{q.strip()}%"},
             ).mappings().fetchall()
 
         status_counts: Dict[str, int] = {}
@@ -528,6 +587,96 @@ class ContentRepository:
                 {"user_id": user_id, "content_id": content_id, "buckets": buckets_json, "updated_at": updated_at},
             )
 
+    def apply_consumption_batch(
+        self,
+        user_id: str,
+        content_id: str,
+        events: List[Dict[str, Any]],
+        bucket_increments: Dict[int, int],
+        bucket_count: int,
+        updated_at: str,
+    ) -> List[int]:
+        """
+        Write a coalesced batch of consumption in one transaction: ensure the
+        user_content row, append the events and add `bucket_increments` to the
+        rollup under a row lock (so concurrent writers add up instead of
+        overwriting each other). Returns the resulting buckets.
+        """
+        with get_db_session() as session:
+            session.execute(
+                text("""
+                    INSERT INTO user_content (id, user_id, content_id, status, added_at)
+                    VALUES (:id, :user_id, :content_id, 'saved', :added_at)
+                    ON CONFLICT (user_id, content_id) DO NOTHING
+                """),
+                {"id": str(uuid.uuid4()), "user_id": user_id, "content_id": content_id, "added_at": updated_at},
+            )
+            if events:
+                session.execute(
+                    text("""
+                        INSERT INTO content_consumption_event (
+                            id, user_id, content_id, event_type, start_position, end_position,
+                            position_unit, started_at, ended_at, client, device_id, created_at
+                        ) VALUES (
+                            :id, :user_id, :content_id, 'consume', :start_position, :end_position,
+                            :position_unit, :started_at, :ended_at, :client, NULL, :created_at
+                        )
+                    """),
+                    [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "user_id": user_id,
+                            "content_id": content_id,
+                            "start_position": event["start_position"],
+                            "end_position": event["end_position"],
+                            "position_unit": event["position_unit"],
+                            "started_at": event.get("started_at"),
+                            "ended_at": event.get("ended_at"),
+                            "client": event.get("client"),
+                            "created_at": updated_at,
+                        }
+                        for event in events
+                    ],
+                )
+            session.execute(
+                text("""
+                    INSERT INTO user_content_rollup (user_id, content_id, bucket_count, buckets, updated_at)
+                    VALUES (:user_id, :content_id, :bucket_count, CAST(:buckets AS jsonb), :updated_at)
+                    ON CONFLICT (user_id, content_id) DO NOTHING
+                """),
+                {
+                    "user_id": user_id,
+                    "content_id": content_id,
+                    "bucket_count": bucket_count,
+                    "buckets": json.dumps([0] * bucket_count),
+                    "updated_at": updated_at,
+                },
+            )
+            row = session.execute(
+                text("""
+                    SELECT bucket_count, buckets FROM user_content_rollup
+                    WHERE user_id = :user_id AND content_id = :content_id
+                    FOR UPDATE
+                """),
+                {"user_id": user_id, "content_id": content_id},
+            ).mappings().fetchone()
+            stored_count = int(row["bucket_count"]) if row else bucket_count
+            raw = row["buckets"] if row else None
+            buckets = raw if isinstance(raw, list) else json.loads(raw) if isinstance(raw, str) else []
+            if len(buckets) != stored_count:
+                buckets = [0] * stored_count
+            for index, count in bucket_increments.items():
+                if 0 <= index < len(buckets):
+                    buckets[index] = (buckets[index] or 0) + count
+            session.execute(
+                text("""
+                    UPDATE user_content_rollup SET buckets = CAST(:buckets AS jsonb), updated_at = :updated_at
+                    WHERE user_id = :user_id AND content_id = :content_id
+                """),
+                {"user_id": user_id, "content_id": content_id, "buckets": json.dumps(buckets), "updated_at": updated_at},
+            )
+        return buckets
+
     def get_heatmap(self, user_id: str, content_id: str) -> Optional[Dict[str, Any]]:
         """Return bucket_count and buckets for content heatmap."""
         with get_db_session() as session:
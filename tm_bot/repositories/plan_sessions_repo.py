@@ -301,6 +301,26 @@ class PlanSessionsRepository:
         from datetime import datetime, timedelta, timezone
 
         now_utc = datetime.now(timezone.utc).replace(microsecond=0)
+        cutoff = now_utc + timedelta(minutes=lookahead_minutes)
+        return [data for reminder_at, data in self._reminder_candidates(now_utc, lookahead_minutes) if reminder_at <= cutoff]
+
+    def next_reminder_at(self, lookahead_minutes: int = 1):
+        """Earliest reminder time still in the future (beyond the lookahead), or None."""
+        from datetime import datetime, timedelta, timezone
+
+        now_utc = datetime.now(timezone.utc).replace(microsecond=0)
+        cutoff = now_utc + timedelta(minutes=lookahead_minutes)
+        upcoming = [
+            reminder_at - timedelta(minutes=lookahead_minutes)
+            for reminder_at, _ in self._reminder_candidates(now_utc, lookahead_minutes)
+            if reminder_at > cutoff
+        ]
+        return min(upcoming) if upcoming else None
+
+    def _reminder_candidates(self, now_utc, lookahead_minutes: int) -> List[tuple]:
+        """(reminder_at, row) for un-notified planned sessions starting within the next day."""
+        from datetime import datetime, timedelta
+
         lower_bound = (now_utc - timedelta(minutes=30)).isoformat().replace("+00:00", "Z")
         max_upper_bound = (now_utc + timedelta(minutes=1440 + lookahead_minutes)).isoformat().replace("+00:00", "Z")
 
@@ -326,18 +346,17 @@ class PlanSessionsRepository:
                 {"lower_bound": lower_bound, "max_upper_bound": max_upper_bound},
             ).mappings().fetchall()
 
-            due = []
+            candidates = []
             for r in rows:
                 data = _row_to_dict(r)
                 try:
                     planned_start = datetime.fromisoformat(str(data["planned_start"]).replace("Z", "+00:00"))
                     offset = data.get("reminder_offset_min")
                     reminder_at = planned_start - timedelta(minutes=int(10 if offset is None else offset))
-                    if reminder_at <= now_utc + timedelta(minutes=lookahead_minutes):
-                        due.append(data)
+                    candidates.append((reminder_at, data))
                 except Exception:
                     continue
-            return due
+            return candidates
 
     def mark_plan_session_notified(self, session_id: int) -> None:
         """Mark a planned session as notified by setting notified_at to now."""
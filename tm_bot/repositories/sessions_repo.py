@@ -5,6 +5,7 @@ from sqlalchemy import text
 
 from db.postgres_db import (
     get_db_session,
+    dt_from_utc_iso,
     dt_to_utc_iso,
     dt_utc_iso_to_local_naive,
     resolve_promise_uuid,
@@ -202,6 +203,21 @@ class SessionsRepository:
             return max(active, key=lambda s: s.started_at)
         return None
 
+    def next_notification_due_utc(self) -> Optional[datetime]:
+        """Earliest future expected_end_utc of a running, un-notified session (UTC), or None."""
+        with get_db_session() as session_db:
+            value = session_db.execute(
+                text("""
+                    SELECT MIN(expected_end_utc)
+                    FROM sessions
+                    WHERE status = 'running'
+                        AND expected_end_utc > :now_utc
+                        AND notified_at_utc IS NULL;
+                """),
+                {"now_utc": utc_now_iso()},
+            ).scalar()
+        return dt_from_utc_iso(value) if value else None
+
     def list_overdue_sessions_needing_notification(self) -> List[Session]:
         """Find running sessions that have passed their expected_end_utc and haven't been notified yet."""
         with get_db_session() as session_db:
@@ -1,3 +1,5 @@
+from typing import Dict, Iterable
+
 from sqlalchemy import text
 
 from db.postgres_db import get_db_session, utc_now_iso, dt_from_utc_iso, dt_to_utc_iso
@@ -41,6 +43,23 @@ class SettingsRepository:
             last_seen=dt_from_utc_iso(row["last_seen_utc"]) if row["last_seen_utc"] else None,
         )
 
+    def get_timezones(self, user_ids: Iterable[int]) -> Dict[str, str]:
+        """Stored timezone of each given user that has one, in one query (user_id str -> timezone)."""
+        users = sorted({str(user_id) for user_id in user_ids if str(user_id).strip()})
+        if not users:
+            return {}
+        with get_db_session() as session:
+            rows = session.execute(
+                text("""
+                    SELECT user_id, timezone
+                    FROM users
+                    WHERE user_id = ANY(CAST(:user_ids AS TEXT[]))
+                      AND timezone IS NOT NULL;
+                """),
+                {"user_ids": users},
+            ).mappings().fetchall()
+        return {str(row["user_id"]): str(row["timezone"]) for row in rows}
+
     def mark_chat_not_found(self, user_id: int) -> None:
         """Mark this user's chat as unreachable by setting timezone to 'DISABLED'.
 
@@ -0,0 +1,115 @@
+import json
+import threading
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import text
+
+from db.postgres_db import get_db_session
+
+
+def _month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _parse_watched_at(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class YoutubeWatchRepository:
+    """
+    YouTube watch reports in Postgres.
+
+    - youtube_watch_event: raw reports, partitioned by month on watched_at.
+    - youtube_watch_daily: per (user, UTC day, video) counters, incremented in
+      the same statement that inserts the events.
+    """
+
+    # Months whose partition this process already ensured exists.
+    _ensured_months: Set[date] = set()
+    _ensured_lock = threading.Lock()
+
+    def insert_watch_events(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert watch records (keys: id, user_id, video_id, ts, time_spent_seconds,
+        segments, closed_via) in one statement and add them to the daily rollup.
+        Records whose id is already stored are skipped (and not counted again),
+        so re-importing a file is harmless. Returns the number inserted.
+        """
+        rows = []
+        for record in records:
+            rows.append({
+                "id": str(record["id"]),
+                "user_id": str(record["user_id"]),
+                "video_id": str(record["video_id"]),
+                "watched_at": _parse_watched_at(record["ts"]),
+                "time_spent_seconds": float(record.get("time_spent_seconds") or 0),
+                "segments": json.dumps(record.get("segments") or []),
+                "closed_via": record.get("closed_via"),
+            })
+        if not rows:
+            return 0
+
+        with get_db_session() as session:
+            created = self._ensure_partitions(session, {_month_start(row["watched_at"]) for row in rows})
+            inserted = session.execute(
+                text("""
+                    WITH incoming AS (
+                        SELECT *
+                        FROM unnest(
+                            CAST(:ids AS TEXT[]),
+                            CAST(:user_ids AS TEXT[]),
+                            CAST(:video_ids AS TEXT[]),
+                            CAST(:watched_ats AS TIMESTAMPTZ[]),
+                            CAST(:time_spent AS DOUBLE PRECISION[]),
+                            CAST(:segments AS TEXT[]),
+                            CAST(:closed_via AS TEXT[])
+                        ) AS r(id, user_id, video_id, watched_at, time_spent_seconds, segments, closed_via)
+                    ),
+                    ins AS (
+                        INSERT INTO youtube_watch_event (
+                            id, user_id, video_id, watched_at, time_spent_seconds, segments, closed_via
+                        )
+                        SELECT id, user_id, video_id, watched_at, time_spent_seconds, CAST(segments AS jsonb), closed_via
+                        FROM incoming
+                        ON CONFLICT (id, watched_at) DO NOTHING
+                        RETURNING user_id, video_id, watched_at, time_spent_seconds
+                    ),
+                    daily AS (
+                        INSERT INTO youtube_watch_daily (user_id, day, video_id, watch_count, seconds_watched)
+                        SELECT user_id, (watched_at AT TIME ZONE 'UTC')::date, video_id, COUNT(*), SUM(time_spent_seconds)
+                        FROM ins
+                        GROUP BY user_id, (watched_at AT TIME ZONE 'UTC')::date, video_id
+                        ON CONFLICT (user_id, day, video_id) DO UPDATE SET
+                            watch_count = youtube_watch_daily.watch_count + EXCLUDED.watch_count,
+                            seconds_watched = youtube_watch_daily.seconds_watched + EXCLUDED.seconds_watched
+                    )
+                    SELECT COUNT(*) FROM ins
+                """),
+                {
+                    "ids": [row["id"] for row in rows],
+                    "user_ids": [row["user_id"] for row in rows],
+                    "video_ids": [row["video_id"] for row in rows],
+                    "watched_ats": [row["watched_at"] for row in rows],
+                    "time_spent": [row["time_spent_seconds"] for row in rows],
+                    "segments": [row["segments"] for row in rows],
+                    "closed_via": [row["closed_via"] for row in rows],
+                },
+            ).scalar()
+        # Only remember partitions once the transaction that created them committed.
+        with self._ensured_lock:
+            self._ensured_months.update(created)
+        return int(inserted or 0)
+
+    def _ensure_partitions(self, session, months: Set[date]) -> List[date]:
+        with self._ensured_lock:
+            missing = sorted(months - self._ensured_months)
+        for month in missing:
+            session.execute(text("SELECT youtube_watch_event_ensure_partition(:month)"), {"month": month})
+        return missing
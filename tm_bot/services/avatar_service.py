@@ -1,17 +1,146 @@
 """
 Avatar service for fetching, storing, and managing user profile pictures.
+
+Interactions only enqueue the user (`enqueue_refresh`); `refresh_pending`
+drains the queue in the background, checks staleness for the whole batch in one
+query and fetches avatars with bounded concurrency. Each stored avatar gets a
+small WebP thumbnail next to it (media/avatars/thumbs/{user_id}.webp), and
+`avatar_thumbnail` serves thumbnails (as bytes or data URIs) from an in-process
+cache, so the webapp avatar route and the leaderboard renderer don't re-read
+and re-encode full-size files.
 """
+import asyncio
+import base64
+import mimetypes
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import text
 
 from db.postgres_db import get_db_session, utc_now_iso, dt_from_utc_iso
+from utils.env import env_int
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+AVATAR_MAX_AGE = timedelta(hours=24)
+AVATAR_THUMB_SIZE = 96
+_THUMB_DIRNAME = "thumbs"
+_THUMB_CACHE_ENTRIES = 2048
+
+
+def thumbnail_path_for(avatar_path: str) -> str:
+    """Thumbnail location for an avatar file: <dir>/thumbs/<name>.webp."""
+    directory, filename = os.path.split(avatar_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, _THUMB_DIRNAME, f"{stem}.webp")
+
+
+def write_avatar_thumbnail(avatar_path: str, size: int = AVATAR_THUMB_SIZE) -> Optional[str]:
+    """Write a square `size` px WebP thumbnail of `avatar_path`; returns its path, or None."""
+    from PIL import Image, ImageOps
+
+    thumb_path = thumbnail_path_for(avatar_path)
+    try:
+        os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+        with Image.open(avatar_path) as image:
+            thumb = ImageOps.fit(image.convert("RGB"), (size, size), Image.Resampling.LANCZOS)
+        tmp_path = f"{thumb_path}.tmp"
+        thumb.save(tmp_path, format="WEBP", quality=82, method=4)
+        os.replace(tmp_path, thumb_path)
+        return thumb_path
+    except Exception as e:
+        logger.warning(f"Failed to write avatar thumbnail for {avatar_path}: {e}")
+        return None
+
+
+class _AvatarThumbnailCache:
+    """
+    LRU of thumbnail bytes and data URIs keyed by avatar path, invalidated by
+    the avatar file's mtime. Shared by the webapp route and the renderer.
+    """
+
+    def __init__(self, max_entries: int = _THUMB_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, bytes, str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, avatar_path: str) -> Optional[Tuple[bytes, str]]:
+        """(bytes, mime) of the avatar's thumbnail, generating it if missing."""
+        entry = self._entry(avatar_path)
+        return (entry[1], entry[2]) if entry else None
+
+    def get_data_uri(self, avatar_path: str) -> Optional[str]:
+        entry = self._entry(avatar_path)
+        if not entry:
+            return None
+        if entry[3] is None:
+            data_uri = f"data:{entry[2]};base64,{base64.b64encode(entry[1]).decode('ascii')}"
+            entry = (entry[0], entry[1], entry[2], data_uri)
+            with self._lock:
+                self._entries[avatar_path] = entry
+        return entry[3]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _entry(self, avatar_path: str) -> Optional[Tuple[int, bytes, str, Optional[str]]]:
+        try:
+            mtime_ns = os.stat(avatar_path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(avatar_path)
+            if entry and entry[0] == mtime_ns:
+                self._entries.move_to_end(avatar_path)
+                return entry
+
+        payload = self._load(avatar_path, mtime_ns)
+        if payload is None:
+            return None
+        entry = (mtime_ns, payload[0], payload[1], None)
+        with self._lock:
+            self._entries[avatar_path] = entry
+            self._entries.move_to_end(avatar_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _load(avatar_path: str, mtime_ns: int) -> Optional[Tuple[bytes, str]]:
+        """Read the thumbnail (regenerating a missing or outdated one); fall back to the original."""
+        thumb_path = thumbnail_path_for(avatar_path)
+        try:
+            fresh = os.stat(thumb_path).st_mtime_ns >= mtime_ns
+        except OSError:
+            fresh = False
+        if not fresh:
+            thumb_path = write_avatar_thumbnail(avatar_path)
+        path, mime = (thumb_path, "image/webp") if thumb_path else (avatar_path, None)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        return data, mime or mimetypes.guess_type(path)[0] or "image/jpeg"
+
+
+avatar_thumbnail_cache = _AvatarThumbnailCache()
+
+
+def avatar_thumbnail(avatar_path: str) -> Optional[Tuple[bytes, str]]:
+    """Thumbnail (bytes, mime) for an avatar file, served from the shared cache."""
+    return avatar_thumbnail_cache.get(avatar_path)
+
+
+def avatar_thumbnail_data_uri(avatar_path: str) -> Optional[str]:
+    """Thumbnail of an avatar file as a `data:` URI, served from the shared cache."""
+    return avatar_thumbnail_cache.get_data_uri(avatar_path)
+
 
 class AvatarService:
     """Service for managing user avatar/profile pictures."""
@@ -21,6 +150,9 @@ class AvatarService:
         self.avatars_dir = os.path.join(root_dir, "media", "avatars")
         # Ensure avatars directory exists
         os.makedirs(self.avatars_dir, exist_ok=True)
+        self.refresh_concurrency = env_int("AVATAR_REFRESH_CONCURRENCY", 8)
+        self.refresh_batch_size = env_int("AVATAR_REFRESH_BATCH", 200)
+        self._pending: Set[int] = set()
     
     def get_avatar_path(self, user_id: int) -> str:
         """Get local file path for user's avatar."""
@@ -48,7 +180,25 @@ class AvatarService:
             # Check if more than 24 hours have passed
             now = datetime.now(timezone.utc)
             time_diff = now - checked_at
-            return time_diff > timedelta(hours=24)
+            return time_diff > AVATAR_MAX_AGE
+
+    def list_stale_user_ids(self, user_ids: Iterable[int]) -> List[int]:
+        """Users among `user_ids` whose avatar wasn't checked within AVATAR_MAX_AGE (one query)."""
+        ids = [str(u) for u in user_ids]
+        if not ids:
+            return []
+        with get_db_session() as session:
+            rows = session.execute(
+                text("""
+                    SELECT user_id, avatar_checked_at_utc
+                    FROM users
+                    WHERE user_id = ANY(:user_ids);
+                """),
+                {"user_ids": ids},
+            ).mappings().fetchall()
+        checked = {str(row["user_id"]): dt_from_utc_iso(row["avatar_checked_at_utc"]) for row in rows}
+        cutoff = datetime.now(timezone.utc) - AVATAR_MAX_AGE
+        return [int(u) for u in ids if not checked.get(u) or checked[u] < cutoff]
     
     async def fetch_user_avatar(self, bot, user_id: int) -> Optional[str]:
         """
@@ -175,26 +325,38 @@ class AvatarService:
         """
         Fetch and store user's avatar if needed.
         Returns True if avatar was fetched/stored, False otherwise.
-        
-        This method:
-        1. Checks if avatar needs refresh (24 hour check)
-        2. Fetches profile photo from Telegram
-        3. Downloads and stores locally
-        4. Updates database
+
+        Checks staleness (24 hour check) and then refreshes the avatar. The bot
+        itself enqueues users with `enqueue_refresh` instead; this is kept for
+        one-off callers.
         """
         try:
             # Check if we need to refresh
-            if not self.should_refresh_avatar(user_id):
+            if not await asyncio.to_thread(self.should_refresh_avatar, user_id):
                 logger.debug(f"Avatar for user {user_id} was recently checked, skipping")
                 return False
-            
+        except Exception as e:
+            logger.error(f"Error in fetch_and_store_avatar for user {user_id}: {e}")
+            return False
+        return await self.refresh_avatar(bot, user_id)
+
+    async def refresh_avatar(self, bot, user_id: int) -> bool:
+        """
+        Refresh one user's avatar regardless of when it was last checked.
+
+        This method:
+        1. Fetches profile photo from Telegram
+        2. Downloads and stores locally, with a WebP thumbnail next to it
+        3. Updates database (checked_at is updated even when there is no photo
+           or the download fails, to avoid checking too frequently)
+        """
+        try:
             # Fetch profile photo
             file_id = await self.fetch_user_avatar(bot, user_id)
             if not file_id:
-                # No photo available, but still update checked_at to avoid checking too frequently
-                self.update_user_avatar(user_id, None, None, None)
+                await asyncio.to_thread(self.update_user_avatar, user_id, None, None, None)
                 return False
-            
+
             # Get file info to get file_unique_id
             try:
                 file = await bot.get_file(file_id)
@@ -202,24 +364,59 @@ class AvatarService:
             except Exception as e:
                 logger.warning(f"Failed to get file info for {file_id}: {e}")
                 file_unique_id = None
-            
+
             # Download avatar
             avatar_path = await self.download_avatar(bot, file_id, user_id)
             if not avatar_path:
-                # Download failed, but still update checked_at
-                self.update_user_avatar(user_id, None, file_id, file_unique_id)
+                await asyncio.to_thread(self.update_user_avatar, user_id, None, file_id, file_unique_id)
                 return False
-            
-            # Update database
-            self.update_user_avatar(user_id, avatar_path, file_id, file_unique_id)
+
+            await asyncio.to_thread(write_avatar_thumbnail, avatar_path)
+            await asyncio.to_thread(self.update_user_avatar, user_id, avatar_path, file_id, file_unique_id)
             return True
-            
+
         except Exception as e:
-            logger.error(f"Error in fetch_and_store_avatar for user {user_id}: {e}")
+            logger.error(f"Error refreshing avatar for user {user_id}: {e}")
             # Still update checked_at to avoid repeated failures
             try:
-                self.update_user_avatar(user_id, None, None, None)
-            except:
+                await asyncio.to_thread(self.update_user_avatar, user_id, None, None, None)
+            except Exception:
                 pass
             return False
 
+    def enqueue_refresh(self, user_id: int) -> None:
+        """Queue a user for the next background refresh (no I/O; safe on every update)."""
+        self._pending.add(int(user_id))
+
+    async def refresh_pending(self, bot) -> int:
+        """
+        Refresh avatars of queued users whose avatar is stale.
+
+        Takes up to `refresh_batch_size` users off the queue, filters them with
+        one staleness query and refreshes the rest with at most
+        `refresh_concurrency` Telegram fetches in flight. Returns how many
+        avatars were stored.
+        """
+        if not self._pending:
+            return 0
+        batch: List[int] = []
+        while self._pending and len(batch) < self.refresh_batch_size:
+            batch.append(self._pending.pop())
+        try:
+            stale = await asyncio.to_thread(self.list_stale_user_ids, batch)
+        except Exception as e:
+            logger.warning(f"Failed to check avatar staleness for {len(batch)} user(s): {e}")
+            return 0
+        if not stale:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+
+        async def refresh(user_id: int) -> bool:
+            async with semaphore:
+                return await self.refresh_avatar(bot, user_id)
+
+        results = await asyncio.gather(*(refresh(user_id) for user_id in stale))
+        stored = sum(1 for ok in results if ok)
+        logger.info(f"Avatar refresh: {len(batch)} queued, {len(stale)} stale, {stored} stored")
+        return stored
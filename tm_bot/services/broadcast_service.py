@@ -14,6 +14,7 @@ from zoneinfo import ZoneInfo
 
 from platforms.interfaces import IResponseService
 from repositories.broadcasts_repo import BroadcastsRepository
+from services.broadcast_engine import BroadcastEngine, BroadcastProgress
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -86,14 +87,35 @@ def get_all_users_from_db() -> List[int]:
     return sorted(user_ids)
 
 
+class _RepoBroadcastProgress:
+    """BroadcastProgress backed by the broadcast_recipients table."""
+
+    def __init__(self, repo: BroadcastsRepository, broadcast_id: str) -> None:
+        self._repo = repo
+        self._broadcast_id = broadcast_id
+
+    def finished_recipients(self):
+        return self._repo.get_finished_recipients(self._broadcast_id)
+
+    def record(self, results):
+        self._repo.record_recipient_results(self._broadcast_id, results)
+
+    def get_media_file_id(self):
+        return self._repo.get_media_file_id(self._broadcast_id)
+
+    def set_media_file_id(self, file_id: str) -> None:
+        self._repo.set_media_file_id(self._broadcast_id, file_id)
+
+
 async def send_broadcast(
     response_service: Optional[IResponseService],
     user_ids: List[int],
     message: str,
-    rate_limit_delay: float = 0.05,
+    rate_limit_delay: Optional[float] = None,
     bot_token: Optional[str] = None,
     media_type: Optional[str] = None,
     media_url: Optional[str] = None,
+    progress: Optional[BroadcastProgress] = None,
 ) -> Dict[str, int]:
     """
     Send a broadcast message to all users with rate limiting.
@@ -102,10 +124,12 @@ async def send_broadcast(
         response_service: Platform-agnostic response service
         user_ids: List of user IDs to send to
         message: Message text to send
-        rate_limit_delay: Delay between messages in seconds (default 0.05 = 20 msg/sec)
+        rate_limit_delay: Optional minimum delay between messages in seconds; caps the
+            engine rate at 1/rate_limit_delay (default: BROADCAST_RATE_PER_SECOND)
         bot_token: Optional bot token to use instead of the default response service
         media_type: Optional media type (currently supports "image")
         media_url: Optional media payload (public URL or data URL)
+        progress: Optional per-recipient progress store, used to resume interrupted broadcasts
         
     Returns:
         Dictionary with 'success' and 'failed' counts
@@ -113,8 +137,6 @@ async def send_broadcast(
     if response_service is None and not bot_token:
         raise ValueError("Either response_service or bot_token must be provided to send broadcasts")
 
-    success_count = 0
-    failed_count = 0
     has_image_media = media_type == "image" and bool(media_url)
     image_bytes: Optional[bytes] = None
     local_media_path: Optional[Path] = None
@@ -146,89 +168,56 @@ async def send_broadcast(
     
     logger.info(f"Starting broadcast to {len(user_ids)} users")
     
-    # If bot_token is provided, create a Bot instance to use directly
+    # If bot_token is provided, use the shared pooled Bot for that token
     bot = None
     if bot_token:
-        from telegram import Bot
+        from services.telegram_gateway import get_telegram_bot
         try:
-            bot = Bot(token=bot_token)
+            bot = get_telegram_bot(bot_token)
             logger.info(f"Using custom bot token for broadcast")
         except Exception as e:
             logger.error(f"Failed to create Bot instance with provided token: {e}")
             return {"success": 0, "failed": len(user_ids)}
-    
-    for user_id in user_ids:
-        try:
-            if bot and has_image_media:
-                if image_bytes is not None:
-                    image_file = BytesIO(image_bytes)
-                    image_file.name = "broadcast_image"
-                    await bot.send_photo(
-                        chat_id=user_id,
-                        photo=image_file,
-                        caption=message,
-                        parse_mode='Markdown'
-                    )
-                else:
-                    await bot.send_photo(
-                        chat_id=user_id,
-                        photo=media_url,
-                        caption=message,
-                        parse_mode='Markdown'
-                    )
-            elif bot:
-                # Use the custom bot token directly
-                await bot.send_message(
-                    chat_id=user_id,
-                    text=message,
-                    parse_mode='Markdown'
-                )
-            elif has_image_media:
-                if image_bytes is not None:
-                    image_file = BytesIO(image_bytes)
-                    image_file.name = "broadcast_image"
-                    await response_service.send_photo(
-                        user_id=user_id,
-                        chat_id=user_id,
-                        photo=image_file,
-                        caption=message,
-                        parse_mode='Markdown'
-                    )
-                else:
-                    await response_service.send_photo(
-                        user_id=user_id,
-                        chat_id=user_id,
-                        photo=media_url,
-                        caption=message,
-                        parse_mode='Markdown'
-                    )
-            else:
-                # Use the default response service
-                await response_service.send_text(
-                    user_id=user_id,
-                    chat_id=user_id,  # For Telegram, chat_id == user_id for private chats
-                    text=message,
-                    parse_mode='Markdown'
-                )
-            success_count += 1
-            
-            # Rate limiting: delay between messages
-            if rate_limit_delay > 0:
-                await asyncio.sleep(rate_limit_delay)
-                
-        except Exception as e:
-            failed_count += 1
-            # Log specific error types
-            error_msg = str(e)
-            if "blocked" in error_msg.lower() or "chat not found" in error_msg.lower():
-                logger.debug(f"User {user_id} blocked bot or chat not found")
-            elif "forbidden" in error_msg.lower():
-                logger.debug(f"User {user_id} forbidden")
-            else:
-                logger.warning(f"Error sending to user {user_id}: {error_msg}")
-    
-    logger.info(f"Broadcast completed: {success_count} sent, {failed_count} failed")
-    return {"success": success_count, "failed": failed_count}
+
+    def photo_source():
+        if image_bytes is None:
+            return media_url
+        image_file = BytesIO(image_bytes)
+        image_file.name = "broadcast_image"
+        return image_file
+
+    async def send(user_id: int, photo):
+        if bot and photo is not None:
+            return await bot.send_photo(chat_id=user_id, photo=photo, caption=message, parse_mode='Markdown')
+        if bot:
+            return await bot.send_message(chat_id=user_id, text=message, parse_mode='Markdown')
+        if photo is not None:
+            return await response_service.send_photo(
+                user_id=user_id,
+                chat_id=user_id,
+                photo=photo,
+                caption=message,
+                parse_mode='Markdown',
+                raise_errors=True,
+            )
+        # For Telegram, chat_id == user_id for private chats
+        return await response_service.send_text(
+            user_id=user_id,
+            chat_id=user_id,
+            text=message,
+            parse_mode='Markdown',
+            raise_errors=True,
+        )
+
+    engine = BroadcastEngine(
+        send,
+        photo_source=photo_source if has_image_media else None,
+        progress=progress,
+        rate_per_second=(1.0 / rate_limit_delay) if rate_limit_delay else None,
+    )
+    results = await engine.run(user_ids)
+    logger.info(f"Broadcast completed: {results['success']} sent, {results['failed']} failed")
+    return results
 
 
 async def execute_broadcast_from_db(
@@ -291,6 +280,7 @@ async def execute_broadcast_from_db(
             bot_token=bot_token,
             media_type=broadcast.media_type,
             media_url=broadcast.media_url,
+            progress=_RepoBroadcastProgress(broadcasts_repo, broadcast_id),
         )
         
         # Mark as completed
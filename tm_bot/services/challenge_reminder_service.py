@@ -10,7 +10,7 @@ Per-user timezone scheduling is a refinement (v1 treats reminder_local_time as U
 
 import asyncio
 import os
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from utils.logger import get_logger
 
@@ -30,6 +30,7 @@ class ChallengeReminderService:
         # In-memory dedup so a challenge isn't reminded twice within the same minute/day.
         self._sent: set[tuple[str, str, str]] = set()  # (date, challenge_id, user_id)
         self._task: asyncio.Task | None = None
+        self._scheduler = None
 
     def find_due(self, now_utc: datetime) -> list[dict]:
         """Return [{user_id, challenge_id, title, source_key}] to remind right now."""
@@ -53,15 +54,17 @@ class ChallengeReminderService:
     async def send_due(self, now_utc: datetime | None = None) -> int:
         if not self.bot_token:
             return 0
-        from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+
+        from services.telegram_gateway import get_telegram_bot
 
         now_utc = now_utc or datetime.now(timezone.utc)
         today = now_utc.strftime("%Y-%m-%d")
-        due = self.find_due(now_utc)
+        due = await asyncio.to_thread(self.find_due, now_utc)
         if not due:
             return 0
 
-        bot = Bot(token=self.bot_token)
+        bot = get_telegram_bot(self.bot_token)
         sent = 0
         for item in due:
             try:
@@ -81,22 +84,35 @@ class ChallengeReminderService:
                 logger.warning("Challenge reminder send failed for %s/%s: %s", item["challenge_id"], item["user_id"], e)
         return sent
 
-    async def start(self) -> None:
+    async def sweep(self) -> datetime:
+        """One pass: send today's due reminders; returns the next minute boundary."""
+        now = datetime.now(timezone.utc)
+        # Drop yesterday's dedup entries so today can fire.
+        today = now.strftime("%Y-%m-%d")
+        self._sent = {s for s in self._sent if s[0] == today}
+        await self.send_due(now)
+        # reminder_local_time has minute resolution: run right after each minute turns.
+        return now.replace(second=0, microsecond=0) + timedelta(minutes=1, seconds=1)
+
+    async def start(self, scheduler=None) -> None:
         if not is_challenge_reminder_enabled():
             logger.info("Challenge reminder sweeper disabled (WEBAPP_CHALLENGE_REMINDER_SWEEPER=0)")
             return
-        if self._task is not None:
+        if self._task is not None or self._scheduler is not None:
+            return
+
+        if scheduler is not None:
+            # Leader-only: the in-memory dedup is per process.
+            scheduler.register("challenge_reminders", self.sweep, interval=60)
+            self._scheduler = scheduler
+            logger.info("✓ Started challenge reminder sweeper (runs each minute)")
             return
 
         async def _loop() -> None:
             logger.info("✓ Started challenge reminder sweeper (checks every 60s)")
             while True:
                 try:
-                    now = datetime.now(timezone.utc)
-                    # Drop yesterday's dedup entries so today can fire.
-                    today = now.strftime("%Y-%m-%d")
-                    self._sent = {s for s in self._sent if s[0] == today}
-                    await self.send_due(now)
+                    await self.sweep()
                 except Exception as e:
                     logger.error("Challenge reminder sweeper error: %s", e, exc_info=True)
                 await asyncio.sleep(60)
@@ -104,6 +120,9 @@ class ChallengeReminderService:
         self._task = asyncio.create_task(_loop())
 
     async def stop(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.unregister("challenge_reminders")
+            self._scheduler = None
         if self._task:
             self._task.cancel()
             self._task = None
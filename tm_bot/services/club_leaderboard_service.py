@@ -9,8 +9,6 @@ either process without pulling webapp code into the bot.
 """
 from __future__ import annotations
 
-import base64
-import mimetypes
 import os
 from collections import defaultdict
 from datetime import date, datetime, timedelta
@@ -19,6 +17,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import text
 
 from db.postgres_db import get_db_session
+from services.avatar_service import avatar_thumbnail_data_uri
 
 DAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
@@ -375,6 +374,7 @@ def resolve_avatar_data_uris(user_ids: List[str], root_dir: Optional[str] = None
     render has no session for — that request would just 401. Read the
     files directly instead, applying the same visibility check and
     path-traversal guard as `webapp/routers/health.py::get_user_avatar`.
+    Avatars are embedded as cached 96 px thumbnails, not full-size files.
     """
     if not user_ids:
         return {}
@@ -405,12 +405,8 @@ def resolve_avatar_data_uris(user_ids: List[str], root_dir: Optional[str] = None
         if not os.path.isfile(full_path):
             continue
 
-        mime_type, _ = mimetypes.guess_type(full_path)
-        try:
-            with open(full_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode("ascii")
-        except OSError:
-            continue
-        data_uris[str(row["user_id"])] = f"data:{mime_type or 'image/jpeg'};base64,{encoded}"
+        data_uri = avatar_thumbnail_data_uri(full_path)
+        if data_uri:
+            data_uris[str(row["user_id"])] = data_uri
 
     return data_uris
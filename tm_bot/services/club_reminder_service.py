@@ -7,7 +7,13 @@ explicitly shared to that club via promise_club_shares, together with an
 inline keyboard so members can check in (Done / Not Today).
 
 When a member taps a button the planner_bot callback handler updates the
-member's status in bot_data and edits the original group message in place.
+member's status on the stored card and edits the original group message in
+place.
+
+Reminder/leaderboard dedup ("already sent today") and live card state are
+kept in Postgres (see ClubReminderStateRepository), so ticks can run on
+several bot replicas and survive restarts; bot_data["club_checkins"] is only
+a per-process cache of the card state.
 
 Privacy guarantee
 -----------------
@@ -17,20 +23,25 @@ A member's private promises are never touched.
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import random
+import socket
 import tempfile
+import time
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, time as dt_time, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-from repositories.clubs_repo import ClubsRepository
+from repositories.clubs_repo import CLUB_SCHEDULE_COLUMNS, ClubsRepository
+from repositories.club_reminder_state_repo import ClubReminderStateRepository
 from repositories.settings_repo import SettingsRepository
 from repositories.actions_repo import ActionsRepository
 from services.club_leaderboard_service import compute_club_leaderboard, resolve_avatar_data_uris
+from utils.env import env_int
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -39,6 +50,21 @@ logger = get_logger(__name__)
 # Full format: "club_checkin:{club_id}:{action}"  (action = done | skip)
 CLUB_CHECKIN_PREFIX = "club_checkin:"
 
+# Check-in cards older than this are no longer refreshed and are pruned.
+CHECKIN_CARD_TTL = timedelta(days=2)
+
+# Identifies this process in send claims.
+_CLAIM_OWNER = f"{socket.gethostname()}-{os.getpid()}"
+
+# A club whose reminder time passed less than this long ago (e.g. it was just
+# configured) is still reminded today; failed sends are retried within it.
+DUE_GRACE = timedelta(minutes=15)
+RETRY_DELAY = timedelta(minutes=5)
+
+
+# Due clubs handled at once within a tick (member queries, render, send).
+CLUB_SEND_CONCURRENCY = env_int("CLUB_SEND_CONCURRENCY", 16)
+
 _NON_LATIN_LANGUAGE_CODES = {"fa", "ar", "ur", "ps"}
 _WEEKDAYS_BY_LANGUAGE = {
     "en": ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"),
@@ -109,17 +135,25 @@ def _display_name(member: dict, language: str | None = None) -> str:
     return primary or (f"@{username}" if username else "Member")
 
 
+def _valid_timezone(tz: Optional[str]) -> Optional[str]:
+    """`tz` when it names a real zone; None for empty, DEFAULT or unknown values."""
+    tz = (tz or "").strip()
+    if not tz or tz == "DEFAULT":
+        return None
+    try:
+        ZoneInfo(tz)
+        return tz
+    except (ZoneInfoNotFoundError, Exception):
+        return None
+
+
 def _owner_timezone(owner_user_id: str) -> str:
     """Look up the club owner's timezone; fall back to UTC."""
     try:
         settings_repo = SettingsRepository()
         settings = settings_repo.get_settings(int(owner_user_id))
-        tz = getattr(settings, "timezone", None) or "UTC"
-        if tz == "DEFAULT":
-            return "UTC"
-        ZoneInfo(tz)
-        return tz
-    except (ZoneInfoNotFoundError, Exception):
+        return _valid_timezone(getattr(settings, "timezone", None)) or "UTC"
+    except Exception:
         return "UTC"
 
 
@@ -131,14 +165,32 @@ def resolve_club_timezone(club: dict) -> str:
     23:59 Asia/Tehran), else the owner's personal timezone — i.e. exactly
     today's behavior when `timezone` is unset.
     """
-    club_tz = (club.get("timezone") or "").strip()
-    if club_tz:
+    return _valid_timezone(club.get("timezone")) or _owner_timezone(str(club.get("owner_user_id") or ""))
+
+
+def resolve_club_timezones(clubs: list[dict]) -> dict[str, str]:
+    """
+    `resolve_club_timezone` for many clubs (club_id -> timezone), with a single
+    owner-settings query for all clubs without a timezone of their own.
+    Blocking; call it from a worker thread on the bot loop.
+    """
+    resolved: dict[str, str] = {}
+    owners: dict[str, str] = {}
+    for club in clubs:
+        club_tz = _valid_timezone(club.get("timezone"))
+        if club_tz:
+            resolved[str(club["club_id"])] = club_tz
+        else:
+            owners[str(club["club_id"])] = str(club.get("owner_user_id") or "")
+    if owners:
         try:
-            ZoneInfo(club_tz)
-            return club_tz
-        except ZoneInfoNotFoundError:
-            pass
-    return _owner_timezone(str(club.get("owner_user_id") or ""))
+            owner_timezones = SettingsRepository().get_timezones(owners.values())
+        except Exception as exc:
+            logger.warning("[ClubReminder] Owner timezone lookup failed, using UTC: %s", exc)
+            owner_timezones = {}
+        for club_id, owner_user_id in owners.items():
+            resolved[club_id] = _valid_timezone(owner_timezones.get(owner_user_id)) or "UTC"
+    return resolved
 
 
 def local_today_for_timezone(tz_name: str, now_utc: datetime | None = None) -> date:
@@ -153,6 +205,161 @@ def local_today_for_timezone(tz_name: str, now_utc: datetime | None = None) -> d
     return now.astimezone(tz).date()
 
 
+# ---------------------------------------------------------------------------
+# Fire-time scheduling
+# ---------------------------------------------------------------------------
+
+def _utc_iso(dt: datetime) -> str:
+    """Naive-UTC datetime -> the ISO format stored in clubs.next_*_at_utc."""
+    return dt.replace(microsecond=0).isoformat() + "Z"
+
+
+def _parse_utc_iso(value) -> Optional[datetime]:
+    """Stored UTC ISO string -> naive-UTC datetime (None when unset or invalid)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+    return parsed
+
+
+def next_fire_utc(hhmm: str, tz_name: str, after_utc: datetime) -> datetime:
+    """
+    First instant after ``after_utc`` at which the local time in ``tz_name`` is
+    ``hhmm`` (default 21:00), as a naive-UTC datetime. Computed per local day,
+    so DST changes are respected.
+    """
+    try:
+        hh, mm = map(int, str(hhmm).split(":"))
+        local_time = dt_time(hh, mm)
+    except (ValueError, TypeError):
+        local_time = dt_time(21, 0)
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = ZoneInfo("UTC")
+
+    after = after_utc.replace(tzinfo=ZoneInfo("UTC")) if after_utc.tzinfo is None else after_utc
+    local_day = after.astimezone(tz).date()
+    for offset in range(3):
+        candidate = datetime.combine(local_day + timedelta(days=offset), local_time, tzinfo=tz)
+        candidate_utc = candidate.astimezone(ZoneInfo("UTC"))
+        if candidate_utc > after:
+            return candidate_utc.replace(tzinfo=None)
+    return (after + timedelta(days=1)).astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+def club_fire_times(club: dict, tz_name: str, now_utc: datetime) -> dict[str, Optional[str]]:
+    """Next reminder / leaderboard fire times for a club (leaderboard None when not configured)."""
+    after = now_utc - DUE_GRACE
+    leaderboard_time = str(club.get("leaderboard_time") or "").strip()
+    return {
+        "reminder": _utc_iso(next_fire_utc(str(club.get("reminder_time") or "21:00"), tz_name, after)),
+        "leaderboard": _utc_iso(next_fire_utc(leaderboard_time, tz_name, after)) if leaderboard_time else None,
+    }
+
+
+def schedule_clubs(clubs: list[dict], now_utc: datetime | None = None, clubs_repo=None) -> None:
+    """Compute and store the next reminder/leaderboard fire times of ``clubs``."""
+    if not clubs:
+        return
+    now = now_utc or datetime.utcnow()
+    repo = clubs_repo or ClubsRepository()
+    by_kind: dict[str, dict[str, Optional[str]]] = {kind: {} for kind in CLUB_SCHEDULE_COLUMNS}
+    timezones = resolve_club_timezones(clubs)
+    for club in clubs:
+        fire_times = club_fire_times(club, timezones[str(club["club_id"])], now)
+        for kind, fire_at in fire_times.items():
+            by_kind[kind][str(club["club_id"])] = fire_at
+    for kind, fire_times in by_kind.items():
+        repo.set_club_fire_times(kind, fire_times)
+
+
+def refresh_club_schedule(club_id: str) -> None:
+    """Recompute one club's fire times after its reminder settings changed."""
+    repo = ClubsRepository()
+    club = repo.get_club(club_id)
+    if club:
+        schedule_clubs([club], clubs_repo=repo)
+
+
+# ---------------------------------------------------------------------------
+# Check-in card state
+# ---------------------------------------------------------------------------
+
+def _card_key(chat_id, message_id) -> tuple[int, int]:
+    return int(chat_id), int(message_id)
+
+
+def remember_checkin_card(bot_data: dict | None, chat_id, message_id, state: dict) -> None:
+    """Store a card's state durably and in the per-process bot_data cache."""
+    key = _card_key(chat_id, message_id)
+    if bot_data is not None:
+        bot_data.setdefault("club_checkins", {})[key] = state
+    try:
+        ClubReminderStateRepository().save_checkin_card(key[0], key[1], state)
+    except Exception as exc:
+        logger.warning("[ClubCheckin] Could not persist card %s: %s", key, exc)
+
+
+def load_checkin_card(bot_data: dict | None, chat_id, message_id) -> Optional[dict]:
+    """Return a card's state, preferring the durable copy (it may have been updated elsewhere)."""
+    key = _card_key(chat_id, message_id)
+    try:
+        state = ClubReminderStateRepository().get_checkin_card(*key)
+    except Exception as exc:
+        logger.debug("[ClubCheckin] Could not load card %s: %s", key, exc)
+        state = None
+    if state is None:
+        return ((bot_data or {}).get("club_checkins") or {}).get(key)
+    if bot_data is not None:
+        bot_data.setdefault("club_checkins", {})[key] = state
+    return state
+
+
+def live_checkin_cards(bot_data: dict | None, club_id: str) -> dict[tuple[int, int], dict]:
+    """Recent check-in cards of a club, keyed by (chat_id, message_id)."""
+    club_id = str(club_id)
+    cards = {
+        key: state
+        for key, state in ((bot_data or {}).get("club_checkins") or {}).items()
+        if isinstance(state, dict) and str(state.get("club_id") or "") == club_id
+    }
+    try:
+        stored = ClubReminderStateRepository().list_checkin_cards(
+            club_id, since_utc=datetime.utcnow() - CHECKIN_CARD_TTL
+        )
+    except Exception as exc:
+        logger.debug("[ClubCheckin] Could not list cards for club %s: %s", club_id, exc)
+        stored = []
+    for key, state in stored:
+        cards[key] = state
+        if bot_data is not None:
+            bot_data.setdefault("club_checkins", {})[key] = state
+    return cards
+
+
+def _prune_checkin_cards(bot_data: dict, now: datetime) -> None:
+    """Drop expired cards from the cache and the durable store."""
+    cutoff = now - CHECKIN_CARD_TTL
+    cache = bot_data.get("club_checkins") or {}
+    for key, state in list(cache.items()):
+        try:
+            sent_at = datetime.fromisoformat(str(state.get("sent_at_utc")))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        if sent_at.replace(tzinfo=None) < cutoff.replace(tzinfo=None):
+            cache.pop(key, None)
+    try:
+        ClubReminderStateRepository().delete_checkin_cards_before(cutoff)
+    except Exception as exc:
+        logger.debug("[ClubCheckin] Could not prune expired cards: %s", exc)
+
+
 # ---------------------------------------------------------------------------
 # Message building
 # ---------------------------------------------------------------------------
@@ -239,256 +446,356 @@ class ClubReminderService:
     def __init__(self) -> None:
         self.clubs_repo = ClubsRepository()
         self.actions_repo = ActionsRepository()
+        self.state_repo = ClubReminderStateRepository()
 
-    def _is_reminder_due(self, reminder_time: str, tz_name: str, now_utc: datetime) -> bool:
-        """Return True if the club's reminder falls within the current 15-min window."""
+    def _claim_due(self, kind: str, due: list[tuple[dict, str, date]]) -> set[str]:
+        """
+        Claim the day's send for every due (club, tz, local_date) in one query and
+        return the club_ids this instance won. Clubs already sent that day, or
+        being sent by another replica, are left out.
+        """
+        if not due:
+            return set()
+        return self.state_repo.claim_daily_sends(
+            kind,
+            [(str(club["club_id"]), local_date.isoformat()) for club, _, local_date in due],
+            owner=_CLAIM_OWNER,
+        )
+
+    def _finish_claim(self, kind: str, club_id: str, local_date: date, done: bool) -> None:
+        """Mark a claim sent, or release it so a later tick may retry."""
         try:
-            hh, mm = map(int, reminder_time.split(":"))
-        except (ValueError, AttributeError):
-            hh, mm = 21, 0
-
-        now_local = now_utc.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo(tz_name))
-        target_minutes = hh * 60 + mm
-        current_minutes = now_local.hour * 60 + now_local.minute
-        return target_minutes <= current_minutes < target_minutes + 15
+            if done:
+                self.state_repo.mark_daily_send_done(kind, club_id, local_date.isoformat())
+            else:
+                self.state_repo.release_daily_send(kind, club_id, local_date.isoformat())
+        except Exception as exc:
+            logger.warning("[ClubReminder] Could not update %s claim for club %s: %s", kind, club_id, exc)
+
+    @staticmethod
+    def _next_fire_after_run(
+        kind: str, club: dict, tz_name: str, fire_at: datetime, now: datetime, done: bool
+    ) -> Optional[str]:
+        """Fire time to store after a run: retry soon within the grace window, else the next day."""
+        hhmm = str(club.get("reminder_time") or "21:00") if kind == "reminder" else str(club.get("leaderboard_time") or "").strip()
+        if not hhmm:
+            return None
+        if not done and now + RETRY_DELAY <= fire_at + DUE_GRACE:
+            return _utc_iso(now + RETRY_DELAY)
+        return _utc_iso(next_fire_utc(hhmm, tz_name, max(now, fire_at)))
+
+    def schedule_unscheduled_clubs(self, now_utc: datetime | None = None) -> int:
+        """Fill in fire times for clubs that have none yet (new or just connected)."""
+        clubs = self.clubs_repo.list_unscheduled_clubs()
+        schedule_clubs(clubs, now_utc, clubs_repo=self.clubs_repo)
+        return len(clubs)
+
+    def refresh_all_schedules(self, now_utc: datetime | None = None) -> int:
+        """Recompute every club's fire times (picks up owner timezone changes)."""
+        clubs = self.clubs_repo.list_scheduled_clubs()
+        schedule_clubs(clubs, now_utc, clubs_repo=self.clubs_repo)
+        return len(clubs)
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Earliest pending reminder/leaderboard fire time (naive UTC), if any."""
+        value = self.clubs_repo.get_next_club_fire_time()
+        if value is None:
+            return None
+        return value.astimezone(ZoneInfo("UTC")).replace(tzinfo=None) if value.tzinfo else value
+
+    async def _run_due(self, kind: str, now: datetime, send_one) -> int:
+        """
+        Send ``kind`` to every club whose stored fire time has come.
 
-    async def send_due_club_reminders(self, bot, bot_data: dict, now_utc: datetime | None = None) -> None:
+        Only due clubs are loaded (indexed next_*_at_utc column). They are claimed
+        in bulk, sent concurrently (at most CLUB_SEND_CONCURRENCY at a time, so one
+        slow chat or query does not hold up the others), and rescheduled: to the
+        next day once done, or a few minutes later after a failed send inside the
+        grace window. Repository calls run in worker threads to keep the loop free.
         """
-        Called every 15 minutes. Sends a check-in reminder to each club whose
-        configured reminder_time falls within the current 15-minute window and
-        has not yet been sent today.
+        started = time.monotonic()
+        column = CLUB_SCHEDULE_COLUMNS[kind]
+        clubs = await asyncio.to_thread(self.clubs_repo.list_clubs_due, kind, _utc_iso(now))
+        if not clubs:
+            return 0
+
+        timezones = await asyncio.to_thread(resolve_club_timezones, clubs)
+        due: list[tuple[dict, str, date]] = []
+        fire_at_by_club: dict[str, datetime] = {}
+        for club in clubs:
+            club_tz = timezones[str(club["club_id"])]
+            fire_at = _parse_utc_iso(club.get(column)) or now
+            fire_at_by_club[str(club["club_id"])] = fire_at
+            # The club-local day the reminder belongs to is the day of its fire time.
+            due.append((club, club_tz, local_today_for_timezone(club_tz, fire_at)))
+
+        claimed = await asyncio.to_thread(self._claim_due, kind, due)
+        semaphore = asyncio.Semaphore(CLUB_SEND_CONCURRENCY)
 
-        State for each sent message is stored in bot_data['club_checkins']
-        under (chat_id, message_id) so the callback handler can edit it on tap.
+        async def run_one(club: dict, club_tz: str, club_local_day: date) -> tuple[str, bool]:
+            club_id = str(club["club_id"])
+            if club_id not in claimed:
+                return club_id, True  # already sent that day, or another replica is sending it
+            async with semaphore:
+                try:
+                    done = await send_one(club, club_tz, club_local_day)
+                except Exception as exc:
+                    logger.exception("[ClubReminder] %s for club %s failed: %s", kind, club_id, exc)
+                    done = False
+                await asyncio.to_thread(self._finish_claim, kind, club_id, club_local_day, done)
+            return club_id, done
+
+        results = await asyncio.gather(*(run_one(*item) for item in due))
+        done_by_club = dict(results)
+        next_fire: dict[str, Optional[str]] = {
+            str(club["club_id"]): self._next_fire_after_run(
+                kind, club, club_tz, fire_at_by_club[str(club["club_id"])], now, done_by_club[str(club["club_id"])]
+            )
+            for club, club_tz, _ in due
+        }
+        await asyncio.to_thread(self.clubs_repo.set_club_fire_times, kind, next_fire)
+
+        elapsed = time.monotonic() - started
+        sent = sum(1 for club_id, done in results if done and club_id in claimed)
+        logger.info(
+            "[ClubReminder] %s tick: %d due, %d claimed, %d sent in %.2fs",
+            kind, len(due), len(claimed), sent, elapsed,
+        )
+        if elapsed > DUE_GRACE.total_seconds():
+            logger.warning("[ClubReminder] %s tick took %.0fs, longer than the %s grace window", kind, elapsed, DUE_GRACE)
+        return sent
+
+    async def send_due_club_reminders(self, bot, bot_data: dict, now_utc: datetime | None = None) -> int:
+        """
+        Send a check-in reminder to each club whose next reminder fire time
+        (clubs.next_reminder_at_utc, the club's reminder_time in its timezone)
+        has come and that has not been reminded yet for that local day.
+
+        Due clubs are claimed in bulk in club_daily_sends before sending, so
+        several instances can run this without double-sending. State for each
+        sent message is stored in club_checkin_cards (and cached in
+        bot_data['club_checkins']) under (chat_id, message_id) so the callback
+        handler can edit it on tap. Returns the number of clubs reminded.
         """
         now = now_utc or datetime.utcnow()
-        today_str = now.strftime("%Y-%m-%d")
+        await asyncio.to_thread(_prune_checkin_cards, bot_data, now)
 
-        clubs = self.clubs_repo.get_active_clubs_with_telegram()
-        logger.info("[ClubReminder] Tick — %d club(s) with Telegram groups", len(clubs))
+        async def send_one(club: dict, club_tz: str, club_local_day: date) -> bool:
+            return await self._send_club_reminder(bot, bot_data, club, club_tz, club_local_day, now)
 
-        if "club_checkins" not in bot_data:
-            bot_data["club_checkins"] = {}
-        if "club_reminder_sent" not in bot_data:
-            bot_data["club_reminder_sent"] = {}
+        return await self._run_due("reminder", now, send_one)
 
-        for club in clubs:
-            club_id = str(club["club_id"])
-            club_name = str(club.get("name") or "Club")
-            chat_id = club.get("telegram_chat_id")
-            owner_user_id = str(club.get("owner_user_id") or "")
-            reminder_time = str(club.get("reminder_time") or "21:00")
-            language = str(club.get("language") or "en")
-
-            # Already sent today?
-            if bot_data["club_reminder_sent"].get(club_id) == today_str:
-                continue
-
-            club_tz = resolve_club_timezone(club)
-            if not self._is_reminder_due(reminder_time, club_tz, now):
-                continue
-
-            if not chat_id:
-                logger.warning("[ClubReminder] Club %s has no telegram_chat_id — skipping", club_id)
-                continue
-
-            try:
-                raw_members = self.clubs_repo.get_club_members_promises(club_id)
-            except Exception as exc:
-                logger.exception("[ClubReminder] Failed to fetch members for club %s: %s", club_id, exc)
-                continue
-
-            if not raw_members:
-                logger.info("[ClubReminder] Club %s has no active members — skipping", club_id)
-                continue
-
-            # Shared club promise text (same for all members)
-            promise_text = next(
-                (m.get("promise_text") for m in raw_members if m.get("promise_text")), None
+    def _load_reminder_members(
+        self, club_id: str, language: str, club_local_today: date
+    ) -> tuple[Optional[str], Optional[str], list[dict]]:
+        """
+        Blocking DB work for one club's card: shared promise text, the
+        promise_uuid check-ins are recorded against, and member state with
+        today's check-ins and streaks. Run in a worker thread.
+        """
+        raw_members = self.clubs_repo.get_club_members_promises(club_id)
+        if not raw_members:
+            return None, None, []
+
+        # Shared club promise text (same for all members)
+        promise_text = next(
+            (m.get("promise_text") for m in raw_members if m.get("promise_text")), None
+        )
+        # Pick the promise_uuid to record actions against
+        promise_uuid = next(
+            (m.get("promise_uuid") for m in raw_members if m.get("promise_uuid")), None
+        )
+        checked_in_today = (
+            self.actions_repo.get_today_checkins(promise_uuid, today=club_local_today)
+            if promise_uuid else set()
+        )
+
+        # Build member state with streak pre-loaded from DB
+        members = []
+        for m in raw_members:
+            uid = int(m["user_id"])
+            streak = 0
+            if promise_uuid:
+                try:
+                    streak = self.actions_repo.get_checkin_streak(
+                        uid, promise_uuid, reference_date=club_local_today
+                    )
+                except Exception:
+                    pass
+            members.append({
+                "user_id": uid,
+                "name": _display_name(m, language),
+                "promise_text": m.get("promise_text"),
+                "status": "done" if str(uid) in checked_in_today else None,
+                "streak": streak,
+            })
+        return promise_text, promise_uuid, members
+
+    async def _send_club_reminder(
+        self, bot, bot_data: dict, club: dict, club_tz: str, club_local_today: date, now: datetime
+    ) -> bool:
+        """Build and send one club's check-in card; returns True when it was sent."""
+        club_id = str(club["club_id"])
+        club_name = str(club.get("name") or "Club")
+        chat_id = club.get("telegram_chat_id")
+        language = str(club.get("language") or "en")
+
+        try:
+            promise_text, promise_uuid, members = await asyncio.to_thread(
+                self._load_reminder_members, club_id, language, club_local_today
             )
-            # Pick the promise_uuid to record actions against
-            promise_uuid = next(
-                (m.get("promise_uuid") for m in raw_members if m.get("promise_uuid")), None
+        except Exception as exc:
+            logger.exception("[ClubReminder] Failed to fetch members for club %s: %s", club_id, exc)
+            return False
+
+        if not members:
+            logger.info("[ClubReminder] Club %s has no active members — skipping", club_id)
+            return False
+
+        message = build_club_reminder_message(
+            club_name,
+            members,
+            promise_text=promise_text,
+            language=language,
+            now_utc=now,
+            timezone=club_tz,
+        )
+        if message is None:
+            logger.info("[ClubReminder] Club %s has no promise — skipping", club_id)
+            return False
+
+        keyboard = create_club_checkin_keyboard(club_id)
+
+        try:
+            sent = await bot.send_message(
+                chat_id=int(chat_id),
+                text=message,
+                parse_mode=None,
+                reply_markup=keyboard,
             )
-            club_local_today = local_today_for_timezone(club_tz, now)
-            checked_in_today = (
-                self.actions_repo.get_today_checkins(promise_uuid, today=club_local_today)
-                if promise_uuid else set()
+        except Exception as exc:
+            logger.warning(
+                "[ClubReminder] ✗ Failed to send to club %s chat %s: %s",
+                club_id, chat_id, exc,
             )
-
-            # Build member state with streak pre-loaded from DB
-            members = []
-            for m in raw_members:
-                uid = int(m["user_id"])
-                streak = 0
-                if promise_uuid:
-                    try:
-                        streak = self.actions_repo.get_checkin_streak(
-                            uid, promise_uuid, reference_date=club_local_today
-                        )
-                    except Exception:
-                        pass
-                members.append({
-                    "user_id": uid,
-                    "name": _display_name(m, language),
-                    "promise_text": m.get("promise_text"),
-                    "status": "done" if str(uid) in checked_in_today else None,
-                    "streak": streak,
-                })
-
-            message = build_club_reminder_message(
-                club_name,
-                members,
-                promise_text=promise_text,
-                language=language,
-                now_utc=now,
-                timezone=club_tz,
+            return False
+
+        await asyncio.to_thread(remember_checkin_card, bot_data, sent.chat_id, sent.message_id, {
+            "club_id": club_id,
+            "club_name": club_name,
+            "promise_text": promise_text,
+            "promise_uuid": promise_uuid,
+            "language": language,
+            "timezone": club_tz,
+            "members": members,
+            "sent_at_utc": now.isoformat(),
+        })
+        logger.info(
+            "[ClubReminder] ✓ Sent to club %s ('%s') chat %s msg %s",
+            club_id, club_name, sent.chat_id, sent.message_id,
+        )
+        try:
+            await bot.pin_chat_message(
+                chat_id=int(chat_id),
+                message_id=sent.message_id,
+                disable_notification=True,
             )
-            if message is None:
-                logger.info("[ClubReminder] Club %s has no promise — skipping", club_id)
-                continue
-
-            keyboard = create_club_checkin_keyboard(club_id)
-
-            try:
-                sent = await bot.send_message(
-                    chat_id=int(chat_id),
-                    text=message,
-                    parse_mode=None,
-                    reply_markup=keyboard,
-                )
-                state_key = (sent.chat_id, sent.message_id)
-                bot_data["club_checkins"][state_key] = {
-                    "club_id": club_id,
-                    "club_name": club_name,
-                    "promise_text": promise_text,
-                    "promise_uuid": promise_uuid,
-                    "language": language,
-                    "timezone": club_tz,
-                    "members": members,
-                    "sent_at_utc": now.isoformat(),
-                }
-                bot_data["club_reminder_sent"][club_id] = today_str
-                logger.info(
-                    "[ClubReminder] ✓ Sent to club %s ('%s') chat %s msg %s",
-                    club_id, club_name, sent.chat_id, sent.message_id,
-                )
-                try:
-                    await bot.pin_chat_message(
-                        chat_id=int(chat_id),
-                        message_id=sent.message_id,
-                        disable_notification=True,
-                    )
-                except Exception as pin_exc:
-                    logger.debug("[ClubReminder] Could not pin reminder for club %s: %s", club_id, pin_exc)
-            except Exception as exc:
-                logger.warning(
-                    "[ClubReminder] ✗ Failed to send to club %s chat %s: %s",
-                    club_id, chat_id, exc,
-                )
+        except Exception as pin_exc:
+            logger.debug("[ClubReminder] Could not pin reminder for club %s: %s", club_id, pin_exc)
+        return True
 
     async def send_due_club_leaderboards(
         self, bot, bot_data: dict, miniapp_url: str, now_utc: datetime | None = None
-    ) -> None:
+    ) -> int:
         """
-        Called every 15 minutes. Sends a rendered 7-day leaderboard image to
-        each club whose `leaderboard_time` falls within the current window.
-        Opt-in only — clubs with `leaderboard_time` unset are skipped
-        entirely, so this never sends anything for a club that hasn't
-        configured it. Leaves the plain-text check-in message untouched.
+        Send a rendered 7-day leaderboard image to each club whose next
+        leaderboard fire time has come. Opt-in only — clubs with
+        `leaderboard_time` unset have no fire time, so this never sends
+        anything for a club that hasn't configured it. Leaves the plain-text
+        check-in message untouched. Sends are claimed in club_daily_sends
+        like the check-in reminders. Returns the number of clubs sent to.
         """
         now = now_utc or datetime.utcnow()
-        today_str = now.strftime("%Y-%m-%d")
 
-        clubs = self.clubs_repo.get_active_clubs_with_telegram()
+        async def send_one(club: dict, club_tz: str, club_local_day: date) -> bool:
+            return await self._send_club_leaderboard(bot, club, club_local_day, miniapp_url)
 
-        if "club_leaderboard_sent" not in bot_data:
-            bot_data["club_leaderboard_sent"] = {}
+        return await self._run_due("leaderboard", now, send_one)
 
-        for club in clubs:
-            club_id = str(club["club_id"])
-            club_name = str(club.get("name") or "Club")
-            chat_id = club.get("telegram_chat_id")
-            leaderboard_time = str(club.get("leaderboard_time") or "").strip()
-            if not leaderboard_time:
-                continue
-
-            if bot_data["club_leaderboard_sent"].get(club_id) == today_str:
-                continue
-
-            club_tz = resolve_club_timezone(club)
-            if not self._is_reminder_due(leaderboard_time, club_tz, now):
-                continue
-
-            if not chat_id:
-                logger.warning("[ClubLeaderboard] Club %s has no telegram_chat_id — skipping", club_id)
-                continue
-
-            image_path: Optional[str] = None
-            try:
-                club_local_today = local_today_for_timezone(club_tz, now)
-                leaderboard = compute_club_leaderboard(club_id, today=club_local_today, limit=10)
-                if not leaderboard.get("members"):
-                    logger.info("[ClubLeaderboard] Club %s has no members yet — skipping image", club_id)
-                    bot_data["club_leaderboard_sent"][club_id] = today_str
-                    continue
-
-                from visualisation.club_leaderboard import render_club_leaderboard_png
-
-                # The webapp's avatar endpoint requires Telegram auth this
-                # server-side render has no session for, so resolve public
-                # avatars straight from disk into inline data URIs instead.
-                member_ids = [str(m["user_id"]) for m in leaderboard.get("members", [])]
-                avatar_data_uris = resolve_avatar_data_uris(member_ids)
-
-                image_path = os.path.join(
-                    tempfile.gettempdir(), f"club_leaderboard_{club_id}_{uuid.uuid4().hex}.png"
-                )
-                await render_club_leaderboard_png(
-                    club_name=club_name,
-                    leaderboard=leaderboard,
-                    output_path=image_path,
-                    avatar_data_uris=avatar_data_uris,
-                )
+    async def _send_club_leaderboard(self, bot, club: dict, club_local_today: date, miniapp_url: str) -> bool:
+        """Render and send one club's leaderboard; returns True when the day is done."""
+        club_id = str(club["club_id"])
+        club_name = str(club.get("name") or "Club")
+        chat_id = club.get("telegram_chat_id")
 
-                keyboard = InlineKeyboardMarkup([[
-                    InlineKeyboardButton(
-                        "See full leaderboard",
-                        # Plain url button, not web_app: Telegram restricts
-                        # InlineKeyboardButton.web_app to private chats, and
-                        # this message is posted into the group.
-                        #
-                        # /community?club=<id> opens the club's bottom sheet,
-                        # which is where the interactive leaderboard actually
-                        # lives (see webapp_frontend ClubBadge.tsx). NOT
-                        # /clubs/<id> — that's the owner-only management page
-                        # (edit/delete promise, delete club), which is both
-                        # wrong for members and alarming for non-admins.
-                        url=f"{miniapp_url.rstrip('/')}/community?club={club_id}",
-                    )
-                ]])
-                await bot.send_photo(
-                    chat_id=int(chat_id),
-                    photo=image_path,
-                    caption=f"🏆 {club_name} · leaderboard",
-                    reply_markup=keyboard,
-                )
-                bot_data["club_leaderboard_sent"][club_id] = today_str
-                logger.info(
-                    "[ClubLeaderboard] ✓ Sent to club %s ('%s') chat %s",
-                    club_id, club_name, chat_id,
-                )
-            except Exception as exc:
-                logger.warning(
-                    "[ClubLeaderboard] ✗ Failed to send to club %s chat %s: %s",
-                    club_id, chat_id, exc,
+        image_path: Optional[str] = None
+        try:
+            leaderboard = await asyncio.to_thread(
+                compute_club_leaderboard, club_id, today=club_local_today, limit=10
+            )
+            if not leaderboard.get("members"):
+                logger.info("[ClubLeaderboard] Club %s has no members yet — skipping image", club_id)
+                return True
+
+            from visualisation.club_leaderboard import render_club_leaderboard_png
+            from visualisation.render_cache import send_cached_photo
+
+            # The webapp's avatar endpoint requires Telegram auth this
+            # server-side render has no session for, so resolve public
+            # avatars straight from disk into inline data URIs instead.
+            member_ids = [str(m["user_id"]) for m in leaderboard.get("members", [])]
+            avatar_data_uris = await asyncio.to_thread(resolve_avatar_data_uris, member_ids)
+
+            image_path = os.path.join(
+                tempfile.gettempdir(), f"club_leaderboard_{club_id}_{uuid.uuid4().hex}.png"
+            )
+            await render_club_leaderboard_png(
+                club_name=club_name,
+                leaderboard=leaderboard,
+                output_path=image_path,
+                avatar_data_uris=avatar_data_uris,
+            )
+
+            keyboard = InlineKeyboardMarkup([[
+                InlineKeyboardButton(
+                    "See full leaderboard",
+                    # Plain url button, not web_app: Telegram restricts
+                    # InlineKeyboardButton.web_app to private chats, and
+                    # this message is posted into the group.
+                    #
+                    # /community?club=<id> opens the club's bottom sheet,
+                    # which is where the interactive leaderboard actually
+                    # lives (see webapp_frontend ClubBadge.tsx). NOT
+                    # /clubs/<id> — that's the owner-only management page
+                    # (edit/delete promise, delete club), which is both
+                    # wrong for members and alarming for non-admins.
+                    url=f"{miniapp_url.rstrip('/')}/community?club={club_id}",
                 )
-            finally:
-                if image_path and os.path.exists(image_path):
-                    try:
-                        os.remove(image_path)
-                    except OSError:
-                        pass
+            ]])
+            await send_cached_photo(
+                bot,
+                image_path,
+                chat_id=int(chat_id),
+                caption=f"🏆 {club_name} · leaderboard",
+                reply_markup=keyboard,
+            )
+            logger.info(
+                "[ClubLeaderboard] ✓ Sent to club %s ('%s') chat %s",
+                club_id, club_name, chat_id,
+            )
+            return True
+        except Exception as exc:
+            logger.warning(
+                "[ClubLeaderboard] ✗ Failed to send to club %s chat %s: %s",
+                club_id, chat_id, exc,
+            )
+            return False
+        finally:
+            if image_path and os.path.exists(image_path):
+                try:
+                    os.remove(image_path)
+                except OSError:
+                    pass
 
     # Keep old name as alias so any external callers don't break
     async def send_all_club_nightly_reminders(self, bot, bot_data: dict) -> None:
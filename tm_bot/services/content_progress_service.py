@@ -1,9 +1,19 @@
 """
 Content consumption progress: record events, update rollup buckets, compute progress_ratio,
 and update user_content status.
+
+Playback and reading send a stream of small segments for the same
+(user, content). With a ConsumptionCoalescer (the webapp uses the shared one
+from `get_consumption_coalescer`) segments are merged in memory and written
+behind: one transaction per (user, content) every CONTENT_PROGRESS_FLUSH_SECONDS,
+when the reading/watching session ends, and on shutdown.
 """
 import math
-from typing import Any, Dict, List, Optional
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 from db.postgres_db import utc_now_iso
 from repositories.content_repo import ContentRepository
@@ -69,11 +79,259 @@ def _progress_ratio_from_buckets(buckets: List[int]) -> float:
     return min(1.0, non_zero / len(buckets))
 
 
+def _status_for_progress(progress_ratio: float) -> str:
+    return "completed" if progress_ratio >= COMPLETED_THRESHOLD else "in_progress" if progress_ratio > 0 else "saved"
+
+
+def _segment_indices(start: float, end: float, duration_or_1: float, bucket_count: int, exclusive: bool) -> List[int]:
+    if exclusive:
+        return map_ratio_to_bucket_indices_exclusive(start, end, bucket_count)
+    return map_to_bucket_indices(start, end, duration_or_1, bucket_count)
+
+
+def _merge_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge overlapping or touching segments with the same unit and client into one event."""
+    merged: List[Dict[str, Any]] = []
+    for event in sorted(events, key=lambda e: (e["position_unit"], e.get("client") or "", e["start_position"])):
+        last = merged[-1] if merged else None
+        if (
+            last is not None
+            and last["position_unit"] == event["position_unit"]
+            and last.get("client") == event.get("client")
+            and event["start_position"] <= last["end_position"]
+        ):
+            last["end_position"] = max(last["end_position"], event["end_position"])
+            last["started_at"] = min(filter(None, [last.get("started_at"), event.get("started_at")]), default=None)
+            last["ended_at"] = max(filter(None, [last.get("ended_at"), event.get("ended_at")]), default=None)
+        else:
+            merged.append(dict(event))
+    return merged
+
+
+@dataclass
+class _PendingConsumption:
+    """Unwritten consumption of one (user, content)."""
+
+    content: Dict[str, Any]
+    buckets: List[int]  # stored buckets plus the pending increments
+    increments: Dict[int, int] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    last_position: Optional[float] = None
+    position_unit: Optional[str] = None
+    completed_at: Optional[str] = None
+    created: float = field(default_factory=time.monotonic)
+
+    def absorb(self, other: "_PendingConsumption") -> None:
+        """Fold an older, unflushed entry back in (after a failed flush)."""
+        for index, count in other.increments.items():
+            self.increments[index] = self.increments.get(index, 0) + count
+            if 0 <= index < len(self.buckets):
+                self.buckets[index] = (self.buckets[index] or 0) + count
+        self.events = other.events + self.events
+        if self.last_position is None:
+            self.last_position, self.position_unit = other.last_position, other.position_unit
+        self.completed_at = other.completed_at or self.completed_at
+        self.created = min(self.created, other.created)
+
+
+class ConsumptionCoalescer:
+    """
+    Per-(user, content) write-behind buffer for consumption segments.
+
+    The first segment of a window loads the stored rollup once; later segments
+    only update memory, so the API can still answer with the current progress.
+    A flush writes the merged segments and the summed bucket increments in one
+    transaction (ContentRepository.apply_consumption_batch), then the progress
+    fields of user_content. A failed flush is folded back into the buffer.
+    """
+
+    def __init__(self, content_repo: Optional[ContentRepository] = None, flush_seconds: float = 5.0):
+        self._repo = content_repo or ContentRepository()
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[Tuple[str, str], _PendingConsumption] = {}
+        self._lock = threading.Lock()
+        self.segments_recorded = 0
+        self.flushes = 0
+
+    def cached_content(self, user_id: str, content_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pending.get((user_id, content_id))
+            return entry.content if entry else None
+
+    def pending_buckets(self, user_id: str, content_id: str) -> Optional[List[int]]:
+        """Buckets including unflushed segments, or None when nothing is pending."""
+        with self._lock:
+            entry = self._pending.get((user_id, content_id))
+            return list(entry.buckets) if entry else None
+
+    def record(
+        self,
+        user_id: str,
+        content_id: str,
+        content: Dict[str, Any],
+        last_position: Optional[float] = None,
+        position_unit: Optional[str] = None,
+        segment: Optional[Dict[str, Any]] = None,
+        duration_or_1: float = 1.0,
+        exclusive: bool = False,
+    ) -> float:
+        """Buffer a checkpoint (position only) or a segment; returns the progress ratio so far."""
+        key = (user_id, content_id)
+        # The stored rollup is read outside the lock; the entry is then found (or
+        # created) and updated in one critical section, so a concurrent flush takes
+        # it either before or after this segment, never in between.
+        loaded: Optional[_PendingConsumption] = None
+        while True:
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is None and loaded is not None:
+                    entry = self._pending[key] = loaded
+                if entry is not None:
+                    progress_ratio = self._apply(entry, last_position, position_unit, segment, duration_or_1, exclusive)
+                    break
+            loaded = self._load(user_id, content_id, content)
+        if self.flush_seconds <= 0:
+            self.flush(user_id, content_id)
+        return progress_ratio
+
+    def _apply(
+        self,
+        entry: _PendingConsumption,
+        last_position: Optional[float],
+        position_unit: Optional[str],
+        segment: Optional[Dict[str, Any]],
+        duration_or_1: float,
+        exclusive: bool,
+    ) -> float:
+        """Add a checkpoint/segment to a buffered entry. Caller holds the lock."""
+        if last_position is not None:
+            entry.last_position, entry.position_unit = last_position, position_unit
+        if segment is not None:
+            for index in _segment_indices(
+                segment["start_position"], segment["end_position"], duration_or_1, len(entry.buckets), exclusive
+            ):
+                entry.buckets[index] = (entry.buckets[index] or 0) + 1
+                entry.increments[index] = entry.increments.get(index, 0) + 1
+            entry.events.append(segment)
+            self.segments_recorded += 1
+        progress_ratio = _progress_ratio_from_buckets(entry.buckets)
+        if segment is not None and progress_ratio >= COMPLETED_THRESHOLD and not entry.completed_at:
+            entry.completed_at = _now()
+        return progress_ratio
+
+    def _load(self, user_id: str, content_id: str, content: Dict[str, Any]) -> _PendingConsumption:
+        heatmap = self._repo.get_heatmap(user_id, content_id) or {}
+        bucket_count = int(heatmap.get("bucket_count") or DEFAULT_BUCKET_COUNT)
+        buckets = list(heatmap.get("buckets") or [])
+        if len(buckets) != bucket_count:
+            buckets = [0] * bucket_count
+        return _PendingConsumption(content=content, buckets=buckets)
+
+    def flush(self, user_id: str, content_id: str) -> bool:
+        """Write one (user, content) now (session end). Returns False if the write failed."""
+        with self._lock:
+            entry = self._pending.pop((str(user_id), str(content_id)), None)
+        return self._write((str(user_id), str(content_id)), entry) if entry else True
+
+    def flush_due(self) -> int:
+        """Write entries buffered for at least flush_seconds; returns how many were written."""
+        cutoff = time.monotonic() - self.flush_seconds
+        with self._lock:
+            due = [(key, entry) for key, entry in self._pending.items() if entry.created <= cutoff]
+            for key, _ in due:
+                del self._pending[key]
+        return sum(1 for key, entry in due if self._write(key, entry))
+
+    def flush_all(self) -> int:
+        """Write everything (shutdown)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        written = sum(1 for key, entry in pending.items() if self._write(key, entry))
+        if pending:
+            logger.info("Flushed %d/%d pending content progress entries", written, len(pending))
+        return written
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"pending": len(self._pending), "segments": self.segments_recorded, "flushes": self.flushes}
+
+    def _write(self, key: Tuple[str, str], entry: _PendingConsumption) -> bool:
+        user_id, content_id = key
+        now = _now()
+        try:
+            if entry.events or entry.increments:
+                buckets = self._repo.apply_consumption_batch(
+                    user_id, content_id, _merge_events(entry.events), entry.increments, len(entry.buckets), now
+                )
+            else:
+                self._repo.add_user_content(user_id, content_id)
+                buckets = None
+        except Exception as exc:
+            logger.warning("Content progress flush failed for %s/%s, keeping it buffered: %s", user_id, content_id, exc)
+            with self._lock:
+                current = self._pending.get(key)
+                if current is None:
+                    self._pending[key] = entry
+                else:
+                    current.absorb(entry)
+            return False
+
+        with self._lock:
+            self.flushes += 1
+        try:
+            if buckets is None:
+                self._repo.update_user_content_progress(
+                    user_id=user_id,
+                    content_id=content_id,
+                    last_position=entry.last_position,
+                    position_unit=entry.position_unit,
+                )
+            else:
+                progress_ratio = _progress_ratio_from_buckets(buckets)
+                status = "completed" if progress_ratio >= COMPLETED_THRESHOLD else "in_progress"
+                self._repo.update_user_content_progress(
+                    user_id=user_id,
+                    content_id=content_id,
+                    last_position=entry.last_position,
+                    position_unit=entry.position_unit,
+                    progress_ratio=progress_ratio,
+                    status=status,
+                    completed_at=(entry.completed_at or now) if status == "completed" else None,
+                )
+        except Exception as exc:
+            logger.warning("Content progress update failed for %s/%s: %s", user_id, content_id, exc)
+        return True
+
+
+_coalescer: Optional[ConsumptionCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_consumption_coalescer() -> Optional[ConsumptionCoalescer]:
+    """Process-wide coalescer, or None when CONTENT_PROGRESS_FLUSH_SECONDS is 0."""
+    global _coalescer
+    try:
+        flush_seconds = float(os.getenv("CONTENT_PROGRESS_FLUSH_SECONDS", "").strip() or 5)
+    except ValueError:
+        flush_seconds = 5.0
+    if flush_seconds <= 0:
+        return None
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = ConsumptionCoalescer(flush_seconds=flush_seconds)
+        return _coalescer
+
+
 class ContentProgressService:
     """Record consumption events and maintain rollup + user_content progress."""
 
-    def __init__(self, content_repo: Optional[ContentRepository] = None):
+    def __init__(
+        self,
+        content_repo: Optional[ContentRepository] = None,
+        coalescer: Optional[ConsumptionCoalescer] = None,
+    ):
         self._repo = content_repo or ContentRepository()
+        self._coalescer = coalescer
 
     def record_consumption(
         self,
@@ -89,6 +347,7 @@ class ContentProgressService:
         """
         Record a consumption segment: validate, filter short segments, insert event,
         update rollup buckets, compute progress_ratio, update user_content.
+        With a coalescer the writes are buffered (see ConsumptionCoalescer).
         Returns {progress_ratio, status, ...}.
         """
         user_id = str(user_id)
@@ -102,12 +361,18 @@ class ContentProgressService:
         if position_unit not in {"seconds", "ratio"}:
             return {"progress_ratio": 0.0, "status": "saved", "skipped": "invalid position_unit"}
 
-        content = self._repo.get_content_by_id(content_id)
+        content = self._coalescer.cached_content(user_id, content_id) if self._coalescer else None
+        content = content or self._repo.get_content_by_id(content_id)
         if not content:
             return {"progress_ratio": 0.0, "status": "saved", "skipped": "content not found"}
 
         # PDF resume checkpoints are not read coverage. They update where the
         # user left off, but never color heatmap buckets or inflate progress.
+        if is_pdf_checkpoint and self._coalescer:
+            progress_ratio = self._coalescer.record(
+                user_id, content_id, content, last_position=end_position, position_unit=position_unit
+            )
+            return {"progress_ratio": progress_ratio, "status": _status_for_progress(progress_ratio), "checkpoint": True}
         if is_pdf_checkpoint:
             self._repo.add_user_content(user_id, content_id)
             self._repo.update_user_content_progress(
@@ -119,8 +384,7 @@ class ContentProgressService:
             heatmap = self._repo.get_heatmap(user_id, content_id) if hasattr(self._repo, "get_heatmap") else None
             buckets = list((heatmap or {}).get("buckets") or [])
             progress_ratio = _progress_ratio_from_buckets(buckets)
-            status = "completed" if progress_ratio >= COMPLETED_THRESHOLD else "in_progress" if progress_ratio > 0 else "saved"
-            return {"progress_ratio": progress_ratio, "status": status, "checkpoint": True}
+            return {"progress_ratio": progress_ratio, "status": _status_for_progress(progress_ratio), "checkpoint": True}
 
         if position_unit == "seconds":
             if (end_position - start_position) < MIN_SEGMENT_SECONDS:
@@ -142,6 +406,27 @@ class ContentProgressService:
         if position_unit == "ratio":
             duration_or_1 = 1.0
 
+        if self._coalescer:
+            progress_ratio = self._coalescer.record(
+                user_id,
+                content_id,
+                content,
+                last_position=None if is_pdf_read else end_position,
+                position_unit=None if is_pdf_read else position_unit,
+                segment={
+                    "start_position": start_position,
+                    "end_position": end_position,
+                    "position_unit": position_unit,
+                    "started_at": started_at,
+                    "ended_at": ended_at,
+                    "client": client,
+                },
+                duration_or_1=duration_or_1,
+                exclusive=is_pdf_read,
+            )
+            status = "completed" if progress_ratio >= COMPLETED_THRESHOLD else "in_progress"
+            return {"progress_ratio": progress_ratio, "status": status}
+
         # Ensure user_content row exists (lazy add when first consumption)
         self._repo.add_user_content(user_id, content_id)
 
@@ -162,11 +447,7 @@ class ContentProgressService:
         buckets = list(rollup.get("buckets") or [])
         if len(buckets) != rollup.get("bucket_count", DEFAULT_BUCKET_COUNT):
             buckets = [0] * (rollup.get("bucket_count") or DEFAULT_BUCKET_COUNT)
-        indices = (
-            map_ratio_to_bucket_indices_exclusive(start_position, end_position, len(buckets))
-            if is_pdf_read
-            else map_to_bucket_indices(start_position, end_position, duration_or_1, len(buckets))
-        )
+        indices = _segment_indices(start_position, end_position, duration_or_1, len(buckets), is_pdf_read)
         for i in indices:
             if 0 <= i < len(buckets):
                 buckets[i] = (buckets[i] or 0) + 1
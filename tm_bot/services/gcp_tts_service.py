@@ -7,24 +7,42 @@ Primary path:
 Fallback path:
 - Classic Google Cloud TTS voices
 
-Output is OGG_OPUS so Telegram can deliver it as a voice note.
+Output is OGG_OPUS so Telegram can deliver it as a voice note. One
+TextToSpeechClient is shared by the process; with a `VoiceNoteCache`, audio
+for text already spoken with the same voice settings is read from disk
+instead of synthesized again.
 """
 
 from __future__ import annotations
 
 import os
+import threading
 from typing import Optional
 
 from llms.llm_env_utils import load_llm_env
+from services.voice_note_cache import VoiceNoteCache, voice_note_key
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_tts_client = None
+_tts_client_lock = threading.Lock()
+
+
+def _get_tts_client(texttospeech_module):
+    """The process-wide TextToSpeechClient (created on first use)."""
+    global _tts_client
+    with _tts_client_lock:
+        if _tts_client is None:
+            _tts_client = texttospeech_module.TextToSpeechClient()
+        return _tts_client
+
 
 class GcpTtsService:
     """Generate Telegram-friendly voice-note bytes with Google Cloud TTS."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache: Optional[VoiceNoteCache] = None) -> None:
+        self.cache = cache
         # Ensures GOOGLE_APPLICATION_CREDENTIALS is configured when using
         # base64 credentials env pattern in this codebase.
         try:
@@ -56,11 +74,39 @@ class GcpTtsService:
             return "fr-FR"
         return "en-US"
 
+    def cache_key(self, text: str, language_code: str = "en-US") -> str:
+        """Key of the voice note for `text`: covers every setting the synthesis attempts depend on."""
+        locale = self.normalize_language_code(language_code)
+        return voice_note_key(
+            text,
+            [
+                locale,
+                self.gemini_model_name,
+                self.gemini_voice_map.get(locale),
+                self.standard_voice_map.get(locale),
+                self.gemini_prompt,
+            ],
+        )
+
     def synthesize_voice_note(self, text: str, language_code: str = "en-US") -> Optional[bytes]:
-        """Synthesize OGG_OPUS bytes for Telegram voice notes."""
+        """Synthesize OGG_OPUS bytes for Telegram voice notes (served from the cache when present)."""
         if not text:
             return None
 
+        key = self.cache_key(text, language_code) if self.cache else None
+        if key:
+            cached = self.cache.get_audio(key)
+            if cached:
+                logger.debug("GCP TTS cache hit (key=%s)", key[:12])
+                return cached
+
+        audio = self._synthesize(text, language_code)
+        if audio and key:
+            self.cache.put_audio(key, audio)
+        return audio
+
+    def _synthesize(self, text: str, language_code: str) -> Optional[bytes]:
+
         try:
             from google.cloud import texttospeech
         except Exception as e:
@@ -68,7 +114,11 @@ class GcpTtsService:
             return None
 
         locale = self.normalize_language_code(language_code)
-        client = texttospeech.TextToSpeechClient()
+        try:
+            client = _get_tts_client(texttospeech)
+        except Exception as e:
+            logger.error("GCP TTS client could not be created: %s", e)
+            return None
 
         synthesis_input = self._build_input(text, texttospeech)
         audio_config = texttospeech.AudioConfig(
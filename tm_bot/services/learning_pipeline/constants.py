@@ -32,6 +32,29 @@ STAGE_PROGRESS: Dict[str, int] = {
     "done": 100,
 }
 
+# Job statuses that other requests for the same content join instead of restarting.
+IN_FLIGHT_JOB_STATUSES = ("pending", "running")
+
+# Stages that only depend on persisted segments and may run concurrently.
+PARALLEL_STAGES: List[str] = ["embed", "summarize", "concept_extract"]
+
+# Per-stage concurrency limits shared by all jobs handled by one worker.
+STAGE_CONCURRENCY: Dict[str, int] = {
+    "fetch": 2,
+    "transcribe": 1,
+    "embed": 2,
+    "summarize": 2,
+    "concept_extract": 2,
+    "quiz_generate": 2,
+}
+
+# content_artifact.artifact_type prefix used for per-stage resume checkpoints.
+CHECKPOINT_ARTIFACT_PREFIX = "checkpoint_"
+
+# Rows per multi-row INSERT when persisting segments, and chunks per embedding/upsert call.
+SEGMENT_INSERT_BATCH_SIZE = 500
+EMBED_BATCH_SIZE = 128
+
 MAX_RETRIES = 3
 RETRY_BACKOFF_SECONDS = (30, 120, 600)
 
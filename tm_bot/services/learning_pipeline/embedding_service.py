@@ -61,6 +61,7 @@ class EmbeddingService:
         chunks: Iterable[Dict[str, Any]],
         language: Optional[str] = None,
         user_id: Optional[str] = None,
+        skip_existing: bool = False,
     ) -> bool:
         chunk_list = [dict(chunk) for chunk in chunks if (chunk.get("text") or "").strip()]
         if not chunk_list:
@@ -69,17 +70,29 @@ class EmbeddingService:
             logger.warning("Qdrant is not configured (QDRANT_URL missing); skipping vector index")
             return False
 
+        client, models = self.get_qdrant_client()
+        if client is None or models is None:
+            raise VectorStoreUnavailableError("Qdrant client is unavailable")
+
+        point_ids = [_point_id(chunk.get("chunk_id"), user_id) for chunk in chunk_list]
+        if skip_existing:
+            # Chunk IDs are content-addressed, so an existing point already holds this exact text.
+            existing = self.existing_point_ids(client, point_ids)
+            if existing:
+                kept = [(chunk, pid) for chunk, pid in zip(chunk_list, point_ids) if pid not in existing]
+                if not kept:
+                    return True
+                chunk_list = [chunk for chunk, _ in kept]
+                point_ids = [pid for _, pid in kept]
+
         vectors = self.embed_texts([chunk["text"] for chunk in chunk_list])
         if not vectors:
             logger.warning("No embeddings generated; skipping vector index")
             return False
-        client, models = self.get_qdrant_client()
-        if client is None or models is None:
-            raise VectorStoreUnavailableError("Qdrant client is unavailable")
 
         self.ensure_collection(client, models, vector_size=len(vectors[0]), collection_name=self.collection_name)
         points = []
-        for chunk, vector in zip(chunk_list, vectors):
+        for chunk, point_id, vector in zip(chunk_list, point_ids, vectors):
             payload = {
                 "content_id": str(content_id),
                 "segment_id": str(chunk.get("segment_id") or ""),
@@ -95,11 +108,6 @@ class EmbeddingService:
             }
             if user_id is not None:
                 payload["user_id"] = str(user_id)
-            raw_id = str(chunk.get("chunk_id") or "")
-            try:
-                point_id = str(uuid.UUID(raw_id))
-            except ValueError:
-                point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, raw_id))
             points.append(
                 models.PointStruct(
                     id=point_id,
@@ -110,6 +118,22 @@ class EmbeddingService:
         self.upsert_points(client, points=points, collection_name=self.collection_name, wait=True)
         return True
 
+    def existing_point_ids(self, client, point_ids: List[str], collection_name: Optional[str] = None) -> set[str]:
+        if not point_ids:
+            return set()
+        try:
+            records = client.retrieve(
+                collection_name=collection_name or self.collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=False,
+            )
+        except Exception as exc:
+            # Missing collection or older client: treat everything as new.
+            logger.debug("Qdrant retrieve failed, indexing all chunks: %s", exc)
+            return set()
+        return {str(getattr(record, "id", "")) for record in records or []}
+
     def search_chunks(
         self,
         content_id: str,
@@ -280,6 +304,18 @@ class EmbeddingService:
         )
 
 
+def _point_id(chunk_id: Any, user_id: Optional[str] = None) -> str:
+    raw_id = str(chunk_id or "")
+    try:
+        base = uuid.UUID(raw_id)
+    except ValueError:
+        base = uuid.uuid5(uuid.NAMESPACE_URL, raw_id)
+    if user_id is None:
+        return str(base)
+    # Points are filtered per user, so the same chunk indexed for two users must not collide.
+    return str(uuid.uuid5(base, str(user_id)))
+
+
 def _deterministic_vector(text: str, size: int = 256) -> List[float]:
     values = [0.0] * size
     raw = (text or "").encode("utf-8")
@@ -0,0 +1,278 @@
+"""
+On-disk, content-addressed cache for raw artifacts fetched by ingestors.
+
+Blobs are stored once under their SHA-256; a small JSON index maps each cache key
+(the canonical URL unless the caller supplies a stable key) to the blob plus its
+ETag/Last-Modified validators. Fresh entries are served without any network call,
+stale ones are revalidated with a conditional GET. Total blob size is bounded and
+the least recently used blobs are evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from services.learning_pipeline.constants import DEFAULT_FETCH_TIMEOUT_SECONDS
+from services.learning_pipeline.ingestors.common import safe_get
+from utils.logger import get_logger
+from utils.url_utils import canonicalize_url
+
+logger = get_logger(__name__)
+
+DEFAULT_INGEST_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_INGEST_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class ArtifactTooLargeError(ValueError):
+    """Raised when a streamed artifact exceeds the caller's size limit."""
+
+
+@dataclass
+class CachedArtifact:
+    path: str
+    size_bytes: int
+    sha256: str
+    content_type: Optional[str] = None
+    encoding: Optional[str] = None
+    from_cache: bool = False
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as handle:
+            return handle.read()
+
+    def read_text(self) -> str:
+        return self.read_bytes().decode(self.encoding or "utf-8", errors="replace")
+
+
+class IngestCache:
+    def __init__(
+        self,
+        root_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age_seconds: Optional[int] = None,
+    ) -> None:
+        env_root = os.getenv("LEARNING_INGEST_CACHE_DIR", "").strip()
+        default_root = os.path.join(os.getenv("ROOT_DIR") or os.getcwd(), "cache", "ingest")
+        self.root_dir = root_dir or env_root or default_root
+        env_max_mb = os.getenv("LEARNING_INGEST_CACHE_MAX_MB", "").strip()
+        self.max_bytes = int(max_bytes if max_bytes is not None else (
+            int(env_max_mb) * 1024 * 1024 if env_max_mb.isdigit() else DEFAULT_INGEST_CACHE_MAX_BYTES
+        ))
+        self.max_age_seconds = int(
+            max_age_seconds if max_age_seconds is not None else DEFAULT_INGEST_CACHE_MAX_AGE_SECONDS
+        )
+        self.blobs_dir = os.path.join(self.root_dir, "blobs")
+        self.index_dir = os.path.join(self.root_dir, "index")
+        self.tmp_dir = os.path.join(self.root_dir, "tmp")
+        self._lock = threading.Lock()
+        self._dirs_ready = False
+
+    def fetch(
+        self,
+        url: str,
+        cache_key: Optional[str] = None,
+        timeout_seconds: int = DEFAULT_FETCH_TIMEOUT_SECONDS,
+        max_bytes: Optional[int] = None,
+    ) -> CachedArtifact:
+        """
+        Return the artifact at ``url``, streaming it to disk on a miss.
+
+        ``cache_key`` lets callers with short-lived signed URLs (subtitle tracks,
+        audio streams) key the entry on the stable page URL instead.
+        """
+        self._ensure_dirs()
+        key = _normalize_key(cache_key or url)
+        entry = self._load_entry(key)
+        cached = self._artifact_from_entry(entry) if entry else None
+        if cached and time.time() - float(entry.get("fetched_at") or 0) < self.max_age_seconds:
+            self._touch(cached.path)
+            return cached
+
+        headers: Dict[str, str] = {}
+        if cached:
+            if entry.get("etag"):
+                headers["If-None-Match"] = str(entry["etag"])
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = str(entry["last_modified"])
+
+        response = safe_get(url, timeout_seconds=timeout_seconds, headers=headers or None, stream=True)
+        try:
+            if response.status_code == 304 and cached:
+                entry["fetched_at"] = time.time()
+                self._save_entry(key, entry)
+                self._touch(cached.path)
+                return cached
+            response.raise_for_status()
+            artifact = self._store_stream(response, max_bytes=max_bytes)
+        finally:
+            close = getattr(response, "close", None)
+            if callable(close):
+                close()
+
+        self._save_entry(
+            key,
+            {
+                "url": url,
+                "sha256": artifact.sha256,
+                "size_bytes": artifact.size_bytes,
+                "content_type": artifact.content_type,
+                "encoding": artifact.encoding,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            },
+        )
+        self._evict(keep_path=artifact.path)
+        return artifact
+
+    def fetch_text(self, url: str, cache_key: Optional[str] = None, **kwargs: Any) -> str:
+        return self.fetch(url, cache_key=cache_key, **kwargs).read_text()
+
+    def fetch_bytes(self, url: str, cache_key: Optional[str] = None, **kwargs: Any) -> bytes:
+        return self.fetch(url, cache_key=cache_key, **kwargs).read_bytes()
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._iter_blobs())
+
+    def _ensure_dirs(self) -> None:
+        if self._dirs_ready:
+            return
+        for path in (self.blobs_dir, self.index_dir, self.tmp_dir):
+            os.makedirs(path, exist_ok=True)
+        self._dirs_ready = True
+
+    def _store_stream(self, response: Any, max_bytes: Optional[int]) -> CachedArtifact:
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_BYTES):
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ArtifactTooLargeError("Fetched artifact exceeds the maximum allowed size")
+                    digest.update(chunk)
+                    handle.write(chunk)
+            sha = digest.hexdigest()
+            blob_path = self._blob_path(sha)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(tmp_path, blob_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return CachedArtifact(
+            path=blob_path,
+            size_bytes=size,
+            sha256=sha,
+            content_type=response.headers.get("Content-Type"),
+            encoding=getattr(response, "encoding", None),
+            from_cache=False,
+        )
+
+    def _artifact_from_entry(self, entry: Dict[str, Any]) -> Optional[CachedArtifact]:
+        sha = str(entry.get("sha256") or "")
+        if not sha:
+            return None
+        path = self._blob_path(sha)
+        if not os.path.exists(path):
+            return None
+        return CachedArtifact(
+            path=path,
+            size_bytes=int(entry.get("size_bytes") or 0),
+            sha256=sha,
+            content_type=entry.get("content_type"),
+            encoding=entry.get("encoding"),
+            from_cache=True,
+        )
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.blobs_dir, sha[:2], sha)
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.index_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json")
+
+    def _load_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._index_path(key), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _save_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._index_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({**entry, "key": key}, handle)
+        os.replace(tmp_path, path)
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _iter_blobs(self):
+        if not os.path.isdir(self.blobs_dir):
+            return
+        for prefix in os.listdir(self.blobs_dir):
+            prefix_dir = os.path.join(self.blobs_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self, keep_path: Optional[str] = None) -> None:
+        with self._lock:
+            blobs = sorted(self._iter_blobs(), key=lambda item: item[2])
+            total = sum(size for _, size, _ in blobs)
+            for path, size, _ in blobs:
+                if total <= self.max_bytes:
+                    break
+                if path == keep_path:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+                logger.debug("Evicted ingest cache blob %s (%s bytes)", path, size)
+            # Index entries whose blob was evicted are treated as misses on next lookup.
+
+
+def _normalize_key(value: str) -> str:
+    raw = (value or "").strip()
+    if "#" in raw:
+        base, suffix = raw.split("#", 1)
+        return f"{canonicalize_url(base) or base}#{suffix}"
+    return canonicalize_url(raw) or raw
+
+
+_shared_cache: Optional[IngestCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_ingest_cache() -> IngestCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = IngestCache()
+    return _shared_cache
@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 from bs4 import BeautifulSoup
 
 from services.learning_pipeline.constants import DEFAULT_FETCH_TIMEOUT_SECONDS, MAX_ARTICLE_CHARS
-from services.learning_pipeline.ingestors.common import safe_get
+from services.learning_pipeline.ingest_cache import IngestCache, get_ingest_cache
 from services.learning_pipeline.security import validate_safe_http_url
 from services.learning_pipeline.types import IngestedContent, SegmentRecord
 from utils.logger import get_logger
@@ -24,14 +24,18 @@ except Exception:
 
 
 class BlogIngestor:
+    def __init__(self, cache: Optional[IngestCache] = None) -> None:
+        self._cache = cache
+
     def ingest(self, url: str, content_metadata: Optional[Dict[str, Any]] = None) -> IngestedContent:
         validate_safe_http_url(url)
         content_metadata = content_metadata or {}
         language = content_metadata.get("language")
+        cache = self._cache or get_ingest_cache()
 
         if trafilatura is not None:
             try:
-                downloaded = trafilatura.fetch_url(url)
+                downloaded = cache.fetch_text(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
                 if downloaded:
                     extracted = trafilatura.extract(
                         downloaded,
@@ -65,9 +69,7 @@ class BlogIngestor:
             except Exception as exc:
                 logger.warning("Trafilatura extraction failed: %s", exc)
 
-        response = safe_get(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
-        response.raise_for_status()
-        html = response.text[: MAX_ARTICLE_CHARS * 2]
+        html = cache.fetch_text(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)[: MAX_ARTICLE_CHARS * 2]
         soup = BeautifulSoup(html, "html.parser")
         for tag in soup(["script", "style", "noscript", "iframe"]):
             tag.decompose()
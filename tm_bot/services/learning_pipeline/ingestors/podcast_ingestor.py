@@ -16,7 +16,7 @@ from services.learning_pipeline.constants import (
     MAX_ARTICLE_CHARS,
     MAX_AUDIO_DURATION_SECONDS,
 )
-from services.learning_pipeline.ingestors.common import safe_get
+from services.learning_pipeline.ingest_cache import IngestCache, get_ingest_cache
 from services.learning_pipeline.security import validate_safe_http_url
 from services.learning_pipeline.types import IngestedContent, SegmentRecord
 from utils.logger import get_logger
@@ -30,17 +30,20 @@ except Exception:
 
 
 class PodcastIngestor:
+    def __init__(self, cache: Optional[IngestCache] = None) -> None:
+        self._cache = cache
+
     def ingest(self, url: str, content_metadata: Optional[Dict[str, Any]] = None) -> IngestedContent:
         validate_safe_http_url(url)
         content_metadata = content_metadata or {}
+        cache = self._cache or get_ingest_cache()
 
-        rss_url = _discover_rss(url)
+        rss_url = _discover_rss(url, cache)
         if rss_url and podcastparser is not None:
             try:
                 validate_safe_http_url(rss_url)
-                feed_response = safe_get(rss_url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
-                feed_response.raise_for_status()
-                feed = podcastparser.parse(rss_url, io.BytesIO(feed_response.content))
+                feed_bytes = cache.fetch_bytes(rss_url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
+                feed = podcastparser.parse(rss_url, io.BytesIO(feed_bytes))
                 episodes = feed.get("episodes") or []
                 if episodes:
                     episode = episodes[0]
@@ -66,7 +69,7 @@ class PodcastIngestor:
                             {
                                 "asset_type": "metadata_json",
                                 "storage_uri": "inline://podcast_feed",
-                                "size_bytes": len(feed_response.content),
+                                "size_bytes": len(feed_bytes),
                                 "checksum": None,
                             }
                         ],
@@ -82,9 +85,8 @@ class PodcastIngestor:
                 logger.warning("Podcast RSS ingestion failed: %s", exc)
 
         # Fallback: parse source page metadata.
-        response = safe_get(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text[: MAX_ARTICLE_CHARS * 2], "html.parser")
+        page_html = cache.fetch_text(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
+        soup = BeautifulSoup(page_html[: MAX_ARTICLE_CHARS * 2], "html.parser")
         title = soup.find("meta", property="og:title") or soup.find("title")
         description = soup.find("meta", property="og:description") or soup.find("meta", attrs={"name": "description"})
         title_text = ""
@@ -105,15 +107,14 @@ class PodcastIngestor:
         )
 
 
-def _discover_rss(url: str) -> Optional[str]:
+def _discover_rss(url: str, cache: IngestCache) -> Optional[str]:
     if re.search(r"\.(rss|xml)$", url, flags=re.IGNORECASE):
         return url
     try:
-        response = safe_get(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
-        response.raise_for_status()
+        page_html = cache.fetch_text(url, timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
     except Exception:
         return None
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(page_html, "html.parser")
     rss_link = soup.find("link", attrs={"type": "application/rss+xml"})
     if rss_link and rss_link.get("href"):
         return urljoin(url, rss_link["href"])
@@ -7,7 +7,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
 from services.learning_pipeline.constants import DEFAULT_FETCH_TIMEOUT_SECONDS
-from services.learning_pipeline.ingestors.common import parse_json3_to_segments, parse_vtt_to_segments, safe_get
+from services.learning_pipeline.ingest_cache import IngestCache, get_ingest_cache
+from services.learning_pipeline.ingestors.common import parse_json3_to_segments, parse_vtt_to_segments
 from services.learning_pipeline.security import validate_safe_http_url
 from services.learning_pipeline.types import IngestedContent, SegmentRecord
 from utils.logger import get_logger
@@ -21,6 +22,9 @@ except Exception:
 
 
 class YouTubeIngestor:
+    def __init__(self, cache: Optional[IngestCache] = None) -> None:
+        self._cache = cache
+
     def ingest(self, url: str, content_metadata: Optional[Dict[str, Any]] = None) -> IngestedContent:
         validate_safe_http_url(url)
         content_metadata = content_metadata or {}
@@ -38,10 +42,13 @@ class YouTubeIngestor:
                 subtitle_ref = _pick_subtitle_ref(video_info)
                 if subtitle_ref and subtitle_ref.get("url"):
                     validate_safe_http_url(subtitle_ref["url"])
-                    response = safe_get(subtitle_ref["url"], timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS)
-                    response.raise_for_status()
-                    subtitle_payload = response.text
                     ext = (subtitle_ref.get("ext") or "").lower()
+                    # Subtitle URLs are signed and short-lived; key the cache on the video URL instead.
+                    subtitle_payload = (self._cache or get_ingest_cache()).fetch_text(
+                        subtitle_ref["url"],
+                        cache_key=f"{url}#subtitles:{subtitle_ref.get('lang')}.{ext}",
+                        timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS,
+                    )
                     if ext in ("json3", "srv3"):
                         segments = parse_json3_to_segments(subtitle_payload)
                     else:
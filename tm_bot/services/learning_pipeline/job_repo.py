@@ -10,7 +10,8 @@ from typing import Any, Dict, Optional
 from sqlalchemy import text
 
 from db.postgres_db import get_db_session, utc_now_iso
-from services.learning_pipeline.constants import PIPELINE_VERSION, STAGE_PROGRESS
+from services.learning_pipeline.constants import IN_FLIGHT_JOB_STATUSES, PIPELINE_VERSION, STAGE_PROGRESS
+from services.learning_pipeline.learning_repo import delete_shared_analysis
 
 
 class LearningPipelineJobRepository:
@@ -21,91 +22,22 @@ class LearningPipelineJobRepository:
         force_rebuild: bool = False,
         pipeline_version: str = PIPELINE_VERSION,
     ) -> Dict[str, Any]:
+        """
+        Return the single analysis job for (content, pipeline version).
+
+        Analysis output is shared by every user who saved the content, so there is
+        one job row per content. Concurrent callers race on the unique key with
+        ``ON CONFLICT DO NOTHING`` and then lock the winning row; a job that is
+        already pending or running is joined as-is, even on ``force_rebuild``.
+        Otherwise ``force_rebuild`` clears the shared analysis in the same
+        transaction, while the row lock keeps any other caller from starting a
+        run on it until the job is requeued.
+        """
         user_id = str(user_id)
         content_id = str(content_id)
         now = utc_now_iso()
+        params = {"content_id": content_id, "pipeline_version": pipeline_version}
         with get_db_session() as session:
-            existing = session.execute(
-                text(
-                    """
-                    SELECT id, user_id, content_id, pipeline_version, status, stage, attempt_count,
-                           error_code, error_detail, created_at, started_at, finished_at, trace_id
-                    FROM content_ingest_job
-                    WHERE content_id = :content_id AND pipeline_version = :pipeline_version
-                    LIMIT 1
-                    """
-                ),
-                {"content_id": content_id, "pipeline_version": pipeline_version},
-            ).mappings().fetchone()
-            if existing and not force_rebuild:
-                if str(existing.get("status") or "").lower() == "failed":
-                    session.execute(
-                        text(
-                            """
-                            UPDATE content_ingest_job
-                            SET user_id = :user_id,
-                                status = 'pending',
-                                stage = 'queued',
-                                attempt_count = 0,
-                                error_code = NULL,
-                                error_detail = NULL,
-                                created_at = :now,
-                                started_at = NULL,
-                                finished_at = NULL,
-                                trace_id = NULL
-                            WHERE id = :job_id
-                            """
-                        ),
-                        {"job_id": existing["id"], "user_id": user_id, "now": now},
-                    )
-                    refreshed = session.execute(
-                        text(
-                            """
-                            SELECT id, user_id, content_id, pipeline_version, status, stage, attempt_count,
-                                   error_code, error_detail, created_at, started_at, finished_at, trace_id
-                            FROM content_ingest_job
-                            WHERE id = :job_id
-                            """
-                        ),
-                        {"job_id": existing["id"]},
-                    ).mappings().fetchone()
-                    return _job_to_dict(refreshed)
-                return _job_to_dict(existing)
-
-            if existing and force_rebuild:
-                session.execute(
-                    text(
-                        """
-                        UPDATE content_ingest_job
-                        SET user_id = :user_id,
-                            status = 'pending',
-                            stage = 'queued',
-                            attempt_count = 0,
-                            error_code = NULL,
-                            error_detail = NULL,
-                            created_at = :now,
-                            started_at = NULL,
-                            finished_at = NULL,
-                            trace_id = NULL
-                        WHERE id = :job_id
-                        """
-                    ),
-                    {"job_id": existing["id"], "user_id": user_id, "now": now},
-                )
-                refreshed = session.execute(
-                    text(
-                        """
-                        SELECT id, user_id, content_id, pipeline_version, status, stage, attempt_count,
-                               error_code, error_detail, created_at, started_at, finished_at, trace_id
-                        FROM content_ingest_job
-                        WHERE id = :job_id
-                        """
-                    ),
-                    {"job_id": existing["id"]},
-                ).mappings().fetchone()
-                return _job_to_dict(refreshed)
-
-            job_id = str(uuid.uuid4())
             session.execute(
                 text(
                     """
@@ -114,28 +46,53 @@ class LearningPipelineJobRepository:
                     ) VALUES (
                         :id, :user_id, :content_id, :pipeline_version, 'pending', 'queued', 0, :created_at
                     )
+                    ON CONFLICT (content_id, pipeline_version) DO NOTHING
                     """
                 ),
-                {
-                    "id": job_id,
-                    "user_id": user_id,
-                    "content_id": content_id,
-                    "pipeline_version": pipeline_version,
-                    "created_at": now,
-                },
+                {**params, "id": str(uuid.uuid4()), "user_id": user_id, "created_at": now},
             )
-            created = session.execute(
+            existing = session.execute(
                 text(
                     """
                     SELECT id, user_id, content_id, pipeline_version, status, stage, attempt_count,
                            error_code, error_detail, created_at, started_at, finished_at, trace_id
                     FROM content_ingest_job
+                    WHERE content_id = :content_id AND pipeline_version = :pipeline_version
+                    FOR UPDATE
+                    """
+                ),
+                params,
+            ).mappings().fetchone()
+            status = str(existing.get("status") or "").lower()
+            if status in IN_FLIGHT_JOB_STATUSES:
+                return _job_to_dict(existing)
+            if status != "failed" and not force_rebuild:
+                return _job_to_dict(existing)
+            if force_rebuild:
+                delete_shared_analysis(session, content_id)
+
+            refreshed = session.execute(
+                text(
+                    """
+                    UPDATE content_ingest_job
+                    SET user_id = :user_id,
+                        status = 'pending',
+                        stage = 'queued',
+                        attempt_count = 0,
+                        error_code = NULL,
+                        error_detail = NULL,
+                        created_at = :now,
+                        started_at = NULL,
+                        finished_at = NULL,
+                        trace_id = NULL
                     WHERE id = :job_id
+                    RETURNING id, user_id, content_id, pipeline_version, status, stage, attempt_count,
+                              error_code, error_detail, created_at, started_at, finished_at, trace_id
                     """
                 ),
-                {"job_id": job_id},
+                {"job_id": existing["id"], "user_id": user_id, "now": now},
             ).mappings().fetchone()
-            return _job_to_dict(created)
+            return _job_to_dict(refreshed)
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         with get_db_session() as session:
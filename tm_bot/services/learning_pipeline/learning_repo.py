@@ -5,94 +5,67 @@ Repository for learning pipeline artifacts, concepts, quizzes, and mastery.
 from __future__ import annotations
 
 import json
+import re
 import uuid
 from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import bindparam, text
+from sqlalchemy import bindparam, column, insert, table, text
 from sqlalchemy.exc import IntegrityError
 
 from db.postgres_db import get_db_session, utc_now_iso
+from services.learning_pipeline.constants import CHECKPOINT_ARTIFACT_PREFIX, SEGMENT_INSERT_BATCH_SIZE
+from services.learning_pipeline.segmenter import segment_id_for
 from services.learning_pipeline.types import SegmentRecord
 
+# Lightweight table clause so bulk inserts go through SQLAlchemy's multi-row "insertmanyvalues" path.
+_content_segment_table = table(
+    "content_segment",
+    column("id"),
+    column("content_id"),
+    column("segment_index"),
+    column("text"),
+    column("start_ms"),
+    column("end_ms"),
+    column("section_path"),
+    column("token_count"),
+    column("created_at"),
+    column("text_search_config"),
+)
 
-class LearningPipelineRepository:
-    def clear_content_learning_data(self, content_id: str) -> None:
-        content_id = str(content_id)
-        with get_db_session() as session:
-            concept_ids = session.execute(
-                text("SELECT id FROM content_concept WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            ).fetchall()
-            concept_id_values = [str(row[0]) for row in concept_ids]
+_CONCEPT_ID_NAMESPACE = uuid.UUID("5d0c6f1e-2f2b-4f5e-9a51-1c3f0b7a8e42")
+
+# Postgres text search configs for content languages; anything else uses the
+# language-agnostic "simple" config (no stemming, no stopwords).
+_TEXT_SEARCH_CONFIGS = {
+    "ar": "arabic",
+    "da": "danish",
+    "de": "german",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "hu": "hungarian",
+    "it": "italian",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "tr": "turkish",
+}
+
+
+def delete_shared_analysis(session, content_id: str) -> None:
+    """Delete the shared analysis rows of a content inside the caller's transaction."""
+    for table_name in ("content_concept_edge", "content_artifact", "content_segment", "content_asset"):
+        session.execute(
+            text(f"DELETE FROM {table_name} WHERE content_id = :content_id"),
+            {"content_id": str(content_id)},
+        )
 
-            session.execute(
-                text(
-                    """
-                    DELETE FROM quiz_attempt_answer
-                    WHERE attempt_id IN (
-                        SELECT qa.id
-                        FROM quiz_attempt qa
-                        JOIN quiz_set qs ON qs.id = qa.quiz_set_id
-                        WHERE qs.content_id = :content_id
-                    )
-                    """
-                ),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text(
-                    """
-                    DELETE FROM quiz_attempt
-                    WHERE quiz_set_id IN (SELECT id FROM quiz_set WHERE content_id = :content_id)
-                    """
-                ),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text(
-                    """
-                    DELETE FROM quiz_question
-                    WHERE quiz_set_id IN (SELECT id FROM quiz_set WHERE content_id = :content_id)
-                    """
-                ),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text("DELETE FROM quiz_set WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
-            if concept_id_values:
-                delete_mastery_stmt = text(
-                    """
-                    DELETE FROM user_concept_mastery
-                    WHERE concept_id IN :concept_ids
-                    """
-                ).bindparams(bindparam("concept_ids", expanding=True))
-                session.execute(
-                    delete_mastery_stmt,
-                    {"concept_ids": concept_id_values},
-                )
-            session.execute(
-                text("DELETE FROM content_concept_edge WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text("DELETE FROM content_concept WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text("DELETE FROM content_artifact WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text("DELETE FROM content_segment WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
-            session.execute(
-                text("DELETE FROM content_asset WHERE content_id = :content_id"),
-                {"content_id": content_id},
-            )
 
+class LearningPipelineRepository:
     def add_asset(
         self,
         content_id: str,
@@ -123,51 +96,48 @@ class LearningPipelineRepository:
             )
         return asset_id
 
-    def replace_segments(self, content_id: str, segments: Iterable[SegmentRecord]) -> List[Dict[str, Any]]:
+    def replace_segments(
+        self,
+        content_id: str,
+        segments: Iterable[SegmentRecord],
+        batch_size: int = SEGMENT_INSERT_BATCH_SIZE,
+        language: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace all segments of a content item, consuming ``segments`` lazily.
+
+        Rows are written in multi-row INSERT batches, and segment IDs are derived from
+        content, position and text so unchanged segments keep their IDs across re-runs.
+        """
         content_id = str(content_id)
         now = utc_now_iso()
+        batch_size = max(1, int(batch_size))
+        search_config = text_search_config_for(language)
         inserted: List[Dict[str, Any]] = []
         with get_db_session() as session:
             session.execute(text("DELETE FROM content_segment WHERE content_id = :content_id"), {"content_id": content_id})
+            batch: List[Dict[str, Any]] = []
             for idx, segment in enumerate(segments):
-                segment_id = str(uuid.uuid4())
                 token_count = segment.token_count
                 if token_count is None:
                     token_count = _estimate_token_count(segment.text)
-                session.execute(
-                    text(
-                        """
-                        INSERT INTO content_segment (
-                            id, content_id, segment_index, text, start_ms, end_ms, section_path, token_count, created_at
-                        ) VALUES (
-                            :id, :content_id, :segment_index, :text, :start_ms, :end_ms, :section_path, :token_count, :created_at
-                        )
-                        """
-                    ),
-                    {
-                        "id": segment_id,
-                        "content_id": content_id,
-                        "segment_index": idx,
-                        "text": segment.text,
-                        "start_ms": segment.start_ms,
-                        "end_ms": segment.end_ms,
-                        "section_path": segment.section_path,
-                        "token_count": token_count,
-                        "created_at": now,
-                    },
-                )
-                inserted.append(
-                    {
-                        "id": segment_id,
-                        "content_id": content_id,
-                        "segment_index": idx,
-                        "text": segment.text,
-                        "start_ms": segment.start_ms,
-                        "end_ms": segment.end_ms,
-                        "section_path": segment.section_path,
-                        "token_count": token_count,
-                    }
-                )
+                row = {
+                    "id": segment_id_for(content_id, idx, segment.text),
+                    "content_id": content_id,
+                    "segment_index": idx,
+                    "text": segment.text,
+                    "start_ms": segment.start_ms,
+                    "end_ms": segment.end_ms,
+                    "section_path": segment.section_path,
+                    "token_count": token_count,
+                }
+                inserted.append(row)
+                batch.append({**row, "created_at": now, "text_search_config": search_config})
+                if len(batch) >= batch_size:
+                    session.execute(insert(_content_segment_table), batch)
+                    batch = []
+            if batch:
+                session.execute(insert(_content_segment_table), batch)
         return inserted
 
     def list_segments(self, content_id: str) -> List[Dict[str, Any]]:
@@ -185,6 +155,29 @@ class LearningPipelineRepository:
             ).mappings().fetchall()
         return [dict(row) for row in rows]
 
+    def search_segments_lexical(self, content_id: str, question: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Rank a content item's segments against ``question`` using the full-text index."""
+        query = build_or_tsquery(question)
+        if not query:
+            return []
+        with get_db_session() as session:
+            rows = session.execute(
+                text(
+                    """
+                    SELECT s.id, s.segment_index, s.start_ms, s.end_ms, s.text,
+                           ts_rank(s.search_tsv, q.query, 1) AS score
+                    FROM content_segment s
+                    CROSS JOIN LATERAL to_tsquery(s.text_search_config, :query) AS q(query)
+                    WHERE s.content_id = :content_id
+                      AND s.search_tsv @@ q.query
+                    ORDER BY score DESC, s.segment_index ASC
+                    LIMIT :limit
+                    """
+                ),
+                {"content_id": str(content_id), "query": query, "limit": max(1, int(limit))},
+            ).mappings().fetchall()
+        return [dict(row) for row in rows]
+
     def add_artifact(
         self,
         content_id: str,
@@ -237,24 +230,99 @@ class LearningPipelineRepository:
             result["payload_json"] = _json_loads_safe(result.get("payload_json"), {})
         return result
 
+    def save_stage_checkpoint(self, content_id: str, stage: str, payload: Dict[str, Any]) -> str:
+        return self.add_artifact(
+            content_id=content_id,
+            artifact_type=f"{CHECKPOINT_ARTIFACT_PREFIX}{stage}",
+            artifact_format="json",
+            payload_json=payload,
+            model_name=None,
+        )
+
+    def get_stage_checkpoints(self, content_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return the latest checkpoint artifact per stage, keyed by stage name."""
+        with get_db_session() as session:
+            rows = session.execute(
+                text(
+                    """
+                    SELECT DISTINCT ON (artifact_type)
+                           id, content_id, artifact_type, payload_json, created_at
+                    FROM content_artifact
+                    WHERE content_id = :content_id
+                      AND artifact_type LIKE :prefix
+                    ORDER BY artifact_type, created_at DESC
+                    """
+                ),
+                {"content_id": str(content_id), "prefix": f"{CHECKPOINT_ARTIFACT_PREFIX}%"},
+            ).mappings().fetchall()
+        checkpoints: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            item = dict(row)
+            if not isinstance(item.get("payload_json"), dict):
+                item["payload_json"] = _json_loads_safe(item.get("payload_json"), {})
+            stage = str(item["artifact_type"])[len(CHECKPOINT_ARTIFACT_PREFIX):]
+            checkpoints[stage] = item
+        return checkpoints
+
     def replace_concepts_and_edges(
         self,
         content_id: str,
         concepts: List[Dict[str, Any]],
         edges: List[Dict[str, Any]],
     ) -> Dict[str, str]:
+        """
+        Reconcile the concept graph for a content item.
+
+        Concepts are matched by case-insensitive label and updated in place, so
+        per-user mastery and quiz questions keep pointing at them across rebuilds.
+        Concepts that disappear lose their mastery rows and quiz question links.
+        """
         content_id = str(content_id)
         now = utc_now_iso()
         concept_id_by_label: Dict[str, str] = {}
         with get_db_session() as session:
             session.execute(text("DELETE FROM content_concept_edge WHERE content_id = :content_id"), {"content_id": content_id})
-            session.execute(text("DELETE FROM content_concept WHERE content_id = :content_id"), {"content_id": content_id})
+            existing_rows = session.execute(
+                text("SELECT id, label FROM content_concept WHERE content_id = :content_id"),
+                {"content_id": content_id},
+            ).fetchall()
+            existing_by_label = {str(row[1]).strip().lower(): str(row[0]) for row in existing_rows}
             for concept in concepts:
                 label = str(concept.get("label") or "").strip()
-                if not label:
+                if not label or label.lower() in concept_id_by_label:
+                    continue
+                concept_id = existing_by_label.get(label.lower())
+                params = {
+                    "id": concept_id or concept_id_for(content_id, label),
+                    "content_id": content_id,
+                    "label": label,
+                    "concept_type": concept.get("concept_type"),
+                    "definition": concept.get("definition"),
+                    "examples_json": json.dumps(concept.get("examples") or []),
+                    "importance_weight": float(concept.get("importance_weight") or 0.0),
+                    "support_count": int(concept.get("support_count") or 0),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                concept_id_by_label[label.lower()] = params["id"]
+                if concept_id:
+                    session.execute(
+                        text(
+                            """
+                            UPDATE content_concept
+                            SET label = :label,
+                                concept_type = :concept_type,
+                                definition = :definition,
+                                examples_json = CAST(:examples_json AS jsonb),
+                                importance_weight = :importance_weight,
+                                support_count = :support_count,
+                                updated_at = :updated_at
+                            WHERE id = :id
+                            """
+                        ),
+                        params,
+                    )
                     continue
-                concept_id = str(uuid.uuid4())
-                concept_id_by_label[label.lower()] = concept_id
                 session.execute(
                     text(
                         """
@@ -267,20 +335,21 @@ class LearningPipelineRepository:
                         )
                         """
                     ),
-                    {
-                        "id": concept_id,
-                        "content_id": content_id,
-                        "label": label,
-                        "concept_type": concept.get("concept_type"),
-                        "definition": concept.get("definition"),
-                        "examples_json": json.dumps(concept.get("examples") or []),
-                        "importance_weight": float(concept.get("importance_weight") or 0.0),
-                        "support_count": int(concept.get("support_count") or 0),
-                        "created_at": now,
-                        "updated_at": now,
-                    },
+                    params,
                 )
 
+            stale_ids = sorted(set(existing_by_label.values()) - set(concept_id_by_label.values()))
+            if stale_ids:
+                for statement in (
+                    "UPDATE quiz_question SET concept_id = NULL WHERE concept_id IN :concept_ids",
+                    "DELETE FROM user_concept_mastery WHERE concept_id IN :concept_ids",
+                    "DELETE FROM content_concept WHERE id IN :concept_ids",
+                ):
+                    session.execute(
+                        text(statement).bindparams(bindparam("concept_ids", expanding=True)),
+                        {"concept_ids": stale_ids},
+                    )
+
             for edge in edges:
                 source_raw = str(edge.get("source") or "").strip().lower()
                 target_raw = str(edge.get("target") or "").strip().lower()
@@ -729,6 +798,25 @@ def _json_loads_safe(value: Any, default: Any) -> Any:
         return default
 
 
+def concept_id_for(content_id: str, label: str) -> str:
+    """Stable concept id so re-extraction of the same label keeps its identity."""
+    return str(uuid.uuid5(_CONCEPT_ID_NAMESPACE, f"{content_id}:{label.strip().lower()}"))
+
+
+def text_search_config_for(language: Optional[str]) -> str:
+    code = str(language or "").strip().lower().replace("_", "-").split("-")[0]
+    return _TEXT_SEARCH_CONFIGS.get(code, "simple")
+
+
+def build_or_tsquery(question: str) -> str:
+    """Build a to_tsquery() expression matching any question term (ranking does the rest)."""
+    terms: List[str] = []
+    for term in re.findall(r"\w{2,}", (question or "").lower()):
+        if term not in terms:
+            terms.append(term)
+    return " | ".join(f"'{term}'" for term in terms[:32])
+
+
 def _estimate_token_count(text: str) -> int:
     if not text:
         return 0
@@ -30,14 +30,16 @@ class QAService:
         if not question:
             return {"answer": "", "citations": [], "confidence": 0.0, "model_name": "none"}, False
         try:
+            # Embeddings are shared per content; over-fetch so legacy per-user copies
+            # of the same chunk can be collapsed without shrinking the result.
             hits = self.embedding_service.search_chunks(
                 content_id=content_id,
                 query=question,
-                limit=limit,
-                user_id=str(user_id),
+                limit=limit * 2,
             )
         except VectorStoreUnavailableError:
             raise
+        hits = _dedupe_hits(hits)[:limit]
         if not hits:
             hits = self._fallback_retrieval(content_id, question, limit=limit)
 
@@ -86,6 +88,27 @@ class QAService:
         }, used_fallback
 
     def _fallback_retrieval(self, content_id: str, question: str, limit: int = 8) -> List[Dict[str, Any]]:
+        limit = max(1, int(limit))
+        try:
+            rows = self.learning_repo.search_segments_lexical(content_id, question, limit=limit)
+        except Exception as exc:
+            # Full-text column missing (migration not applied) or query error: scan segments instead.
+            logger.warning("Lexical segment search failed, falling back to overlap scan: %s", exc)
+            return self._overlap_retrieval(content_id, question, limit=limit)
+        return [
+            {
+                "score": float(row.get("score") or 0.0),
+                "payload": {
+                    "segment_id": row.get("id"),
+                    "start_ms": row.get("start_ms"),
+                    "end_ms": row.get("end_ms"),
+                    "text": str(row.get("text") or ""),
+                },
+            }
+            for row in rows
+        ]
+
+    def _overlap_retrieval(self, content_id: str, question: str, limit: int = 8) -> List[Dict[str, Any]]:
         terms = set(re.findall(r"[a-zA-Z0-9_]{2,}", question.lower()))
         segments = self.learning_repo.list_segments(content_id)
         scored = []
@@ -110,6 +133,19 @@ class QAService:
         return scored[: max(1, int(limit))]
 
 
+def _dedupe_hits(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = set()
+    result = []
+    for hit in hits or []:
+        payload = hit.get("payload") or {}
+        key = (payload.get("segment_id"), payload.get("chunk_index"), payload.get("text"))
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(hit)
+    return result
+
+
 def _heuristic_answer(question: str, citations: List[Dict[str, Any]]) -> str:
     if not citations:
         return "I could not find enough grounded context to answer this question yet."
@@ -4,9 +4,10 @@ Segment normalization and chunking for embeddings/retrieval.
 
 from __future__ import annotations
 
+import hashlib
 import re
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 from services.learning_pipeline.types import SegmentRecord
 
@@ -16,72 +17,89 @@ except Exception:
     RecursiveCharacterTextSplitter = None
 
 
+# Namespace for deterministic segment/chunk IDs; re-indexing identical text yields identical IDs.
+_ID_NAMESPACE = uuid.UUID("6f1c2a4e-93b5-4d5e-8a0b-1f2d3c4b5a69")
+
+
 class Segmenter:
     def __init__(self, chunk_size: int = 1200, chunk_overlap: int = 180):
         self.chunk_size = int(chunk_size)
         self.chunk_overlap = int(chunk_overlap)
+        self._splitter = None
 
     def segment_text(self, text: str, section_path: str | None = None) -> List[SegmentRecord]:
+        return list(self.iter_segments(text, section_path=section_path))
+
+    def iter_segments(self, text: str, section_path: str | None = None) -> Iterator[SegmentRecord]:
+        """Yield segments paragraph by paragraph without materialising the whole split."""
         cleaned = (text or "").strip()
         if not cleaned:
-            return []
-        paragraphs = [p.strip() for p in re.split(r"\n{2,}", cleaned) if p.strip()]
-        if not paragraphs:
-            paragraphs = [cleaned]
-        records: List[SegmentRecord] = []
-        for paragraph in paragraphs:
+            return
+        for paragraph in _iter_paragraphs(cleaned):
             for part in _split_long_block(paragraph, self.chunk_size):
-                records.append(SegmentRecord(text=part, section_path=section_path, token_count=_estimate_tokens(part)))
-        return records
-
-    def build_chunks(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        if not segments:
-            return []
-        chunks: List[Dict[str, Any]] = []
-        if RecursiveCharacterTextSplitter:
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap,
-                separators=["\n\n", "\n", ". ", " ", ""],
-            )
-            for segment in segments:
-                segment_text = (segment.get("text") or "").strip()
-                if not segment_text:
-                    continue
-                split_items = splitter.split_text(segment_text)
-                for idx, chunk_text in enumerate(split_items):
-                    chunks.append(
-                        {
-                            "chunk_id": str(uuid.uuid4()),
-                            "segment_id": segment.get("id"),
-                            "segment_index": segment.get("segment_index"),
-                            "chunk_index": idx,
-                            "text": chunk_text,
-                            "start_ms": segment.get("start_ms"),
-                            "end_ms": segment.get("end_ms"),
-                            "section_path": segment.get("section_path"),
-                        }
-                    )
-            return chunks
+                yield SegmentRecord(text=part, section_path=section_path, token_count=_estimate_tokens(part))
+
+    def build_chunks(self, segments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return list(self.iter_chunks(segments))
 
+    def iter_chunks(self, segments: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        split = self._split_segment_text
         for segment in segments:
             segment_text = (segment.get("text") or "").strip()
             if not segment_text:
                 continue
-            for idx, chunk_text in enumerate(_split_long_block(segment_text, self.chunk_size)):
-                chunks.append(
-                    {
-                        "chunk_id": str(uuid.uuid4()),
-                        "segment_id": segment.get("id"),
-                        "segment_index": segment.get("segment_index"),
-                        "chunk_index": idx,
-                        "text": chunk_text,
-                        "start_ms": segment.get("start_ms"),
-                        "end_ms": segment.get("end_ms"),
-                        "section_path": segment.get("section_path"),
-                    }
-                )
-        return chunks
+            scope = str(segment.get("id") or f"{segment.get('content_id')}:{segment.get('segment_index')}")
+            search_from = 0
+            for idx, chunk_text in enumerate(split(segment_text)):
+                found = segment_text.find(chunk_text, search_from)
+                offset = found if found >= 0 else idx
+                if found >= 0:
+                    search_from = found + 1
+                yield {
+                    "chunk_id": chunk_id_for(scope, offset, chunk_text),
+                    "segment_id": segment.get("id"),
+                    "segment_index": segment.get("segment_index"),
+                    "chunk_index": idx,
+                    "text": chunk_text,
+                    "start_ms": segment.get("start_ms"),
+                    "end_ms": segment.get("end_ms"),
+                    "section_path": segment.get("section_path"),
+                }
+
+    def _split_segment_text(self, text: str) -> List[str]:
+        if RecursiveCharacterTextSplitter is None:
+            return _split_long_block(text, self.chunk_size)
+        if self._splitter is None:
+            self._splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                separators=["\n\n", "\n", ". ", " ", ""],
+            )
+        return self._splitter.split_text(text)
+
+
+def segment_id_for(content_id: str, segment_index: int, text: str) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, f"segment:{content_id}:{int(segment_index)}:{_text_digest(text)}"))
+
+
+def chunk_id_for(scope: str, offset: int, text: str) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, f"chunk:{scope}:{int(offset)}:{_text_digest(text)}"))
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+def _iter_paragraphs(text: str) -> Iterator[str]:
+    start = 0
+    for match in re.finditer(r"\n{2,}", text):
+        paragraph = text[start:match.start()].strip()
+        if paragraph:
+            yield paragraph
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        yield tail
 
 
 def _split_long_block(text: str, max_chars: int) -> List[str]:
@@ -33,8 +33,9 @@ class LearningPipelineService:
         if not content:
             raise ValueError("Content not found")
         self._assert_user_has_content(user_id=user_id, content_id=content_id)
-        if force_rebuild:
-            self.learning_repo.clear_content_learning_data(content_id)
+        # Analysis is shared by everyone who saved this content: a force rebuild joins a
+        # job already in flight, and otherwise clears the shared analysis under the job
+        # row lock, so it never wipes the inputs of a run in progress.
         job = self.job_repo.create_or_reuse_job(
             user_id=str(user_id),
             content_id=content_id,
@@ -10,7 +10,12 @@ from services.learning_pipeline.constants import (
     DEFAULT_FETCH_TIMEOUT_SECONDS,
     MAX_AUDIO_DURATION_SECONDS,
 )
-from services.learning_pipeline.ingestors.common import safe_get
+from services.learning_pipeline.ingest_cache import (
+    ArtifactTooLargeError,
+    CachedArtifact,
+    IngestCache,
+    get_ingest_cache,
+)
 from services.learning_pipeline.security import validate_safe_http_url
 from services.learning_pipeline.types import SegmentRecord
 from utils.logger import get_logger
@@ -21,19 +26,25 @@ MAX_AUDIO_DOWNLOAD_BYTES = 30 * 1024 * 1024
 
 
 class TranscriptionService:
+    def __init__(self, cache: Optional[IngestCache] = None) -> None:
+        self._cache = cache
+
     def transcribe_audio_url(
         self,
         audio_url: str,
         language_code: str = "en-US",
         duration_seconds: Optional[float] = None,
+        cache_key: Optional[str] = None,
     ) -> List[SegmentRecord]:
         validate_safe_http_url(audio_url)
         if duration_seconds and duration_seconds > MAX_AUDIO_DURATION_SECONDS:
             raise ValueError("Audio duration exceeds maximum supported duration")
 
-        audio_bytes = _download_audio(audio_url)
-        if not audio_bytes:
+        audio_file = self._download_audio(audio_url, cache_key=cache_key)
+        if not audio_file.size_bytes:
             return []
+        # The file is streamed to disk; it is only loaded for the inline recognize call.
+        audio_bytes = audio_file.read_bytes()
         try:
             from google.cloud import speech
         except Exception as exc:
@@ -74,21 +85,16 @@ class TranscriptionService:
         return segments
 
 
-def _download_audio(audio_url: str) -> bytes:
-    response = safe_get(
-        audio_url,
-        timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS,
-        stream=True,
-    )
-    response.raise_for_status()
-    content = bytearray()
-    for chunk in response.iter_content(chunk_size=8192):
-        if not chunk:
-            continue
-        content.extend(chunk)
-        if len(content) > MAX_AUDIO_DOWNLOAD_BYTES:
-            raise ValueError("Audio file is too large for inline transcription")
-    return bytes(content)
+    def _download_audio(self, audio_url: str, cache_key: Optional[str] = None) -> CachedArtifact:
+        try:
+            return (self._cache or get_ingest_cache()).fetch(
+                audio_url,
+                cache_key=cache_key,
+                timeout_seconds=DEFAULT_FETCH_TIMEOUT_SECONDS,
+                max_bytes=MAX_AUDIO_DOWNLOAD_BYTES,
+            )
+        except ArtifactTooLargeError as exc:
+            raise ValueError("Audio file is too large for inline transcription") from exc
 
 
 def _duration_to_ms(duration_obj) -> Optional[int]:
@@ -9,11 +9,19 @@ import os
 import socket
 import traceback
 import uuid
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from repositories.content_repo import ContentRepository
 from services.learning_pipeline.analysis_service import AnalysisService
-from services.learning_pipeline.constants import MAX_RETRIES, RETRY_BACKOFF_SECONDS
+from services.learning_pipeline.constants import (
+    EMBED_BATCH_SIZE,
+    MAX_RETRIES,
+    PARALLEL_STAGES,
+    PIPELINE_VERSION,
+    RETRY_BACKOFF_SECONDS,
+    STAGE_CONCURRENCY,
+)
 from services.learning_pipeline.embedding_service import EmbeddingService
 from services.learning_pipeline.ingestors import BlogIngestor, PodcastIngestor, YouTubeIngestor
 from services.learning_pipeline.job_repo import LearningPipelineJobRepository
@@ -22,7 +30,6 @@ from services.learning_pipeline.quiz_service import QuizService
 from services.learning_pipeline.security import validate_safe_http_url
 from services.learning_pipeline.segmenter import Segmenter
 from services.learning_pipeline.transcription_service import TranscriptionService
-from services.learning_pipeline.types import SegmentRecord
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,10 +42,10 @@ class LearningPipelineWorker:
         self.worker_id = f"{socket.gethostname()}-{uuid.uuid4()}"
         self._stop_event = asyncio.Event()
         self._dispatcher_task: Optional[asyncio.Task] = None
+        self._scheduler: Any = None
         self._running_tasks: set[asyncio.Task] = set()
         self._max_concurrent_jobs = 4
-        self._ingest_semaphore = asyncio.Semaphore(2)
-        self._analysis_semaphore = asyncio.Semaphore(2)
+        self._stage_semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in STAGE_CONCURRENCY.items()}
 
         self.job_repo = LearningPipelineJobRepository()
         self.learning_repo = LearningPipelineRepository()
@@ -52,13 +59,22 @@ class LearningPipelineWorker:
         self.analysis_service = AnalysisService()
         self.quiz_service = QuizService(self.learning_repo)
 
-    async def start(self) -> None:
+    async def start(self, scheduler: Any = None) -> None:
+        """Start dispatching; with a ``SweepScheduler`` the dispatch pass runs as one of its sweepers."""
         if not self.enabled:
             logger.info("Learning pipeline worker is disabled (CONTENT_LEARNING_PIPELINE_ENABLED=false)")
             return
         if self._dispatcher_task and not self._dispatcher_task.done():
             return
         self._stop_event.clear()
+        if scheduler is not None:
+            # Claims are atomic per job, so every replica dispatches (not leader-only).
+            scheduler.register(
+                "learning_pipeline", self._dispatch_once, interval=self.poll_interval_seconds, leader_only=False
+            )
+            self._scheduler = scheduler
+            logger.info("Learning pipeline worker started with worker_id=%s", self.worker_id)
+            return
         self._dispatcher_task = asyncio.create_task(self._dispatch_loop(), name="learning-pipeline-dispatcher")
         logger.info("Learning pipeline worker started with worker_id=%s", self.worker_id)
 
@@ -66,6 +82,9 @@ class LearningPipelineWorker:
         if not self.enabled:
             return
         self._stop_event.set()
+        if self._scheduler is not None:
+            self._scheduler.unregister("learning_pipeline")
+            self._scheduler = None
         if self._dispatcher_task:
             self._dispatcher_task.cancel()
             try:
@@ -76,7 +95,7 @@ class LearningPipelineWorker:
             for task in list(self._running_tasks):
                 task.cancel()
             await asyncio.gather(*self._running_tasks, return_exceptions=True)
-        released = self.job_repo.release_worker_jobs(self.worker_id)
+        released = await asyncio.to_thread(self.job_repo.release_worker_jobs, self.worker_id)
         logger.info("Learning pipeline worker stopped; released_jobs=%s", released)
 
     async def _dispatch_loop(self) -> None:
@@ -91,7 +110,7 @@ class LearningPipelineWorker:
 
     async def _dispatch_once(self) -> None:
         while len(self._running_tasks) < self._max_concurrent_jobs:
-            job = self.job_repo.claim_next_pending(self.worker_id)
+            job = await asyncio.to_thread(self.job_repo.claim_next_pending, self.worker_id)
             if not job:
                 break
             task = asyncio.create_task(self._process_job(job), name=f"learning-job-{job['id']}")
@@ -127,6 +146,58 @@ class LearningPipelineWorker:
                 await asyncio.sleep(RETRY_BACKOFF_SECONDS[min(attempt - 1, len(RETRY_BACKOFF_SECONDS) - 1)])
 
     async def _run_pipeline(self, job_id: str, content_id: str, user_id: str) -> None:
+        checkpoints = self.learning_repo.get_stage_checkpoints(content_id)
+        segment_checkpoint = checkpoints.get("segment")
+        inserted_segments: list[Dict[str, Any]] = []
+        if _is_current_checkpoint(segment_checkpoint):
+            inserted_segments = self.learning_repo.list_segments(content_id)
+        if inserted_segments:
+            logger.info("Resuming learning pipeline from segment checkpoint (job_id=%s, content_id=%s)", job_id, content_id)
+            segment_checkpoint_id = str(segment_checkpoint["id"])
+            segment_meta = dict(segment_checkpoint.get("payload_json") or {})
+        else:
+            inserted_segments, segment_meta = await self._run_ingest_stages(job_id, content_id)
+            segment_checkpoint_id = self.learning_repo.save_stage_checkpoint(
+                content_id,
+                "segment",
+                {"pipeline_version": PIPELINE_VERSION, **segment_meta},
+            )
+            # Fresh segments invalidate everything derived from the previous ones.
+            checkpoints = {}
+
+        completed = {
+            stage
+            for stage in PARALLEL_STAGES
+            if _is_current_checkpoint(checkpoints.get(stage), segment_checkpoint_id)
+        }
+        pending = [stage for stage in PARALLEL_STAGES if stage not in completed]
+        if pending:
+            self.job_repo.set_stage(job_id, _parallel_stage_label(completed))
+            runners = {
+                "embed": self._stage_embed,
+                "summarize": self._stage_summarize,
+                "concept_extract": self._stage_concept_extract,
+            }
+
+            async def _run_stage(stage: str) -> None:
+                result = await runners[stage](job_id, content_id, user_id, inserted_segments, segment_meta)
+                self._save_checkpoint(content_id, stage, segment_checkpoint_id, result)
+                completed.add(stage)
+                self.job_repo.set_stage(job_id, _parallel_stage_label(completed))
+
+            results = await asyncio.gather(*(_run_stage(stage) for stage in pending), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                # Stages that succeeded are already checkpointed; the retry only reruns the failed ones.
+                raise errors[0]
+
+        if not _is_current_checkpoint(checkpoints.get("quiz_generate"), segment_checkpoint_id):
+            self.job_repo.set_stage(job_id, "quiz_generate")
+            result = await self._stage_quiz_generate(job_id, content_id)
+            self._save_checkpoint(content_id, "quiz_generate", segment_checkpoint_id, result)
+        self.job_repo.set_stage(job_id, "done")
+
+    async def _run_ingest_stages(self, job_id: str, content_id: str) -> tuple[list[Dict[str, Any]], Dict[str, Any]]:
         self.job_repo.set_stage(job_id, "resolve")
         content = self.content_repo.get_content_by_id(content_id)
         if not content:
@@ -137,7 +208,7 @@ class LearningPipelineWorker:
         validate_safe_http_url(source_url)
 
         self.job_repo.set_stage(job_id, "fetch")
-        async with self._ingest_semaphore:
+        async with self._stage_semaphores["fetch"]:
             ingested = await asyncio.to_thread(self._ingest_content, content)
         for asset in ingested.assets:
             self.learning_repo.add_asset(
@@ -151,13 +222,14 @@ class LearningPipelineWorker:
         segments = list(ingested.segments or [])
         if ingested.needs_transcription:
             self.job_repo.set_stage(job_id, "transcribe")
-            async with self._ingest_semaphore:
+            async with self._stage_semaphores["transcribe"]:
                 try:
                     transcribed = await asyncio.to_thread(
                         self.transcription_service.transcribe_audio_url,
                         ingested.audio_url or source_url,
                         "en-US",
                         content.get("duration_seconds"),
+                        cache_key=f"{content.get('canonical_url') or source_url}#audio",
                     )
                 except Exception as exc:
                     logger.warning("Transcription failed for content_id=%s: %s", content_id, exc)
@@ -165,35 +237,65 @@ class LearningPipelineWorker:
             if transcribed:
                 segments = transcribed
 
-        if not segments and ingested.text:
+        if segments:
             self.job_repo.set_stage(job_id, "segment")
-            segments = self.segmenter.segment_text(ingested.text, section_path="content")
-        elif segments:
+            inserted_segments = self.learning_repo.replace_segments(content_id, segments, language=ingested.language)
+        elif ingested.text:
             self.job_repo.set_stage(job_id, "segment")
+            inserted_segments = self.learning_repo.replace_segments(
+                content_id,
+                self.segmenter.iter_segments(ingested.text, section_path="content"),
+                language=ingested.language,
+            )
+        else:
+            inserted_segments = []
 
-        if not segments:
+        if not inserted_segments:
             raise ValueError("No content segments available after ingestion/transcription")
+        segment_meta = {
+            "source_type": ingested.source_type,
+            "language": ingested.language,
+            "segment_count": len(inserted_segments),
+        }
+        return inserted_segments, segment_meta
 
-        inserted_segments = self.learning_repo.replace_segments(content_id, segments)
+    async def _stage_embed(
+        self,
+        job_id: str,
+        content_id: str,
+        user_id: str,
+        segments: list[Dict[str, Any]],
+        segment_meta: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        chunk_count = 0
+        indexed = False
+        for batch in _batched(self.segmenter.iter_chunks(segments), EMBED_BATCH_SIZE):
+            for chunk in batch:
+                chunk["source_type"] = segment_meta.get("source_type")
+            chunk_count += len(batch)
+            async with self._stage_semaphores["embed"]:
+                indexed = await asyncio.to_thread(
+                    self.embedding_service.index_chunks,
+                    content_id,
+                    batch,
+                    segment_meta.get("language"),
+                    None,
+                    True,
+                ) or indexed
+        return {"chunk_count": chunk_count, "indexed": bool(indexed)}
 
-        self.job_repo.set_stage(job_id, "embed")
-        chunks = self.segmenter.build_chunks(inserted_segments)
-        for chunk in chunks:
-            chunk["source_type"] = ingested.source_type
-        async with self._analysis_semaphore:
-            await asyncio.to_thread(
-                self.embedding_service.index_chunks,
-                content_id,
-                chunks,
-                ingested.language,
-                user_id,
-            )
-
-        self.job_repo.set_stage(job_id, "summarize")
-        async with self._analysis_semaphore:
+    async def _stage_summarize(
+        self,
+        job_id: str,
+        content_id: str,
+        user_id: str,
+        segments: list[Dict[str, Any]],
+        segment_meta: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        async with self._stage_semaphores["summarize"]:
             summaries, summary_fallback_used, summary_model = await asyncio.to_thread(
                 self.analysis_service.generate_summaries,
-                inserted_segments,
+                segments,
             )
         for artifact_type, payload in summaries.items():
             self.learning_repo.add_artifact(
@@ -205,12 +307,20 @@ class LearningPipelineWorker:
             )
         if summary_fallback_used:
             self.job_repo.mark_gemini_fallback_used(job_id)
+        return {"model_name": summary_model, "artifact_types": sorted(summaries.keys())}
 
-        self.job_repo.set_stage(job_id, "concept_extract")
-        async with self._analysis_semaphore:
+    async def _stage_concept_extract(
+        self,
+        job_id: str,
+        content_id: str,
+        user_id: str,
+        segments: list[Dict[str, Any]],
+        segment_meta: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        async with self._stage_semaphores["concept_extract"]:
             concept_payload, concept_fallback_used, concept_model = await asyncio.to_thread(
                 self.analysis_service.extract_concepts,
-                inserted_segments,
+                segments,
             )
         concepts = concept_payload.get("concepts") or []
         edges = concept_payload.get("edges") or []
@@ -224,9 +334,10 @@ class LearningPipelineWorker:
         )
         if concept_fallback_used:
             self.job_repo.mark_gemini_fallback_used(job_id)
+        return {"model_name": concept_model, "concept_count": len(concepts), "edge_count": len(edges)}
 
-        self.job_repo.set_stage(job_id, "quiz_generate")
-        async with self._analysis_semaphore:
+    async def _stage_quiz_generate(self, job_id: str, content_id: str) -> Dict[str, Any]:
+        async with self._stage_semaphores["quiz_generate"]:
             quiz_payload, quiz_fallback_used = await asyncio.to_thread(
                 self.quiz_service.create_quiz,
                 content_id,
@@ -242,7 +353,24 @@ class LearningPipelineWorker:
         )
         if quiz_fallback_used:
             self.job_repo.mark_gemini_fallback_used(job_id)
-        self.job_repo.set_stage(job_id, "done")
+        return {"quiz_set_id": quiz_payload.get("quiz_set_id")}
+
+    def _save_checkpoint(
+        self,
+        content_id: str,
+        stage: str,
+        segment_checkpoint_id: str,
+        result: Optional[Dict[str, Any]],
+    ) -> None:
+        self.learning_repo.save_stage_checkpoint(
+            content_id,
+            stage,
+            {
+                "pipeline_version": PIPELINE_VERSION,
+                "segment_checkpoint_id": segment_checkpoint_id,
+                **(result or {}),
+            },
+        )
 
     def _ingest_content(self, content: Dict[str, Any]):
         provider = str(content.get("provider") or "").lower()
@@ -253,3 +381,31 @@ class LearningPipelineWorker:
         if provider in ("podcast",) or content_type == "audio":
             return self.podcast_ingestor.ingest(source_url, content)
         return self.blog_ingestor.ingest(source_url, content)
+
+
+def _is_current_checkpoint(checkpoint: Optional[Dict[str, Any]], segment_checkpoint_id: Optional[str] = None) -> bool:
+    if not checkpoint:
+        return False
+    payload = checkpoint.get("payload_json") or {}
+    if payload.get("pipeline_version") != PIPELINE_VERSION:
+        return False
+    if segment_checkpoint_id is not None and str(payload.get("segment_checkpoint_id") or "") != segment_checkpoint_id:
+        return False
+    return True
+
+
+def _parallel_stage_label(completed: set[str]) -> str:
+    """Report the earliest unfinished parallel stage so progress never jumps backwards."""
+    for stage in PARALLEL_STAGES:
+        if stage not in completed:
+            return stage
+    return "quiz_generate"
+
+
+def _batched(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
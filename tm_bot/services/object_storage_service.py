@@ -1,9 +1,16 @@
 """
 S3-compatible object storage service for storing immutable PDF binaries.
+
+Signed GET URLs are cached per object and reused while they have at least a
+quarter of their lifetime left, so repeat opens hand the browser the same URL
+and its HTTP cache can answer (or revalidate with 304) instead of downloading
+the object again.
 """
 from __future__ import annotations
 
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
@@ -11,6 +18,8 @@ from typing import Optional, Tuple
 import boto3
 from botocore.client import Config
 
+SIGNED_URL_CACHE_MAX_ENTRIES = 5000
+
 
 class ObjectStorageService:
     def __init__(self) -> None:
@@ -21,6 +30,8 @@ class ObjectStorageService:
         self.secret_key = (os.getenv("OBJECT_STORAGE_SECRET_ACCESS_KEY") or "").strip()
         self.presign_ttl = int(os.getenv("OBJECT_STORAGE_SIGNED_URL_TTL_SECONDS") or "600")
         self.local_dir = self._default_local_dir()
+        self._signed_urls: "OrderedDict[Tuple[str, int], Tuple[str, datetime]]" = OrderedDict()
+        self._signed_urls_lock = threading.Lock()
 
         self._client = None
         if self.mode == "s3":
@@ -64,6 +75,8 @@ class ObjectStorageService:
                 Key=normalized_key,
                 Body=payload,
                 ContentType="application/pdf",
+                # Keys are unique per upload, so the bytes behind a key never change.
+                CacheControl="private, max-age=31536000, immutable",
             )
             return f"s3://{self.bucket}/{normalized_key}", len(payload)
 
@@ -82,13 +95,26 @@ class ObjectStorageService:
         client = self._require_client()
         bucket, key = self._parse_storage_uri(storage_uri)
         ttl = int(expires_in or self.presign_ttl)
+        now = datetime.now(timezone.utc)
+        cache_key = (storage_uri, ttl)
+        with self._signed_urls_lock:
+            cached = self._signed_urls.get(cache_key)
+            if cached and cached[1] - now >= timedelta(seconds=ttl / 4):
+                self._signed_urls.move_to_end(cache_key)
+                return cached[0], cached[1].isoformat()
+
         url = client.generate_presigned_url(
             ClientMethod="get_object",
             Params={"Bucket": bucket, "Key": key},
             ExpiresIn=ttl,
         )
-        expires_at = (datetime.now(timezone.utc) + timedelta(seconds=ttl)).isoformat()
-        return url, expires_at
+        expires = now + timedelta(seconds=ttl)
+        with self._signed_urls_lock:
+            self._signed_urls[cache_key] = (url, expires)
+            self._signed_urls.move_to_end(cache_key)
+            while len(self._signed_urls) > SIGNED_URL_CACHE_MAX_ENTRIES:
+                self._signed_urls.popitem(last=False)
+        return url, expires.isoformat()
 
     def build_local_file_url(self, content_id: str, asset_id: str) -> str:
         return f"/api/content/{content_id}/pdf/file?asset_id={asset_id}"
@@ -1,15 +1,34 @@
 """
 Service for executing read-only SQL queries with security validation.
+
+Validated queries run in a READ ONLY transaction on the read-only engine (a
+replica when one is configured for the environment, with its own small pool either way)
+under a per-query statement_timeout. Before execution the planner's estimated
+cost is checked with EXPLAIN, and queries above the budget are rejected without
+being run. Rows are read through a server-side cursor, at most MAX_RESULT_ROWS.
 """
+import json
 import re
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 
-from db.postgres_db import get_db_session
+from db.postgres_db import get_readonly_db_session
 from sqlalchemy import text
+from utils.env import env_int
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+MAX_RESULT_ROWS = 100
+
+
+def _plan_total_cost(plan: Any) -> float:
+    """Total cost of the top plan node from EXPLAIN (FORMAT JSON) output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if isinstance(plan, list):
+        plan = plan[0]
+    return float(plan["Plan"]["Total Cost"])
+
 
 class QueryService:
     """Service for executing validated read-only SQL queries."""
@@ -23,6 +42,10 @@ class QueryService:
         "promise_aliases",
         "promise_events",
     ]
+
+    def __init__(self, statement_timeout_ms: Optional[int] = None, max_plan_cost: Optional[float] = None):
+        self.statement_timeout_ms = statement_timeout_ms or env_int("QUERY_STATEMENT_TIMEOUT_MS", 5000)
+        self.max_plan_cost = max_plan_cost or env_int("QUERY_MAX_PLAN_COST", 100000)
     
     def validate_and_execute_query(
         self, 
@@ -211,17 +234,17 @@ class QueryService:
         if normalized.rstrip().endswith(";"):
             normalized = normalized.rstrip()[:-1].strip()
         
-        # Check if LIMIT is present, add if not (cap at 100)
+        # Check if LIMIT is present, add if not (cap at MAX_RESULT_ROWS)
         if "LIMIT" not in query_upper:
-            normalized = f"{normalized} LIMIT 100"
+            normalized = f"{normalized} LIMIT {MAX_RESULT_ROWS}"
         else:
             # Ensure existing LIMIT is not too high
             limit_match = re.search(r'LIMIT\s+(\d+)', query_upper)
             if limit_match:
                 limit_val = int(limit_match.group(1))
-                if limit_val > 100:
-                    # Replace with max 100
-                    normalized = re.sub(r'LIMIT\s+\d+', 'LIMIT 100', normalized, flags=re.IGNORECASE)
+                if limit_val > MAX_RESULT_ROWS:
+                    # Replace with the maximum
+                    normalized = re.sub(r'LIMIT\s+\d+', f'LIMIT {MAX_RESULT_ROWS}', normalized, flags=re.IGNORECASE)
         
         return (True, normalized, None)
     
@@ -259,10 +282,35 @@ class QueryService:
             # Wrap the original query and add a parameterized user_id predicate.
             # This prevents cross-user leaks even if the model omits WHERE user_id.
             wrapped_query = f"SELECT * FROM ({query}) AS q WHERE q.user_id = :user_id"
+            params = {"user_id": safe_user_id}
             
-            with get_db_session() as session:
-                result = session.execute(text(wrapped_query), {"user_id": safe_user_id})
-                rows = result.mappings().fetchall()
+            with get_readonly_db_session() as session:
+                # Scoped to this transaction; the server cancels anything running longer.
+                session.execute(
+                    text("SELECT set_config('statement_timeout', :timeout, true)"),
+                    {"timeout": str(self.statement_timeout_ms)},
+                )
+
+                plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {wrapped_query}"), params).scalar()
+                cost = _plan_total_cost(plan)
+                if cost > self.max_plan_cost:
+                    logger.warning(
+                        f"[query_service] Rejected query with estimated cost {cost:.0f} "
+                        f"(max {self.max_plan_cost}): {query[:200]}"
+                    )
+                    return (
+                        False,
+                        "This query would scan too much data. Narrow it down (for example to a date range) and try again.",
+                    )
+
+                # Server-side cursor: rows are pulled as needed, never the whole result at once.
+                result = session.execute(
+                    text(wrapped_query),
+                    params,
+                    execution_options={"stream_results": True, "max_row_buffer": MAX_RESULT_ROWS},
+                )
+                rows = result.mappings().fetchmany(MAX_RESULT_ROWS)
+                result.close()
                 
                 # Convert to list of dicts
                 results = [dict(row) for row in rows]
@@ -273,6 +321,10 @@ class QueryService:
             logger.error(f"SQL query execution error: {e}")
             # Don't leak internal error details to user
             error_msg = str(e)
+            if "statement timeout" in error_msg.lower():
+                return (False, "Query took too long and was cancelled. Narrow it down and try again.")
+            if "queuepool limit" in error_msg.lower():
+                return (False, "Too many queries are running right now. Please try again in a moment.")
             if "user_id" in error_msg.lower() and "column" in error_msg.lower():
                 return (
                     False,
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, date
+import asyncio
 import os
 import tempfile
 import uuid
@@ -563,6 +564,17 @@ class ReportsService:
             from visualisation.vis_rects import generate_weekly_visualization
 
             generate_weekly_visualization(summary, image_path, width=1200, height=900)
+        elif engine in ("pillow", "native"):
+            from visualisation.native_cards import render_weekly_report_card_pillow
+
+            await asyncio.to_thread(
+                render_weekly_report_card_pillow,
+                summary=summary,
+                output_path=image_path,
+                week_start=week_start,
+                week_end=week_end,
+                width=1200,
+            )
         else:
             try:
                 from visualisation.weekly_report_card import render_weekly_report_card_png_async
@@ -599,6 +611,8 @@ class ReportsService:
         Returns:
             Path to generated image file (should be deleted after use)
         """
+        engine = (os.environ.get("HEATMAP_VIZ_ENGINE") or "html").strip().lower()
+
         # Get streak heatmap data
         heatmap_data = self.get_streak_heatmap_data(user_id, ref_time)
         
@@ -611,6 +625,18 @@ class ReportsService:
         image_path = os.path.join(temp_dir, f"streak_heatmap_{user_id}_{unique_id}.png")
         
         # Generate visualization
+        if engine in ("pillow", "native"):
+            from visualisation.native_cards import render_streak_heatmap_pillow
+
+            await asyncio.to_thread(
+                render_streak_heatmap_pillow,
+                heatmap_data=heatmap_data,
+                output_path=image_path,
+                ref_time=ref_time,
+                width=1400,
+            )
+            return image_path
+
         try:
             from visualisation.streak_heatmap import render_streak_heatmap_png
 
@@ -629,6 +655,33 @@ class ReportsService:
         
         return image_path
     
+    async def send_weekly_visualization(self, bot, user_id: int, ref_time: datetime, **kwargs) -> Any:
+        """
+        Render the weekly report card and send it with ``send_cached_photo``.
+
+        An unchanged week re-sends the Telegram file_id of the previous upload.
+        ``kwargs`` go to ``bot.send_photo`` (chat_id, caption, reply_markup, ...).
+        """
+        image_path = await self.generate_weekly_visualization_image(user_id, ref_time)
+        return await self._send_card(bot, image_path, **kwargs)
+
+    async def send_streak_heatmap(self, bot, user_id: int, ref_time: datetime, **kwargs) -> Any:
+        """Render the streak heatmap and send it with ``send_cached_photo``."""
+        image_path = await self.generate_streak_heatmap_image(user_id, ref_time)
+        return await self._send_card(bot, image_path, **kwargs)
+
+    @staticmethod
+    async def _send_card(bot, image_path: str, **kwargs) -> Any:
+        from visualisation.render_cache import send_cached_photo
+
+        try:
+            return await send_cached_photo(bot, image_path, **kwargs)
+        finally:
+            try:
+                os.remove(image_path)
+            except OSError:
+                pass
+
     def format_weekly_report(self, summary: Dict[str, Any]) -> str:
         """Format weekly report from summary data."""
         if not summary:
@@ -14,6 +14,7 @@ from telegram.error import TelegramError
 from handlers.messages_store import get_user_language, Language
 from handlers.translator import translate_text
 from repositories.conversation_repo import ConversationRepository
+from services.translation_review import ReviewCache, review_reason
 from utils.logger import get_logger
 from utils.formatting import prepend_xaana_to_message
 
@@ -35,6 +36,7 @@ class ResponseService:
         self._lang_cache: Dict[int, Language] = {}
         # Optional LLM handler for translation review
         self.llm_handler = llm_handler
+        self._review_cache = ReviewCache()
     
     def _get_user_language_cached(self, user_id: int) -> Language:
         """Get user language with caching."""
@@ -93,6 +95,8 @@ class ResponseService:
             log_suffix = log_match.group(1)
             text = text[: log_match.start(1)]
 
+        source_text = text
+
         # Extract and preserve promise IDs and technical terms
         # Pattern: P01, P02, T01, T02, etc. or in brackets [P01: text]
         placeholders = {}
@@ -133,9 +137,21 @@ class ResponseService:
                 )
                 return original_text
             
-            # Review translation for errors (e.g., proper noun mistranslations)
+            # Review translation for errors (e.g., proper noun mistranslations), but only
+            # when the local checks flag it: the review costs a full model round-trip.
             if self.llm_handler:
-                translated = self._review_translation(text, translated, user_lang, user_id)
+                reason = review_reason(source_text, translated, user_lang_code)
+                if reason:
+                    cached = self._review_cache.get(user_lang_code, source_text)
+                    if cached is not None:
+                        translated = cached
+                    else:
+                        logger.debug(f"Reviewing translation for user {user_id}: {reason}")
+                        reviewed = self._review_translation(source_text, translated, user_lang, user_id)
+                        # Only a completed review is cached; after a failure the next send tries again.
+                        if reviewed is not None:
+                            translated = reviewed
+                            self._review_cache.put(user_lang_code, source_text, translated)
 
             # Re-attach any log suffix without translating it.
             if log_suffix:
@@ -146,7 +162,7 @@ class ResponseService:
             logger.warning(f"Translation failed for user {user_id}: {e}")
             return original_text  # Fallback to original (without placeholders)
     
-    def _review_translation(self, original_text: str, translated_text: str, user_lang: Language, user_id: Optional[int] = None) -> str:
+    def _review_translation(self, original_text: str, translated_text: str, user_lang: Language, user_id: Optional[int] = None) -> Optional[str]:
         """
         Review translated text using LLM to catch errors like proper noun mistranslations.
         
@@ -157,10 +173,11 @@ class ResponseService:
             user_id: Optional user ID for logging
             
         Returns:
-            Corrected translation if errors found, otherwise original translated text
+            The reviewed translation (corrected, or unchanged when it was fine), or
+            None when no review happened (no model, model error, unusable output)
         """
         if not self.llm_handler or not self.llm_handler.chat_model:
-            return translated_text
+            return None
         
         try:
             from langchain_core.messages import HumanMessage, SystemMessage
@@ -184,7 +201,7 @@ class ResponseService:
             ]
             
             result = self.llm_handler.chat_model.invoke(messages)
-            reviewed_text = getattr(result, "content", translated_text).strip()
+            reviewed_text = str(getattr(result, "content", "") or "").strip()
             
             # If the review returned something reasonable, use it; otherwise fall back to original translation
             if reviewed_text and len(reviewed_text) > 0 and len(reviewed_text) <= len(translated_text) * 2:
@@ -192,11 +209,11 @@ class ResponseService:
                 return reviewed_text
             else:
                 logger.debug(f"Translation review returned unexpected result, using original translation")
-                return translated_text
+                return None
                 
         except Exception as e:
             logger.warning(f"Translation review failed for user {user_id}: {e}")
-            return translated_text  # Fallback to original translation
+            return None  # Caller keeps the unreviewed translation
     
     def _detect_parse_mode(self, text: str) -> Optional[str]:
         """Detect parse mode from text content."""
@@ -509,22 +526,19 @@ class ResponseService:
             logger.error("Cannot reply voice: user_id is None")
             return None
         
-        # Log as "[Voice message sent]"
-        if log_conversation:
-            self.conversation_repo.save_message(
-                user_id=user_id,
-                message_type='bot',
-                content="[Voice message sent]",
-                message_id=None,  # Will be updated after sending
-                chat_id=update.effective_chat.id if update.effective_chat else None,
-            )
-        
         try:
             message = await update.message.reply_voice(voice=voice)
             
-            # Update conversation log with actual message_id
+            # Log as "[Voice message sent]" only once Telegram accepted it: a voice note
+            # re-sent by a cached file_id may be rejected and then uploaded again.
             if log_conversation and message:
-                self.conversation_repo.update_message_id(user_id, message.message_id)
+                self.conversation_repo.save_message(
+                    user_id=user_id,
+                    message_type='bot',
+                    content="[Voice message sent]",
+                    message_id=message.message_id,
+                    chat_id=update.effective_chat.id if update.effective_chat else None,
+                )
             
             return message
         except TelegramError as e:
@@ -0,0 +1,297 @@
+"""
+One scheduler for the webapp's background sweepers.
+
+The webapp used to start an independent ``while True: sleep(N)`` loop per job
+(auth-session cleanup, broadcast dispatch, focus timer and plan-session
+reminders, challenge reminders, learning pipeline dispatch). Each replica ran all
+of them, and they called synchronous repositories straight on the event loop.
+
+Here every sweeper is registered with one ``SweepScheduler``:
+
+- Sweepers sit in a due-time priority queue. A sweeper's ``run`` returns the next
+  time it has work (e.g. the earliest ``expected_end_utc`` of a running focus
+  session, read from the DB); the scheduler sleeps until then, bounded by the
+  sweeper's ``interval`` so rows written by other processes are still picked up.
+  ``wake(name)`` pulls a sweeper forward when a request creates new work.
+- Sweepers marked ``leader_only`` run on a single replica: the leader holds a
+  Postgres session-level advisory lock on a dedicated connection, and followers
+  retry acquiring it.
+- ``run`` callables are expected to offload blocking DB work (``asyncio.to_thread``);
+  each runs as its own task so a slow sweeper does not delay the others.
+- Per-sweeper metrics: runs, errors, last/max duration and lag (start time minus
+  due time), exposed through ``stats()``.
+
+Env:
+- WEBAPP_SWEEPER_LEADER_ELECTION: "0" to skip the advisory lock (single replica / no Postgres)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# pg advisory lock key for "the replica that runs leader-only sweepers" ("ZANA").
+SWEEPER_LEADER_LOCK_KEY = 0x5A414E41
+LEADER_RETRY_SECONDS = 30.0
+
+SweepResult = Optional[datetime]
+
+
+@dataclass
+class Sweeper:
+    name: str
+    run: Callable[[], Awaitable[SweepResult]]
+    interval: float
+    min_interval: float = 1.0
+    leader_only: bool = True
+    runs: int = 0
+    errors: int = 0
+    last_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    due: float = 0.0
+    running: bool = False
+    woken: bool = False
+    last_error: Optional[str] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class AdvisoryLeaderLock:
+    """Session-level ``pg_try_advisory_lock`` held on its own connection for as long as it is open."""
+
+    def __init__(self, key: int = SWEEPER_LEADER_LOCK_KEY) -> None:
+        self.key = int(key)
+        self._connection: Any = None
+
+    def try_acquire(self) -> bool:
+        """Acquire or confirm leadership (blocking; call from a worker thread)."""
+        if self._connection is not None:
+            try:
+                self._connection.exec_driver_sql("SELECT 1")
+                # End the autobegun transaction so the leader session is never left idle in transaction.
+                self._connection.commit()
+                return True
+            except Exception as exc:
+                logger.warning("Sweeper leader connection lost: %s", exc)
+                self.release()
+        from sqlalchemy import text
+        from db.postgres_db import get_engine
+
+        connection = get_engine().connect()
+        try:
+            acquired = bool(connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar())
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            # Closing returns the connection to the pool; unlock first so the session does not keep it.
+            connection.exec_driver_sql(f"SELECT pg_advisory_unlock({self.key})")
+            connection.commit()
+        except Exception:
+            pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class SweepScheduler:
+    def __init__(self, leader_lock: Optional[Any] = None, leader_election: Optional[bool] = None) -> None:
+        if leader_election is None:
+            leader_election = os.getenv("WEBAPP_SWEEPER_LEADER_ELECTION", "1").strip() != "0"
+        self._leader_lock = leader_lock if leader_lock is not None else (AdvisoryLeaderLock() if leader_election else None)
+        self._is_leader = self._leader_lock is None
+        self._leader_checked = 0.0
+        self._sweepers: Dict[str, Sweeper] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def register(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[SweepResult]],
+        *,
+        interval: float,
+        min_interval: float = 1.0,
+        leader_only: bool = True,
+        first_run_delay: float = 0.0,
+    ) -> None:
+        sweeper = Sweeper(name=name, run=run, interval=float(interval), min_interval=float(min_interval), leader_only=leader_only)
+        self._sweepers[name] = sweeper
+        self._schedule(sweeper, time.monotonic() + max(0.0, first_run_delay))
+
+    def unregister(self, name: str) -> None:
+        sweeper = self._sweepers.pop(name, None)
+        if sweeper and sweeper._task:
+            sweeper._task.cancel()
+
+    def wake(self, name: str) -> None:
+        """Run ``name`` as soon as possible (e.g. a request just created work for it)."""
+        sweeper = self._sweepers.get(name)
+        if sweeper is None:
+            return
+        if sweeper.running:
+            sweeper.woken = True  # re-run right after the current pass
+            return
+        self._schedule(sweeper, time.monotonic())
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="sweep-scheduler")
+        logger.info("Sweep scheduler started with sweepers: %s", ", ".join(sorted(self._sweepers)))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        running = [s._task for s in self._sweepers.values() if s._task is not None]
+        for sweeper_task in running:
+            sweeper_task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        if self._leader_lock is not None:
+            await asyncio.to_thread(self._leader_lock.release)
+            self._is_leader = False
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "leader": self._is_leader,
+            "sweepers": {
+                s.name: {
+                    "runs": s.runs,
+                    "errors": s.errors,
+                    "running": s.running,
+                    "leader_only": s.leader_only,
+                    "last_duration_ms": round(s.last_duration_ms, 1),
+                    "max_duration_ms": round(s.max_duration_ms, 1),
+                    "last_lag_ms": round(s.last_lag_ms, 1),
+                    "max_lag_ms": round(s.max_lag_ms, 1),
+                    "next_run_in_s": round(max(0.0, s.due - now), 1),
+                    "last_error": s.last_error,
+                }
+                for s in self._sweepers.values()
+            },
+        }
+
+    def _schedule(self, sweeper: Sweeper, due: float) -> None:
+        sweeper.due = due
+        heapq.heappush(self._heap, (due, next(self._seq), sweeper.name))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _loop(self) -> None:
+        while True:
+            await self._refresh_leadership()
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                due, _, name = heapq.heappop(self._heap)
+                sweeper = self._sweepers.get(name)
+                # Stale heap entries (rescheduled or unregistered sweepers) are skipped.
+                if sweeper is None or due != sweeper.due or sweeper.running:
+                    continue
+                if sweeper.leader_only and not self._is_leader:
+                    self._schedule(sweeper, now + min(sweeper.interval, LEADER_RETRY_SECONDS))
+                    continue
+                sweeper.running = True
+                sweeper._task = asyncio.create_task(self._run(sweeper, due), name=f"sweeper-{name}")
+            delay = (self._heap[0][0] - time.monotonic()) if self._heap else LEADER_RETRY_SECONDS
+            if self._leader_lock is not None and not self._is_leader:
+                delay = min(delay, LEADER_RETRY_SECONDS)
+            wakeup = self._wakeup
+            if wakeup is None:
+                return
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(0.0, delay))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_leadership(self) -> None:
+        if self._leader_lock is None:
+            return
+        now = time.monotonic()
+        if self._leader_checked and now - self._leader_checked < LEADER_RETRY_SECONDS:
+            return
+        self._leader_checked = now
+        try:
+            leader = bool(await asyncio.to_thread(self._leader_lock.try_acquire))
+        except Exception as exc:
+            logger.warning("Sweeper leader election failed: %s", exc)
+            leader = False
+        if leader != self._is_leader:
+            logger.info("Sweeper leadership %s", "acquired" if leader else "lost / held by another replica")
+        self._is_leader = leader
+
+    async def _run(self, sweeper: Sweeper, due: float) -> None:
+        started = time.monotonic()
+        sweeper.last_lag_ms = max(0.0, (started - due) * 1000.0)
+        sweeper.max_lag_ms = max(sweeper.max_lag_ms, sweeper.last_lag_ms)
+        next_due: SweepResult = None
+        try:
+            next_due = await sweeper.run()
+            sweeper.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            sweeper.errors += 1
+            sweeper.last_error = str(exc)[:300]
+            logger.error("Sweeper %s failed: %s", sweeper.name, exc, exc_info=True)
+        finally:
+            finished = time.monotonic()
+            sweeper.runs += 1
+            sweeper.running = False
+            sweeper._task = None
+            sweeper.last_duration_ms = (finished - started) * 1000.0
+            sweeper.max_duration_ms = max(sweeper.max_duration_ms, sweeper.last_duration_ms)
+            if sweeper.last_duration_ms > sweeper.interval * 1000.0:
+                logger.warning("Sweeper %s took %.0f ms (interval %.0f s)", sweeper.name, sweeper.last_duration_ms, sweeper.interval)
+        if sweeper.name in self._sweepers:
+            if sweeper.woken:
+                sweeper.woken = False
+                next_due = datetime.now(timezone.utc)
+            self._schedule(sweeper, _next_run(sweeper, finished, next_due))
+
+
+def _next_run(sweeper: Sweeper, now: float, next_due: SweepResult) -> float:
+    """Monotonic time of the next run: the DB hint clamped to [min_interval, interval]."""
+    delay = sweeper.interval
+    if next_due is not None:
+        if next_due.tzinfo is None:
+            next_due = next_due.replace(tzinfo=timezone.utc)
+        delay = (next_due - datetime.now(timezone.utc)).total_seconds()
+    return now + min(sweeper.interval, max(sweeper.min_interval, delay))
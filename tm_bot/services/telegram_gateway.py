@@ -0,0 +1,230 @@
+"""
+Process-wide outbound Telegram gateway.
+
+Notification helpers, broadcasts and reminder sweepers used to build a fresh
+``Bot(token=...)`` per message, i.e. a new httpx client and a cold TLS handshake for
+every send. The gateway hands out one ``Bot`` per token (and event loop) backed by
+a pooled, keep-alive ``HTTPXRequest`` (HTTP/2 when ``h2`` is installed). Every Bot
+API call made through those bots goes through a single per-loop send queue drained
+by a fixed number of workers, which bounds concurrent outbound requests and gives
+one place to measure them.
+
+Bots are cached per event loop because an httpx client must not be shared across
+loops (the webapp and the Telegram application run on different ones).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from typing import Any, Deque, Dict, Optional
+
+from telegram import Bot
+from telegram.request import BaseRequest, HTTPXRequest
+
+from utils.env import env_int
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STATS_LOG_EVERY = 100
+_LATENCY_WINDOW = 512
+
+
+class _QueuedRequest(BaseRequest):
+    """``BaseRequest`` that runs every call of a pooled ``HTTPXRequest`` through the gateway queue."""
+
+    def __init__(self, gateway: "TelegramGateway", inner: HTTPXRequest) -> None:
+        self._gateway = gateway
+        self._inner = inner
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return self._inner.read_timeout
+
+    async def initialize(self) -> None:
+        await self._inner.initialize()
+
+    async def shutdown(self) -> None:
+        # Shared client: owned by the gateway, closed by TelegramGateway.aclose().
+        return None
+
+    async def do_request(self, url: str, method: str, *args: Any, **kwargs: Any):
+        return await self._gateway._submit(self._inner.do_request(url, method, *args, **kwargs))
+
+
+class _LoopState:
+    def __init__(self) -> None:
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self.workers: list = []
+        self.bots: Dict[str, Bot] = {}
+        self.requests: Dict[str, HTTPXRequest] = {}
+
+
+class TelegramGateway:
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        http2: Optional[bool] = None,
+    ) -> None:
+        self.concurrency = concurrency or env_int("TELEGRAM_GATEWAY_CONCURRENCY", 8)
+        self.pool_size = pool_size or env_int("TELEGRAM_GATEWAY_POOL_SIZE", 16)
+        if http2 is None:
+            http2 = os.getenv("TELEGRAM_GATEWAY_HTTP2", "1").strip() != "0"
+        self.http2 = bool(http2) and importlib.util.find_spec("h2") is not None
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = collections.deque(maxlen=_LATENCY_WINDOW)
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "errors": 0,
+            "new_connections": 0,
+            "queue_wait_ms_total": 0.0,
+        }
+
+    def get_bot(self, token: str) -> Bot:
+        """Shared ``Bot`` for ``token`` on the running event loop (call from a coroutine)."""
+        state = self._state()
+        bot = state.bots.get(token)
+        if bot is None:
+            request = _QueuedRequest(self, self._build_request())
+            bot = Bot(token=token, request=request, get_updates_request=request)
+            state.requests[token] = request._inner
+            state.bots[token] = bot
+        return bot
+
+    async def aclose(self) -> None:
+        """Close the pooled clients and workers of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.pop(loop, None)
+        if state is None:
+            return
+        for worker in state.workers:
+            worker.cancel()
+        for request in state.requests.values():
+            try:
+                await request.shutdown()
+            except Exception as exc:
+                logger.debug("Error closing Telegram HTTP client: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            latencies = sorted(self._latencies)
+            stats["bots"] = sum(len(state.bots) for state in self._loops.values())
+            stats["queue_depth"] = sum(state.queue.qsize() for state in self._loops.values())
+        requests = int(stats["requests"])
+        stats["requests"] = requests
+        stats["errors"] = int(stats["errors"])
+        stats["new_connections"] = int(stats["new_connections"])
+        stats["reused_connections"] = max(0, requests - stats["new_connections"])
+        stats["connection_reuse_rate"] = round(stats["reused_connections"] / requests, 4) if requests else 0.0
+        stats["avg_queue_wait_ms"] = round(stats.pop("queue_wait_ms_total") / requests, 2) if requests else 0.0
+        stats["avg_latency_ms"] = round(sum(latencies) / len(latencies), 2) if latencies else 0.0
+        stats["p95_latency_ms"] = round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else 0.0
+        stats["http2"] = self.http2
+        return stats
+
+    def _build_request(self) -> HTTPXRequest:
+        async def trace(event_name: str, _info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                self._count(new_connections=1)
+
+        async def on_request(request: Any) -> None:
+            request.extensions["trace"] = trace
+
+        return HTTPXRequest(
+            connection_pool_size=self.pool_size,
+            connect_timeout=10,
+            read_timeout=20,
+            http_version="2" if self.http2 else "1.1",
+            httpx_kwargs={"event_hooks": {"request": [on_request]}},
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = _LoopState()
+        if not state.workers:
+            state.workers = [loop.create_task(self._worker(state)) for _ in range(self.concurrency)]
+        return state
+
+    async def _submit(self, call: Any) -> Any:
+        state = self._state()
+        future = asyncio.get_running_loop().create_future()
+        await state.queue.put((call, future, time.perf_counter()))
+        return await future
+
+    async def _worker(self, state: _LoopState) -> None:
+        while True:
+            call, future, enqueued = await state.queue.get()
+            try:
+                if future.cancelled():
+                    call.close()
+                    continue
+                started = time.perf_counter()
+                try:
+                    result = await call
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as exc:
+                    self._record(enqueued, started, error=True)
+                    if not future.cancelled():
+                        future.set_exception(exc)
+                else:
+                    # (status_code, body); Bot API errors come back as 4xx/5xx, not exceptions.
+                    self._record(enqueued, started, error=not 200 <= int(result[0]) < 300)
+                    if not future.cancelled():
+                        future.set_result(result)
+            finally:
+                state.queue.task_done()
+
+    def _record(self, enqueued: float, started: float, error: bool) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            self._latencies.append((finished - started) * 1000.0)
+        self._count(requests=1, errors=int(error), queue_wait_ms_total=(started - enqueued) * 1000.0)
+
+    def _count(self, **deltas: float) -> None:
+        with self._lock:
+            for name, value in deltas.items():
+                self._stats[name] += value
+            should_log = bool(deltas.get("requests")) and int(self._stats["requests"]) % _STATS_LOG_EVERY == 0
+        if should_log:
+            stats = self.stats()
+            logger.info(
+                "Telegram gateway: %s requests, %.0f%% on reused connections, avg %.0f ms (p95 %.0f ms), %s errors",
+                stats["requests"],
+                100.0 * stats["connection_reuse_rate"],
+                stats["avg_latency_ms"],
+                stats["p95_latency_ms"],
+                stats["errors"],
+            )
+
+
+_shared_gateway: Optional[TelegramGateway] = None
+_shared_gateway_lock = threading.Lock()
+
+
+def get_telegram_gateway() -> TelegramGateway:
+    global _shared_gateway
+    if _shared_gateway is None:
+        with _shared_gateway_lock:
+            if _shared_gateway is None:
+                _shared_gateway = TelegramGateway()
+    return _shared_gateway
+
+
+def get_telegram_bot(token: str) -> Bot:
+    """Pooled ``Bot`` for ``token``; use instead of ``Bot(token=...)`` for outbound sends."""
+    return get_telegram_gateway().get_bot(token)
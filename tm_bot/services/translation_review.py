@@ -0,0 +1,144 @@
+"""
+Quality gate for machine-translated bot replies.
+
+`review_reason` runs cheap local checks on a translation and says why it should
+go to the LLM reviewer, or None when it looks fine (the common case, which then
+skips the extra model round-trip):
+
+- formatting integrity: URLs, numbers, inline code, HTML tags and Markdown
+  markers must survive translation unchanged,
+- length ratio: translated / source length outside LENGTH_RATIO_BOUNDS,
+- script: the text must actually be in the target language's script (and not
+  come back untranslated),
+- proper nouns (Latin-script targets only): capitalised mid-sentence words of
+  the source must appear verbatim.
+
+`ReviewCache` remembers reviewed outputs by (language, source hash) so the same
+phrasing is never reviewed twice.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Optional, Tuple
+
+LENGTH_RATIO_BOUNDS = (0.4, 2.5)
+REVIEW_CACHE_MAX_ENTRIES = 2000
+
+# Letters of these scripts are expected to dominate a translation into the language.
+_SCRIPT_RANGES = {
+    "fa": ((0x0600, 0x06FF), (0x0750, 0x077F), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)),
+}
+_LATIN_TARGETS = {"en", "fr", "de", "es", "it", "pt", "nl"}
+
+_URL_RE = re.compile(r"https?://\S+")
+_CODE_RE = re.compile(r"`[^`]*`")
+_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+_NUMBER_RE = re.compile(r"\d+(?:[.,:]\d+)*")
+_MARKDOWN_RE = re.compile(r"\*\*|__|\*|_|~~")
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+_SENTENCE_END_RE = re.compile(r"[.!?:;\n]\s*$")
+
+# Persian and Arabic-Indic digits (and separators) are a valid rendering of ASCII numbers.
+_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩٫٬", "01234567890123456789.,")
+
+
+def _strip_protected(text: str) -> str:
+    for pattern in (_URL_RE, _CODE_RE, _TAG_RE):
+        text = pattern.sub(" ", text)
+    return text
+
+
+def _numbers(text: str) -> Counter:
+    return Counter(n.replace(",", "").replace(".", "") for n in _NUMBER_RE.findall(text.translate(_DIGITS)))
+
+
+def _in_script(char: str, ranges) -> bool:
+    code = ord(char)
+    return any(low <= code <= high for low, high in ranges)
+
+
+def _proper_nouns(text: str):
+    """Capitalised words that do not start a sentence (names, places, brands)."""
+    nouns = set()
+    for match in _WORD_RE.finditer(text):
+        word = match.group(0)
+        if len(word) < 2 or not word[0].isupper() or word.isupper():
+            continue
+        before = text[: match.start()]
+        if not before.strip() or _SENTENCE_END_RE.search(before):
+            continue
+        nouns.add(word)
+    return nouns
+
+
+def review_reason(source: str, translated: str, target_lang: str) -> Optional[str]:
+    """Why `translated` needs an LLM review, or None when it passes every local check."""
+    if not translated or not translated.strip():
+        return "empty"
+
+    for name, pattern in (("urls", _URL_RE), ("code", _CODE_RE), ("tags", _TAG_RE)):
+        if Counter(pattern.findall(source)) != Counter(pattern.findall(translated)):
+            return f"{name} changed"
+    if _numbers(source) != _numbers(translated):
+        return "numbers changed"
+    if Counter(_MARKDOWN_RE.findall(_strip_protected(source))) != Counter(
+        _MARKDOWN_RE.findall(_strip_protected(translated))
+    ):
+        return "markdown changed"
+
+    source_body, translated_body = _strip_protected(source).strip(), _strip_protected(translated).strip()
+    if len(source_body) >= 20:
+        ratio = len(translated_body) / len(source_body)
+        if not LENGTH_RATIO_BOUNDS[0] <= ratio <= LENGTH_RATIO_BOUNDS[1]:
+            return f"length ratio {ratio:.2f}"
+
+    letters = [c for c in translated_body if c.isalpha()]
+    ranges = _SCRIPT_RANGES.get(target_lang)
+    if ranges and letters:
+        share = sum(1 for c in letters if _in_script(c, ranges)) / len(letters)
+        # Names and terms stay in Latin script, but most of the text must not.
+        if share < 0.5:
+            return f"script share {share:.2f}"
+    elif len(letters) >= 20 and translated_body == source_body:
+        return "untranslated"
+
+    if target_lang in _LATIN_TARGETS:
+        translated_words = set(_WORD_RE.findall(translated))
+        missing = [noun for noun in _proper_nouns(source) if noun not in translated_words]
+        if missing:
+            return "proper nouns changed: " + ", ".join(sorted(missing)[:3])
+    return None
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ReviewCache:
+    """Bounded LRU of (language, source hash) -> reviewed translation."""
+
+    def __init__(self, max_entries: int = REVIEW_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, lang: str, source: str) -> Optional[str]:
+        key = (lang, source_hash(source))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, lang: str, source: str, reviewed: str) -> None:
+        key = (lang, source_hash(source))
+        with self._lock:
+            self._entries[key] = reviewed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
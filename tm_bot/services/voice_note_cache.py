@@ -0,0 +1,158 @@
+"""
+Content-addressed disk cache for synthesized voice notes.
+
+Audio is stored as <directory>/<key[:2]>/<key>.ogg, where the key hashes the
+normalized text with everything that shapes the audio (locale, model, voices,
+prompt), so a template reply is synthesized once. Next to it, <key>.json maps
+bot id -> Telegram file_id of the uploaded note: Telegram can re-send a file by
+id, so a repeat reply needs neither synthesis nor upload. File ids belong to
+the bot that uploaded them, hence the per-bot mapping.
+
+Hits refresh the file mtime; once the cache outgrows its byte budget the least
+recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.env import env_int
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_tts_text(text: str) -> str:
+    """NFC, single spaces, no surrounding whitespace: spellings that sound the same share a key."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def voice_note_key(text: str, voice_params: Iterable[Optional[str]]) -> str:
+    """Cache key of `text` spoken with `voice_params` (locale, model, voice names, prompt...)."""
+    payload = json.dumps([normalize_tts_text(text), *voice_params], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class VoiceNoteCache:
+    """Synthesized audio and uploaded Telegram file ids, keyed by `voice_note_key`."""
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes or env_int("TTS_CACHE_MAX_MB", 256) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{suffix}")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_audio(self, key: str) -> Optional[bytes]:
+        path = self._path(key, ".ogg")
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("Could not read cached voice note %s: %s", path, exc)
+            return None
+        return audio or None
+
+    def put_audio(self, key: str, audio: bytes) -> None:
+        if not audio:
+            return
+        path = self._path(key, ".ogg")
+        try:
+            self._write_atomic(path, audio)
+        except OSError as exc:
+            logger.warning("Could not cache voice note %s: %s", path, exc)
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(audio)
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.prune()
+
+    def get_file_id(self, key: str, bot_id: str) -> Optional[str]:
+        return self._file_ids(key).get(str(bot_id))
+
+    def put_file_id(self, key: str, bot_id: str, file_id: str) -> None:
+        with self._lock:
+            file_ids = self._file_ids(key)
+            file_ids[str(bot_id)] = file_id
+            self._save_file_ids(key, file_ids)
+
+    def forget_file_id(self, key: str, bot_id: str) -> None:
+        """Drop a file id Telegram no longer accepts; the next send uploads again."""
+        with self._lock:
+            file_ids = self._file_ids(key)
+            if file_ids.pop(str(bot_id), None) is not None:
+                self._save_file_ids(key, file_ids)
+
+    def _file_ids(self, key: str) -> Dict[str, str]:
+        try:
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    def _save_file_ids(self, key: str, file_ids: Dict[str, str]) -> None:
+        try:
+            self._write_atomic(self._path(key, ".json"), json.dumps(file_ids, sort_keys=True).encode("utf-8"))
+        except OSError as exc:
+            logger.warning("Could not save voice note file ids for %s: %s", key, exc)
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """(path, size, mtime) of every cached audio file."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".ogg"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def prune(self) -> int:
+        """Remove least recently used notes until the cache is under 90% of its budget; returns how many."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            for victim in (path, path[: -len(".ogg")] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        if removed:
+            logger.info("Voice note cache pruned %d note(s), %d bytes kept", removed, total)
+        return removed
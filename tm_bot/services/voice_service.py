@@ -1,19 +1,28 @@
 """
 Voice service for speech-to-text (ASR) and text-to-speech (TTS).
 
-ASR uses Google Cloud Speech-to-Text.
+ASR uses Google Cloud Speech-to-Text through one pooled SpeechClient per
+process. `transcribe_voice_multi_language` runs the user-language and English
+recognitions concurrently and stops waiting as soon as the user-language
+result is decisive.
 TTS uses a dedicated Google Cloud implementation (Gemini/classic fallback)
 that returns Telegram-compatible voice-note audio.
 """
 
+import os
 import re
 import html
-from typing import Optional, Tuple, List
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple, List
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
 from llms.llm_env_utils import load_llm_env
 from services.gcp_tts_service import GcpTtsService
+from services.voice_note_cache import VoiceNoteCache
+from utils.env import env_float
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,6 +30,16 @@ logger = get_logger(__name__)
 # Load environment variables
 load_dotenv()
 
+LANGUAGE_CODES = {
+    "en": "en-US",
+    "fa": "fa-IR",
+    "fr": "fr-FR",
+}
+COMMON_ALTERNATIVES = ["en-US", "fa-IR", "fr-FR"]
+
+# The user's language wins unless English is more confident by more than this.
+CONFIDENCE_MARGIN = 0.15
+
 
 @dataclass
 class TranscriptionResult:
@@ -31,10 +50,176 @@ class TranscriptionResult:
     alternatives: List[Tuple[str, float]]  # List of (text, confidence) tuples
 
 
+# (audio content, primary language, alternative languages) -> result; may raise.
+Recognizer = Callable[[bytes, str, List[str]], TranscriptionResult]
+
+_speech_client = None
+_speech_client_lock = threading.Lock()
+_recognizer_override: Optional[Recognizer] = None
+# Shared so the two recognitions of a message reuse threads across messages.
+_recognition_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speech")
+
+
+def _empty_result(language_code: str = "en-US") -> TranscriptionResult:
+    return TranscriptionResult(text="", confidence=0.0, language_code=language_code, alternatives=[])
+
+
+def _base_lang(code: str) -> str:
+    return code.split("-")[0] if code else ""
+
+
+def _get_speech_client():
+    """The process-wide SpeechClient (created on first use; its gRPC channel is reused)."""
+    global _speech_client
+    with _speech_client_lock:
+        if _speech_client is None:
+            from google.cloud import speech
+
+            _speech_client = speech.SpeechClient()
+        return _speech_client
+
+
+def google_recognizer(content: bytes, primary_language: str, alternative_languages: List[str]) -> TranscriptionResult:
+    from google.cloud import speech
+
+    # Note: Confidence scores are available by default in the API response
+    config = speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.OGG_OPUS,
+        sample_rate_hertz=48000,  # Telegram voice notes are typically 48kHz
+        language_code=primary_language,
+        alternative_language_codes=alternative_languages,
+        enable_automatic_punctuation=True,
+    )
+    audio = speech.RecognitionAudio(content=content)
+    response = _get_speech_client().recognize(config=config, audio=audio)
+
+    if not response.results:
+        logger.warning("No transcription results returned")
+        return _empty_result(primary_language)
+
+    # Extract transcribed text with confidence scores
+    all_transcripts = []
+    all_confidences = []
+    alternatives_list = []
+    detected_language = primary_language
+
+    for result in response.results:
+        if result.alternatives:
+            # Get the best alternative
+            best_alt = result.alternatives[0]
+            all_transcripts.append(best_alt.transcript)
+            confidence = best_alt.confidence if hasattr(best_alt, 'confidence') and best_alt.confidence > 0 else 0.0
+            all_confidences.append(confidence)
+
+            # Prefer detected language when available (for multi-language recognition)
+            if hasattr(result, "language_code") and result.language_code:
+                detected_language = result.language_code
+            elif hasattr(best_alt, "language_code") and best_alt.language_code:
+                detected_language = best_alt.language_code
+
+            # Collect all alternatives for this result
+            for alt in result.alternatives:
+                alt_confidence = alt.confidence if hasattr(alt, 'confidence') and alt.confidence > 0 else 0.0
+                alternatives_list.append((alt.transcript, alt_confidence))
+
+    # Combine all transcripts
+    transcribed_text = " ".join(all_transcripts)
+    # Average confidence across all results
+    avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
+
+    logger.debug(f"Transcribed voice: {transcribed_text[:50]}... (confidence: {avg_confidence:.2f})")
+
+    return TranscriptionResult(
+        text=transcribed_text,
+        confidence=avg_confidence,
+        language_code=detected_language,
+        alternatives=alternatives_list
+    )
+
+
+class LocalRecognizer:
+    """
+    Offline recogniser: returns the scripted result for each primary language
+    (empty when none is scripted) after an optional per-language delay, without
+    looking at the audio. Records the primary language of every call.
+    """
+
+    def __init__(
+        self,
+        results: Optional[Dict[str, TranscriptionResult]] = None,
+        delays: Optional[Dict[str, float]] = None,
+    ):
+        self.results = dict(results or {})
+        self.delays = dict(delays or {})
+        self.calls: List[str] = []
+
+    def __call__(self, content: bytes, primary_language: str, alternative_languages: List[str]) -> TranscriptionResult:
+        self.calls.append(primary_language)
+        delay = self.delays.get(primary_language, 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return self.results.get(primary_language) or _empty_result(primary_language)
+
+
+def set_speech_recognizer(recognizer: Optional[Recognizer]) -> None:
+    """Use `recognizer` instead of the env-selected one (None restores it)."""
+    global _recognizer_override
+    _recognizer_override = recognizer
+
+
+def _default_recognizer() -> Recognizer:
+    if _recognizer_override is not None:
+        return _recognizer_override
+    if os.getenv("SPEECH_RECOGNIZER", "google").strip().lower() == "local":
+        return LocalRecognizer()
+    return google_recognizer
+
+
+def is_decisive(result: TranscriptionResult, user_language_base: str, threshold: float) -> bool:
+    """
+    Whether the user-language pass can be returned without the English one.
+
+    It must have detected the user's (non-English) language with at least
+    `threshold` confidence; at 1 - CONFIDENCE_MARGIN or above that result is
+    selected whatever the English pass returns.
+    """
+    detected_base = _base_lang(result.language_code)
+    return bool(detected_base) and detected_base == user_language_base and result.confidence >= threshold
+
+
+def select_transcription(
+    result_user_lang: TranscriptionResult,
+    result_english: TranscriptionResult,
+    user_language_base: str,
+) -> TranscriptionResult:
+    """Pick between the user-language and English passes, favouring the user's language."""
+    user_detected_base = _base_lang(result_user_lang.language_code)
+    english_detected_base = _base_lang(result_english.language_code)
+
+    # Prefer non-English detections when English is likely a fallback mismatch,
+    # and the user's language when close in confidence.
+    prefer_user = (
+        (user_detected_base and user_detected_base != "en" and english_detected_base == "en")
+        or user_detected_base == user_language_base
+    )
+    if prefer_user and result_user_lang.confidence >= result_english.confidence - CONFIDENCE_MARGIN:
+        selected, other = result_user_lang, result_english
+    # Compare confidence scores and return the best
+    elif result_user_lang.confidence >= result_english.confidence:
+        selected, other = result_user_lang, result_english
+    else:
+        selected, other = result_english, result_user_lang
+    logger.info(
+        f"Selected {selected.language_code} transcription "
+        f"(confidence: {selected.confidence:.2f} vs {other.confidence:.2f})"
+    )
+    return selected
+
+
 class VoiceService:
     """Service for voice transcription and synthesis using Google Cloud APIs."""
     
-    def __init__(self):
+    def __init__(self, recognizer: Optional[Recognizer] = None, tts_cache_dir: Optional[str] = None):
         self.project_id = None
         self.location = "us-central1"
         try:
@@ -43,8 +228,35 @@ class VoiceService:
             self.location = cfg.get("GCP_LOCATION", "us-central1")
         except Exception as e:
             logger.warning("VoiceService env bootstrap failed, using existing env: %s", e)
-        self.gcp_tts_service = GcpTtsService()
-        
+        # Synthesized notes and their Telegram file ids, when a cache directory is given.
+        self.voice_note_cache = VoiceNoteCache(tts_cache_dir) if tts_cache_dir else None
+        self.gcp_tts_service = GcpTtsService(cache=self.voice_note_cache)
+        self.recognizer = recognizer or _default_recognizer()
+        self.early_accept_confidence = env_float("SPEECH_EARLY_ACCEPT_CONFIDENCE", 1.0 - CONFIDENCE_MARGIN, allow_zero=True)
+
+    def _recognize(
+        self,
+        content: bytes,
+        primary_language: Optional[str],
+        alternative_languages: Optional[List[str]],
+    ) -> TranscriptionResult:
+        try:
+            return self.recognizer(content, primary_language or "en-US", list(alternative_languages or []))
+        except ImportError:
+            logger.error("google-cloud-speech not available. Install with: pip install google-cloud-speech")
+        except Exception as e:
+            logger.error(f"Voice transcription failed: {str(e)}")
+        return _empty_result()
+
+    @staticmethod
+    def _read_audio(voice_file_path: str) -> Optional[bytes]:
+        try:
+            with open(voice_file_path, "rb") as audio_file:
+                return audio_file.read()
+        except OSError as e:
+            logger.error(f"Voice transcription failed: {str(e)}")
+            return None
+
     def transcribe_voice(
         self, 
         voice_file_path: str, 
@@ -62,84 +274,10 @@ class VoiceService:
         Returns:
             TranscriptionResult with text, confidence, and metadata
         """
-        try:
-            from google.cloud import speech
-            
-            client = speech.SpeechClient()
-            
-            # Read audio file
-            with open(voice_file_path, "rb") as audio_file:
-                content = audio_file.read()
-            
-            # Configure recognition
-            # Note: Confidence scores are available by default in the API response
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.OGG_OPUS,
-                sample_rate_hertz=48000,  # Telegram voice notes are typically 48kHz
-                language_code=primary_language or "en-US",
-                alternative_language_codes=alternative_languages or [],
-                enable_automatic_punctuation=True,
-            )
-            
-            audio = speech.RecognitionAudio(content=content)
-            
-            # Perform transcription
-            response = client.recognize(config=config, audio=audio)
-            
-            # Extract transcribed text with confidence scores
-            if response.results:
-                all_transcripts = []
-                all_confidences = []
-                alternatives_list = []
-                detected_language = primary_language or "en-US"
-                
-                for result in response.results:
-                    if result.alternatives:
-                        # Get the best alternative
-                        best_alt = result.alternatives[0]
-                        all_transcripts.append(best_alt.transcript)
-                        confidence = best_alt.confidence if hasattr(best_alt, 'confidence') and best_alt.confidence > 0 else 0.0
-                        all_confidences.append(confidence)
-
-                        # Prefer detected language when available (for multi-language recognition)
-                        if hasattr(result, "language_code") and result.language_code:
-                            detected_language = result.language_code
-                        elif hasattr(best_alt, "language_code") and best_alt.language_code:
-                            detected_language = best_alt.language_code
-                        
-                        # Collect all alternatives for this result
-                        for alt in result.alternatives:
-                            alt_confidence = alt.confidence if hasattr(alt, 'confidence') and alt.confidence > 0 else 0.0
-                            alternatives_list.append((alt.transcript, alt_confidence))
-                
-                # Combine all transcripts
-                transcribed_text = " ".join(all_transcripts)
-                # Average confidence across all results
-                avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
-                
-                logger.debug(f"Transcribed voice: {transcribed_text[:50]}... (confidence: {avg_confidence:.2f})")
-                
-                return TranscriptionResult(
-                    text=transcribed_text,
-                    confidence=avg_confidence,
-                    language_code=detected_language,
-                    alternatives=alternatives_list
-                )
-            else:
-                logger.warning("No transcription results returned")
-                return TranscriptionResult(
-                    text="",
-                    confidence=0.0,
-                    language_code=primary_language or "en-US",
-                    alternatives=[]
-                )
-                
-        except ImportError:
-            logger.error("google-cloud-speech not available. Install with: pip install google-cloud-speech")
-            return TranscriptionResult(text="", confidence=0.0, language_code="en-US", alternatives=[])
-        except Exception as e:
-            logger.error(f"Voice transcription failed: {str(e)}")
-            return TranscriptionResult(text="", confidence=0.0, language_code="en-US", alternatives=[])
+        content = self._read_audio(voice_file_path)
+        if content is None:
+            return _empty_result()
+        return self._recognize(content, primary_language, alternative_languages)
     
     def transcribe_voice_multi_language(
         self,
@@ -150,6 +288,10 @@ class VoiceService:
         """
         Transcribe voice with multi-language support, trying user language and English.
         Returns the transcription with highest confidence.
+
+        Both recognitions run concurrently; a decisive user-language result (see
+        `is_decisive`) is returned without waiting for the English one, whose
+        late result is then discarded.
         
         Args:
             voice_file_path: Path to the voice audio file
@@ -159,78 +301,39 @@ class VoiceService:
         Returns:
             TranscriptionResult with the best transcription
         """
-        # Map language codes
-        lang_map = {
-            "en": "en-US",
-            "fa": "fa-IR",
-            "fr": "fr-FR"
-        }
-        
-        primary_lang = lang_map.get(user_language, "en-US")
-        user_language_base = user_language.split("-")[0] if "-" in user_language else user_language
-        common_alternatives = ["en-US", "fa-IR", "fr-FR"]
-        
+        primary_lang = LANGUAGE_CODES.get(user_language, "en-US")
+        user_language_base = _base_lang(user_language)
+
         # If user language is not English and fallback is enabled, try both
         if user_language_base != "en" and fallback_to_english:
-            # Try user's language first with broader alternatives
-            user_alternatives = [lang for lang in common_alternatives if lang != primary_lang]
-            result_user_lang = self.transcribe_voice(
-                voice_file_path,
-                primary_language=primary_lang,
-                alternative_languages=user_alternatives
-            )
-            
-            # Try English as primary with user's language as an alternative
-            english_alternatives = [lang for lang in common_alternatives if lang != "en-US"]
+            content = self._read_audio(voice_file_path)
+            if content is None:
+                return _empty_result()
+
+            # User's language first with broader alternatives; English as primary
+            # with the user's language as an alternative.
+            user_alternatives = [lang for lang in COMMON_ALTERNATIVES if lang != primary_lang]
+            english_alternatives = [lang for lang in COMMON_ALTERNATIVES if lang != "en-US"]
             if primary_lang not in english_alternatives:
                 english_alternatives.insert(0, primary_lang)
-            result_english = self.transcribe_voice(
-                voice_file_path,
-                primary_language="en-US",
-                alternative_languages=english_alternatives
-            )
-
-            def _base_lang(code: str) -> str:
-                return code.split("-")[0] if code else ""
-
-            user_detected_base = _base_lang(result_user_lang.language_code)
-            english_detected_base = _base_lang(result_english.language_code)
 
-            # Prefer non-English detections when English is likely a fallback mismatch.
-            confidence_margin = 0.15
-            if user_detected_base and user_detected_base != "en" and english_detected_base == "en":
-                if result_user_lang.confidence >= result_english.confidence - confidence_margin:
-                    logger.info(
-                        f"Selected {result_user_lang.language_code} transcription "
-                        f"(confidence: {result_user_lang.confidence:.2f} vs {result_english.confidence:.2f})"
-                    )
-                    return result_user_lang
+            user_future = _recognition_executor.submit(self._recognize, content, primary_lang, user_alternatives)
+            english_future = _recognition_executor.submit(self._recognize, content, "en-US", english_alternatives)
 
-            # Prefer the user's language when close in confidence.
-            if user_detected_base == user_language_base:
-                if result_user_lang.confidence >= result_english.confidence - confidence_margin:
+            done, _ = wait([user_future, english_future], return_when=FIRST_COMPLETED)
+            if user_future in done:
+                result_user_lang = user_future.result()
+                if is_decisive(result_user_lang, user_language_base, self.early_accept_confidence):
+                    english_future.cancel()
                     logger.info(
                         f"Selected {result_user_lang.language_code} transcription "
-                        f"(confidence: {result_user_lang.confidence:.2f} vs {result_english.confidence:.2f})"
+                        f"(confidence: {result_user_lang.confidence:.2f}, English pass not awaited)"
                     )
                     return result_user_lang
-
-            # Compare confidence scores and return the best
-            if result_user_lang.confidence >= result_english.confidence:
-                logger.info(
-                    f"Selected {result_user_lang.language_code} transcription "
-                    f"(confidence: {result_user_lang.confidence:.2f} vs {result_english.confidence:.2f})"
-                )
-                return result_user_lang
-            else:
-                logger.info(
-                    f"Selected {result_english.language_code} transcription "
-                    f"(confidence: {result_english.confidence:.2f} vs {result_user_lang.confidence:.2f})"
-                )
-                return result_english
+            return select_transcription(user_future.result(), english_future.result(), user_language_base)
         else:
             # Single language transcription with alternatives
-            alternative_langs = common_alternatives if primary_lang == "en-US" else [lang for lang in common_alternatives if lang != primary_lang]
+            alternative_langs = COMMON_ALTERNATIVES if primary_lang == "en-US" else [lang for lang in COMMON_ALTERNATIVES if lang != primary_lang]
             return self.transcribe_voice(
                 voice_file_path,
                 primary_language=primary_lang,
@@ -284,6 +387,11 @@ class VoiceService:
 
         return text.strip()
     
+    def voice_note_key(self, text: str, language_code: str = "en-US") -> Optional[str]:
+        """Cache key of the voice note `synthesize_speech` would produce, or None if there is nothing to say."""
+        cleaned_text = self.clean_text_for_tts(text)
+        return self.gcp_tts_service.cache_key(cleaned_text, language_code) if cleaned_text else None
+
     def synthesize_speech(self, text: str, language_code: str = "en-US") -> Optional[bytes]:
         """
         Synthesize text to speech for Telegram voice notes.
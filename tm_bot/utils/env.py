@@ -0,0 +1,22 @@
+"""
+Numeric settings read from environment variables.
+"""
+import os
+
+
+def env_int(name: str, default: int, allow_zero: bool = False) -> int:
+    """Positive integer from `name` (or zero when `allow_zero`); unset or invalid values give `default`."""
+    try:
+        value = int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+    return value if value > 0 or (allow_zero and value == 0) else default
+
+
+def env_float(name: str, default: float, allow_zero: bool = False) -> float:
+    """Positive number from `name` (or zero when `allow_zero`); unset or invalid values give `default`."""
+    try:
+        value = float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+    return value if value > 0 or (allow_zero and value == 0) else default
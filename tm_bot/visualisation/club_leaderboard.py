@@ -13,7 +13,6 @@ than the older dark heatmap style in `visualisation/streak_heatmap.py`.
 from __future__ import annotations
 
 import html
-import os
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
@@ -315,33 +314,10 @@ async def render_club_leaderboard_png(
     avatar_data_uris: Optional[Dict[str, str]] = None,
     width: int = 760,
 ) -> str:
-    """Render the club leaderboard HTML to a PNG at output_path (headless Chromium)."""
-    from playwright.async_api import async_playwright  # type: ignore  # pylint: disable=import-error
+    """Render the club leaderboard HTML to a PNG at output_path (shared Chromium pool)."""
+    from visualisation.render_pool import render_html_to_png
 
     html_doc = build_club_leaderboard_html(
         club_name, leaderboard, avatar_data_uris=avatar_data_uris, width=width
     )
-
-    out_dir = os.path.dirname(output_path)
-    if out_dir:
-        os.makedirs(out_dir, exist_ok=True)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
-        )
-        try:
-            page = await browser.new_page(
-                viewport={"width": int(width), "height": 800},
-                device_scale_factor=2,
-            )
-            await page.set_content(html_doc, wait_until="load")
-            await page.evaluate(
-                "() => document.fonts && document.fonts.ready ? document.fonts.ready.then(() => true) : true"
-            )
-            await page.screenshot(path=output_path, full_page=True, type="png")
-        finally:
-            await browser.close()
-
-    return output_path
+    return await render_html_to_png(html_doc, output_path, width=int(width), height=800)
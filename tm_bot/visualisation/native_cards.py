@@ -0,0 +1,564 @@
+"""
+Chromium-free Pillow renderer for the weekly report card and the streak heatmap.
+
+Draws the same layout as the HTML cards (`weekly_report_card.py`,
+`streak_heatmap.py`) straight onto a bitmap at the same 2x device scale. A card
+takes tens of milliseconds and a few MB, so workers that cannot host Chromium can
+still send images. Selected per card type with WEEKLY_VIZ_ENGINE=pillow /
+HEATMAP_VIZ_ENGINE=pillow (see services.reports).
+
+Fonts come from CARD_FONT_DIR or the system Noto install (fonts-noto-core in the
+Docker image), falling back to DejaVu and finally Pillow's built-in font.
+
+RTL handling strategy:
+- Paragraph direction follows `_is_rtl_text`, exactly like the HTML `dir` choice.
+- A minimal bidi pass (`_direction_runs`) orders LTR/RTL runs visually, then each
+  run is split by script (Latin / Arabic / Hebrew) to pick the matching Noto face.
+- With libraqm available Pillow shapes RTL runs (joined Arabic/Persian letters);
+  without it the run is only reversed into visual order.
+- Status emoji are drawn as coloured dots rather than colour emoji glyphs.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+from utils.time_utils import get_week_range
+from visualisation.streak_heatmap import _get_activity_color, _get_week_days
+from visualisation.weekly_report_card import (
+    DAY_LABELS,
+    _is_rtl_text,
+    _progress_pct,
+    _status_emoji,
+    _week_days,
+)
+
+SCALE = 2
+
+RGB = Tuple[int, int, int]
+
+BG: RGB = (11, 16, 32)
+CARD_TOP: RGB = (15, 26, 56)
+CARD_BOTTOM: RGB = (15, 23, 48)
+TEXT: RGB = (232, 238, 252)
+ACCENT: RGB = (91, 163, 245)
+ACCENT2: RGB = (125, 211, 252)
+
+STATUS_COLORS: Dict[str, RGB] = {
+    "✅": (34, 197, 94),
+    "🟡": (234, 179, 8),
+    "🟠": (249, 115, 22),
+    "🔴": (239, 68, 68),
+}
+
+_FONT_DIRS = (
+    "/usr/share/fonts/truetype/noto",
+    "/usr/share/fonts/opentype/noto",
+    "/usr/share/fonts/noto",
+    "/usr/share/fonts/truetype/dejavu",
+)
+_FONT_FILES: Dict[Tuple[str, bool], Tuple[str, ...]] = {
+    ("latin", False): ("NotoSans-Regular.ttf", "DejaVuSans.ttf"),
+    ("latin", True): ("NotoSans-Bold.ttf", "DejaVuSans-Bold.ttf"),
+    ("arabic", False): ("NotoSansArabic-Regular.ttf", "NotoNaskhArabic-Regular.ttf", "DejaVuSans.ttf"),
+    ("arabic", True): ("NotoSansArabic-Bold.ttf", "NotoNaskhArabic-Bold.ttf", "DejaVuSans-Bold.ttf"),
+    ("hebrew", False): ("NotoSansHebrew-Regular.ttf", "DejaVuSans.ttf"),
+    ("hebrew", True): ("NotoSansHebrew-Bold.ttf", "DejaVuSans-Bold.ttf"),
+}
+
+_HAS_RAQM = features.check("raqm")
+_LAYOUT = ImageFont.Layout.RAQM if _HAS_RAQM else ImageFont.Layout.BASIC
+
+# Run of text in one font: (font, text, raqm direction or None).
+_Piece = Tuple[Any, str, Optional[str]]
+
+
+# --------------------------------------------------------------------------- primitives
+
+
+def _px(value: float) -> int:
+    return int(round(value * SCALE))
+
+
+def _over(fg: RGB, alpha: float, bg: RGB = BG) -> RGB:
+    return tuple(int(round(f * alpha + b * (1.0 - alpha))) for f, b in zip(fg, bg))  # type: ignore[return-value]
+
+
+def _hex(color: str) -> RGB:
+    color = color.lstrip("#")
+    return (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+
+
+MUTED: RGB = _over(TEXT, 0.72)
+BORDER: RGB = _over(TEXT, 0.10)
+
+
+@lru_cache(maxsize=64)
+def _font(script: str, bold: bool, size: float):
+    size_px = _px(size)
+    dirs = [os.getenv("CARD_FONT_DIR", "").strip()] + list(_FONT_DIRS)
+    for name in _FONT_FILES[(script, bold)]:
+        for directory in dirs:
+            path = os.path.join(directory, name) if directory else ""
+            if path and os.path.exists(path):
+                return ImageFont.truetype(path, size_px, layout_engine=_LAYOUT)
+    return ImageFont.load_default(size=size_px)
+
+
+_MIRRORED = str.maketrans("()[]{}<>«»", ")(][}{><»«")
+
+
+def _script_of(ch: str) -> Optional[str]:
+    code_point = ord(ch)
+    if 0x0590 <= code_point <= 0x05FF or 0xFB1D <= code_point <= 0xFB4F:
+        return "hebrew"
+    if _is_rtl_text(ch):
+        return "arabic"
+    if ch.isalnum():
+        return "latin"
+    return None  # spaces and punctuation: neutral
+
+
+def _script_runs(text: str) -> List[Tuple[str, str]]:
+    """Split ``text`` into (script, run) in logical order; neutrals join the preceding run."""
+    runs: List[List[Any]] = []
+    for ch in text:
+        script = _script_of(ch)
+        if runs and (script is None or script == runs[-1][0]):
+            runs[-1][1] += ch
+        elif runs and runs[-1][0] is None:
+            runs[-1] = [script, runs[-1][1] + ch]
+        else:
+            runs.append([script, ch])
+    return [(script or "latin", run) for script, run in runs]
+
+
+def _direction_runs(text: str, rtl: bool) -> List[Tuple[bool, str]]:
+    """
+    Minimal bidi: (is_rtl, run) pairs in visual left-to-right order.
+
+    Neutrals between two runs of the same direction join them; any other neutral
+    takes the paragraph direction, as in the Unicode bidi algorithm (rules N1/N2).
+    Digits count as LTR, matching the `dir="ltr"` numeric spans of the HTML cards.
+    """
+    scripts = [_script_of(ch) for ch in text]
+    strong = [None if script is None else script != "latin" for script in scripts]
+    resolved: List[bool] = []
+    for idx, direction in enumerate(strong):
+        if direction is not None:
+            resolved.append(direction)
+            continue
+        before = next((d for d in reversed(strong[:idx]) if d is not None), rtl)
+        after = next((d for d in strong[idx + 1:] if d is not None), rtl)
+        resolved.append(before if before == after else rtl)
+    runs: List[List[Any]] = []
+    for ch, direction in zip(text, resolved):
+        if runs and runs[-1][0] == direction:
+            runs[-1][1] += ch
+        else:
+            runs.append([direction, ch])
+    if rtl:
+        runs.reverse()
+    return [(direction, run) for direction, run in runs]
+
+
+def _layout(text: str, size: float, bold: bool, rtl: bool) -> List[_Piece]:
+    pieces: List[_Piece] = []
+    for run_rtl, run in _direction_runs(text, rtl):
+        scripts = _script_runs(run)
+        if run_rtl:
+            if _HAS_RAQM:
+                # raqm reorders and mirrors within the run; only the font switches are ours.
+                pieces.extend((_font(script, bold, size), part, "rtl") for script, part in reversed(scripts))
+                continue
+            scripts = [(script, part[::-1].translate(_MIRRORED)) for script, part in reversed(scripts)]
+        pieces.extend((_font(script, bold, size), part, None) for script, part in scripts)
+    return pieces
+
+
+def _pieces_width(pieces: Sequence[_Piece]) -> float:
+    total = 0.0
+    for font, run, direction in pieces:
+        total += font.getlength(run, direction=direction) if direction else font.getlength(run)
+    return total
+
+
+def _text_width(text: str, size: float, bold: bool = False, rtl: bool = False) -> float:
+    return _pieces_width(_layout(text, size, bold, rtl)) / SCALE
+
+
+def _draw_text(
+    draw: ImageDraw.ImageDraw,
+    x: float,
+    y: float,
+    text: str,
+    *,
+    size: float,
+    fill: RGB,
+    bold: bool = False,
+    rtl: bool = False,
+    align: str = "left",
+) -> None:
+    """Draw one line with its top at ``y``; ``x`` is the left edge, right edge or centre per ``align``."""
+    pieces = _layout(text, size, bold, rtl)
+    offset = {"right": 1.0, "center": 0.5}.get(align, 0.0)
+    cursor = _px(x) - _pieces_width(pieces) * offset
+    for font, run, direction in pieces:
+        kwargs = {"direction": direction} if direction else {}
+        draw.text((cursor, _px(y)), run, font=font, fill=fill, anchor="la", **kwargs)
+        cursor += font.getlength(run, **kwargs)
+
+
+def _wrap(text: str, size: float, bold: bool, rtl: bool, max_width: float, max_lines: int) -> List[str]:
+    words = text.split()
+    lines: List[str] = []
+    current = ""
+    for idx, word in enumerate(words):
+        candidate = f"{current} {word}".strip()
+        if not current or _text_width(candidate, size, bold, rtl) <= max_width:
+            current = candidate
+            continue
+        lines.append(current)
+        current = word
+        if len(lines) == max_lines - 1:
+            current = " ".join(words[idx:])
+            break
+    if current:
+        lines.append(current)
+    lines = lines[:max_lines] or [""]
+    last = lines[-1]
+    if _text_width(last, size, bold, rtl) > max_width:
+        while last and _text_width(last + "…", size, bold, rtl) > max_width:
+            last = last[:-1]
+        lines[-1] = last.rstrip() + "…"
+    return lines
+
+
+def _gradient(size: Tuple[int, int], start: RGB, end: RGB, horizontal: bool = False) -> Image.Image:
+    width, height = max(1, size[0]), max(1, size[1])
+    # 1px-wide ramp stretched with NEAREST: a straight linear gradient, far cheaper than resampling 256x256.
+    ramp = Image.linear_gradient("L").resize((1, width if horizontal else height), Image.Resampling.BILINEAR)
+    if horizontal:
+        ramp = ramp.transpose(Image.Transpose.ROTATE_90)
+    ramp = ramp.resize((width, height), Image.Resampling.NEAREST)
+    return Image.composite(Image.new("RGB", (width, height), end), Image.new("RGB", (width, height), start), ramp)
+
+
+def _panel(
+    image: Image.Image,
+    box: Tuple[float, float, float, float],
+    radius: float,
+    *,
+    fill: Optional[RGB] = None,
+    gradient: Optional[Tuple[RGB, RGB]] = None,
+    horizontal: bool = False,
+    outline: Optional[RGB] = None,
+) -> None:
+    left, top, right, bottom = (_px(v) for v in box)
+    width, height = right - left, bottom - top
+    if width <= 0 or height <= 0:
+        return
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, width - 1, height - 1), radius=_px(radius), fill=255)
+    if gradient:
+        tile = _gradient((width, height), gradient[0], gradient[1], horizontal=horizontal)
+    else:
+        tile = Image.new("RGB", (width, height), fill or BG)
+    image.paste(tile, (left, top), mask)
+    if outline:
+        ImageDraw.Draw(image).rounded_rectangle(
+            (left, top, right - 1, bottom - 1), radius=_px(radius), outline=outline, width=SCALE
+        )
+
+
+def _status_dot(draw: ImageDraw.ImageDraw, x: float, y: float, emoji: str, diameter: float = 13) -> None:
+    draw.ellipse(
+        (_px(x), _px(y), _px(x + diameter), _px(y + diameter)),
+        fill=STATUS_COLORS.get(emoji, MUTED),
+    )
+
+
+def _header(image: Image.Image, draw: ImageDraw.ImageDraw, width: int, title: str, title_size: float, subtitle: str) -> float:
+    title_h = title_size * 1.35
+    sub_h = 13 * 1.35
+    height = 18 + title_h + 4 + sub_h + 18
+    _panel(
+        image,
+        (28, 28, width - 28, 28 + height),
+        18,
+        gradient=(_over(ACCENT, 0.20), _over(ACCENT2, 0.08)),
+        horizontal=True,
+        outline=BORDER,
+    )
+    _panel(image, (28 + 9, 28, width - 28 - 9, 30), 1, gradient=(_over(ACCENT, 0.6), _over(ACCENT2, 0.6)), horizontal=True)
+    _draw_text(draw, 28 + 18, 28 + 18, title, size=title_size, fill=ACCENT, bold=True)
+    _draw_text(draw, 28 + 18, 28 + 18 + title_h + 4, subtitle, size=13, fill=MUTED)
+    return height
+
+
+def _save(image: Image.Image, output_path: str) -> str:
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    # Flat-colour cards: zlib's RLE strategy is both faster and smaller than the default here.
+    image.save(output_path, format="PNG", compress_level=1, compress_type=zlib.Z_RLE)
+    return output_path
+
+
+# --------------------------------------------------------------------------- weekly report card
+
+
+def draw_weekly_report_card(
+    summary: Dict[str, Any],
+    *,
+    week_start: datetime,
+    week_end: datetime,
+    width: int = 1200,
+    min_height: int = 900,
+) -> Image.Image:
+    week_days = _week_days(week_start)
+    total_promised = sum(float((d or {}).get("hours_promised", 0.0) or 0.0) for d in (summary or {}).values())
+    total_spent = sum(float((d or {}).get("hours_spent", 0.0) or 0.0) for d in (summary or {}).values())
+
+    col_w = (width - 56 - 16) / 2.0
+    inner_w = col_w - 32
+    meta_h = 12 * 1.35 + 2 + 12 * 1.35 + 2 + 13 * 1.35
+
+    cards: List[Dict[str, Any]] = []
+    for pid, data in sorted((summary or {}).items(), key=lambda kv: str(kv[0])):
+        d = data or {}
+        title = str(d.get("text", "") or "").replace("_", " ")
+        promised = float(d.get("hours_promised", 0.0) or 0.0)
+        spent = float(d.get("hours_spent", 0.0) or 0.0)
+        pct = _progress_pct(spent, promised)
+        per_day = {sd.get("date"): float(sd.get("hours", 0.0) or 0.0) for sd in (d.get("sessions") or []) if sd}
+        day_hours = [float(per_day.get(day, 0.0) or 0.0) for day in week_days]
+        baseline = max(promised / 7.0 if promised > 0 else 0.0, max(day_hours) if day_hours else 0.0, 0.25)
+        meta = [f"#{pid}", f"{spent:.1f}/{promised:.1f} h", f"{min(pct, 100)}%"]
+        meta_w = max(_text_width(meta[0], 12), _text_width(meta[1], 12), _text_width(meta[2], 13, bold=True))
+        rtl = _is_rtl_text(title)
+        title_lines = _wrap(title, 15, True, rtl, inner_w - meta_w - 12 - 13 - 8, max_lines=2)
+        top_h = max(len(title_lines) * 15 * 1.25, meta_h)
+        cards.append(
+            {
+                "title_lines": title_lines,
+                "rtl": rtl,
+                "meta": meta,
+                "meta_w": meta_w,
+                "pct": pct,
+                "emoji": _status_emoji(min(pct, 100)),
+                "day_heights": [max(0.0, min(1.0, h / baseline)) for h in day_hours],
+                "top_h": top_h,
+                "height": 16 + top_h + 2 + 10 + 12 + 10 + 46 + 14,
+            }
+        )
+
+    header_h = 18 + 22 * 1.35 + 4 + 13 * 1.35 + 18
+    rows = [cards[i:i + 2] for i in range(0, len(cards), 2)]
+    row_heights = [max(card["height"] for card in row) for row in rows]
+    body_h = sum(row_heights) + 16 * max(0, len(rows) - 1) if rows else 18 + 80 + 16 * 1.35
+    content_h = 28 + header_h + (20 if rows else 0) + body_h + 30
+    height = max(float(min_height), content_h)
+
+    image = Image.new("RGB", (_px(width), _px(height)), BG)
+    draw = ImageDraw.Draw(image)
+
+    week_range = f"{week_start.strftime('%d %b')} - {week_end.strftime('%d %b')}"
+    _header(image, draw, width, "Weekly Report", 22, week_range)
+    _draw_text(draw, width - 28 - 18, 28 + 18 + 2, "Totals", size=13, fill=MUTED, align="right")
+    _draw_text(
+        draw,
+        width - 28 - 18,
+        28 + 18 + 2 + 13 * 1.35 + 4,
+        f"{total_spent:.1f}/{total_promised:.1f} h",
+        size=13,
+        fill=TEXT,
+        bold=True,
+        align="right",
+    )
+
+    if not rows:
+        top = 28 + header_h + 18
+        _panel(image, (28, top, width - 28, top + 80 + 16 * 1.35), 16, fill=_over(CARD_BOTTOM, 0.7), outline=BORDER)
+        _draw_text(draw, width / 2.0, top + 40, "No data available for this week", size=16, fill=TEXT, bold=True,
+                   align="center")
+        return image
+
+    top = 28 + header_h + 20
+    for row, row_h in zip(rows, row_heights):
+        for col, card in enumerate(row):
+            _draw_weekly_card(image, draw, card, 28 + col * (col_w + 16), top, col_w, row_h)
+        top += row_h + 16
+    return image
+
+
+def _draw_weekly_card(
+    image: Image.Image,
+    draw: ImageDraw.ImageDraw,
+    card: Dict[str, Any],
+    x: float,
+    y: float,
+    w: float,
+    h: float,
+) -> None:
+    _panel(image, (x, y, x + w, y + h), 16, gradient=(CARD_TOP, CARD_BOTTOM), outline=BORDER)
+    inner_x = x + 16
+    inner_w = w - 32
+
+    _status_dot(draw, inner_x, y + 16 + 3, card["emoji"])
+    title_left = inner_x + 13 + 8
+    title_right = inner_x + inner_w - card["meta_w"] - 12
+    for idx, line in enumerate(card["title_lines"]):
+        line_y = y + 16 + idx * 15 * 1.25
+        if card["rtl"]:
+            _draw_text(draw, title_right, line_y, line, size=15, fill=TEXT, bold=True, rtl=True, align="right")
+        else:
+            _draw_text(draw, title_left, line_y, line, size=15, fill=TEXT, bold=True)
+
+    meta_right = inner_x + inner_w
+    pid, ratio, pct_text = card["meta"]
+    _draw_text(draw, meta_right, y + 16, pid, size=12, fill=MUTED, align="right")
+    _draw_text(draw, meta_right, y + 16 + 12 * 1.35 + 2, ratio, size=12, fill=MUTED, align="right")
+    _draw_text(draw, meta_right, y + 16 + 2 * (12 * 1.35 + 2), pct_text, size=13, fill=TEXT, bold=True, align="right")
+
+    track_y = y + 16 + card["top_h"] + 2 + 10
+    _panel(image, (inner_x, track_y, inner_x + inner_w, track_y + 12), 6, fill=_over(TEXT, 0.10, CARD_BOTTOM))
+    fill_w = inner_w * max(0, min(100, card["pct"])) / 100.0
+    if fill_w > 0:
+        _panel(image, (inner_x + 1, track_y + 1, inner_x + 1 + max(fill_w - 2, 10), track_y + 11), 5,
+               gradient=(ACCENT, ACCENT2), horizontal=True)
+
+    days_y = track_y + 12 + 10
+    day_w = (inner_w - 6 * 6) / 7.0
+    for idx, ratio_h in enumerate(card["day_heights"]):
+        day_x = inner_x + idx * (day_w + 6)
+        _panel(image, (day_x, days_y, day_x + day_w, days_y + 46), 10, fill=_over(TEXT, 0.05, CARD_BOTTOM),
+               outline=_over(TEXT, 0.06, CARD_BOTTOM))
+        bar_h = 44 * ratio_h
+        if bar_h >= 1:
+            _panel(image, (day_x + 1, days_y + 45 - bar_h, day_x + day_w - 1, days_y + 45), 9,
+                   gradient=(ACCENT, ACCENT2))
+        _draw_text(draw, day_x + 6, days_y + 46 - 3 - 10 * 1.35, DAY_LABELS[idx][0], size=10, fill=MUTED, bold=True)
+
+
+def render_weekly_report_card_pillow(
+    *,
+    summary: Dict[str, Any],
+    output_path: str,
+    week_start: datetime,
+    week_end: datetime,
+    width: int = 1200,
+) -> str:
+    """Render the weekly report card PNG without a browser (same size as the HTML render)."""
+    image = draw_weekly_report_card(summary, week_start=week_start, week_end=week_end, width=width)
+    return _save(image, output_path)
+
+
+# --------------------------------------------------------------------------- streak heatmap
+
+
+def draw_streak_heatmap(
+    heatmap_data: Dict[str, Any],
+    *,
+    ref_time: datetime,
+    width: int = 1400,
+    min_height: int = 1200,
+) -> Image.Image:
+    week_start, _ = get_week_range(ref_time)
+    four_weeks_monday = (week_start - timedelta(days=21)).date()
+    weeks = [_get_week_days(four_weeks_monday + timedelta(days=offset * 7)) for offset in range(4)]
+
+    inner_w = width - 56 - 40
+    grid_h = 7 * 34 + 6 * 5
+    cards: List[Dict[str, Any]] = []
+    for pid, data in sorted((heatmap_data or {}).items(), key=lambda kv: str(kv[0])):
+        d = data or {}
+        title = str(d.get("text", "") or "").replace("_", " ")
+        rtl = _is_rtl_text(title)
+        lines = _wrap(title, 16, True, rtl, inner_w, max_lines=3)
+        hours_dict = d.get("hours_by_date", {}) or {}
+        cards.append(
+            {
+                "pid": pid,
+                "title_lines": lines,
+                "rtl": rtl,
+                "hours": [[float(hours_dict.get(day, 0.0) or 0.0) for day in week] for week in weeks],
+                "height": 20 + len(lines) * 16 * 1.3 + 8 + 12 * 1.35 + 16
+                + (10 * 1.35 + 2) + 10 + grid_h + 10 + (2 + 10 * 1.35) + 18,
+            }
+        )
+
+    header_h = 18 + 24 * 1.35 + 4 + 13 * 1.35 + 18
+    if cards:
+        body_h = sum(card["height"] + 18 for card in cards)
+    else:
+        body_h = 18 + 80 + 16 * 1.35
+    height = max(float(min_height), 28 + header_h + 20 + body_h + 30)
+
+    image = Image.new("RGB", (_px(width), _px(height)), BG)
+    draw = ImageDraw.Draw(image)
+    end_date = (week_start - timedelta(days=1)).date()
+    date_range = f"{four_weeks_monday.strftime('%d %b')} - {end_date.strftime('%d %b')}"
+    _header(image, draw, width, "Streak Heatmap", 24, date_range)
+
+    top = 28 + header_h + 20
+    if not cards:
+        message = "No promises with activity in the last 4 weeks"
+        _panel(image, (28, top + 18, width - 28, top + 18 + 80 + 16 * 1.35), 16, fill=_over(CARD_BOTTOM, 0.7), outline=BORDER)
+        _draw_text(draw, width / 2.0, top + 18 + 40, message, size=16, fill=TEXT, bold=True, align="center")
+        return image
+
+    for card in cards:
+        _draw_heatmap_card(image, draw, card, 28, top, width - 56)
+        top += card["height"] + 18
+    return image
+
+
+def _draw_heatmap_card(image: Image.Image, draw: ImageDraw.ImageDraw, card: Dict[str, Any], x: float, y: float, w: float) -> None:
+    _panel(image, (x, y, x + w, y + card["height"]), 16, gradient=(CARD_TOP, CARD_BOTTOM), outline=BORDER)
+    inner_x = x + 20
+    cursor = y + 20
+    for line in card["title_lines"]:
+        if card["rtl"]:
+            _draw_text(draw, x + w - 20, cursor, line, size=16, fill=TEXT, bold=True, rtl=True, align="right")
+        else:
+            _draw_text(draw, inner_x, cursor, line, size=16, fill=TEXT, bold=True)
+        cursor += 16 * 1.3
+    cursor += 8
+    _draw_text(draw, inner_x, cursor, f"#{card['pid']}", size=12, fill=MUTED)
+    cursor += 12 * 1.35 + 16
+
+    for idx in range(4):
+        label = f"W{idx + 1}"
+        _draw_text(draw, inner_x + idx * 40 + 17, cursor, label, size=10, fill=MUTED, bold=True, align="center")
+    cursor += 10 * 1.35 + 2 + 10
+
+    for week_idx, week_hours in enumerate(card["hours"]):
+        cell_x = inner_x + week_idx * (34 + 8)
+        for day_idx, hours in enumerate(week_hours):
+            base, lighter = _get_activity_color(hours)
+            cell_y = cursor + day_idx * (34 + 5)
+            _panel(image, (cell_x, cell_y, cell_x + 34, cell_y + 34), 7,
+                   gradient=(_hex(base), _hex(lighter)), outline=_over((255, 255, 255), 0.12, _hex(base)))
+    cursor += 7 * 34 + 6 * 5 + 10 + 2
+
+    for idx, label in enumerate(DAY_LABELS):
+        _draw_text(draw, inner_x + idx * 40 + 17, cursor, label, size=10, fill=MUTED, bold=True, align="center")
+
+
+def render_streak_heatmap_pillow(
+    *,
+    heatmap_data: Dict[str, Any],
+    output_path: str,
+    ref_time: datetime,
+    width: int = 1400,
+) -> str:
+    """Render the streak heatmap PNG without a browser (same size as the HTML render)."""
+    image = draw_streak_heatmap(heatmap_data, ref_time=ref_time, width=width)
+    return _save(image, output_path)
@@ -0,0 +1,229 @@
+"""
+Content-addressed on-disk cache for rendered PNG cards.
+
+Card HTML is deterministic for a given input (no timestamps or random ids), so the
+SHA-256 of the HTML plus the viewport and RENDER_CACHE_VERSION identifies the
+image. A repeated render (several club members opening the same leaderboard, a
+user re-tapping "weekly" with no new actions) is served by copying the cached PNG
+instead of another Chromium screenshot. Total size is bounded; least recently
+used files are evicted first.
+
+The cache also remembers the Telegram ``file_id`` of each PNG it has seen uploaded
+(keyed by the PNG bytes), so an identical image can be re-sent without uploading.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when renderer output changes for identical HTML (pool viewport/scale, fonts, Chromium flags).
+RENDER_CACHE_VERSION = "1"
+DEFAULT_PNG_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_STATS_LOG_EVERY = 50
+
+
+class PngRenderCache:
+    def __init__(self, root_dir: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        env_root = os.getenv("PNG_RENDER_CACHE_DIR", "").strip()
+        default_root = os.path.join(os.getenv("ROOT_DIR") or os.getcwd(), "cache", "png")
+        self.root_dir = root_dir or env_root or default_root
+        env_max_mb = os.getenv("PNG_RENDER_CACHE_MAX_MB", "").strip()
+        self.max_bytes = int(max_bytes if max_bytes is not None else (
+            int(env_max_mb) * 1024 * 1024 if env_max_mb.isdigit() else DEFAULT_PNG_CACHE_MAX_BYTES
+        ))
+        self.images_dir = os.path.join(self.root_dir, "images")
+        self.file_ids_dir = os.path.join(self.root_dir, "telegram_file_ids")
+        self.tmp_dir = os.path.join(self.root_dir, "tmp")
+        self._lock = threading.Lock()
+        self._dirs_ready = False
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "bytes_saved": 0,
+            "file_id_reuses": 0,
+            "upload_bytes_saved": 0,
+        }
+
+    @staticmethod
+    def key_for(html_doc: str, width: int, height: int) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"v{RENDER_CACHE_VERSION}:{int(width)}x{int(height)}:".encode("utf-8"))
+        digest.update((html_doc or "").encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, output_path: str) -> bool:
+        """Copy the cached PNG for ``key`` to ``output_path``; False on a miss."""
+        path = self._image_path(key)
+        try:
+            size = os.path.getsize(path)
+            _ensure_parent(output_path)
+            shutil.copyfile(path, output_path)
+            os.utime(path, None)
+        except OSError:
+            self._count(misses=1)
+            return False
+        self._count(hits=1, bytes_saved=size)
+        return True
+
+    def put(self, key: str, png_path: str) -> None:
+        self._ensure_dirs()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        os.close(fd)
+        try:
+            shutil.copyfile(png_path, tmp_path)
+            os.replace(tmp_path, self._image_path(key))
+        except OSError as exc:
+            logger.debug("Could not store PNG in render cache: %s", exc)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict(keep_path=self._image_path(key))
+
+    def get_telegram_file_id(self, png_path: str) -> Optional[str]:
+        try:
+            digest, size = _file_digest(png_path)
+            with open(os.path.join(self.file_ids_dir, f"{digest}.json"), "r", encoding="utf-8") as handle:
+                file_id = json.load(handle).get("file_id")
+        except (OSError, ValueError):
+            return None
+        if file_id:
+            self._count(file_id_reuses=1, upload_bytes_saved=size)
+        return file_id or None
+
+    def remember_telegram_file_id(self, png_path: str, file_id: Optional[str]) -> None:
+        if not file_id:
+            return
+        self._ensure_dirs()
+        try:
+            digest, _ = _file_digest(png_path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"file_id": str(file_id)}, handle)
+            os.replace(tmp_path, os.path.join(self.file_ids_dir, f"{digest}.json"))
+        except OSError as exc:
+            logger.debug("Could not store Telegram file_id: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["total_bytes"] = sum(size for _, size, _ in self._iter_images())
+        return stats
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, value in deltas.items():
+                self._stats[name] += int(value)
+            lookups = self._stats["hits"] + self._stats["misses"]
+            should_log = bool(deltas.get("hits") or deltas.get("misses")) and lookups % _STATS_LOG_EVERY == 0
+            snapshot = dict(self._stats)
+        if should_log:
+            logger.info(
+                "PNG render cache: %s hits / %s lookups (%.0f%%), %s bytes saved, %s Telegram uploads skipped",
+                snapshot["hits"],
+                lookups,
+                100.0 * snapshot["hits"] / lookups,
+                snapshot["bytes_saved"],
+                snapshot["file_id_reuses"],
+            )
+
+    def _ensure_dirs(self) -> None:
+        if self._dirs_ready:
+            return
+        for path in (self.images_dir, self.file_ids_dir, self.tmp_dir):
+            os.makedirs(path, exist_ok=True)
+        self._dirs_ready = True
+
+    def _image_path(self, key: str) -> str:
+        return os.path.join(self.images_dir, f"{key}.png")
+
+    def _iter_images(self):
+        if not os.path.isdir(self.images_dir):
+            return
+        for name in os.listdir(self.images_dir):
+            path = os.path.join(self.images_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self, keep_path: Optional[str] = None) -> None:
+        with self._lock:
+            images = sorted(self._iter_images(), key=lambda item: item[2])
+            total = sum(size for _, size, _ in images)
+            for path, size, _ in images:
+                if total <= self.max_bytes:
+                    break
+                if path == keep_path:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+
+
+def _ensure_parent(path: str) -> None:
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+
+def _file_digest(path: str):
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(64 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+_shared_cache: Optional[PngRenderCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_png_render_cache() -> PngRenderCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = PngRenderCache()
+    return _shared_cache
+
+
+async def send_cached_photo(bot: Any, png_path: str, **kwargs: Any) -> Any:
+    """
+    ``bot.send_photo`` that reuses the Telegram ``file_id`` of an identical PNG.
+
+    Falls back to uploading the file when there is no known ``file_id`` or Telegram
+    rejects it, and records the ``file_id`` of any new upload.
+    """
+    from telegram.error import BadRequest
+
+    cache = get_png_render_cache()
+    file_id = cache.get_telegram_file_id(png_path)
+    if file_id:
+        try:
+            return await bot.send_photo(photo=file_id, **kwargs)
+        except BadRequest as exc:
+            logger.debug("Cached Telegram file_id rejected, re-uploading: %s", exc)
+    message = await bot.send_photo(photo=png_path, **kwargs)
+    photos = getattr(message, "photo", None) or []
+    if photos:
+        cache.remember_telegram_file_id(png_path, getattr(photos[-1], "file_id", None))
+    return message
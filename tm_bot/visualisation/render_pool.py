@@ -0,0 +1,345 @@
+"""
+Shared headless-Chromium pool for rendering HTML cards to PNG.
+
+Launching Playwright + Chromium costs about a second and a few hundred MB per
+image, so the card renderers (weekly report, streak heatmap, club leaderboard)
+share a small set of long-lived browsers with pre-warmed pages instead.
+
+The pool lives on its own daemon thread and event loop. That keeps Playwright's
+objects bound to one loop no matter which loop (or plain thread) the caller is
+on, and lets sync callers render without spinning up a browser of their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from utils.env import env_int
+from utils.logger import get_logger
+from visualisation.render_cache import get_png_render_cache
+
+logger = get_logger(__name__)
+
+CHROMIUM_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+DEVICE_SCALE_FACTOR = 2
+
+# Touches every font stack the cards use (Latin, Arabic/Persian, Hebrew, emoji) so
+# the first real render doesn't pay for font discovery.
+_WARMUP_HTML = """<!doctype html>
+<html><head><meta charset="utf-8" /></head>
+<body style="font-family: 'Noto Sans', 'Noto Sans Arabic', 'Noto Sans Hebrew', system-ui, sans-serif;">
+  <div style="font-weight: 400">Weekly report 0123456789</div>
+  <div style="font-weight: 800">Leaderboard 🔥✅🏆</div>
+  <div dir="rtl">گزارش هفتگی ۱۲۳ — דוח שבועי</div>
+</body></html>
+"""
+_FONTS_READY_JS = "() => document.fonts && document.fonts.ready ? document.fonts.ready.then(() => true) : true"
+
+
+class RenderQueueFullError(RuntimeError):
+    """Raised when too many renders are already queued; callers should fall back to text."""
+
+
+@dataclass
+class _PooledPage:
+    slot: int
+    context: Any
+    page: Any
+    uses: int = 0
+
+
+class RenderPool:
+    def __init__(
+        self,
+        browsers: Optional[int] = None,
+        pages_per_browser: Optional[int] = None,
+        queue_limit: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        page_max_uses: Optional[int] = None,
+    ) -> None:
+        self.browser_count = browsers or env_int("PNG_RENDER_BROWSERS", 1)
+        self.pages_per_browser = pages_per_browser or env_int("PNG_RENDER_PAGES_PER_BROWSER", 2)
+        self.queue_limit = queue_limit or env_int("PNG_RENDER_QUEUE_LIMIT", 32)
+        self.timeout_seconds = float(timeout_seconds or env_int("PNG_RENDER_TIMEOUT_SECONDS", 30))
+        self.page_max_uses = page_max_uses or env_int("PNG_RENDER_PAGE_MAX_USES", 200)
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_lock = threading.Lock()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+        # Owned by the pool loop.
+        self._playwright: Any = None
+        self._browsers: List[Any] = []
+        self._slot_locks: List[asyncio.Lock] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+
+        self._stats: Dict[str, float] = {
+            "renders": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "browser_restarts": 0,
+            "render_seconds_total": 0.0,
+        }
+
+    # ------------------------------------------------------------------ public API
+
+    async def render(self, html_doc: str, output_path: str, width: int, height: int) -> str:
+        """Render ``html_doc`` to ``output_path`` (full-page PNG). Safe from any event loop."""
+        future = self._submit(html_doc, output_path, width, height)
+        return await asyncio.wrap_future(future)
+
+    def render_sync(self, html_doc: str, output_path: str, width: int, height: int) -> str:
+        """Blocking variant for non-async callers (scripts, worker threads)."""
+        return self._submit(html_doc, output_path, width, height).result()
+
+    def stats(self) -> Dict[str, float]:
+        with self._pending_lock:
+            pending = self._pending
+        return {**self._stats, "pending": pending, "browsers": len([b for b in self._browsers if b is not None])}
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout=timeout)
+        except Exception as exc:
+            logger.debug("Render pool shutdown did not complete cleanly: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._loop = None
+
+    # ------------------------------------------------------------------ internals
+
+    def _submit(self, html_doc: str, output_path: str, width: int, height: int) -> Future:
+        with self._pending_lock:
+            if self._pending >= self.queue_limit:
+                self._stats["rejected"] += 1
+                raise RenderQueueFullError(f"PNG render queue is full ({self.queue_limit} pending)")
+            self._pending += 1
+
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        try:
+            loop = self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._render_with_timeout(html_doc, output_path, int(width), int(height)),
+                loop,
+            )
+        except BaseException:
+            self._release_pending()
+            raise
+        future.add_done_callback(lambda _f: self._release_pending())
+        return future
+
+    def _release_pending(self) -> None:
+        with self._pending_lock:
+            self._pending = max(0, self._pending - 1)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._thread_lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=_run, name="png-render-pool", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    async def _render_with_timeout(self, html_doc: str, output_path: str, width: int, height: int) -> str:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                self._render(html_doc, output_path, width, height),
+                timeout=self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            self._stats["failures"] += 1
+            raise
+        except Exception:
+            self._stats["failures"] += 1
+            raise
+        self._stats["renders"] += 1
+        self._stats["render_seconds_total"] += time.perf_counter() - started
+        return result
+
+    async def _render(self, html_doc: str, output_path: str, width: int, height: int) -> str:
+        await self._ensure_started()
+        pooled: _PooledPage = await self._idle.get()
+        healthy = False
+        try:
+            pooled = await self._ensure_usable(pooled)
+            page = pooled.page
+            await page.set_viewport_size({"width": width, "height": height})
+            await page.set_content(html_doc, wait_until="load")
+            # Ensure web fonts are ready before screenshot (important for RTL shaping and consistent layout).
+            await page.evaluate(_FONTS_READY_JS)
+            await page.screenshot(path=output_path, full_page=True, type="png")
+            pooled.uses += 1
+            healthy = True
+            return output_path
+        finally:
+            if healthy and pooled.uses < self.page_max_uses:
+                self._idle.put_nowait(pooled)
+            else:
+                # Timed out, crashed or worn out: replace the page in the background so the
+                # slot isn't lost, without making this caller wait for it.
+                asyncio.ensure_future(self._recycle(pooled))
+
+    async def _ensure_started(self) -> None:
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            # Local import so the bot can still run without Playwright installed (text-only fallback).
+            from playwright.async_api import async_playwright  # type: ignore  # pylint: disable=import-error
+
+            self._playwright = await async_playwright().start()
+            self._browsers = [None] * self.browser_count
+            self._slot_locks = [asyncio.Lock() for _ in range(self.browser_count)]
+            self._idle = asyncio.Queue()
+            try:
+                for slot in range(self.browser_count):
+                    for _ in range(self.pages_per_browser):
+                        self._idle.put_nowait(await self._new_page(slot))
+            except BaseException:
+                # Chromium missing or failed to launch: leave the pool unstarted so the next
+                # render retries from scratch instead of leaking a half-built pool.
+                await self._close_all()
+                raise
+            self._started = True
+            logger.info(
+                "PNG render pool started: %s browser(s) x %s page(s)",
+                self.browser_count,
+                self.pages_per_browser,
+            )
+
+    async def _ensure_browser(self, slot: int) -> Any:
+        async with self._slot_locks[slot]:
+            browser = self._browsers[slot]
+            if browser is not None and browser.is_connected():
+                return browser
+            if browser is not None:
+                self._stats["browser_restarts"] += 1
+                logger.warning("PNG render pool: browser %s disconnected, relaunching", slot)
+            browser = await self._playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+            self._browsers[slot] = browser
+            return browser
+
+    async def _new_page(self, slot: int) -> _PooledPage:
+        browser = await self._ensure_browser(slot)
+        context = await browser.new_context(
+            viewport={"width": 800, "height": 600},
+            device_scale_factor=DEVICE_SCALE_FACTOR,
+        )
+        page = await context.new_page()
+        await page.set_content(_WARMUP_HTML, wait_until="load")
+        await page.evaluate(_FONTS_READY_JS)
+        return _PooledPage(slot=slot, context=context, page=page)
+
+    async def _ensure_usable(self, pooled: _PooledPage) -> _PooledPage:
+        browser = self._browsers[pooled.slot]
+        if browser is not None and browser.is_connected() and not pooled.page.is_closed():
+            return pooled
+        await self._close_page(pooled)
+        return await self._new_page(pooled.slot)
+
+    async def _recycle(self, pooled: _PooledPage) -> None:
+        await self._close_page(pooled)
+        while self._started:
+            try:
+                replacement = await self._new_page(pooled.slot)
+            except Exception as exc:
+                logger.warning("PNG render pool: could not replace page in slot %s: %s", pooled.slot, exc)
+                await asyncio.sleep(5)
+                continue
+            self._idle.put_nowait(replacement)
+            return
+
+    async def _close_page(self, pooled: _PooledPage) -> None:
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    async def _close_all(self) -> None:
+        for browser in self._browsers:
+            if browser is None:
+                continue
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+        self._playwright = None
+        self._started = False
+
+
+_shared_pool: Optional[RenderPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = RenderPool()
+                atexit.register(_shared_pool.shutdown)
+    return _shared_pool
+
+
+async def render_html_to_png(html_doc: str, output_path: str, width: int, height: int) -> str:
+    """Render via the pool, serving identical HTML from the PNG render cache."""
+    cache = get_png_render_cache()
+    key = cache.key_for(html_doc, width, height)
+    if cache.get(key, output_path):
+        return output_path
+    await get_render_pool().render(html_doc, output_path, width=width, height=height)
+    cache.put(key, output_path)
+    return output_path
+
+
+def render_html_to_png_sync(html_doc: str, output_path: str, width: int, height: int) -> str:
+    cache = get_png_render_cache()
+    key = cache.key_for(html_doc, width, height)
+    if cache.get(key, output_path):
+        return output_path
+    get_render_pool().render_sync(html_doc, output_path, width=width, height=height)
+    cache.put(key, output_path)
+    return output_path
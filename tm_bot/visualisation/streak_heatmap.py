@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List
 
@@ -320,41 +319,13 @@ async def render_streak_heatmap_png(
 ) -> str:
     """
     Render the streak heatmap HTML to a PNG at output_path.
-    Uses async Playwright API to work within asyncio event loop.
+    Renders on the shared Chromium pool (see visualisation.render_pool).
     """
-    # Local import so the bot can still run without Playwright installed (text-only fallback).
-    from playwright.async_api import async_playwright  # type: ignore  # pylint: disable=import-error
+    from visualisation.render_pool import render_html_to_png
 
     html_doc = build_streak_heatmap_html(
         heatmap_data,
         ref_time=ref_time,
         width=width,
     )
-
-    out_dir = os.path.dirname(output_path)
-    if out_dir:
-        os.makedirs(out_dir, exist_ok=True)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ],
-        )
-        try:
-            page = await browser.new_page(
-                viewport={"width": int(width), "height": 1200},
-                device_scale_factor=2,
-            )
-            await page.set_content(html_doc, wait_until="load")
-            # Ensure web fonts are ready before screenshot (important for RTL shaping and consistent layout).
-            await page.evaluate("() => document.fonts && document.fonts.ready ? document.fonts.ready.then(() => true) : true")
-            await page.screenshot(path=output_path, full_page=True, type="png")
-        finally:
-            await browser.close()
-
-    return output_path
-
+    return await render_html_to_png(html_doc, output_path, width=int(width), height=1200)
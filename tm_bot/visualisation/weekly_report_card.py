@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List
 
@@ -472,9 +471,11 @@ def render_weekly_report_card_png(
 ) -> str:
     """
     Render the weekly report card HTML to a PNG at output_path.
+
+    Blocks until the shared Chromium pool has rendered it; async callers should use
+    render_weekly_report_card_png_async.
     """
-    # Local import so the bot can still run without Playwright installed (text-only fallback).
-    from playwright.sync_api import sync_playwright  # type: ignore  # pylint: disable=import-error
+    from visualisation.render_pool import render_html_to_png_sync
 
     html_doc = build_weekly_report_card_html(
         summary,
@@ -482,33 +483,7 @@ def render_weekly_report_card_png(
         week_end=week_end,
         width=width,
     )
-
-    out_dir = os.path.dirname(output_path)
-    if out_dir:
-        os.makedirs(out_dir, exist_ok=True)
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ],
-        )
-        try:
-            page = browser.new_page(
-                viewport={"width": int(width), "height": 900},
-                device_scale_factor=2,
-            )
-            page.set_content(html_doc, wait_until="load")
-            # Ensure web fonts are ready before screenshot (important for RTL shaping and consistent layout).
-            page.evaluate("() => document.fonts && document.fonts.ready ? document.fonts.ready.then(() => true) : true")
-            page.screenshot(path=output_path, full_page=True, type="png")
-        finally:
-            browser.close()
-
-    return output_path
+    return render_html_to_png_sync(html_doc, output_path, width=int(width), height=900)
 
 
 async def render_weekly_report_card_png_async(
@@ -520,12 +495,12 @@ async def render_weekly_report_card_png_async(
     width: int = 1200,
 ) -> str:
     """
-    Render the weekly report card HTML to a PNG at output_path (async Playwright API).
+    Render the weekly report card HTML to a PNG at output_path on the shared Chromium pool.
 
-    IMPORTANT: Use this from async Telegram handlers to avoid:
-    "It looks like you are using Playwright Sync API inside the asyncio loop."
+    IMPORTANT: Use this from async Telegram handlers so the event loop isn't blocked
+    while the pool renders.
     """
-    from playwright.async_api import async_playwright  # type: ignore  # pylint: disable=import-error
+    from visualisation.render_pool import render_html_to_png
 
     html_doc = build_weekly_report_card_html(
         summary,
@@ -533,33 +508,4 @@ async def render_weekly_report_card_png_async(
         week_end=week_end,
         width=width,
     )
-
-    out_dir = os.path.dirname(output_path)
-    if out_dir:
-        os.makedirs(out_dir, exist_ok=True)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ],
-        )
-        try:
-            page = await browser.new_page(
-                viewport={"width": int(width), "height": 900},
-                device_scale_factor=2,
-            )
-            await page.set_content(html_doc, wait_until="load")
-            # Ensure web fonts are ready before screenshot (important for RTL shaping and consistent layout).
-            await page.evaluate(
-                "() => document.fonts && document.fonts.ready ? document.fonts.ready.then(() => true) : true"
-            )
-            await page.screenshot(path=output_path, full_page=True, type="png")
-        finally:
-            await browser.close()
-
-    return output_path
-
+    return await render_html_to_png(html_doc, output_path, width=int(width), height=900)
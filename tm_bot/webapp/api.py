@@ -3,9 +3,9 @@ FastAPI web application for Telegram Mini App.
 Provides API endpoints for the React frontend.
 """
 
+import asyncio
 import os
 from typing import Optional
-from datetime import datetime, timezone
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -17,6 +17,7 @@ from utils.logger import get_logger
 
 # Import all routers
 from .routers import health, auth, users, promises, templates, distractions, admin, community, focus_timer, youtube_watch, content, plan_sessions, challenges, oauth_consent
+from .auth_cache import VerifiedAuthCache
 
 logger = get_logger(__name__)
 
@@ -70,6 +71,7 @@ def create_webapp_api(
     # Initialize auth session repository
     auth_session_repo = AuthSessionRepository()
     app.state.auth_session_repo = auth_session_repo
+    app.state.auth_cache = VerifiedAuthCache()
     
     # Initialize bot_username (will be set in startup)
     app.state.bot_username = ""
@@ -87,6 +89,10 @@ def create_webapp_api(
     from services.challenge_reminder_service import ChallengeReminderService
     app.state.challenge_reminder_service = ChallengeReminderService(bot_token)
 
+    # Scheduler for background sweepers (registered and started on startup).
+    from services.sweep_scheduler import SweepScheduler
+    app.state.sweep_scheduler = SweepScheduler()
+
     # Include all routers
     app.include_router(health.router)
     app.include_router(auth.router)
@@ -143,204 +149,75 @@ def create_webapp_api(
             if not app.state.bot_username:
                 logger.warning("Bot username not found in env or API, Login Widget may not work")
         
-        # Start background task for session cleanup
-        import asyncio
-        async def cleanup_task():
-            while True:
-                await asyncio.sleep(3600)  # Run every hour
-                auth_session_repo.cleanup_expired()
-        
-        asyncio.create_task(cleanup_task())
-        logger.info("Started auth session cleanup task")
-
-        # Start background task for due broadcast dispatch.
-        async def broadcast_dispatcher():
-            from repositories.broadcasts_repo import BroadcastsRepository
-            from services.broadcast_service import execute_broadcast_from_db
-
-            poll_interval_seconds = 15
-            max_batch_size = 25
-
-            while True:
-                try:
-                    broadcasts_repo = BroadcastsRepository()
-                    due_broadcasts = broadcasts_repo.list_due_broadcasts(
-                        now_utc=datetime.now(timezone.utc),
-                        limit=max_batch_size,
-                    )
-
-                    if due_broadcasts:
-                        logger.info(
-                            "Broadcast dispatcher found %d due pending broadcast(s)",
-                            len(due_broadcasts),
-                        )
-
-                    for broadcast in due_broadcasts:
-                        try:
-                            await execute_broadcast_from_db(
-                                response_service=None,
-                                broadcast_id=broadcast.broadcast_id,
-                                default_bot_token=app.state.bot_token,
-                            )
-                        except Exception as e:
-                            logger.error(
-                                "Failed to execute due broadcast %s: %s",
-                                broadcast.broadcast_id,
-                                e,
-                                exc_info=True,
-                            )
-                except Exception as e:
-                    logger.error("Error in broadcast dispatcher loop: %s", e, exc_info=True)
-
-                await asyncio.sleep(poll_interval_seconds)
-
-        asyncio.create_task(broadcast_dispatcher())
-        logger.info("Started broadcast dispatcher sweeper (checks every 15 seconds)")
-        
-        # Start background task for focus timer completion notifications
-        async def focus_timer_sweeper():
-            """Periodically check for overdue focus sessions and send Telegram notifications."""
-            from repositories.sessions_repo import SessionsRepository
-            from webapp.notifications import send_focus_finished_notification
-            import os
-            
-            while True:
-                try:
-                    await asyncio.sleep(30)  # Check every 30 seconds
-                    
-                    sessions_repo = SessionsRepository()
-                    overdue_sessions = sessions_repo.list_overdue_sessions_needing_notification()
-                    
-                    if overdue_sessions:
-                        logger.info(f"Found {len(overdue_sessions)} overdue focus session(s) needing notification")
-                    else:
-                        # Log occasionally to confirm sweeper is running (every 5 minutes)
-                        import time
-                        if int(time.time()) % 300 < 30:  # Log roughly every 5 minutes
-                            logger.debug("Focus timer sweeper running - no overdue sessions found")
-                    
-                    for session in overdue_sessions:
-                        try:
-                            logger.info(f"Processing overdue session {session.session_id} for user {session.user_id}, "
-                                      f"expected_end: {session.expected_end_utc}, "
-                                      f"planned_duration: {session.planned_duration_minutes} minutes")
-                            
-                            # Get promise text
-                            from repositories.promises_repo import PromisesRepository
-                            promises_repo = PromisesRepository()
-                            promise = promises_repo.get_promise(int(session.user_id), session.promise_id)
-                            promise_text = promise.text if promise else f"Promise #{session.promise_id}"
-                            
-                            # Calculate proposed hours
-                            proposed_hours = (session.planned_duration_minutes or 25) / 60.0
-                            
-                            # Send notification
-                            miniapp_url = os.getenv("MINIAPP_URL", "https://xaana.club")
-                            logger.info(f"Sending focus completion notification to user {session.user_id} for session {session.session_id}")
-                            await send_focus_finished_notification(
-                                bot_token=bot_token,
-                                user_id=int(session.user_id),
-                                session_id=session.session_id,
-                                promise_text=promise_text,
-                                proposed_hours=proposed_hours,
-                                miniapp_url=miniapp_url,
-                            )
-                            sessions_repo.mark_session_notified(session.session_id)
-                            
-                            logger.info(f"✓ Successfully sent focus completion notification for session {session.session_id} to user {session.user_id}")
-                        except Exception as e:
-                            logger.error(f"❌ FAILED to send focus notification for session {session.session_id} to user {session.user_id}: {e}", exc_info=True)
-                            if "button_data_invalid" in str(e).lower():
-                                logger.warning(
-                                    "Marking session %s as notified after non-retryable Telegram button error to prevent infinite retries",
-                                    session.session_id,
-                                )
-                                sessions_repo.mark_session_notified(session.session_id)
-                            # Keep session unnotified on other failures so the sweeper can retry.
-                            
-                except Exception as e:
-                    logger.error(f"Error in focus timer sweeper: {e}", exc_info=True)
-                    await asyncio.sleep(60)  # Wait longer on error
-        
-        asyncio.create_task(focus_timer_sweeper())
-        logger.info("✓ Started focus timer completion sweeper (checks every 30 seconds)")
-
-        # Start background task for planned session reminders
-        async def plan_session_reminder_sweeper():
-            """Periodically check for planned sessions that are due and send reminders."""
-            from repositories.plan_sessions_repo import PlanSessionsRepository
-            from webapp.notifications import send_plan_session_reminder
-
-            while True:
-                try:
-                    await asyncio.sleep(60)  # Check every 60 seconds
-
-                    plan_sessions_repo = PlanSessionsRepository()
-                    due_sessions = plan_sessions_repo.list_sessions_needing_reminder(lookahead_minutes=1)
-
-                    if due_sessions:
-                        logger.info(f"Found {len(due_sessions)} planned session(s) needing reminder")
-
-                    for ps in due_sessions:
-                        try:
-                            user_id = int(ps["user_id"])
-                            plan_session_id = int(ps["id"])
-                            promise_id = ps.get("promise_id") or ""
-                            promise_text = ps.get("promise_text") or f"Promise {promise_id}"
-
-                            offset = ps.get("reminder_offset_min")
-                            await send_plan_session_reminder(
-                                bot_token=bot_token,
-                                user_id=user_id,
-                                plan_session_id=plan_session_id,
-                                promise_id=promise_id,
-                                promise_text=promise_text,
-                                title=ps.get("title"),
-                                planned_start=ps.get("planned_start"),
-                                planned_duration_min=ps.get("planned_duration_min"),
-                                reminder_offset_min=int(10 if offset is None else offset),
-                            )
-                            plan_sessions_repo.mark_plan_session_notified(plan_session_id)
-                            logger.info(
-                                f"✓ Sent plan session reminder for session {plan_session_id} to user {user_id}"
-                            )
-                        except Exception as e:
-                            logger.error(
-                                f"❌ FAILED to send plan session reminder {ps.get('id')} "
-                                f"to user {ps.get('user_id')}: {e}",
-                                exc_info=True,
-                            )
-                            # Keep notified_at unset so the sweeper retries next cycle.
-
-                except Exception as e:
-                    logger.error(f"Error in plan session reminder sweeper: {e}", exc_info=True)
-                    await asyncio.sleep(60)  # Wait longer on error
+        # Background sweepers share one scheduler: DB-driven next-due times,
+        # wake-ups from request handlers, and leader election across replicas.
+        from services.content_progress_service import get_consumption_coalescer
+        from webapp.sweepers import (
+            make_auth_cleanup_sweep,
+            make_broadcast_sweep,
+            make_content_progress_flush_sweep,
+            make_focus_timer_sweep,
+            make_plan_session_reminder_sweep,
+            make_youtube_watch_stats_sweep,
+        )
+        from webapp.youtube_watch_stats import get_watch_stats_buffer
 
+        sweep_scheduler = app.state.sweep_scheduler
+        sweep_scheduler.register("auth_cleanup", make_auth_cleanup_sweep(auth_session_repo), interval=3600, first_run_delay=3600)
+        sweep_scheduler.register("broadcasts", make_broadcast_sweep(lambda: app.state.bot_token), interval=15)
+        sweep_scheduler.register("focus_timer", make_focus_timer_sweep(bot_token), interval=30)
         if os.getenv("WEBAPP_PLAN_SESSION_REMINDER_SWEEPER", "0") == "1":
-            asyncio.create_task(plan_session_reminder_sweeper())
-        logger.info("✓ Started plan session reminder sweeper (checks every 60 seconds)")
+            sweep_scheduler.register("plan_session_reminders", make_plan_session_reminder_sweep(bot_token), interval=60)
+        coalescer = get_consumption_coalescer()
+        if coalescer:
+            sweep_scheduler.register(
+                "content_progress_flush",
+                make_content_progress_flush_sweep(coalescer),
+                interval=coalescer.flush_seconds,
+                leader_only=False,
+            )
+        watch_stats_buffer = get_watch_stats_buffer()
+        sweep_scheduler.register(
+            "youtube_watch_stats",
+            make_youtube_watch_stats_sweep(watch_stats_buffer),
+            interval=watch_stats_buffer.flush_seconds,
+            leader_only=False,
+        )
 
-        # Start content learning pipeline dispatcher (every 5 seconds when enabled)
+        # Content learning pipeline dispatcher (every 5 seconds when enabled)
         try:
-            await app.state.learning_pipeline_worker.start()
+            await app.state.learning_pipeline_worker.start(scheduler=sweep_scheduler)
         except Exception as e:
             logger.error(f"Failed to start learning pipeline worker: {e}", exc_info=True)
 
-        # Start daily challenge quiz reminder sweeper (gated by env flag).
+        # Daily challenge quiz reminder sweeper (gated by env flag).
         try:
-            await app.state.challenge_reminder_service.start()
+            await app.state.challenge_reminder_service.start(scheduler=sweep_scheduler)
         except Exception as e:
             logger.error(f"Failed to start challenge reminder sweeper: {e}", exc_info=True)
 
+        await sweep_scheduler.start()
+
     @app.on_event("shutdown")
     async def shutdown_event():
         try:
+            await app.state.sweep_scheduler.stop()
+            from services.content_progress_service import get_consumption_coalescer
+            from webapp.youtube_watch_stats import get_watch_stats_buffer
+
+            coalescer = get_consumption_coalescer()
+            if coalescer:
+                await asyncio.to_thread(coalescer.flush_all)
+            await asyncio.to_thread(get_watch_stats_buffer().flush)
             worker = getattr(app.state, "learning_pipeline_worker", None)
             if worker:
                 await worker.stop()
             reminder = getattr(app.state, "challenge_reminder_service", None)
             if reminder:
                 await reminder.stop()
+            from services.telegram_gateway import get_telegram_gateway
+
+            await get_telegram_gateway().aclose()
         except Exception as e:
             logger.warning(f"Failed to stop background workers cleanly: {e}")
     
@@ -0,0 +1,129 @@
+"""
+In-process cache of verified webapp credentials.
+
+A Mini App page load fires a dozen parallel API calls carrying the same session
+token or initData, and each used to repeat the DB session lookup or the initData
+HMAC check. `get_current_user` caches successful verifications here, keyed by a
+SHA-256 digest of the credential (raw tokens are not kept in memory).
+
+An entry never outlives the credential: it expires at the earlier of the
+cache TTL and the session's `expires_at` / initData's auth_date + max age.
+Logout and session revocation invalidate entries immediately on this replica;
+other replicas drop them within the TTL.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from utils.env import env_float, env_int
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def credential_digest(kind: str, credential: str) -> str:
+    """Cache key for a credential of `kind` ('session' or 'init_data')."""
+    return f"{kind}:{hashlib.sha256(credential.encode('utf-8')).hexdigest()}"
+
+
+class VerifiedAuthCache:
+    """Bounded LRU of credential digest -> (user_id, expiry as epoch seconds)."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = (
+            env_float("WEBAPP_AUTH_CACHE_TTL_SECONDS", 60, allow_zero=True) if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = (
+            env_int("WEBAPP_AUTH_CACHE_MAX_ENTRIES", 10000, allow_zero=True) if max_entries is None else max_entries
+        )
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, kind: str, credential: str) -> Optional[int]:
+        """User id of a still-valid cached verification, else None."""
+        if not self.enabled or not credential:
+            return None
+        key = credential_digest(kind, credential)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user_id
+
+    def put(self, kind: str, credential: str, user_id: int, credential_expires_at: Optional[float] = None) -> None:
+        """Cache a successful verification; `credential_expires_at` is epoch seconds."""
+        if not self.enabled or not credential:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if credential_expires_at is not None:
+            expires_at = min(expires_at, credential_expires_at)
+        if expires_at <= time.time():
+            return
+        key = credential_digest(kind, credential)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (int(user_id), expires_at)
+            self._keys_by_user.setdefault(int(user_id), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate(self, kind: str, credential: str) -> None:
+        """Forget one credential (logout)."""
+        if not credential:
+            return
+        with self._lock:
+            self._remove(credential_digest(kind, credential))
+
+    def invalidate_user(self, user_id: int) -> int:
+        """Forget every cached credential of a user (session revocation); returns how many."""
+        with self._lock:
+            keys = list(self._keys_by_user.get(int(user_id), ()))
+            for key in keys:
+                self._remove(key)
+        if keys:
+            logger.debug("Invalidated %d cached credential(s) for user %s", len(keys), user_id)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[0]]
@@ -2,12 +2,13 @@
 Shared dependencies for FastAPI routes.
 """
 
+import asyncio
 from typing import Optional, TYPE_CHECKING
 from fastapi import HTTPException, Header, Depends, Request
 from webapp.auth import validate_telegram_init_data, extract_user_id
 from utils.admin_utils import is_admin
 from utils.logger import get_logger
-from datetime import datetime
+from datetime import datetime, timezone
 
 if TYPE_CHECKING:
     from services.reports import ReportsService
@@ -15,6 +16,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Maximum age of Telegram initData accepted by get_current_user.
+INIT_DATA_MAX_AGE_SECONDS = 86400
+
 
 async def get_current_user(
     request: Request,
@@ -26,16 +30,32 @@ async def get_current_user(
     Supports both:
     1. Session token (browser login): Authorization: Bearer <session_token>
     2. Telegram Mini App initData: X-Telegram-Init-Data or Authorization header
+
+    Successful verifications are cached in app.state.auth_cache (see
+    webapp/auth_cache.py), bounded by the session's / initData's own expiry.
     """
     app = request.app
+    auth_cache = getattr(app.state, "auth_cache", None)
     
     # First, check for session token (browser login)
     if authorization and authorization.startswith("Bearer "):
         session_token = authorization[7:]
+        if auth_cache is not None:
+            cached_user_id = auth_cache.get("session", session_token)
+            if cached_user_id is not None:
+                return cached_user_id
+
         auth_session_repo = app.state.auth_session_repo
-        session = auth_session_repo.get_session(session_token)
+        session = await asyncio.to_thread(auth_session_repo.get_session, session_token)
         
         if session:
+            if auth_cache is not None:
+                auth_cache.put(
+                    "session",
+                    session_token,
+                    session.user_id,
+                    credential_expires_at=session.expires_at.replace(tzinfo=timezone.utc).timestamp(),
+                )
             return session.user_id
         # If session not found, fall through to initData check
     
@@ -54,8 +74,13 @@ async def get_current_user(
             status_code=401,
             detail="Missing Telegram authentication data"
         )
+
+    if auth_cache is not None:
+        cached_user_id = auth_cache.get("init_data", init_data)
+        if cached_user_id is not None:
+            return cached_user_id
     
-    validated = validate_telegram_init_data(init_data, app.state.bot_token)
+    validated = validate_telegram_init_data(init_data, app.state.bot_token, max_age_seconds=INIT_DATA_MAX_AGE_SECONDS)
     if not validated:
         raise HTTPException(
             status_code=401,
@@ -68,6 +93,15 @@ async def get_current_user(
             status_code=401,
             detail="Could not extract user ID from authentication data"
         )
+
+    if auth_cache is not None:
+        auth_date = validated.get("auth_date")
+        auth_cache.put(
+            "init_data",
+            init_data,
+            user_id,
+            credential_expires_at=auth_date + INIT_DATA_MAX_AGE_SECONDS if auth_date else None,
+        )
     
     return user_id
 
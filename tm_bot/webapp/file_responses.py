@@ -0,0 +1,52 @@
+"""
+Conditional file responses for stored media (PDFs, avatars).
+
+Starlette's FileResponse streams the file and answers Range requests; on top of
+that `conditional_file_response` sets a strong ETag and Cache-Control and answers
+304 when If-None-Match matches (`not_modified_response`, also used for generated
+bodies such as avatar thumbnails).
+"""
+
+import os
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+
+def file_etag(path: str, checksum: Optional[str] = None) -> str:
+    """Strong ETag: the stored checksum when known, else size + mtime of the file."""
+    if checksum:
+        return f'"{checksum}"'
+    stat = os.stat(path)
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified_response(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """304 when the request's If-None-Match matches `etag`, else None."""
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def conditional_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    etag: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    etag = etag or file_etag(path)
+    not_modified = not_modified_response(request, etag, cache_control)
+    if not_modified is not None:
+        return not_modified
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
@@ -7,10 +7,11 @@ import html
 from io import BytesIO
 from datetime import datetime, timezone
 from typing import Optional
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, InputFile, WebAppInfo
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputFile, WebAppInfo
 from telegram.error import BadRequest, TelegramError
 from telegram.helpers import escape_markdown
 from repositories.settings_repo import SettingsRepository
+from services.telegram_gateway import get_telegram_bot
 from utils.admin_utils import get_admin_ids
 from utils.calendar_utils import (
     calendar_event_description,
@@ -62,7 +63,7 @@ async def send_club_telegram_setup_request(
         keyboard = InlineKeyboardMarkup([
             [InlineKeyboardButton("Open setup", url=setup_url)]
         ])
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         for admin_id in admin_ids:
             try:
                 await bot.send_message(
@@ -111,7 +112,7 @@ async def send_club_admin_reminder(
         keyboard = InlineKeyboardMarkup([
             [InlineKeyboardButton("Open setup", url=setup_url)]
         ])
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         for admin_id in admin_ids:
             try:
                 await bot.send_message(
@@ -152,7 +153,7 @@ async def send_club_pending_notification(
                 InlineKeyboardButton("Remind admin", callback_data=encode_cb("club_remind", cid=club_id)),
             ]
         ])
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         await bot.send_message(
             chat_id=user_id,
             text=message,
@@ -181,7 +182,7 @@ async def send_club_telegram_ready_notification(
         if not bot_token or not invite_link:
             return
 
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
 
         keyboard = InlineKeyboardMarkup([
             [InlineKeyboardButton("Join Telegram group", url=invite_link)]
@@ -339,7 +340,7 @@ async def send_settings_change_notification(
         if not lines:
             return
 
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         await bot.send_message(
             chat_id=user_id,
             text="\n".join(lines),
@@ -396,7 +397,7 @@ async def send_follow_notification(bot_token: str, follower_id: int, followee_id
         community_url = f"{miniapp_url}/community"
         
         # Create bot instance
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         
         # Construct notification message with profile link if username exists
         if follower_settings.username:
@@ -474,7 +475,7 @@ async def send_suggestion_notifications(
         else:
             suggestion_text = "a promise"
         
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         
         # 1. Send notification to RECEIVER with Accept/Decline buttons
         receiver_message = f"💡 {sender_display} suggested a promise for you!\n\n{suggestion_text}"
@@ -631,7 +632,7 @@ async def send_plan_session_reminder(
             ],
         ])
 
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         await bot.send_message(
             chat_id=user_id,
             text=message,
@@ -757,7 +758,7 @@ async def send_plan_session_saved_notification(
             ],
         ])
 
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         await bot.send_message(
             chat_id=user_id,
             text=message,
@@ -797,7 +798,7 @@ async def send_focus_finished_notification(
     """
     try:
         from handlers.messages_store import get_message, Language
-        from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
         from utils.time_utils import beautify_time
 
         def build_focus_keyboard(include_actions: bool = True) -> InlineKeyboardMarkup:
@@ -871,7 +872,7 @@ async def send_focus_finished_notification(
         logger.info(f"Attempting to send Telegram notification to user {user_id} for session {session_id}")
         logger.debug(f"Bot token present: {bool(bot_token)}, token length: {len(bot_token) if bot_token else 0}")
         
-        bot = Bot(token=bot_token)
+        bot = get_telegram_bot(bot_token)
         try:
             result = await bot.send_message(
                 chat_id=user_id,
@@ -19,6 +19,7 @@ from typing import Optional, Dict, Any, List, Literal
 from fastapi import APIRouter, HTTPException, Query, Depends, Request, UploadFile, File
 from fastapi.responses import StreamingResponse, Response
 from ..dependencies import get_current_user, get_admin_user
+from ..sweepers import wake_sweeper
 from ..schemas import (
     AdminUsersResponse, AdminUserUpdateRequest, CreateBroadcastRequest, UpdateBroadcastRequest,
     BroadcastResponse, BotTokenResponse, ConversationResponse, ConversationMessage,
@@ -822,6 +823,18 @@ async def get_admin_stats(
         raise HTTPException(status_code=500, detail=f"Failed to compute stats: {str(e)}")
 
 
+@router.get("/sweepers")
+async def get_sweeper_stats(
+    request: Request,
+    admin_id: int = Depends(get_admin_user)
+):
+    """Background sweeper metrics for this replica: runs, errors, duration and lag (admin only)."""
+    scheduler = getattr(request.app.state, "sweep_scheduler", None)
+    if scheduler is None:
+        return {"leader": False, "sweepers": {}}
+    return scheduler.stats()
+
+
 @router.get("/llm-usage")
 async def get_llm_usage(
     hours: int = Query(24, ge=1, le=24 * 90),
@@ -1606,6 +1619,8 @@ async def create_broadcast(
 
             for broadcast_id in broadcast_ids:
                 asyncio.create_task(_dispatch_immediate(broadcast_id))
+        else:
+            wake_sweeper(request.app, "broadcasts")
         
         # Get created broadcast (primary group in source language if available)
         primary_id = broadcast_ids_by_language.get(source_language, broadcast_ids[0])
@@ -1810,6 +1825,8 @@ async def update_broadcast(
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update broadcast")
+        if scheduled_dt is not None:
+            wake_sweeper(request.app, "broadcasts")
         
         # Get updated broadcast
         updated_broadcast = broadcasts_repo.get_broadcast(broadcast_id)
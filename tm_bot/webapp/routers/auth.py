@@ -2,9 +2,12 @@
 Authentication endpoints.
 """
 
+import asyncio
 import time
-from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from ..auth import validate_telegram_widget_auth, extract_user_id
+from ..dependencies import get_current_user
 from ..schemas import TelegramLoginRequest, TelegramLoginResponse
 from utils.dev_auth import get_dev_admin_user_id, is_dev_auth_enabled
 from utils.logger import get_logger
@@ -98,6 +101,31 @@ async def telegram_login(request: Request, login_request: TelegramLoginRequest):
         raise HTTPException(status_code=500, detail=f"Authentication failed: {str(e)}")
 
 
+@router.post("/logout")
+async def logout(request: Request, authorization: Optional[str] = Header(None)):
+    """
+    Revoke the browser session sent as `Authorization: Bearer <session_token>`.
+    Mini App initData has no server-side session, so there is nothing to revoke.
+    """
+    if authorization and authorization.startswith("Bearer "):
+        session_token = authorization[7:]
+        auth_cache = getattr(request.app.state, "auth_cache", None)
+        await asyncio.to_thread(request.app.state.auth_session_repo.delete_session, session_token)
+        if auth_cache is not None:
+            auth_cache.invalidate("session", session_token)
+    return {"status": "ok"}
+
+
+@router.post("/sessions/revoke")
+async def revoke_sessions(request: Request, user_id: int = Depends(get_current_user)):
+    """Revoke all of the current user's browser sessions (e.g. after a lost device)."""
+    auth_cache = getattr(request.app.state, "auth_cache", None)
+    revoked = await asyncio.to_thread(request.app.state.auth_session_repo.delete_user_sessions, user_id)
+    if auth_cache is not None:
+        auth_cache.invalidate_user(user_id)
+    return {"revoked": revoked}
+
+
 @router.get("/bot-username")
 async def get_bot_username_endpoint(request: Request):
     """
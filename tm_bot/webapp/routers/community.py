@@ -634,6 +634,14 @@ async def update_club_settings(
                     text(f"UPDATE clubs SET {set_clause}, updated_at_utc = :updated_at_utc WHERE club_id = :club_id;"),
                     updates,
                 )
+            if {"reminder_time", "timezone", "leaderboard_time"} & updates.keys():
+                # Move the bot's club timer to the new reminder/leaderboard time.
+                try:
+                    from services.club_reminder_service import refresh_club_schedule
+
+                    refresh_club_schedule(club_id)
+                except Exception as e:
+                    logger.warning(f"Could not reschedule club {club_id}: {e}")
 
         clubs = _list_user_clubs(user_id)
         updated = next((c for c in clubs if c.club_id == club_id), None)
@@ -4,8 +4,8 @@ Content consumption manager API: resolve URL, user library, consume events, heat
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Request
-from fastapi.responses import FileResponse
 from ..dependencies import get_current_user
+from ..file_responses import conditional_file_response
 from ..schemas import (
     ResolveContentRequest,
     AddUserContentRequest,
@@ -51,9 +51,9 @@ def get_resolve_service() -> "ContentResolveService":
 
 
 def get_progress_service() -> "ContentProgressService":
-    from services.content_progress_service import ContentProgressService
+    from services.content_progress_service import ContentProgressService, get_consumption_coalescer
 
-    return ContentProgressService(content_repo=get_content_repo())
+    return ContentProgressService(content_repo=get_content_repo(), coalescer=get_consumption_coalescer())
 
 
 def get_learning_service() -> "LearningPipelineService":
@@ -62,10 +62,17 @@ def get_learning_service() -> "LearningPipelineService":
     return LearningPipelineService()
 
 
+_object_storage_service: Optional["ObjectStorageService"] = None
+
+
 def get_object_storage_service() -> "ObjectStorageService":
-    from services.object_storage_service import ObjectStorageService
+    """Shared instance: one boto3 client and one signed-URL cache per process."""
+    global _object_storage_service
+    if _object_storage_service is None:
+        from services.object_storage_service import ObjectStorageService
 
-    return ObjectStorageService()
+        _object_storage_service = ObjectStorageService()
+    return _object_storage_service
 
 
 @router.post("/content/resolve")
@@ -109,26 +116,35 @@ async def get_my_contents(
     limit: int = 20,
     user_id: int = Depends(get_current_user),
 ) -> Dict[str, Any]:
-    """Paginated list of user's content with content + user_content + rollup buckets."""
+    """
+    Paginated list of user's content with content + user_content + rollup buckets.
+
+    `next_cursor` is an opaque keyset cursor tied to the sort mode. Facet
+    counts are returned with the first page only.
+    """
     repo = get_content_repo()
     safe_limit = max(1, min(int(limit or 20), 100))
     resolved_status = None if status in (None, "", "all") else status
     resolved_type = None if content_type in (None, "", "all") else content_type
-    rows = repo.get_user_contents(
-        str(user_id),
-        status=resolved_status,
-        cursor=cursor,
-        limit=safe_limit + 1,
-        q=q,
-        content_type=resolved_type,
-        sort=sort,
-    )
+    try:
+        rows = repo.get_user_contents(
+            str(user_id),
+            status=resolved_status,
+            cursor=cursor,
+            limit=safe_limit + 1,
+            q=q,
+            content_type=resolved_type,
+            sort=sort,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     has_next = len(rows) > safe_limit
     visible_rows = rows[:safe_limit]
     # Normalize for JSON: ensure buckets is list, metadata_json is dict
     items: List[Dict[str, Any]] = []
     for r in visible_rows:
         item = dict(r)
+        item.pop("cursor", None)
         if "buckets" in item and item["buckets"] is not None:
             b = item["buckets"]
             item["buckets"] = b if isinstance(b, list) else []
@@ -136,20 +152,12 @@ async def get_my_contents(
             m = item["metadata_json"]
             item["metadata_json"] = m if isinstance(m, dict) else {}
         items.append(item)
-    next_cursor = None
-    if has_next and visible_rows:
-        current_offset = 0
-        if cursor and cursor.startswith("offset:"):
-            try:
-                current_offset = max(0, int(cursor.split(":", 1)[1]))
-            except (TypeError, ValueError):
-                current_offset = 0
-        next_cursor = f"offset:{current_offset + len(visible_rows)}"
+    next_cursor = visible_rows[-1]["cursor"] if has_next and visible_rows else None
     return {
         "items": items,
         "count": len(items),
         "next_cursor": next_cursor,
-        "facets": repo.get_user_content_facets(str(user_id), q=q),
+        "facets": None if cursor else repo.get_user_content_facets(str(user_id), q=q),
     }
 
 
@@ -171,16 +179,19 @@ async def post_consume_event(
         ended_at=body.ended_at,
         client=body.client,
     )
+    if body.session_end:
+        _flush_pending_progress(user_id, body.content_id)
+    if not (
+        body.position_unit == "ratio"
+        and body.client == "web_pdf_reader_read"
+        and body.end_position > body.start_position
+    ):
+        return result
     try:
         repo = get_content_repo()
         uc = repo.get_user_content(str(user_id), body.content_id)
         promise_id = str((uc or {}).get("assigned_promise_id") or "").strip()
-        if (
-            promise_id
-            and body.position_unit == "ratio"
-            and body.client == "web_pdf_reader_read"
-            and body.end_position > body.start_position
-        ):
+        if promise_id:
             content = repo.get_content_by_id(body.content_id) or {}
             estimated_seconds = content.get("estimated_read_seconds") or content.get("duration_seconds")
             if estimated_seconds:
@@ -204,12 +215,27 @@ async def post_consume_event(
     return result
 
 
+def _flush_pending_progress(user_id: int, content_id: str) -> None:
+    """Write buffered consumption of (user, content) now, e.g. when a reading session ends."""
+    from services.content_progress_service import get_consumption_coalescer
+
+    coalescer = get_consumption_coalescer()
+    if coalescer:
+        coalescer.flush(str(user_id), content_id)
+
+
 @router.get("/content/{content_id}/heatmap")
 async def get_content_heatmap(
     content_id: str,
     user_id: int = Depends(get_current_user),
 ) -> Dict[str, Any]:
-    """Return bucket_count and buckets for content heatmap."""
+    """Return bucket_count and buckets for content heatmap (including not yet flushed segments)."""
+    from services.content_progress_service import get_consumption_coalescer
+
+    coalescer = get_consumption_coalescer()
+    pending = coalescer.pending_buckets(str(user_id), content_id) if coalescer else None
+    if pending:
+        return {"bucket_count": len(pending), "buckets": pending}
     repo = get_content_repo()
     data = repo.get_heatmap(str(user_id), content_id)
     if not data:
@@ -247,6 +273,7 @@ async def get_pdf_content_open(
     Return latest PDF asset + signed URL + resume fields for a user's content item.
     """
     uid = str(user_id)
+    _flush_pending_progress(user_id, content_id)
     repo = get_content_repo()
     uc = repo.get_user_content(uid, content_id)
     if not uc:
@@ -294,6 +321,7 @@ async def get_pdf_content_open(
 
 @router.get("/content/{content_id}/pdf/file")
 async def get_pdf_content_file(
+    request: Request,
     content_id: str,
     asset_id: Optional[str] = None,
     user_id: int = Depends(get_current_user),
@@ -301,6 +329,7 @@ async def get_pdf_content_file(
     """
     Stream a locally stored PDF file for an owned content item.
     Used for local-storage MVP fallback when S3/object storage is unavailable.
+    Supports Range requests (the reader fetches pages on demand) and ETag revalidation.
     """
     uid = str(user_id)
     repo = get_content_repo()
@@ -332,10 +361,14 @@ async def get_pdf_content_file(
     if not path.exists():
         raise HTTPException(status_code=404, detail="PDF file missing on server")
 
-    return FileResponse(
-        path=str(path),
+    # An asset id names immutable bytes; without one the latest asset may change, so revalidate.
+    return conditional_file_response(
+        request,
+        str(path),
         media_type="application/pdf",
+        etag=f'"{asset["checksum"]}"' if asset.get("checksum") else None,
         filename=f"{content_id}.pdf",
+        cache_control="private, max-age=31536000, immutable" if asset_id else "private, no-cache",
     )
 
 
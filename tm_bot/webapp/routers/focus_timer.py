@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Request
 from ..dependencies import get_current_user, get_settings_repo
+from ..sweepers import wake_sweeper
 from ..schemas import (
     StartFocusRequest, FocusSessionResponse, PauseFocusRequest,
     ResumeFocusRequest, StopFocusRequest
@@ -110,6 +111,8 @@ async def start_focus(
         sessions_service.sessions_repo.update_session(created_session)
         
         logger.info(f"Created focus session {created_session.session_id} with expected_end_utc: {created_session.expected_end_utc}")
+        # Let the completion sweeper pick up the new expected end time.
+        wake_sweeper(request.app, "focus_timer")
         
         return session_to_response(created_session, promise.text)
         
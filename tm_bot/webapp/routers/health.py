@@ -2,10 +2,13 @@
 Health check and media serving endpoints.
 """
 
+import asyncio
 import os
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import FileResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response
 from ..dependencies import get_current_user
+from ..file_responses import conditional_file_response, file_etag, not_modified_response
 
 router = APIRouter(tags=["health"])
 
@@ -20,6 +23,7 @@ async def health_check():
 async def get_user_avatar(
     request: Request,
     user_id: str,
+    size: Optional[str] = Query(None, description="'thumb' for the 96 px WebP thumbnail"),
     current_user_id: int = Depends(get_current_user),
 ):
     """
@@ -27,6 +31,7 @@ async def get_user_avatar(
     
     Args:
         user_id: User ID (string)
+        size: 'thumb' serves the cached thumbnail (shared with the leaderboard renderer)
     
     Returns:
         Avatar image file or 404 if not found/not visible (auth required)
@@ -92,6 +97,24 @@ async def get_user_avatar(
         if not os.path.exists(full_path):
             raise HTTPException(status_code=404, detail="Avatar file not found")
         
+        if size == "thumb":
+            from services.avatar_service import avatar_thumbnail
+
+            # The thumbnail is derived from the avatar file, so its size + mtime identify it too.
+            etag = file_etag(full_path).rstrip('"') + '-thumb"'
+            cache_control = "public, max-age=86400"
+            not_modified = not_modified_response(request, etag, cache_control)
+            if not_modified is not None:
+                return not_modified
+            thumbnail = await asyncio.to_thread(avatar_thumbnail, full_path)
+            if thumbnail:
+                content, media_type = thumbnail
+                return Response(
+                    content=content,
+                    media_type=media_type,
+                    headers={"ETag": etag, "Cache-Control": cache_control},
+                )
+
         # Determine content type from file extension
         content_type = "image/jpeg"  # Default
         if full_path.lower().endswith(".png"):
@@ -99,12 +122,11 @@ async def get_user_avatar(
         elif full_path.lower().endswith(".gif"):
             content_type = "image/gif"
         
-        return FileResponse(
+        return conditional_file_response(
+            request,
             full_path,
             media_type=content_type,
-            headers={
-                "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
-            }
+            cache_control="public, max-age=86400",  # Cache for 24 hours, then revalidate via ETag
         )
             
     except HTTPException:
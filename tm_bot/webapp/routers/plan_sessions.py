@@ -11,6 +11,7 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy import text
 
 from ..dependencies import get_current_user
+from ..sweepers import wake_sweeper
 from ..schemas import (
     PlanSessionIn,
     PlanSessionOut,
@@ -166,6 +167,7 @@ async def create_plan_session(
     p_uuid = _resolve_uuid(user_id, promise_id)
     result = PlanSessionsRepository().create(p_uuid, user_id, _session_payload(body.model_dump(), user_id))
     _fire_session_saved_dm(request, user_id, result, is_edit=False)
+    wake_sweeper(request.app, "plan_session_reminders")
     return result
 
 
@@ -220,4 +222,5 @@ async def update_plan_session(
     if not result:
         raise HTTPException(status_code=404, detail="Session not found")
     _fire_session_saved_dm(request, user_id, result, is_edit=True)
+    wake_sweeper(request.app, "plan_session_reminders")
     return result
@@ -402,8 +402,8 @@ async def update_user_timezone(
                     ])
                     
                     # Send message
-                    from telegram import Bot
-                    bot = Bot(token=request.app.state.bot_token)
+                    from services.telegram_gateway import get_telegram_bot
+                    bot = get_telegram_bot(request.app.state.bot_token)
                     await bot.send_message(
                         chat_id=user_id,
                         text=prompt_msg,
@@ -98,7 +98,6 @@ async def report_stats(request: Request):
 
     logger.info("youtube report_stats: validated user_id=%s, appending stats", user_id)
     append_stats(
-        root_dir=root_dir,
         user_id=user_id,
         video_id=video_id,
         time_spent_seconds=time_spent,
@@ -108,7 +107,7 @@ async def report_stats(request: Request):
     # Bridge to content consumption manager: resolve video and record segments
     try:
         from services.content_resolve_service import ContentResolveService
-        from services.content_progress_service import ContentProgressService
+        from services.content_progress_service import ContentProgressService, get_consumption_coalescer
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
         resolve_svc = ContentResolveService()
         resolved = resolve_svc.resolve(youtube_url)
@@ -121,7 +120,9 @@ async def report_stats(request: Request):
                     ContentRepository().assign_user_content_to_promise(str(user_id), str(content_id), str(promise_id))
                 except Exception as assign_exc:
                     logger.debug("youtube report_stats: content assignment bridge failed: %s", assign_exc)
-            progress_svc = ContentProgressService()
+            # The player reports once, on close: buffer its segments and write them in one go.
+            coalescer = get_consumption_coalescer()
+            progress_svc = ContentProgressService(coalescer=coalescer)
             if segments:
                 for seg in segments:
                     if isinstance(seg, (list, tuple)) and len(seg) >= 2:
@@ -143,6 +144,8 @@ async def report_stats(request: Request):
                     position_unit="seconds",
                     client="telegram_web",
                 )
+            if coalescer:
+                coalescer.flush(str(user_id), str(content_id))
     except Exception as e:
         logger.debug("youtube report_stats: content manager bridge failed (tables may not exist): %s", e)
     if promise_id and time_spent >= MIN_WATCH_SECONDS_FOR_TASK_LOG:
@@ -174,8 +177,8 @@ async def report_stats(request: Request):
     if time_spent >= MIN_WATCH_SECONDS_FOR_TASK_LOG:
         summary = format_summary_message(video_id, time_spent, segments)
         try:
-            from telegram import Bot
-            bot = Bot(token=bot_token)
+            from services.telegram_gateway import get_telegram_bot
+            bot = get_telegram_bot(bot_token)
             await bot.send_message(chat_id=user_id, text=summary)
             logger.info("youtube report_stats: Telegram message sent to user_id=%s", user_id)
         except Exception as e:
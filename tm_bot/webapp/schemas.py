@@ -598,6 +598,7 @@ class ConsumeEventRequest(BaseModel):
     started_at: Optional[str] = None
     ended_at: Optional[str] = None
     client: Optional[str] = None
+    session_end: bool = False  # reader/player closing: write buffered progress now
 
 
 class UpdateUserContentRequest(BaseModel):
@@ -0,0 +1,187 @@
+"""
+Background sweepers run by the webapp's ``SweepScheduler``.
+
+Each ``make_*`` factory returns the coroutine function the scheduler calls. A
+pass handles everything that is due, offloads repository calls to worker
+threads, and returns the next time it expects work (read from the DB) so the
+scheduler can sleep until then instead of polling on a fixed period.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Sweep = Callable[[], Awaitable[Optional[datetime]]]
+
+BROADCAST_BATCH_SIZE = 25
+PLAN_SESSION_REMINDER_LOOKAHEAD_MINUTES = 1
+
+
+def make_auth_cleanup_sweep(auth_session_repo) -> Sweep:
+    async def sweep() -> Optional[datetime]:
+        await asyncio.to_thread(auth_session_repo.cleanup_expired)
+        return None
+
+    return sweep
+
+
+def make_broadcast_sweep(get_bot_token: Callable[[], Optional[str]]) -> Sweep:
+    """Dispatch due pending broadcasts; next due is the earliest future scheduled_time_utc."""
+    from repositories.broadcasts_repo import BroadcastsRepository
+    from services.broadcast_service import execute_broadcast_from_db
+
+    broadcasts_repo = BroadcastsRepository()
+
+    async def sweep() -> Optional[datetime]:
+        due_broadcasts = await asyncio.to_thread(
+            broadcasts_repo.list_due_broadcasts,
+            now_utc=datetime.now(timezone.utc),
+            limit=BROADCAST_BATCH_SIZE,
+        )
+        if due_broadcasts:
+            logger.info("Broadcast dispatcher found %d due pending broadcast(s)", len(due_broadcasts))
+
+        for broadcast in due_broadcasts:
+            try:
+                await execute_broadcast_from_db(
+                    response_service=None,
+                    broadcast_id=broadcast.broadcast_id,
+                    default_bot_token=get_bot_token(),
+                )
+            except Exception as e:
+                logger.error("Failed to execute due broadcast %s: %s", broadcast.broadcast_id, e, exc_info=True)
+
+        if len(due_broadcasts) >= BROADCAST_BATCH_SIZE:
+            return datetime.now(timezone.utc)  # more may be waiting
+        return await asyncio.to_thread(broadcasts_repo.next_scheduled_time_utc, datetime.now(timezone.utc))
+
+    return sweep
+
+
+def make_focus_timer_sweep(bot_token: Optional[str]) -> Sweep:
+    """Notify users whose focus session has run past its expected end."""
+    from repositories.promises_repo import PromisesRepository
+    from repositories.sessions_repo import SessionsRepository
+    from webapp.notifications import send_focus_finished_notification
+
+    sessions_repo = SessionsRepository()
+    promises_repo = PromisesRepository()
+    miniapp_url = os.getenv("MINIAPP_URL", "https://xaana.club")
+
+    async def sweep() -> Optional[datetime]:
+        overdue_sessions = await asyncio.to_thread(sessions_repo.list_overdue_sessions_needing_notification)
+        if overdue_sessions:
+            logger.info(f"Found {len(overdue_sessions)} overdue focus session(s) needing notification")
+
+        for session in overdue_sessions:
+            try:
+                logger.info(f"Processing overdue session {session.session_id} for user {session.user_id}, "
+                            f"expected_end: {session.expected_end_utc}, "
+                            f"planned_duration: {session.planned_duration_minutes} minutes")
+
+                promise = await asyncio.to_thread(promises_repo.get_promise, int(session.user_id), session.promise_id)
+                promise_text = promise.text if promise else f"Promise #{session.promise_id}"
+                proposed_hours = (session.planned_duration_minutes or 25) / 60.0
+
+                await send_focus_finished_notification(
+                    bot_token=bot_token,
+                    user_id=int(session.user_id),
+                    session_id=session.session_id,
+                    promise_text=promise_text,
+                    proposed_hours=proposed_hours,
+                    miniapp_url=miniapp_url,
+                )
+                await asyncio.to_thread(sessions_repo.mark_session_notified, session.session_id)
+                logger.info(f"✓ Successfully sent focus completion notification for session {session.session_id} to user {session.user_id}")
+            except Exception as e:
+                logger.error(f"❌ FAILED to send focus notification for session {session.session_id} to user {session.user_id}: {e}", exc_info=True)
+                if "button_data_invalid" in str(e).lower():
+                    logger.warning(
+                        "Marking session %s as notified after non-retryable Telegram button error to prevent infinite retries",
+                        session.session_id,
+                    )
+                    await asyncio.to_thread(sessions_repo.mark_session_notified, session.session_id)
+                # Keep session unnotified on other failures so the next pass retries.
+
+        return await asyncio.to_thread(sessions_repo.next_notification_due_utc)
+
+    return sweep
+
+
+def make_plan_session_reminder_sweep(bot_token: Optional[str]) -> Sweep:
+    """Send reminders for planned sessions whose reminder time has come."""
+    from repositories.plan_sessions_repo import PlanSessionsRepository
+    from webapp.notifications import send_plan_session_reminder
+
+    plan_sessions_repo = PlanSessionsRepository()
+    lookahead = PLAN_SESSION_REMINDER_LOOKAHEAD_MINUTES
+
+    async def sweep() -> Optional[datetime]:
+        due_sessions = await asyncio.to_thread(plan_sessions_repo.list_sessions_needing_reminder, lookahead)
+        if due_sessions:
+            logger.info(f"Found {len(due_sessions)} planned session(s) needing reminder")
+
+        for ps in due_sessions:
+            try:
+                user_id = int(ps["user_id"])
+                plan_session_id = int(ps["id"])
+                promise_id = ps.get("promise_id") or ""
+                promise_text = ps.get("promise_text") or f"Promise {promise_id}"
+
+                offset = ps.get("reminder_offset_min")
+                await send_plan_session_reminder(
+                    bot_token=bot_token,
+                    user_id=user_id,
+                    plan_session_id=plan_session_id,
+                    promise_id=promise_id,
+                    promise_text=promise_text,
+                    title=ps.get("title"),
+                    planned_start=ps.get("planned_start"),
+                    planned_duration_min=ps.get("planned_duration_min"),
+                    reminder_offset_min=int(10 if offset is None else offset),
+                )
+                await asyncio.to_thread(plan_sessions_repo.mark_plan_session_notified, plan_session_id)
+                logger.info(f"✓ Sent plan session reminder for session {plan_session_id} to user {user_id}")
+            except Exception as e:
+                logger.error(
+                    f"❌ FAILED to send plan session reminder {ps.get('id')} "
+                    f"to user {ps.get('user_id')}: {e}",
+                    exc_info=True,
+                )
+                # Keep notified_at unset so the next pass retries.
+
+        return await asyncio.to_thread(plan_sessions_repo.next_reminder_at, lookahead)
+
+    return sweep
+
+
+def make_content_progress_flush_sweep(coalescer) -> Sweep:
+    """Write buffered content consumption that has waited its flush delay (per replica, not leader-only)."""
+
+    async def sweep() -> Optional[datetime]:
+        await asyncio.to_thread(coalescer.flush_due)
+        return None
+
+    return sweep
+
+
+def make_youtube_watch_stats_sweep(buffer) -> Sweep:
+    """Write queued YouTube watch reports in batches (per replica, not leader-only)."""
+
+    async def sweep() -> Optional[datetime]:
+        await asyncio.to_thread(buffer.flush)
+        return None
+
+    return sweep
+
+
+def wake_sweeper(app, name: str) -> None:
+    """Ask the app's sweep scheduler to run ``name`` now (no-op when it is not running)."""
+    scheduler = getattr(app.state, "sweep_scheduler", None)
+    if scheduler is not None:
+        scheduler.wake(name)
@@ -1,6 +1,12 @@
 """
-Append-only storage for YouTube watch stats (JSONL under ROOT_DIR).
-No DB for now; file path: ROOT_DIR/youtube_watch_stats/youtube_watch_stats.jsonl
+YouTube watch stats: buffered, batched writes to Postgres (youtube_watch_event
+plus the youtube_watch_daily rollup, see YoutubeWatchRepository).
+
+Reports are queued in process by `append_stats` and written in batches by the
+webapp's "youtube_watch_stats" sweeper and on shutdown, so every replica writes
+to the same tables instead of a JSONL file on its own disk. Old JSONL files
+(ROOT_DIR/youtube_watch_stats/youtube_watch_stats.jsonl) can be loaded with
+scripts/import_youtube_watch_stats.py.
 
 Also helpers for signed user token (fallback when init_data is empty, e.g. inline web_app).
 """
@@ -10,40 +16,132 @@ import json
 import hmac
 import hashlib
 import base64
+import threading
+import uuid
+from collections import deque
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from utils.env import env_int
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def legacy_stats_path(root_dir: str) -> str:
+    """Where the webapp used to append watch stats as JSONL."""
+    return os.path.join(root_dir, "youtube_watch_stats", "youtube_watch_stats.jsonl")
+
+
+def iter_legacy_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Records of a legacy JSONL file, with a stable id derived from the line so
+    importing the same file twice inserts nothing the second time.
+    Unparseable lines are logged and skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                record["id"] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"youtube_watch_stats:{line}"))
+                if not record.get("ts") or not record.get("video_id") or record.get("user_id") is None:
+                    raise ValueError("missing ts, user_id or video_id")
+            except ValueError as exc:
+                logger.warning("Skipping %s:%d: %s", path, line_no, exc)
+                continue
+            yield record
+
+
+class WatchStatsBuffer:
+    """Thread-safe queue of watch reports, written to the DB in batches."""
+
+    def __init__(
+        self,
+        repo=None,
+        batch_size: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self._repo = repo
+        self.batch_size = batch_size or env_int("YOUTUBE_WATCH_STATS_BATCH", 500)
+        self.max_pending = max_pending or env_int("YOUTUBE_WATCH_STATS_MAX_PENDING", 50000)
+        self.flush_seconds = env_int("YOUTUBE_WATCH_STATS_FLUSH_SECONDS", 5)
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def repo(self):
+        if self._repo is None:
+            from repositories.youtube_watch_repo import YoutubeWatchRepository
+
+            self._repo = YoutubeWatchRepository()
+        return self._repo
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append(record)
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning("YouTube watch stats queue full, dropped %d oldest report(s)", self.dropped)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write everything queued, batch_size reports per statement; returns how many were written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                try:
+                    self.repo.insert_watch_events(batch)
+                except Exception as exc:
+                    logger.warning("Writing %d YouTube watch report(s) failed, keeping them queued: %s", len(batch), exc)
+                    with self._lock:
+                        self._pending.extendleft(reversed(batch))
+                    return written
+                written += len(batch)
 
 
-def _stats_dir(root_dir: str) -> str:
-    d = os.path.join(root_dir, "youtube_watch_stats")
-    os.makedirs(d, exist_ok=True)
-    return d
+_buffer: Optional[WatchStatsBuffer] = None
+_buffer_lock = threading.Lock()
 
 
-def _stats_path(root_dir: str) -> str:
-    return os.path.join(_stats_dir(root_dir), "youtube_watch_stats.jsonl")
+def get_watch_stats_buffer() -> WatchStatsBuffer:
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = WatchStatsBuffer()
+        return _buffer
 
 
 def append_stats(
-    root_dir: str,
     user_id: int,
     video_id: str,
     time_spent_seconds: float,
     segments: List[List[float]],
     closed_via: str = "done",
 ) -> None:
-    """Append one stats record to the JSONL file."""
-    record = {
+    """Queue one watch report; the stats sweeper writes it shortly after."""
+    get_watch_stats_buffer().add({
+        "id": str(uuid.uuid4()),
         "ts": datetime.utcnow().isoformat() + "Z",
         "user_id": user_id,
         "video_id": video_id,
         "time_spent_seconds": round(time_spent_seconds, 1),
         "segments": segments,
         "closed_via": closed_via,
-    }
-    path = _stats_path(root_dir)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    })
 
 
 def create_user_token(user_id: int, bot_token: str) -> str:
@@ -223,6 +223,22 @@ class ApiClient {
     localStorage.removeItem('telegram_auth_token');
   }
 
+  /**
+   * Revoke the browser session on the server and clear local auth (logout).
+   * Local auth is cleared immediately; the server call is best-effort.
+   */
+  async logout(): Promise<void> {
+    const revoke = this.authToken
+      ? this.request<{ status: string }>('/auth/logout', { method: 'POST' })
+      : null;
+    this.clearAuth();
+    try {
+      await revoke;
+    } catch {
+      // The session still expires server-side.
+    }
+  }
+
   /**
    * Make an authenticated API request.
    * Supports both session token (browser) and initData (Telegram Mini App).
@@ -270,23 +286,12 @@ class ApiClient {
     return response.json();
   }
 
-  async fetchPdfBlob(pdfUrl: string): Promise<Blob> {
-    const isApiPath = pdfUrl.startsWith('/api/');
-    const headers = isApiPath ? this.buildAuthHeaders() : {};
-    const response = await fetch(pdfUrl, { method: 'GET', headers });
-    if (!response.ok) {
-      let errorMessage = `HTTP error ${response.status}`;
-      try {
-        const errorData = await response.json();
-        if (errorData?.detail) {
-          errorMessage = typeof errorData.detail === 'string' ? errorData.detail : JSON.stringify(errorData.detail);
-        }
-      } catch {
-        // keep default HTTP error message
-      }
-      throw new ApiError(response.status, errorMessage);
-    }
-    return response.blob();
+  /**
+   * Auth headers for loading a PDF URL directly (pdf.js range requests).
+   * Signed object-storage URLs carry their own authorization.
+   */
+  pdfRequestHeaders(pdfUrl: string): Record<string, string> {
+    return pdfUrl.startsWith('/api/') ? this.buildAuthHeaders() : {};
   }
 
   /**
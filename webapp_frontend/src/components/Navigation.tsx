@@ -148,7 +148,7 @@ export function Navigation(_props: NavigationProps) {
   const shouldShowBack = canGoBack || !!shellPage.showBack;
 
   const handleLogout = () => {
-    apiClient.clearAuth();
+    void apiClient.logout();
     window.dispatchEvent(new Event('logout'));
     setShowProfileMenu(false);
     navigate('/', { replace: true });
@@ -46,7 +46,7 @@ export function ActivityItem({
   const shownName = isCurrentUser ? 'You' : displayName;
 
   const avatarUrl = !imageError && actor.avatar_path
-    ? (actor.avatar_path.startsWith('http') ? actor.avatar_path : `/api/media/avatars/${actor.user_id}`)
+    ? (actor.avatar_path.startsWith('http') ? actor.avatar_path : `/api/media/avatars/${actor.user_id}?size=thumb`)
     : null;
 
   const openProfile = () => {
@@ -41,7 +41,7 @@ export function CompactUserChip({
   const canFollow = showFollowButton && !isOwnCard && !!onFollowToggle;
 
   const avatarUrl = !imageError && user.avatar_path
-    ? (user.avatar_path.startsWith('http') ? user.avatar_path : `/api/media/avatars/${user.user_id}`)
+    ? (user.avatar_path.startsWith('http') ? user.avatar_path : `/api/media/avatars/${user.user_id}?size=thumb`)
     : null;
 
   const openProfile = () => {
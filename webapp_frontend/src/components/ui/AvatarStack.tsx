@@ -41,7 +41,7 @@ export function AvatarStack({ users, size = 22, max = 3 }: AvatarStackProps) {
         const avatarSrc = (!hasFailed && user.avatar_path)
           ? user.avatar_path.startsWith('http')
             ? user.avatar_path
-            : `/api/media/avatars/${user.user_id}`
+            : `/api/media/avatars/${user.user_id}?size=thumb`
           : null;
 
         return (
@@ -124,7 +124,9 @@ export function MyContentsPage() {
       );
       setItems((prev) => (isMore ? [...prev, ...response.items] : response.items));
       setNextCursor(response.next_cursor || null);
-      setFacets(response.facets || {});
+      if (!isMore) {
+        setFacets(response.facets || {});
+      }
     } catch (err) {
       if (err instanceof ApiError) {
         setError(err.message || 'Failed to load library');
@@ -9,7 +9,7 @@ import type { PdfHighlight } from '../types';
 import { HighlightLayer } from './pdfReader/HighlightLayer';
 import { HighlightPopover } from './pdfReader/HighlightPopover';
 import { useHighlightPopover } from './pdfReader/useHighlightPopover';
-import { usePdfDocument } from './pdfReader/usePdfDocument';
+import { usePdfDocument, type PdfSource } from './pdfReader/usePdfDocument';
 import { usePinchZoom } from './pdfReader/usePinchZoom';
 import { clearNativeSelection, detectTextLayerDirection, useTextSelection } from './pdfReader/useTextSelection';
 import type { ViewportAnchor } from './pdfReader/types';
@@ -51,7 +51,7 @@ export function PdfReaderPage() {
 
   const [assetId, setAssetId] = useState('');
   const [pdfUrl, setPdfUrl] = useState('');
-  const [pdfBytes, setPdfBytes] = useState<Uint8Array | null>(null);
+  const [pdfSource, setPdfSource] = useState<PdfSource | null>(null);
   const [expiresAt, setExpiresAt] = useState('');
   const [progressRatio, setProgressRatio] = useState(0);
   const [resumeRatio, setResumeRatio] = useState(0);
@@ -106,7 +106,7 @@ export function PdfReaderPage() {
     setPageNumber,
     documentRendering,
   } = usePdfDocument({
-    pdfBytes,
+    pdfSource,
     resumeRatioRef,
     pendingScrollFractionRef,
     setError,
@@ -214,6 +214,7 @@ export function PdfReaderPage() {
         end_position: boundedRatio,
         position_unit: 'ratio',
         client: 'web_pdf_reader_checkpoint',
+        ...(keepalive ? { session_end: true } : {}),
       }, keepalive ? { keepalive: true } : {});
       savedRatioRef.current = boundedRatio;
       setSyncStatus('saved');
@@ -273,13 +274,12 @@ export function PdfReaderPage() {
     setLoading(true);
     setError('');
     setPdfUrl('');
-    setPdfBytes(null);
+    setPdfSource(null);
     try {
       const open = await apiClient.getPdfOpen(contentId);
       setAssetId(open.asset_id);
       setPdfUrl(open.pdf_url);
-      const blob = await apiClient.fetchPdfBlob(open.pdf_url);
-      setPdfBytes(new Uint8Array(await blob.arrayBuffer()));
+      setPdfSource({ url: open.pdf_url, httpHeaders: apiClient.pdfRequestHeaders(open.pdf_url) });
       setExpiresAt(open.expires_at);
       const resume = Number(open.last_position ?? 0);
       const boundedResume = clampRatio(resume);
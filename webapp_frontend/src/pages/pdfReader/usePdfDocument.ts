@@ -4,8 +4,17 @@ import pdfWorkerUrl from 'pdfjs-dist/legacy/build/pdf.worker.mjs?url';
 
 pdfjsLib.GlobalWorkerOptions.workerSrc = pdfWorkerUrl;
 
+export interface PdfSource {
+  url: string;
+  httpHeaders: Record<string, string>;
+}
+
+// pdf.js fetches the document in ranges of this size: page 1 renders as soon as
+// its bytes (and the xref table) arrive, the rest keeps loading in the background.
+const PDF_RANGE_CHUNK_BYTES = 256 * 1024;
+
 interface UsePdfDocumentOptions {
-  pdfBytes: Uint8Array | null;
+  pdfSource: PdfSource | null;
   resumeRatioRef: MutableRefObject<number>;
   pendingScrollFractionRef: MutableRefObject<number | null>;
   setError: (message: string) => void;
@@ -14,7 +23,7 @@ interface UsePdfDocumentOptions {
 const clampRatio = (ratio: number) => Math.max(0, Math.min(1, ratio));
 
 export function usePdfDocument({
-  pdfBytes,
+  pdfSource,
   resumeRatioRef,
   pendingScrollFractionRef,
   setError,
@@ -27,7 +36,7 @@ export function usePdfDocument({
   useEffect(() => {
     let cancelled = false;
     let loadedDoc: pdfjsLib.PDFDocumentProxy | null = null;
-    if (!pdfBytes) {
+    if (!pdfSource) {
       setPdfDoc(null);
       setPageCount(0);
       setPageNumber(1);
@@ -36,10 +45,12 @@ export function usePdfDocument({
 
     setDocumentRendering(true);
     pdfjsLib.getDocument({
-      data: pdfBytes.slice(),
-      disableAutoFetch: true,
-      disableRange: true,
-      disableStream: true,
+      url: pdfSource.url,
+      httpHeaders: pdfSource.httpHeaders,
+      rangeChunkSize: PDF_RANGE_CHUNK_BYTES,
+      disableAutoFetch: false,
+      disableRange: false,
+      disableStream: false,
       isImageDecoderSupported: false,
       isOffscreenCanvasSupported: false,
       useWasm: false,
@@ -85,7 +96,7 @@ export function usePdfDocument({
       cancelled = true;
       loadedDoc?.destroy();
     };
-  }, [pdfBytes, pendingScrollFractionRef, resumeRatioRef, setError]);
+  }, [pdfSource, pendingScrollFractionRef, resumeRatioRef, setError]);
 
   return {
     pdfDoc,
@@ -669,13 +669,14 @@ export interface ConsumeEventRequest {
   started_at?: string;
   ended_at?: string;
   client?: string;
+  session_end?: boolean;
 }
 
 export interface MyContentsResponse {
   items: UserContentWithDetails[];
   count: number;
   next_cursor?: string | null;
-  facets?: MyContentsFacets;
+  facets?: MyContentsFacets | null;
 }
 
 export interface PdfOpenResponse {